@@ -0,0 +1,79 @@
+-- 004_analyst_workload.sql - Carga de analistas mantenida por triggers
+USE incidex_db;
+
+-- Tickets abiertos (NUEVO, ASIGNADO, EN_PROGRESO) asignados a cada usuario.
+-- Se mantiene dentro de la misma transacción que modifica el ticket, así que
+-- los contadores quedan consistentes aunque se creen tickets en paralelo.
+CREATE TABLE IF NOT EXISTS analyst_workload (
+  user_id     INT      NOT NULL PRIMARY KEY,
+  open_count  INT      NOT NULL DEFAULT 0,
+  updated_at  DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  CONSTRAINT fk_aw_user FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+-- Carga inicial a partir de los tickets existentes
+INSERT INTO analyst_workload (user_id, open_count)
+SELECT t.assignee_id, COUNT(*)
+FROM tickets t
+JOIN statuses s ON s.id = t.status_id
+WHERE t.assignee_id IS NOT NULL
+  AND s.name IN ('NUEVO','ASIGNADO','EN_PROGRESO')
+GROUP BY t.assignee_id
+ON DUPLICATE KEY UPDATE open_count = VALUES(open_count);
+
+DROP TRIGGER IF EXISTS trg_tickets_workload_ai;
+DROP TRIGGER IF EXISTS trg_tickets_workload_au;
+DROP TRIGGER IF EXISTS trg_tickets_workload_ad;
+
+DELIMITER $$
+
+CREATE TRIGGER trg_tickets_workload_ai
+AFTER INSERT ON tickets
+FOR EACH ROW
+BEGIN
+  IF NEW.assignee_id IS NOT NULL
+     AND (SELECT name FROM statuses WHERE id = NEW.status_id) IN ('NUEVO','ASIGNADO','EN_PROGRESO') THEN
+    INSERT INTO analyst_workload (user_id, open_count)
+    VALUES (NEW.assignee_id, 1)
+    ON DUPLICATE KEY UPDATE open_count = open_count + 1;
+  END IF;
+END$$
+
+CREATE TRIGGER trg_tickets_workload_au
+AFTER UPDATE ON tickets
+FOR EACH ROW
+BEGIN
+  DECLARE old_open TINYINT DEFAULT 0;
+  DECLARE new_open TINYINT DEFAULT 0;
+
+  IF NOT (OLD.assignee_id <=> NEW.assignee_id) OR OLD.status_id <> NEW.status_id THEN
+    SET old_open = (SELECT name FROM statuses WHERE id = OLD.status_id) IN ('NUEVO','ASIGNADO','EN_PROGRESO');
+    SET new_open = (SELECT name FROM statuses WHERE id = NEW.status_id) IN ('NUEVO','ASIGNADO','EN_PROGRESO');
+
+    IF OLD.assignee_id IS NOT NULL AND old_open = 1 THEN
+      UPDATE analyst_workload
+      SET open_count = GREATEST(open_count - 1, 0)
+      WHERE user_id = OLD.assignee_id;
+    END IF;
+
+    IF NEW.assignee_id IS NOT NULL AND new_open = 1 THEN
+      INSERT INTO analyst_workload (user_id, open_count)
+      VALUES (NEW.assignee_id, 1)
+      ON DUPLICATE KEY UPDATE open_count = open_count + 1;
+    END IF;
+  END IF;
+END$$
+
+CREATE TRIGGER trg_tickets_workload_ad
+AFTER DELETE ON tickets
+FOR EACH ROW
+BEGIN
+  IF OLD.assignee_id IS NOT NULL
+     AND (SELECT name FROM statuses WHERE id = OLD.status_id) IN ('NUEVO','ASIGNADO','EN_PROGRESO') THEN
+    UPDATE analyst_workload
+    SET open_count = GREATEST(open_count - 1, 0)
+    WHERE user_id = OLD.assignee_id;
+  END IF;
+END$$
+
+DELIMITER ;
@@ -0,0 +1,34 @@
+-- 005_notifications_index_archive.sql - Índice compuesto y archivo de notificaciones
+USE incidex_db;
+
+-- list_unread_notifications filtra (user_id, is_read) y ordena por created_at;
+-- mark_all_notifications_read_for_user actualiza por (user_id, is_read).
+-- Con este índice ambas resuelven por rango sin filesort ni leer las ya leídas.
+-- Se conservan idx_notif_user / idx_notif_ticket / idx_notif_created.
+SET @idx_exists := (
+  SELECT COUNT(*) FROM information_schema.statistics
+  WHERE table_schema = DATABASE()
+    AND table_name = 'ticket_notifications'
+    AND index_name = 'idx_notif_user_read_created'
+);
+SET @ddl := IF(@idx_exists = 0,
+  'ALTER TABLE ticket_notifications ADD INDEX idx_notif_user_read_created (user_id, is_read, created_at)',
+  'DO 0');
+PREPARE stmt FROM @ddl;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+-- Notificaciones leídas y antiguas, movidas por el comando archive-notifications.
+-- Misma estructura + fecha de archivo; el id se conserva (sin AUTO_INCREMENT).
+CREATE TABLE IF NOT EXISTS ticket_notifications_archive (
+  id          INT          NOT NULL PRIMARY KEY,
+  user_id     INT          NOT NULL,
+  ticket_id   INT          NOT NULL,
+  kind        VARCHAR(30)  NOT NULL,
+  message     VARCHAR(255) NOT NULL,
+  is_read     TINYINT(1)   NOT NULL DEFAULT 1,
+  created_at  DATETIME     NOT NULL,
+  archived_at DATETIME     NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  INDEX idx_notif_arch_user_created (user_id, created_at),
+  INDEX idx_notif_arch_ticket (ticket_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
@@ -0,0 +1,81 @@
+-- 006_bitacora_partitions.sql - Particionado mensual de bitacora
+USE incidex_db;
+
+-- bitacora crece sin límite. Con particiones mensuales por `fecha`:
+--   * los reportes con rango de fechas solo leen los meses involucrados
+--     (partition pruning);
+--   * retirar un mes antiguo es un ALTER TABLE ... DROP PARTITION (o
+--     EXCHANGE PARTITION hacia una tabla de archivo), sin DELETE masivo.
+--
+-- MySQL exige que la columna de particionado esté en todas las claves
+-- únicas, así que la PK pasa de (id) a (id, fecha). bitacora no tiene FKs.
+
+SET @ya_particionada := (
+  SELECT COUNT(*) FROM information_schema.partitions
+  WHERE table_schema = DATABASE()
+    AND table_name = 'bitacora'
+    AND partition_name IS NOT NULL
+);
+
+SET @ddl := IF(@ya_particionada = 0,
+  'ALTER TABLE bitacora DROP PRIMARY KEY, ADD PRIMARY KEY (id, fecha)',
+  'DO 0');
+PREPARE stmt FROM @ddl;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+-- Todo lo anterior a 2025 queda en p_hist; los meses siguientes los
+-- crea el procedimiento de abajo partiendo pmax.
+SET @ddl := IF(@ya_particionada = 0,
+  'ALTER TABLE bitacora PARTITION BY RANGE COLUMNS (fecha) (
+     PARTITION p_hist VALUES LESS THAN (''2025-01-01''),
+     PARTITION pmax   VALUES LESS THAN (MAXVALUE)
+   )',
+  'DO 0');
+PREPARE stmt FROM @ddl;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+DROP PROCEDURE IF EXISTS sp_bitacora_particiones_futuras;
+
+DELIMITER $$
+
+-- Crea una partición por mes hasta `meses_adelante` meses después del
+-- actual, separándolas de pmax (que queda vacía, así el REORGANIZE es barato).
+CREATE PROCEDURE sp_bitacora_particiones_futuras(IN meses_adelante INT)
+BEGIN
+  DECLARE ultimo DATE;
+  DECLARE hasta DATE;
+  DECLARE limite DATE;
+
+  SELECT MAX(STR_TO_DATE(LEFT(TRIM(BOTH '''' FROM partition_description), 10), '%Y-%m-%d'))
+    INTO ultimo
+    FROM information_schema.partitions
+   WHERE table_schema = DATABASE()
+     AND table_name = 'bitacora'
+     AND partition_name <> 'pmax';
+
+  SET hasta = DATE_ADD(DATE_FORMAT(CURDATE(), '%Y-%m-01'), INTERVAL meses_adelante + 1 MONTH);
+
+  WHILE ultimo IS NOT NULL AND ultimo < hasta DO
+    SET limite = DATE_ADD(ultimo, INTERVAL 1 MONTH);
+    SET @ddl = CONCAT(
+      'ALTER TABLE bitacora REORGANIZE PARTITION pmax INTO (',
+      'PARTITION p', DATE_FORMAT(ultimo, '%Y%m'), ' VALUES LESS THAN (''', limite, '''), ',
+      'PARTITION pmax VALUES LESS THAN (MAXVALUE))'
+    );
+    PREPARE stmt FROM @ddl;
+    EXECUTE stmt;
+    DEALLOCATE PREPARE stmt;
+    SET ultimo = limite;
+  END WHILE;
+END$$
+
+DELIMITER ;
+
+CALL sp_bitacora_particiones_futuras(3);
+
+-- Mantenimiento diario (requiere event_scheduler=ON, por defecto en MySQL 8)
+CREATE EVENT IF NOT EXISTS ev_bitacora_particiones
+  ON SCHEDULE EVERY 1 DAY
+  DO CALL sp_bitacora_particiones_futuras(3);
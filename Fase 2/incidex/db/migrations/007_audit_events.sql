@@ -0,0 +1,63 @@
+-- 007_audit_events.sql - Eventos de auditoría estructurados (web + escritorio)
+USE incidex_db;
+
+-- Un solo flujo de auditoría para la web (TicketRepository) y el
+-- escritorio (DBManager), con columnas tipadas en vez de texto libre:
+--   entity    : ticket | user | category | department | session | bitacora
+--   action    : create | update | delete | deactivate | status_change |
+--               assign | comment | attachment | login | logout | legacy
+--   payload   : JSON compacto con el detalle (estados, nombres, notas...)
+-- Índices: rango de tiempo (ts), historial de una entidad (entity, entity_id, ts)
+-- y actividad de un usuario (actor_id, ts).
+CREATE TABLE IF NOT EXISTS audit_events (
+  id          BIGINT      NOT NULL AUTO_INCREMENT PRIMARY KEY,
+  ts          DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+  source      ENUM('web','desktop') NOT NULL,
+  actor_id    INT         NULL,
+  actor_name  VARCHAR(120) NULL,
+  entity      VARCHAR(30) NOT NULL,
+  entity_id   BIGINT      NULL,
+  action      VARCHAR(40) NOT NULL,
+  payload     JSON        NULL,
+  INDEX idx_audit_ts (ts),
+  INDEX idx_audit_entity (entity, entity_id, ts),
+  INDEX idx_audit_actor (actor_id, ts),
+  INDEX idx_audit_action_ts (action, ts)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+-- Carga inicial (solo si la tabla está vacía): historial de tickets y bitácora
+INSERT INTO audit_events (ts, source, actor_id, entity, entity_id, action, payload)
+SELECT th.created_at, 'web', th.actor_user_id, 'ticket', th.ticket_id, 'status_change',
+       JSON_OBJECT('from_status_id', th.from_status_id,
+                   'to_status_id',   th.to_status_id,
+                   'note',           th.note)
+FROM ticket_history th
+WHERE NOT EXISTS (SELECT 1 FROM audit_events);
+
+INSERT INTO audit_events (ts, source, actor_name, entity, action, payload)
+SELECT b.fecha, 'desktop', b.usuario, 'bitacora', 'legacy',
+       JSON_OBJECT('rol', b.rol, 'accion', b.accion, 'resultado', b.resultado)
+FROM bitacora b
+WHERE NOT EXISTS (SELECT 1 FROM audit_events WHERE source = 'desktop');
+
+-- Solo inserción: los eventos no se modifican ni se borran
+DROP TRIGGER IF EXISTS trg_audit_events_no_update;
+DROP TRIGGER IF EXISTS trg_audit_events_no_delete;
+
+DELIMITER $$
+
+CREATE TRIGGER trg_audit_events_no_update
+BEFORE UPDATE ON audit_events
+FOR EACH ROW
+BEGIN
+  SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'audit_events es de solo inserción';
+END$$
+
+CREATE TRIGGER trg_audit_events_no_delete
+BEFORE DELETE ON audit_events
+FOR EACH ROW
+BEGIN
+  SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'audit_events es de solo inserción';
+END$$
+
+DELIMITER ;
@@ -0,0 +1,173 @@
+-- 008_report_rollups.sql - Tablas de resumen diario para reportes de tickets
+USE incidex_db;
+
+-- Los reportes de escritorio recorrían tickets + 4 catálogos en cada
+-- consulta. Estas tablas guardan agregados por día y se refrescan de forma
+-- incremental con sp_report_refresh(): solo se recalculan los días tocados
+-- por tickets nuevos o por filas nuevas de ticket_history desde la última
+-- pasada (marcas de agua en report_watermarks). Cada pasada relee además
+-- las últimas 2000 ids por debajo de la marca: un id se asigna en el INSERT
+-- pero la fila aparece con el COMMIT, así que una transacción larga puede
+-- confirmar una fila con id menor a otra que ya se resumió.
+--
+-- NULL en department_id / category_id se guarda como 0 (son parte de la PK).
+
+-- Volumen: tickets creados el día `dia`, por su estado/prioridad/
+-- departamento/categoría actuales.
+CREATE TABLE IF NOT EXISTS report_ticket_daily (
+  dia           DATE NOT NULL,
+  status_id     INT  NOT NULL,
+  priority_id   INT  NOT NULL,
+  department_id INT  NOT NULL DEFAULT 0,
+  category_id   INT  NOT NULL DEFAULT 0,
+  tickets       INT  NOT NULL,
+  PRIMARY KEY (dia, status_id, priority_id, department_id, category_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+-- Tiempo de resolución: tickets resueltos (resolved_at, o closed_at si no
+-- pasó por RESUELTO) el día `dia`, agrupados en tramos de horas. Con la
+-- suma de minutos sale el promedio y con los tramos acumulados los
+-- percentiles de cualquier rango de días sin volver a leer tickets.
+-- bucket_horas = límite superior del tramo (9999 = más de 30 días).
+CREATE TABLE IF NOT EXISTS report_resolution_daily (
+  dia           DATE     NOT NULL,
+  priority_id   INT      NOT NULL,
+  department_id INT      NOT NULL DEFAULT 0,
+  category_id   INT      NOT NULL DEFAULT 0,
+  bucket_horas  SMALLINT NOT NULL,
+  resueltos     INT      NOT NULL,
+  minutos_total BIGINT   NOT NULL,
+  PRIMARY KEY (dia, priority_id, department_id, category_id, bucket_horas)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+CREATE TABLE IF NOT EXISTS report_watermarks (
+  source       VARCHAR(40) NOT NULL PRIMARY KEY,
+  last_id      BIGINT      NOT NULL DEFAULT 0,
+  refreshed_at DATETIME    NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+INSERT IGNORE INTO report_watermarks (source, last_id) VALUES
+  ('tickets', 0), ('ticket_history', 0);
+
+-- Índice funcional para recalcular un día de resoluciones por rango
+SET @idx_exists := (
+  SELECT COUNT(*) FROM information_schema.statistics
+  WHERE table_schema = DATABASE()
+    AND table_name = 'tickets'
+    AND index_name = 'idx_tickets_resolved_day'
+);
+SET @ddl := IF(@idx_exists = 0,
+  'ALTER TABLE tickets ADD INDEX idx_tickets_resolved_day ((DATE(COALESCE(resolved_at, closed_at))))',
+  'DO 0');
+PREPARE stmt FROM @ddl;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+DROP PROCEDURE IF EXISTS sp_report_refresh;
+
+DELIMITER $$
+
+-- No abre ni cierra transacción: el llamador decide (el EVENT corre en
+-- autocommit; DBManager hace commit después del CALL). Para reconstruir
+-- todo basta con poner last_id = 0 en report_watermarks.
+CREATE PROCEDURE sp_report_refresh()
+BEGIN
+  DECLARE v_ult_ticket BIGINT;
+  DECLARE v_ult_hist   BIGINT;
+  DECLARE v_max_ticket BIGINT;
+  DECLARE v_max_hist   BIGINT;
+  -- Ids por debajo de la marca que se vuelven a mirar (commits tardíos)
+  DECLARE v_relectura  BIGINT DEFAULT 2000;
+
+  -- Serializa refrescos simultáneos (evento + escritorio)
+  SELECT last_id INTO v_ult_ticket FROM report_watermarks WHERE source = 'tickets' FOR UPDATE;
+  SELECT last_id INTO v_ult_hist   FROM report_watermarks WHERE source = 'ticket_history' FOR UPDATE;
+
+  -- Se fija el tope al empezar: lo que entre mientras tanto queda para la próxima
+  SELECT COALESCE(MAX(id), 0) INTO v_max_ticket FROM tickets;
+  SELECT COALESCE(MAX(id), 0) INTO v_max_hist   FROM ticket_history;
+
+  DROP TEMPORARY TABLE IF EXISTS tmp_report_tickets;
+  CREATE TEMPORARY TABLE tmp_report_tickets (ticket_id BIGINT PRIMARY KEY) ENGINE=MEMORY;
+
+  INSERT IGNORE INTO tmp_report_tickets
+  SELECT id FROM tickets WHERE id > v_ult_ticket - v_relectura AND id <= v_max_ticket;
+
+  INSERT IGNORE INTO tmp_report_tickets
+  SELECT ticket_id FROM ticket_history WHERE id > v_ult_hist - v_relectura AND id <= v_max_hist;
+
+  -- Días afectados: el de creación y el de resolución de cada ticket tocado
+  DROP TEMPORARY TABLE IF EXISTS tmp_report_dias;
+  CREATE TEMPORARY TABLE tmp_report_dias (dia DATE PRIMARY KEY) ENGINE=MEMORY;
+
+  INSERT IGNORE INTO tmp_report_dias
+  SELECT DATE(t.created_at)
+  FROM tmp_report_tickets x
+  JOIN tickets t ON t.id = x.ticket_id;
+
+  INSERT IGNORE INTO tmp_report_dias
+  SELECT DATE(COALESCE(t.resolved_at, t.closed_at))
+  FROM tmp_report_tickets x
+  JOIN tickets t ON t.id = x.ticket_id
+  WHERE COALESCE(t.resolved_at, t.closed_at) IS NOT NULL;
+
+  DELETE r FROM report_ticket_daily r JOIN tmp_report_dias d ON d.dia = r.dia;
+
+  INSERT INTO report_ticket_daily
+    (dia, status_id, priority_id, department_id, category_id, tickets)
+  SELECT d.dia, t.status_id, t.priority_id,
+         COALESCE(t.department_id, 0), COALESCE(t.category_id, 0), COUNT(*)
+  FROM tmp_report_dias d
+  JOIN tickets t
+    ON t.created_at >= d.dia AND t.created_at < d.dia + INTERVAL 1 DAY
+  GROUP BY d.dia, t.status_id, t.priority_id,
+           COALESCE(t.department_id, 0), COALESCE(t.category_id, 0);
+
+  DELETE r FROM report_resolution_daily r JOIN tmp_report_dias d ON d.dia = r.dia;
+
+  INSERT INTO report_resolution_daily
+    (dia, priority_id, department_id, category_id, bucket_horas, resueltos, minutos_total)
+  SELECT x.dia, x.priority_id, x.department_id, x.category_id,
+         CASE
+           WHEN x.minutos <=    60 THEN 1
+           WHEN x.minutos <=   240 THEN 4
+           WHEN x.minutos <=   480 THEN 8
+           WHEN x.minutos <=  1440 THEN 24
+           WHEN x.minutos <=  2880 THEN 48
+           WHEN x.minutos <=  4320 THEN 72
+           WHEN x.minutos <=  7200 THEN 120
+           WHEN x.minutos <= 10080 THEN 168
+           WHEN x.minutos <= 20160 THEN 336
+           WHEN x.minutos <= 43200 THEN 720
+           ELSE 9999
+         END AS bucket_horas,
+         COUNT(*), SUM(x.minutos)
+  FROM (
+    SELECT d.dia, t.priority_id,
+           COALESCE(t.department_id, 0) AS department_id,
+           COALESCE(t.category_id, 0)   AS category_id,
+           GREATEST(TIMESTAMPDIFF(MINUTE, t.created_at, COALESCE(t.resolved_at, t.closed_at)), 0) AS minutos
+    FROM tmp_report_dias d
+    JOIN tickets t
+      ON DATE(COALESCE(t.resolved_at, t.closed_at)) = d.dia
+  ) x
+  GROUP BY x.dia, x.priority_id, x.department_id, x.category_id, bucket_horas;
+
+  UPDATE report_watermarks
+     SET last_id = CASE source WHEN 'tickets' THEN v_max_ticket ELSE v_max_hist END,
+         refreshed_at = NOW()
+   WHERE source IN ('tickets', 'ticket_history');
+
+  DROP TEMPORARY TABLE IF EXISTS tmp_report_dias;
+  DROP TEMPORARY TABLE IF EXISTS tmp_report_tickets;
+END$$
+
+DELIMITER ;
+
+-- Carga inicial (marcas en 0: recorre todos los días con tickets)
+CALL sp_report_refresh();
+
+-- Refresco periódico (requiere event_scheduler=ON, por defecto en MySQL 8)
+CREATE EVENT IF NOT EXISTS ev_report_refresh
+  ON SCHEDULE EVERY 5 MINUTE
+  DO CALL sp_report_refresh();
@@ -0,0 +1,83 @@
+-- 009_ticket_sla.sql - Temporizadores de SLA y tiempo por estado
+USE incidex_db;
+
+-- Objetivo por prioridad: priorities.sla_hours (ya existía) y el porcentaje
+-- del plazo en que se avisa antes del vencimiento.
+SET @col_exists := (
+  SELECT COUNT(*) FROM information_schema.columns
+  WHERE table_schema = DATABASE()
+    AND table_name = 'priorities'
+    AND column_name = 'sla_warn_pct'
+);
+SET @ddl := IF(@col_exists = 0,
+  'ALTER TABLE priorities ADD COLUMN sla_warn_pct TINYINT NOT NULL DEFAULT 80',
+  'DO 0');
+PREPARE stmt FROM @ddl;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+-- Un temporizador por ticket, mantenido por TicketRepository al crear el
+-- ticket y en cada update_status_with_history (nada se recalcula desde
+-- ticket_history). next_deadline es el próximo instante en que el
+-- barrido (flask sla-sweep) tiene algo que hacer:
+--   warn_at  si aún no se avisó,
+--   due_at   si ya se avisó pero no venció,
+--   NULL     si está detenido (RESUELTO / estado terminal) o ya venció.
+-- El barrido lee idx_sla_next_deadline por rango (next_deadline <= NOW()),
+-- sin recorrer los tickets abiertos.
+CREATE TABLE IF NOT EXISTS ticket_sla (
+  ticket_id     BIGINT   NOT NULL PRIMARY KEY,
+  priority_id   INT      NOT NULL,
+  started_at    DATETIME NOT NULL,
+  warn_at       DATETIME NOT NULL,
+  due_at        DATETIME NOT NULL,
+  status_id     INT      NOT NULL,
+  status_since  DATETIME NOT NULL,
+  stopped_at    DATETIME NULL,
+  warned_at     DATETIME NULL,
+  breached_at   DATETIME NULL,
+  next_deadline DATETIME NULL,
+  INDEX idx_sla_next_deadline (next_deadline),
+  INDEX idx_sla_due (due_at),
+  CONSTRAINT fk_sla_ticket FOREIGN KEY (ticket_id) REFERENCES tickets(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+-- Segundos acumulados en cada estado (se suma al salir del estado;
+-- el tramo en curso es NOW() - ticket_sla.status_since).
+CREATE TABLE IF NOT EXISTS ticket_status_time (
+  ticket_id BIGINT NOT NULL,
+  status_id INT    NOT NULL,
+  seconds   BIGINT NOT NULL DEFAULT 0,
+  PRIMARY KEY (ticket_id, status_id),
+  CONSTRAINT fk_tst_ticket FOREIGN KEY (ticket_id) REFERENCES tickets(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+-- Carga inicial. Los avisos y vencimientos ya pasados se marcan como
+-- emitidos para que el primer barrido no notifique todo el histórico.
+-- Las prioridades sin objetivo (sla_hours NULL) no llevan temporizador.
+INSERT IGNORE INTO ticket_sla
+  (ticket_id, priority_id, started_at, warn_at, due_at, status_id, status_since,
+   stopped_at, warned_at, breached_at, next_deadline)
+SELECT x.id, x.priority_id, x.created_at, x.warn_at, x.due_at, x.status_id,
+       COALESCE(x.status_since, x.created_at),
+       x.stopped_at,
+       CASE WHEN x.warn_at <= NOW() THEN x.warn_at END,
+       CASE WHEN x.due_at  <= NOW() THEN x.due_at  END,
+       CASE
+         WHEN x.stopped_at IS NOT NULL THEN NULL
+         WHEN x.warn_at > NOW() THEN x.warn_at
+         WHEN x.due_at  > NOW() THEN x.due_at
+         ELSE NULL
+       END
+FROM (
+  SELECT t.id, t.priority_id, t.status_id, t.created_at,
+         t.created_at + INTERVAL (p.sla_hours * p.sla_warn_pct * 36) SECOND AS warn_at,
+         t.created_at + INTERVAL p.sla_hours HOUR                          AS due_at,
+         (SELECT MAX(th.created_at) FROM ticket_history th WHERE th.ticket_id = t.id) AS status_since,
+         CASE WHEN s.is_terminal = 1 OR s.name = 'RESUELTO'
+              THEN COALESCE(t.resolved_at, t.closed_at, t.updated_at) END AS stopped_at
+  FROM tickets t
+  JOIN priorities p ON p.id = t.priority_id
+  JOIN statuses s   ON s.id = t.status_id
+  WHERE p.sla_hours IS NOT NULL
+) x;
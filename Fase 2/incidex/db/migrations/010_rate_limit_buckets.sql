@@ -0,0 +1,15 @@
+-- 010_rate_limit_buckets.sql - Baldes de límite de uso compartidos (RATELIMIT_STORAGE=db)
+USE incidex_db;
+
+-- Un balde (token bucket) por clave "<endpoint>:<user|ip>:<id>", p. ej.
+-- "tickets.ai_suggest:user:12" o "public.support:ip:10.0.0.8". Lo mantiene
+-- src/infrastructure/rate_limit.py (DbStore): en cada request bloquea las
+-- filas de sus baldes (SELECT ... FOR UPDATE), recarga los tokens por el
+-- tiempo pasado y cobra uno en todos o en ninguno. updated_at es epoch en segundos (con fracción); las filas sin
+-- uso por un día se borran solas (un balde así ya estaría lleno).
+CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+  bucket_key  VARCHAR(191) NOT NULL PRIMARY KEY,
+  tokens      DOUBLE       NOT NULL,
+  updated_at  DOUBLE       NOT NULL,
+  INDEX idx_rate_limit_updated (updated_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
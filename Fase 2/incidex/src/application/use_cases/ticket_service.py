@@ -1,5 +1,11 @@
+import time
+import logging
 from dataclasses import dataclass
+from datetime import datetime
 from src.infrastructure.ai.gemini_client import suggest_ticket_metadata
+from src.infrastructure.analytics import ticket_history as analytics
+
+log = logging.getLogger(__name__)
 
 ADMIN_ROLES = {"ADMIN"}
 
@@ -31,11 +37,35 @@ class AISuggestion:
     department_id: int | None
     reason: str | None = None
 
+@dataclass
+class HistoryReportDTO:
+    history_rows: int
+    tickets: int
+    states: list            # [{status, tickets, mean_hours, p50_hours, p90_hours}]
+    transition_labels: list # nombres de estado (filas y columnas)
+    transitions: list       # [[from_name, n, n, ...]]
+    week_labels: list       # 'dd/mm' del inicio de cada semana
+    throughput: list        # [{name, weeks: [n...], total}]
+    reassigned_tickets: int
+    reassignments_max: int
+    reassignments_mean: float
+
+
+STOP_STATUSES = {"RESUELTO", "CERRADO", "RECHAZADO"}
+DONE_STATUSES = {"RESUELTO", "CERRADO"}
+
 
 class TicketService:
     def __init__(self, repo):
         self.repo = repo
 
+    def unit_of_work(self):
+        """
+        Agrupa varias operaciones del servicio (crear + adjuntos, etc.)
+        en una sola transacción del repositorio.
+        """
+        return self.repo.unit_of_work()
+
     def catalogs(self) -> CatalogsDTO:
         return CatalogsDTO(
             categories = self.repo.get_categories(),
@@ -81,9 +111,7 @@ class TicketService:
         # ======= Crear ticket =======
     def create(self, *, requester_id: int, subject: str, details: str,
                category_id: int, department_id: int, priority_id: int, assignee_id: int | None):
-        code = self.repo.next_ticket_code()
         created = self.repo.insert_ticket(
-            code=code,
             title=subject.strip(),
             description=details.strip(),
             requester_id=requester_id,
@@ -92,6 +120,7 @@ class TicketService:
             priority_id=priority_id,
             assignee_id=assignee_id
         )
+        code = created.code
 
         # === Notificación al solicitante ===
         try:
@@ -103,7 +132,7 @@ class TicketService:
                 message=msg_req
             )
         except Exception as e:
-            print(f"[WARN] No se pudo notificar al solicitante: {e}")
+            log.warning("No se pudo notificar al solicitante: %s", e)
 
         # === Notificación al analista asignado (si existe) ===
         if assignee_id:
@@ -116,7 +145,7 @@ class TicketService:
                     message=msg_ass
                 )
             except Exception as e:
-                print(f"[WARN] No se pudo notificar al analista: {e}")
+                log.warning("No se pudo notificar al analista: %s", e)
 
         return created
     
@@ -129,6 +158,26 @@ class TicketService:
     def _has_role(self, roles: list[str]) -> bool:
         return any((r or "").upper() in ADMIN_ROLES for r in (roles or []))
 
+    # == visibilidad: mismo alcance que el listado por rol (scoped_list) ==
+    def can_view(self, tmin: dict, viewer_id: int, viewer_roles: list[str]) -> bool:
+        roles_up = {(r or "").upper() for r in (viewer_roles or [])}
+        if "ADMIN" in roles_up:
+            return True
+
+        if viewer_id in (tmin.get("requester_id"), tmin.get("assignee_id")):
+            return True
+
+        if "ANALYST" in roles_up:
+            user_dept_id = self.repo.get_user_department_id(viewer_id)
+            ticket_dept_id = tmin.get("department_id")
+            return (
+                ticket_dept_id is not None
+                and user_dept_id is not None
+                and int(ticket_dept_id) == int(user_dept_id)
+            )
+
+        return False
+
     # == permisos para asignar ==
     def detail(self, ticket_id: int, viewer_id: int, viewer_roles: list[str]) -> TicketBundle | None:
         t = self.repo.detail(ticket_id)
@@ -388,7 +437,7 @@ class TicketService:
                             message=msg_ass,
                         )
                     except Exception as e:
-                        print(f"[WARN] No se pudo notificar al analista autoasignado: {e}")
+                        log.warning("No se pudo notificar al analista autoasignado: %s", e)
 
         # --- Notificación para el solicitante cuando se RESUELVE o se CIERRA ---
         tmin = self.repo.get_ticket_minimal(ticket_id)
@@ -413,7 +462,7 @@ class TicketService:
                         message=msg,
                     )
                 except Exception as e:
-                    print(f"[WARN] No se pudo notificar al solicitante: {e}")
+                    log.warning("No se pudo notificar al solicitante: %s", e)
 
 
 
@@ -471,6 +520,96 @@ class TicketService:
                 )
 
 
+    # ===== SLA =====
+    def sweep_sla(self, batch_size: int = 200) -> dict:
+        """
+        Procesa un lote de temporizadores vencidos (aviso o vencimiento)
+        y notifica al asignado, o a los administradores si no hay asignado.
+        Marcas y notificaciones van en una sola transacción.
+        Devuelve {"warned": n, "breached": n}.
+        """
+        warned = breached = 0
+        with self.unit_of_work():
+            due = self.repo.due_sla_timers(limit=batch_size)
+            admins = None
+            for r in due:
+                is_breach = bool(r["breached"])
+                self.repo.advance_sla_timer(int(r["ticket_id"]), breached=is_breach)
+
+                if r["assignee_id"]:
+                    recipients = [int(r["assignee_id"])]
+                else:
+                    if admins is None:
+                        admins = self.repo.list_admin_ids()
+                    recipients = admins
+
+                due_at = r["due_at"].strftime("%d/%m/%Y %H:%M")
+                if is_breach:
+                    kind = "SLA_BREACH"
+                    msg = f"El ticket {r['code']} ({r['priority_name']}) venció su SLA el {due_at}."
+                    breached += 1
+                else:
+                    kind = "SLA_WARNING"
+                    msg = f"El ticket {r['code']} ({r['priority_name']}) vence su SLA el {due_at}."
+                    warned += 1
+
+                for uid in recipients:
+                    self.repo.insert_notification(
+                        user_id=uid,
+                        ticket_id=int(r["ticket_id"]),
+                        kind=kind,
+                        message=msg,
+                    )
+        return {"warned": warned, "breached": breached}
+
+
+    # ===== Analítica del historial =====
+    def history_report(self, *, weeks: int = 8, store=None) -> HistoryReportDTO:
+        """
+        Tiempo en cada estado, matriz de transiciones, reasignaciones y
+        productividad por analista, calculados en bloque sobre la copia
+        columnar de ticket_history (ver infrastructure/analytics).
+        """
+        history, tickets = (store or analytics.history_store).frames()
+        statuses = {int(r["id"]): r["name"] for r in self.repo.get_statuses()}
+        stop_ids = [i for i, n in statuses.items() if n.upper() in STOP_STATUSES]
+        done_ids = [i for i, n in statuses.items() if n.upper() in DONE_STATUSES]
+        now = int(time.time())
+
+        tis = analytics.time_in_state(history, tickets, now=now, stop_status_ids=stop_ids)
+        states = [
+            {"status": statuses.get(int(r.status_id), str(r.status_id)), "tickets": int(r.tickets),
+             "mean_hours": r.mean_hours, "p50_hours": r.p50_hours, "p90_hours": r.p90_hours}
+            for r in analytics.state_duration_summary(tis).itertuples()
+        ]
+
+        matrix = analytics.transition_matrix(history, statuses.keys())
+        labels = [statuses[i] for i in matrix.index]
+        transitions = [[statuses[i], *map(int, row)] for i, row in zip(matrix.index, matrix.to_numpy())]
+
+        thr = analytics.analyst_throughput(history, done_ids, weeks=weeks, now=now)
+        names = self.repo.user_names([int(a) for a in thr.index])
+        throughput = sorted(
+            ({"name": names.get(int(a), f"#{a}"), "weeks": [int(x) for x in row], "total": int(row.sum())}
+             for a, row in zip(thr.index, thr.to_numpy())),
+            key=lambda r: r["total"], reverse=True,
+        )
+
+        reassign = analytics.reassignment_counts(history)
+        return HistoryReportDTO(
+            history_rows=len(history),
+            tickets=len(tickets),
+            states=states,
+            transition_labels=labels,
+            transitions=transitions,
+            week_labels=[datetime.fromtimestamp(int(w)).strftime("%d/%m") for w in thr.columns],
+            throughput=throughput,
+            reassigned_tickets=int(len(reassign)),
+            reassignments_max=int(reassign.max()) if len(reassign) else 0,
+            reassignments_mean=round(float(reassign.mean()), 1) if len(reassign) else 0.0,
+        )
+
+
     # ===== Apoyo front (autoasignar por depto) =====
 
     def analysts_by_dept_map(self) -> dict[int, list[dict]]:
@@ -0,0 +1,47 @@
+import time
+
+import click
+from flask.cli import with_appcontext
+
+from src.infrastructure.persistence.repositories.ticket_repository import TicketRepository
+
+
+@click.command("archive-notifications")
+@with_appcontext
+@click.option("--days", default=90, show_default=True,
+              help="Archivar notificaciones leídas con más de N días")
+@click.option("--batch-size", default=5000, show_default=True,
+              help="Filas por lote (una transacción por lote)")
+@click.option("--pause", default=0.2, show_default=True,
+              help="Segundos de espera entre lotes para no saturar la BD")
+@click.option("--max-batches", default=0, show_default=True,
+              help="Cortar después de N lotes (0 = hasta terminar)")
+def archive_notifications_cmd(days, batch_size, pause, max_batches):
+    """Mueve notificaciones leídas antiguas a ticket_notifications_archive."""
+    repo = TicketRepository()
+    total = 0
+    batches = 0
+    t0 = time.perf_counter()
+
+    try:
+        while True:
+            moved = repo.archive_read_notifications_batch(
+                older_than_days=days, batch_size=batch_size
+            )
+            if not moved:
+                break
+            total += moved
+            batches += 1
+            click.echo(f"  Lote {batches}: {moved} filas (total {total})")
+            if max_batches and batches >= max_batches:
+                break
+            time.sleep(pause)
+    except Exception as e:
+        click.secho(f" Error archivando notificaciones: {e}", fg="red")
+        raise SystemExit(1)
+
+    click.secho(
+        f" Archivadas {total} notificaciones en {batches} lotes "
+        f"({time.perf_counter() - t0:.1f}s).",
+        fg="green",
+    )
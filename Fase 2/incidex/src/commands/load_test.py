@@ -0,0 +1,232 @@
+import math
+import random
+import threading
+import time
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import text
+
+from src.infrastructure.persistence.database import db
+from src.infrastructure.seeding.synthetic import SEED_EMAIL_DOMAIN
+
+FLOWS = ("dashboard", "mine", "detail", "create")
+DEFAULT_MIX = "dashboard=35,mine=35,detail=25,create=5"
+
+
+def parse_mix(mix: str) -> dict:
+    """'dashboard=35,mine=35' -> {'dashboard': 35.0, 'mine': 35.0} (solo flujos conocidos)."""
+    pesos = {}
+    for parte in filter(None, (p.strip() for p in mix.split(","))):
+        nombre, _, peso = parte.partition("=")
+        nombre = nombre.strip()
+        if nombre not in FLOWS:
+            raise click.BadParameter(f"Flujo desconocido: {nombre} (válidos: {', '.join(FLOWS)})")
+        pesos[nombre] = float(peso or 1)
+    if not any(pesos.values()):
+        raise click.BadParameter("La mezcla no tiene ningún flujo con peso > 0")
+    return pesos
+
+
+def percentile(sorted_values, q: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, math.ceil(q / 100.0 * len(sorted_values)) - 1)
+    return sorted_values[min(k, len(sorted_values) - 1)]
+
+
+def summarize(samples: dict, errors: dict, elapsed: float) -> list:
+    """Una fila por flujo: n, errores, p50/p95/p99/máx en ms y req/s."""
+    filas = []
+    for flow in FLOWS:
+        vals = sorted(samples.get(flow, []))
+        if not vals and not errors.get(flow):
+            continue
+        filas.append({
+            "flow": flow,
+            "n": len(vals),
+            "errors": errors.get(flow, 0),
+            "p50": percentile(vals, 50) * 1000,
+            "p95": percentile(vals, 95) * 1000,
+            "p99": percentile(vals, 99) * 1000,
+            "max": (vals[-1] if vals else 0.0) * 1000,
+            "rps": len(vals) / elapsed if elapsed > 0 else 0.0,
+        })
+    return filas
+
+
+def _pool(users: int, tickets_per_user: int, rng: random.Random):
+    """Usuarios sembrados (muestra) con tickets propios para el flujo de detalle."""
+    ids = db.session.execute(
+        text("SELECT id FROM users WHERE email LIKE :d AND is_active = 1"),
+        {"d": f"%@{SEED_EMAIL_DOMAIN}"},
+    ).scalars().all()
+    if not ids:
+        return []
+    pool = []
+    for uid in rng.sample(list(ids), min(users, len(ids))):
+        tks = db.session.execute(text("""
+            SELECT id FROM tickets
+            WHERE requester_id = :u
+            ORDER BY id DESC
+            LIMIT :n
+        """), {"u": uid, "n": tickets_per_user}).scalars().all()
+        pool.append((uid, list(tks)))
+    return pool
+
+
+def _catalog_ids():
+    out = {}
+    for tabla in ("categories", "departments", "priorities"):
+        out[tabla] = db.session.execute(text(f"SELECT id FROM {tabla}")).scalars().all()
+    db.session.commit()
+    return out
+
+
+class _Worker(threading.Thread):
+    """Un cliente de pruebas de Flask con su propia sesión y su propio RNG."""
+
+    def __init__(self, app, pool, catalogs, weights, deadline, max_requests, seed):
+        super().__init__(daemon=True)
+        self.client = app.test_client()
+        self.pool = pool
+        self.catalogs = catalogs
+        self.flows = list(weights)
+        self.weights = list(weights.values())
+        self.deadline = deadline
+        self.max_requests = max_requests
+        self.rng = random.Random(seed)
+        self.samples = {f: [] for f in FLOWS}
+        self.errors = {f: 0 for f in FLOWS}
+
+    def _login(self, uid: int):
+        with self.client.session_transaction() as sess:
+            sess["_user_id"] = str(uid)
+            sess["_fresh"] = True
+
+    def _run_flow(self, flow: str, tickets) -> bool:
+        c = self.client
+        if flow == "dashboard":
+            return c.get("/app/dashboard").status_code == 200
+        if flow == "mine":
+            page = self.rng.randint(1, 5)
+            return c.get(f"/app/mine?page={page}").status_code == 200
+        if flow == "detail":
+            if not tickets:
+                return c.get("/app/mine").status_code == 200
+            return c.get(f"/app/detail/{self.rng.choice(tickets)}").status_code == 200
+        # create: formulario + POST, igual que un usuario real
+        if c.get("/app/tickets/create").status_code != 200:
+            return False
+        r = c.post("/app/create", data={
+            "subject": "[load-test] Ticket de carga",
+            "details": "Generado por flask load-test para medir el flujo de creación.",
+            "category_id": self.rng.choice(self.catalogs["categories"]),
+            "department_id": self.rng.choice(self.catalogs["departments"]),
+            "priority_id": self.rng.choice(self.catalogs["priorities"]),
+            "assignee_id": 0,
+        })
+        return r.status_code == 302 and "/app/detail/" in (r.headers.get("Location") or "")
+
+    def run(self):
+        hechos = 0
+        while time.perf_counter() < self.deadline:
+            if self.max_requests and hechos >= self.max_requests:
+                break
+            uid, tickets = self.rng.choice(self.pool)
+            self._login(uid)
+            flow = self.rng.choices(self.flows, weights=self.weights)[0]
+            t0 = time.perf_counter()
+            try:
+                ok = self._run_flow(flow, tickets)
+            except Exception:
+                ok = False
+            dt = time.perf_counter() - t0
+            if ok:
+                self.samples[flow].append(dt)
+            else:
+                self.errors[flow] += 1
+            hechos += 1
+
+
+@click.command("load-test")
+@with_appcontext
+@click.option("--workers", default=8, show_default=True, help="Hilos cliente en paralelo")
+@click.option("--duration", default=30.0, show_default=True, help="Segundos de carga")
+@click.option("--requests", "max_requests", default=0, show_default=True,
+              help="Máximo de flujos por hilo (0 = hasta --duration)")
+@click.option("--users", default=50, show_default=True,
+              help="Usuarios sembrados (seed-data) que se reparten los hilos")
+@click.option("--mix", default=DEFAULT_MIX, show_default=True,
+              help="Peso de cada flujo: dashboard, mine, detail, create")
+@click.option("--warmup", default=2.0, show_default=True,
+              help="Segundos iniciales que no se cuentan")
+@click.option("--seed", default=1, show_default=True, help="Semilla del generador")
+@click.option("--max-p95-ms", default=0.0, show_default=True,
+              help="Salir con error si algún flujo supera este p95 (0 = no verificar)")
+@click.option("--mail-sink", default="127.0.0.1:1", show_default=True,
+              help="host:puerto SMTP para los correos de la corrida (p. ej. MailHog)")
+def load_test_cmd(workers, duration, max_requests, users, mix, warmup, seed, max_p95_ms, mail_sink):
+    """
+    Carga sobre /app/dashboard, /app/mine, /app/detail y /app/create con el
+    cliente de pruebas de Flask (en proceso, sin servidor HTTP) y reporta
+    p50/p95/p99 por flujo. Usa los usuarios de `flask seed-data`; los tickets
+    creados quedan a nombre de ellos y se borran con `seed-data --purge`.
+    Los correos que disparan los tickets nuevos van a --mail-sink, nunca al
+    SMTP configurado: por defecto un puerto cerrado (fallan al instante y
+    solo se loguean, como en tests/perf/conftest.py).
+    """
+    weights = parse_mix(mix)
+    rng = random.Random(seed)
+    pool = _pool(users, 50, rng)
+    if not pool:
+        click.secho(" No hay usuarios sembrados: ejecuta primero `flask seed-data`.", fg="red")
+        raise SystemExit(1)
+    catalogs = _catalog_ids()
+
+    app = current_app._get_current_object()
+    # Los POST del harness no traen token CSRF (no hay navegador)
+    app.config["WTF_CSRF_ENABLED"] = False
+    mail_host, _, mail_port = mail_sink.rpartition(":")
+    app.config.update(
+        MAIL_SERVER=mail_host or "127.0.0.1",
+        MAIL_PORT=int(mail_port or 1),
+        MAIL_USE_TLS=False,
+        MAIL_USE_SSL=False,
+    )
+
+    if warmup > 0:
+        calentamiento = [_Worker(app, pool, catalogs, weights, time.perf_counter() + warmup, 0, seed + i)
+                         for i in range(workers)]
+        for w in calentamiento:
+            w.start()
+        for w in calentamiento:
+            w.join()
+
+    deadline = time.perf_counter() + duration
+    hilos = [_Worker(app, pool, catalogs, weights, deadline, max_requests, seed + 1000 + i)
+             for i in range(workers)]
+    t0 = time.perf_counter()
+    for w in hilos:
+        w.start()
+    for w in hilos:
+        w.join()
+    elapsed = time.perf_counter() - t0
+
+    samples = {f: [s for w in hilos for s in w.samples[f]] for f in FLOWS}
+    errors = {f: sum(w.errors[f] for w in hilos) for f in FLOWS}
+    filas = summarize(samples, errors, elapsed)
+
+    total = sum(f["n"] for f in filas)
+    click.echo(f" {workers} hilos, {elapsed:.1f}s, {total} flujos ({total / elapsed:.1f}/s)")
+    click.echo(f" {'flujo':<10} {'n':>7} {'err':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'máx ms':>8}")
+    for f in filas:
+        click.echo(f" {f['flow']:<10} {f['n']:>7} {f['errors']:>5} {f['p50']:>8.1f} "
+                   f"{f['p95']:>8.1f} {f['p99']:>8.1f} {f['max']:>8.1f}")
+
+    lentos = [f["flow"] for f in filas if max_p95_ms and f["p95"] > max_p95_ms]
+    if lentos or any(f["errors"] for f in filas):
+        click.secho(f" Con errores o sobre el p95 ({', '.join(lentos) or 'errores'}).", fg="red")
+        raise SystemExit(1)
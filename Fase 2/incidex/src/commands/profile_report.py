@@ -0,0 +1,62 @@
+import os
+import time
+import pstats
+from collections import Counter
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from src.infrastructure.profiling import find_profiles, read_folded, self_samples, write_folded
+
+
+@click.command("profile-report")
+@with_appcontext
+@click.option("--dir", "root", default=None, help="Carpeta de perfiles (por defecto PROFILE_DIR)")
+@click.option("--endpoint", default=None, help="Solo este endpoint (ej: tickets.mine)")
+@click.option("--since-hours", default=0.0, show_default=True,
+              help="Solo perfiles de las últimas N horas (0 = todos)")
+@click.option("--out", default=None, help="Carpeta de salida (por defecto <dir>/aggregate)")
+@click.option("--top", default=10, show_default=True, help="Funciones a listar por endpoint")
+@click.option("--purge", is_flag=True, default=False,
+              help="Borrar los perfiles individuales después de agregarlos")
+def profile_report_cmd(root, endpoint, since_hours, out, top, purge):
+    """
+    Junta los perfiles de todos los workers por endpoint:
+    <out>/<endpoint>.folded (flamegraph.pl / speedscope) y <out>/<endpoint>.prof
+    (pstats / snakeviz), y muestra dónde se va el tiempo.
+    """
+    root = root or current_app.config["PROFILE_DIR"]
+    out = out or os.path.join(root, "aggregate")
+    since = time.time() - since_hours * 3600 if since_hours else None
+
+    found = find_profiles(root, endpoint=endpoint, since=since)
+    if not found:
+        click.echo(f" No hay perfiles en {root}.")
+        return
+    os.makedirs(out, exist_ok=True)
+
+    for name, files in found.items():
+        click.secho(f"\n {name}", bold=True)
+
+        if files["folded"]:
+            stacks = Counter()
+            for path in files["folded"]:
+                stacks.update(read_folded(path))
+            total = sum(stacks.values())
+            dest = os.path.join(out, f"{name}.folded")
+            write_folded(dest, stacks)
+            click.echo(f"   {len(files['folded'])} requests, {total} muestras -> {dest}")
+            for frame, n in self_samples(stacks).most_common(top):
+                click.echo(f"   {n / total:6.1%}  {frame}")
+
+        if files["prof"]:
+            stats = pstats.Stats(*files["prof"], stream=click.get_text_stream("stdout"))
+            dest = os.path.join(out, f"{name}.prof")
+            stats.dump_stats(dest)
+            click.echo(f"   {len(files['prof'])} requests (cProfile) -> {dest}")
+            stats.sort_stats("cumulative").print_stats(top)
+
+        if purge:
+            for path in files["folded"] + files["prof"]:
+                os.remove(path)
@@ -0,0 +1,241 @@
+import random
+import time
+from datetime import datetime
+
+import click
+from flask.cli import with_appcontext
+from werkzeug.security import generate_password_hash
+
+from src.infrastructure.persistence.database import db
+from src.infrastructure.seeding import synthetic as syn
+
+INSERT_SQL = {
+    "users": "INSERT INTO users ({cols}) VALUES ({ph})",
+    "user_roles": "INSERT INTO user_roles ({cols}) VALUES ({ph})",
+    "tickets": "INSERT INTO tickets ({cols}) VALUES ({ph})",
+    "ticket_history": "INSERT INTO ticket_history ({cols}) VALUES ({ph})",
+    "ticket_comments": "INSERT INTO ticket_comments ({cols}) VALUES ({ph})",
+    "ticket_notifications": "INSERT INTO ticket_notifications ({cols}) VALUES ({ph})",
+    "bitacora": "INSERT INTO bitacora ({cols}) VALUES ({ph})",
+}
+COLUMNS = {
+    "users": syn.USER_COLUMNS,
+    "user_roles": ["user_id", "role_id"],
+    "tickets": syn.TICKET_COLUMNS,
+    "ticket_history": syn.HISTORY_COLUMNS,
+    "ticket_comments": syn.COMMENT_COLUMNS,
+    "ticket_notifications": syn.NOTIFICATION_COLUMNS,
+    "bitacora": syn.BITACORA_COLUMNS,
+}
+
+# Temporizadores de SLA de los tickets sembrados, con la misma regla que la
+# carga inicial de 009_ticket_sla.sql (avisos ya pasados quedan emitidos).
+SLA_BACKFILL_SQL = """
+    INSERT IGNORE INTO ticket_sla
+      (ticket_id, priority_id, started_at, warn_at, due_at, status_id, status_since,
+       stopped_at, warned_at, breached_at, next_deadline)
+    SELECT x.id, x.priority_id, x.created_at, x.warn_at, x.due_at, x.status_id,
+           x.updated_at, x.stopped_at,
+           CASE WHEN x.warn_at <= NOW() THEN x.warn_at END,
+           CASE WHEN x.due_at  <= NOW() THEN x.due_at  END,
+           CASE
+             WHEN x.stopped_at IS NOT NULL THEN NULL
+             WHEN x.warn_at > NOW() THEN x.warn_at
+             WHEN x.due_at  > NOW() THEN x.due_at
+             ELSE NULL
+           END
+    FROM (
+      SELECT t.id, t.priority_id, t.status_id, t.created_at, t.updated_at,
+             t.created_at + INTERVAL (p.sla_hours * p.sla_warn_pct * 36) SECOND AS warn_at,
+             t.created_at + INTERVAL p.sla_hours HOUR                          AS due_at,
+             CASE WHEN s.is_terminal = 1 OR s.name = 'RESUELTO'
+                  THEN COALESCE(t.resolved_at, t.closed_at, t.updated_at) END AS stopped_at
+      FROM tickets t
+      JOIN priorities p ON p.id = t.priority_id
+      JOIN statuses s   ON s.id = t.status_id
+      WHERE t.id BETWEEN %s AND %s
+        AND p.sla_hours IS NOT NULL
+    ) x
+"""
+
+
+def _bulk_insert(cur, table: str, rows, batch_size: int) -> int:
+    """
+    INSERT multi-fila: PyMySQL convierte executemany de un INSERT ... VALUES
+    en sentencias de varias filas (hasta ~1 MB cada una), así que cada
+    lote viaja en pocos round-trips.
+    """
+    cols = COLUMNS[table]
+    sql = INSERT_SQL[table].format(cols=", ".join(cols), ph=", ".join(["%s"] * len(cols)))
+    for i in range(0, len(rows), batch_size):
+        cur.executemany(sql, rows[i:i + batch_size])
+    return len(rows)
+
+
+def _catalogs(cur, departments: int) -> syn.Catalogs:
+    """Lee los catálogos y completa departamentos sintéticos hasta `departments`."""
+    cur.execute("SELECT name, id FROM statuses")
+    statuses = dict(cur.fetchall())
+    cur.execute("SELECT id, sla_hours FROM priorities ORDER BY id")
+    priorities = [tuple(r) for r in cur.fetchall()]
+    cur.execute("SELECT id FROM categories ORDER BY id")
+    category_ids = [r[0] for r in cur.fetchall()]
+    cur.execute("SELECT name, id FROM roles")
+    roles = dict(cur.fetchall())
+
+    cur.execute("SELECT COUNT(*) FROM departments")
+    faltan = departments - int(cur.fetchone()[0])
+    if faltan > 0:
+        cur.executemany(
+            "INSERT IGNORE INTO departments (name) VALUES (%s)",
+            [(f"{syn.SEED_DEPT_PREFIX}{i:03d}",) for i in range(1, faltan + 1)],
+        )
+    cur.execute("SELECT id FROM departments ORDER BY id")
+    department_ids = [r[0] for r in cur.fetchall()]
+    return syn.Catalogs(statuses, priorities, category_ids, department_ids, roles)
+
+
+def _next_id(cur, table: str) -> int:
+    cur.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}")
+    return int(cur.fetchone()[0])
+
+
+def _purge(cur, batch_size: int):
+    """Borra por lotes todo lo marcado como sembrado (ver synthetic.SEED_*)."""
+    dominio = f"%@{syn.SEED_EMAIL_DOMAIN}"
+
+    # Tickets sembrados y los creados por usuarios sembrados (p. ej. load-test).
+    # history/comentarios/adjuntos/SLA caen por ON DELETE CASCADE;
+    # ticket_notifications no tiene FK y se borra con el mismo lote de ids.
+    total = 0
+    while True:
+        cur.execute("""
+            SELECT t.id FROM tickets t JOIN users u ON u.id = t.requester_id
+            WHERE u.email LIKE %s OR t.code LIKE %s
+            LIMIT %s
+        """, (dominio, f"{syn.SEED_CODE_PREFIX}%", int(batch_size)))
+        ids = [r[0] for r in cur.fetchall()]
+        if not ids:
+            break
+        ph = ", ".join(["%s"] * len(ids))
+        cur.execute(f"DELETE FROM ticket_notifications WHERE ticket_id IN ({ph})", ids)
+        cur.execute(f"DELETE FROM tickets WHERE id IN ({ph})", ids)
+        cur.connection.commit()
+        total += len(ids)
+    click.echo(f"  tickets: {total} borrados")
+
+    pasos = [
+        ("ticket_notifications",
+         "DELETE FROM ticket_notifications WHERE user_id IN (SELECT id FROM users WHERE email LIKE %s) LIMIT %s",
+         dominio),
+        ("users", "DELETE FROM users WHERE email LIKE %s LIMIT %s", dominio),
+        ("bitacora", "DELETE FROM bitacora WHERE usuario LIKE %s LIMIT %s", f"%{syn.SEED_BITACORA_SUFFIX}"),
+        ("departments", "DELETE FROM departments WHERE name LIKE %s LIMIT %s", f"{syn.SEED_DEPT_PREFIX}%"),
+    ]
+    for tabla, sql, patron in pasos:
+        total = 0
+        while True:
+            cur.execute(sql, (patron, int(batch_size)))
+            cur.connection.commit()
+            total += cur.rowcount
+            if cur.rowcount < batch_size:
+                break
+        click.echo(f"  {tabla}: {total} borrados")
+
+
+@click.command("seed-data")
+@with_appcontext
+@click.option("--tickets", default=10_000, show_default=True,
+              help="Tickets a generar (10k para desarrollo, 1M-10M para medir)")
+@click.option("--users", default=0, show_default=True,
+              help="Usuarios a generar (0 = tickets / 100, mínimo 50)")
+@click.option("--departments", default=12, show_default=True,
+              help="Departamentos en total; se agregan sintéticos si faltan")
+@click.option("--comments-per-ticket", default=2.0, show_default=True,
+              help="Comentarios promedio por ticket")
+@click.option("--bitacora", "bitacora_rows", default=-1, show_default=True,
+              help="Filas de bitácora (-1 = igual a --tickets)")
+@click.option("--days", default=365, show_default=True,
+              help="Ventana de fechas de creación hacia atrás")
+@click.option("--batch-size", default=5000, show_default=True,
+              help="Filas por executemany y tickets por transacción")
+@click.option("--seed", default=42, show_default=True, help="Semilla del generador")
+@click.option("--refresh-reports/--no-refresh-reports", default=True, show_default=True,
+              help="Llamar sp_report_refresh() al terminar")
+@click.option("--purge", is_flag=True, help="Borrar los datos sembrados y salir")
+def seed_data_cmd(tickets, users, departments, comments_per_ticket, bitacora_rows,
+                  days, batch_size, seed, refresh_reports, purge):
+    """Genera usuarios, tickets, historial, comentarios, notificaciones y bitácora sintéticos."""
+    conn = db.engine.raw_connection()
+    try:
+        cur = conn.cursor()
+        if purge:
+            click.secho(" Borrando datos sembrados...", fg="yellow")
+            _purge(cur, batch_size)
+            return
+
+        rng = random.Random(seed)
+        now = datetime.now().replace(microsecond=0)
+        users = users or max(50, tickets // 100)
+        bitacora_rows = tickets if bitacora_rows < 0 else bitacora_rows
+        t0 = time.perf_counter()
+
+        # Los ids se asignan acá para que las FK calcen sin leer LAST_INSERT_ID;
+        # con eso se pueden apagar las verificaciones por sesión durante la carga.
+        cur.execute("SET SESSION unique_checks = 0, foreign_key_checks = 0")
+
+        catalogs = _catalogs(cur, departments)
+        # Una sola contraseña para todos ("seed-data"): el hash es caro y no aporta variedad
+        password_hash = generate_password_hash("seed-data")
+        first_user = _next_id(cur, "users")
+        user_list, role_list, pop = syn.user_rows(rng, first_user, users, catalogs, password_hash, now=now)
+        _bulk_insert(cur, "users", user_list, batch_size)
+        _bulk_insert(cur, "user_roles", role_list, batch_size)
+        conn.commit()
+        click.echo(f"  users: {len(user_list)} (ids {first_user}..{first_user + users - 1})")
+        del user_list, role_list
+
+        first_ticket = _next_id(cur, "tickets")
+        totales = {"tickets": 0, "ticket_history": 0, "ticket_comments": 0, "ticket_notifications": 0}
+        hecho = 0
+        while hecho < tickets:
+            n = min(batch_size, tickets - hecho)
+            lote = syn.ticket_batch(rng, first_ticket + hecho, n, pop, catalogs,
+                                    now=now, days=days, comments_per_ticket=comments_per_ticket)
+            totales["tickets"] += _bulk_insert(cur, "tickets", lote.tickets, batch_size)
+            totales["ticket_history"] += _bulk_insert(cur, "ticket_history", lote.history, batch_size)
+            totales["ticket_comments"] += _bulk_insert(cur, "ticket_comments", lote.comments, batch_size)
+            totales["ticket_notifications"] += _bulk_insert(cur, "ticket_notifications", lote.notifications, batch_size)
+            cur.execute(SLA_BACKFILL_SQL, (first_ticket + hecho, first_ticket + hecho + n - 1))
+            conn.commit()
+            hecho += n
+            if hecho % (batch_size * 20) == 0 or hecho == tickets:
+                rate = hecho / max(time.perf_counter() - t0, 1e-9)
+                click.echo(f"  tickets: {hecho}/{tickets} ({rate:,.0f}/s)")
+
+        hecho = 0
+        while hecho < bitacora_rows:
+            n = min(batch_size, bitacora_rows - hecho)
+            _bulk_insert(cur, "bitacora", syn.bitacora_rows(rng, n, pop, now=now, days=days), batch_size)
+            conn.commit()
+            hecho += n
+
+        cur.execute("SET SESSION unique_checks = 1, foreign_key_checks = 1")
+        # Estadísticas al día para que los planes reflejen el volumen nuevo
+        for tabla in ("users", "tickets", "ticket_history", "ticket_comments", "ticket_notifications"):
+            cur.execute(f"ANALYZE TABLE {tabla}")
+            cur.fetchall()
+        if refresh_reports:
+            cur.execute("CALL sp_report_refresh()")
+            conn.commit()
+
+        click.secho(f" Datos sintéticos generados en {time.perf_counter() - t0:.1f}s:", fg="green")
+        for tabla, n in totales.items():
+            click.echo(f"  {tabla}: {n}")
+        click.echo(f"  bitacora: {bitacora_rows}")
+    except Exception as e:
+        conn.rollback()
+        click.secho(f" Error: {e}", fg="red")
+        raise SystemExit(1)
+    finally:
+        conn.close()
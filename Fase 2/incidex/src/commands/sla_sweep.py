@@ -0,0 +1,39 @@
+import time
+
+import click
+from flask.cli import with_appcontext
+
+from src.application.use_cases.ticket_service import TicketService
+from src.infrastructure.persistence.repositories.ticket_repository import TicketRepository
+
+
+@click.command("sla-sweep")
+@with_appcontext
+@click.option("--batch-size", default=200, show_default=True,
+              help="Temporizadores por lote (una transacción por lote)")
+@click.option("--interval", default=0.0, show_default=True,
+              help="Repetir cada N segundos (0 = una sola pasada, para cron)")
+def sla_sweep_cmd(batch_size, interval):
+    """Emite avisos y vencimientos de SLA leyendo ticket_sla.next_deadline."""
+    svc = TicketService(TicketRepository())
+
+    while True:
+        warned = breached = 0
+        try:
+            # Se vacía todo lo vencido antes de dormir
+            while True:
+                res = svc.sweep_sla(batch_size=batch_size)
+                warned += res["warned"]
+                breached += res["breached"]
+                if res["warned"] + res["breached"] < batch_size:
+                    break
+        except Exception as e:
+            click.secho(f" Error en el barrido de SLA: {e}", fg="red")
+            if not interval:
+                raise SystemExit(1)
+
+        if warned or breached or not interval:
+            click.echo(f" SLA: {warned} avisos, {breached} vencimientos.")
+        if not interval:
+            break
+        time.sleep(interval)
@@ -1,9 +1,12 @@
 import os
 import json
+import asyncio
 import logging
 
 import google.generativeai as genai
 
+from src.infrastructure.metrics import GEMINI_LATENCY, GEMINI_REQUESTS
+
 log = logging.getLogger(__name__)
 
 API_KEY = os.getenv("GEMINI_API_KEY")
@@ -13,16 +16,12 @@ if not API_KEY:
 genai.configure(api_key=API_KEY)
 
 _MODEL_NAME = "gemini-2.5-flash"
+_GENERATION_CONFIG = {"temperature": 0.3}
+TIMEOUT_SECONDS = float(os.getenv("GEMINI_TIMEOUT", "20"))
 
 
-def suggest_ticket_metadata(*, title: str, description: str,
-                            categories: list[dict],
-                            priorities: list[dict],
-                            departments: list[dict]) -> dict | None:
-    """
-    Llama a Gemini y pide que escoja category_id, priority_id y department_id.
-    Devuelve un dict con esos campos y un campo 'reason' (texto).
-    """
+def _prompts(*, title: str, description: str, categories: list[dict],
+             priorities: list[dict], departments: list[dict]) -> list[str]:
     options = {
         "categories": [{"id": c["id"], "name": c["name"]} for c in categories],
         "priorities": [{"id": p["id"], "name": p["name"]} for p in priorities],
@@ -61,17 +60,70 @@ Opciones disponibles (JSON):
 {json.dumps(options, ensure_ascii=False)}
 """.strip()
 
+    return [system_prompt, user_prompt]
+
+
+def _parse(resp) -> dict:
+    text = (resp.text or "").strip()
+    text = text.strip("` \n")
+    if text.lower().startswith("json"):
+        text = text[4:].strip()
+    return json.loads(text)
+
+
+def suggest_ticket_metadata(*, title: str, description: str,
+                            categories: list[dict],
+                            priorities: list[dict],
+                            departments: list[dict]) -> dict | None:
+    """
+    Llama a Gemini y pide que escoja category_id, priority_id y department_id.
+    Devuelve un dict con esos campos y un campo 'reason' (texto).
+    """
+    prompts = _prompts(title=title, description=description, categories=categories,
+                       priorities=priorities, departments=departments)
+    try:
+        model = genai.GenerativeModel(_MODEL_NAME)
+        with GEMINI_LATENCY.time():
+            resp = model.generate_content(
+                prompts,
+                generation_config=_GENERATION_CONFIG,
+                request_options={"timeout": TIMEOUT_SECONDS},
+            )
+        result = _parse(resp)
+        GEMINI_REQUESTS.inc(outcome="ok")
+        return result
+    except Exception as e:
+        # Respuesta no parseable también cuenta como error (la sugerencia no sirve)
+        GEMINI_REQUESTS.inc(outcome="error")
+        log.exception("Error llamando a Gemini: %s", e)
+        return None
+
+
+async def suggest_ticket_metadata_async(*, title: str, description: str,
+                                        categories: list[dict],
+                                        priorities: list[dict],
+                                        departments: list[dict]) -> dict | None:
+    """
+    Igual que suggest_ticket_metadata, pero como corrutina (cliente gRPC
+    asíncrono de Gemini): mientras espera la respuesta no ocupa un hilo.
+    Se usa desde la entrada ASGI (src/presentation/asgi.py).
+    """
+    prompts = _prompts(title=title, description=description, categories=categories,
+                       priorities=priorities, departments=departments)
     try:
         model = genai.GenerativeModel(_MODEL_NAME)
-        resp = model.generate_content(
-            [system_prompt, user_prompt],
-            generation_config={"temperature": 0.3},
-        )
-        text = (resp.text or "").strip()
-        text = text.strip("` \n")
-        if text.lower().startswith("json"):
-            text = text[4:].strip()
-        return json.loads(text)
+        with GEMINI_LATENCY.time():
+            resp = await asyncio.wait_for(
+                model.generate_content_async(prompts, generation_config=_GENERATION_CONFIG),
+                TIMEOUT_SECONDS,
+            )
+        result = _parse(resp)
+        GEMINI_REQUESTS.inc(outcome="ok")
+        return result
+    except asyncio.CancelledError:
+        # El cliente se fue (o la corrutina se canceló): no cuenta como error
+        raise
     except Exception as e:
+        GEMINI_REQUESTS.inc(outcome="error")
         log.exception("Error llamando a Gemini: %s", e)
         return None
@@ -0,0 +1,316 @@
+import time
+import logging
+import threading
+
+import numpy as np
+import pandas as pd
+from flask import current_app
+from sqlalchemy import text
+
+from src.infrastructure.persistence.database import db
+
+log = logging.getLogger(__name__)
+
+CHUNK_ROWS = 200_000       # filas por rango de id al cargar
+REFRESH_SECONDS = 300      # cada cuánto se traen las filas nuevas
+REREAD_IDS = 2000          # ids por debajo de la marca que se vuelven a leer (commits tardíos)
+WEEK_SECONDS = 7 * 24 * 3600
+
+HISTORY_COLUMNS = ["id", "ticket_id", "actor_id", "from_status", "to_status", "ts"]
+TICKET_COLUMNS = ["ticket_id", "status_id", "created_ts"]
+
+# Solo enteros: cada lote se convierte directo a un arreglo int64
+HISTORY_RANGE_SQL = text("""
+    SELECT id, ticket_id, actor_user_id, COALESCE(from_status_id, 0), to_status_id,
+           CAST(UNIX_TIMESTAMP(created_at) AS SIGNED)
+    FROM ticket_history
+    WHERE id > :lo AND id <= :hi
+    ORDER BY id
+""")
+
+TICKETS_RANGE_SQL = text("""
+    SELECT id, status_id, CAST(UNIX_TIMESTAMP(created_at) AS SIGNED)
+    FROM tickets
+    WHERE id > :lo AND id <= :hi
+    ORDER BY id
+""")
+
+
+def empty_history() -> pd.DataFrame:
+    return pd.DataFrame(np.empty((0, len(HISTORY_COLUMNS)), dtype=np.int64), columns=HISTORY_COLUMNS)
+
+
+def empty_tickets() -> pd.DataFrame:
+    return pd.DataFrame(np.empty((0, len(TICKET_COLUMNS)), dtype=np.int64), columns=TICKET_COLUMNS)
+
+
+def _load_ranges(sql, table: str, after_id: int, ncols: int, chunk_rows: int):
+    """
+    Lee `table` por rangos (after_id, after_id + chunk_rows] hasta el MAX(id)
+    actual. Devuelve (arreglo int64 [n, ncols], último id cubierto).
+    """
+    max_id = int(db.session.execute(text(f"SELECT COALESCE(MAX(id), 0) FROM {table}")).scalar() or 0)
+    parts = []
+    lo = after_id
+    while lo < max_id:
+        hi = min(lo + chunk_rows, max_id)
+        rows = db.session.execute(sql, {"lo": lo, "hi": hi}).all()
+        if rows:
+            parts.append(np.array(rows, dtype=np.int64))
+        lo = hi
+    if not parts:
+        return np.empty((0, ncols), dtype=np.int64), max(after_id, max_id)
+    return np.concatenate(parts), max_id
+
+
+def _unseen(frame: pd.DataFrame, id_col: str, rows: np.ndarray) -> np.ndarray:
+    """Filas de `rows` cuyo id (columna 0) no está en `frame` (ordenado por id)."""
+    ids = frame[id_col].to_numpy()
+    if not len(rows) or not len(ids):
+        return rows
+    pos = np.minimum(np.searchsorted(ids, rows[:, 0]), len(ids) - 1)
+    return rows[ids[pos] != rows[:, 0]]
+
+
+def _merge(frame: pd.DataFrame, columns, id_col: str, new: np.ndarray, late: np.ndarray) -> pd.DataFrame:
+    if not len(new) and not len(late):
+        return frame
+    merged = pd.concat([frame, pd.DataFrame(np.concatenate([late, new]), columns=columns)], ignore_index=True)
+    if len(late):
+        # Los tardíos quedan en su lugar: time_in_state asume orden de id
+        merged = merged.sort_values(id_col, kind="stable", ignore_index=True)
+    return merged
+
+
+class HistoryStore:
+    """
+    Copia columnar de ticket_history (y de la fecha/estado de creación de
+    tickets) en memoria del proceso. La primera vez carga todo por rangos
+    de id; después solo agrega los ids nuevos, como mucho una vez cada
+    REFRESH_SECONDS. ticket_history es de solo inserción, así que lo ya
+    cargado no cambia; sí puede aparecer tarde una fila con id menor a la
+    marca (su transacción confirmó después), por eso cada pasada relee las
+    últimas REREAD_IDS ids y agrega las que falten.
+
+    Costo: la copia es por proceso (cada worker de gunicorn tiene la suya),
+    6 columnas int64 = 48 bytes por fila de historial más 24 por ticket:
+    ~240 MB por worker con 5M filas. La primera carga la hace quien la pida
+    primero (el primer /app/reports, o warm() al arrancar con
+    ANALYTICS_WARM=True); las siguientes se hacen en un hilo aparte y
+    mientras tanto se sirve la copia anterior.
+    """
+
+    def __init__(self, chunk_rows: int = CHUNK_ROWS, refresh_seconds: int = REFRESH_SECONDS,
+                 reread_ids: int = REREAD_IDS):
+        self.chunk_rows = chunk_rows
+        self.refresh_seconds = refresh_seconds
+        self.reread_ids = reread_ids
+        self._history = empty_history()
+        self._tickets = empty_tickets()
+        self._last_history_id = 0
+        self._last_ticket_id = 0
+        self._loaded_at = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def frames(self) -> tuple[pd.DataFrame, pd.DataFrame]:
+        with self._lock:
+            if self._loaded_at is None:
+                self._apply(self._read_updates())   # primera carga: no hay copia anterior
+                return self._history, self._tickets
+            stale = time.monotonic() - self._loaded_at >= self.refresh_seconds
+            if stale and not self._refreshing:
+                self._refreshing = True
+                app = current_app._get_current_object()
+                threading.Thread(target=self._refresh_in_background, args=(app,),
+                                 name="history-store-refresh", daemon=True).start()
+            return self._history, self._tickets
+
+    def warm(self, app):
+        """Hace la primera carga en un hilo aparte (al arrancar el worker)."""
+        def _run():
+            try:
+                with app.app_context():
+                    self.frames()
+            except Exception:
+                log.warning("No se pudo precargar el historial", exc_info=True)
+        threading.Thread(target=_run, name="history-store-warm", daemon=True).start()
+
+    def _refresh_in_background(self, app):
+        # Lee sin el lock (los requests siguen con la copia anterior) y
+        # solo reemplaza al final; _refreshing asegura un único refresco
+        try:
+            with app.app_context():
+                updates = self._read_updates()
+            with self._lock:
+                self._apply(updates)
+        except Exception:
+            log.warning("No se pudo refrescar el historial en memoria", exc_info=True)
+        finally:
+            self._refreshing = False
+
+    def _read_updates(self) -> tuple:
+        # Historial primero: todo ticket que aparezca en él ya existe al leer tickets
+        late_hist = self._reread(HISTORY_RANGE_SQL, self._history, "id", self._last_history_id)
+        hist, last_history_id = _load_ranges(
+            HISTORY_RANGE_SQL, "ticket_history", self._last_history_id,
+            len(HISTORY_COLUMNS), self.chunk_rows,
+        )
+        late_tks = self._reread(TICKETS_RANGE_SQL, self._tickets, "ticket_id", self._last_ticket_id)
+        tks, last_ticket_id = _load_ranges(
+            TICKETS_RANGE_SQL, "tickets", self._last_ticket_id,
+            len(TICKET_COLUMNS), self.chunk_rows,
+        )
+        db.session.commit()  # no dejar abierta la transacción de lectura
+        return (
+            _merge(self._history, HISTORY_COLUMNS, "id", hist, late_hist),
+            _merge(self._tickets, TICKET_COLUMNS, "ticket_id", tks, late_tks),
+            last_history_id, last_ticket_id,
+        )
+
+    def _apply(self, updates: tuple):
+        self._history, self._tickets, self._last_history_id, self._last_ticket_id = updates
+        self._loaded_at = time.monotonic()
+
+    def _reread(self, sql, frame: pd.DataFrame, id_col: str, last_id: int) -> np.ndarray:
+        """Filas con id en (last_id - reread_ids, last_id] que todavía no están en `frame`."""
+        if last_id <= 0:
+            return np.empty((0, frame.shape[1]), dtype=np.int64)
+        rows = db.session.execute(sql, {"lo": max(last_id - self.reread_ids, 0), "hi": last_id}).all()
+        return _unseen(frame, id_col, np.array(rows, dtype=np.int64).reshape(-1, frame.shape[1]))
+
+    def clear(self):
+        with self._lock:
+            self._history = empty_history()
+            self._tickets = empty_tickets()
+            self._last_history_id = self._last_ticket_id = 0
+            self._loaded_at = None
+
+
+history_store = HistoryStore()
+
+
+# ==== Cálculos (sin bucles por fila) ====
+
+def time_in_state(history: pd.DataFrame, tickets: pd.DataFrame, *, now: int,
+                  stop_status_ids=()) -> pd.DataFrame:
+    """
+    Segundos que cada ticket pasó en cada estado -> (ticket_id, status_id, seconds).
+
+    Cada ticket arranca en created_ts con el from_status de su primer cambio
+    (o su estado actual si nunca cambió); cada cambio abre un tramo que dura
+    hasta el siguiente cambio del mismo ticket, o hasta `now` si es el último.
+    El último tramo en un estado de `stop_status_ids` no suma tiempo.
+    Las filas con from == to (reasignaciones) no cambian de estado.
+    """
+    stop = np.asarray(list(stop_status_ids), dtype=np.int64)
+
+    tickets = tickets.sort_values("ticket_id", kind="stable")
+    tk_ids = tickets["ticket_id"].to_numpy()
+    tk_created = tickets["created_ts"].to_numpy()
+
+    frm = history["from_status"].to_numpy()
+    to = history["to_status"].to_numpy()
+    keep = frm != to
+    ticket = history["ticket_id"].to_numpy()[keep]
+    ts = history["ts"].to_numpy()[keep]
+    frm, to = frm[keep], to[keep]
+
+    # El historial viene en orden de id (= orden de inserción): un sort
+    # estable por ticket deja cada ticket con sus cambios en orden.
+    order = np.argsort(ticket, kind="stable")
+    ticket, ts, frm, to = ticket[order], ts[order], frm[order], to[order]
+
+    pos = np.searchsorted(tk_ids, ticket)
+    known = (pos < len(tk_ids)) & (tk_ids[np.minimum(pos, len(tk_ids) - 1)] == ticket)
+    ticket, ts, frm, to, pos = ticket[known], ts[known], frm[known], to[known], pos[known]
+
+    n = len(ticket)
+    first = np.ones(n, dtype=bool)
+    first[1:] = ticket[1:] != ticket[:-1]
+    last = np.ones(n, dtype=bool)
+    last[:-1] = first[1:]
+
+    # Tramo que abre cada cambio
+    end = np.full(n, now, dtype=np.int64)
+    end[:-1] = np.where(last[:-1], now, ts[1:])
+    end = np.where(last & np.isin(to, stop), ts, end)
+    seg_ticket, seg_status, seg_secs = [ticket], [to], [end - ts]
+
+    # Tramo inicial (creación -> primer cambio)
+    init = first & (frm > 0)
+    seg_ticket.append(ticket[init])
+    seg_status.append(frm[init])
+    seg_secs.append(ts[init] - tk_created[pos[init]])
+
+    # Tickets sin cambios: un solo tramo en su estado actual
+    untouched = np.ones(len(tk_ids), dtype=bool)
+    untouched[pos[first]] = False
+    st = tickets["status_id"].to_numpy()[untouched]
+    seg_ticket.append(tk_ids[untouched])
+    seg_status.append(st)
+    seg_secs.append(np.where(np.isin(st, stop), 0, now - tk_created[untouched]))
+
+    ticket = np.concatenate(seg_ticket)
+    status = np.concatenate(seg_status)
+    secs = np.clip(np.concatenate(seg_secs), 0, None)
+
+    # Una sola clave entera (ticket, estado) para sumar estados repetidos
+    width = int(status.max()) + 1 if len(status) else 1
+    keys, inverse = np.unique(ticket * width + status, return_inverse=True)
+    return pd.DataFrame({
+        "ticket_id": keys // width,
+        "status_id": keys % width,
+        "seconds": np.bincount(inverse.ravel(), weights=secs, minlength=len(keys)).astype(np.int64),
+    })
+
+
+def state_duration_summary(tis: pd.DataFrame) -> pd.DataFrame:
+    """Por estado: tickets, promedio, p50 y p90 de horas en ese estado."""
+    if tis.empty:
+        return pd.DataFrame(columns=["status_id", "tickets", "mean_hours", "p50_hours", "p90_hours"])
+    hours = tis.assign(hours=tis["seconds"] / 3600.0).groupby("status_id")["hours"]
+    out = pd.DataFrame({
+        "tickets": hours.size(),
+        "mean_hours": hours.mean(),
+        "p50_hours": hours.quantile(0.5),
+        "p90_hours": hours.quantile(0.9),
+    })
+    return out.reset_index().round(1)
+
+
+def transition_matrix(history: pd.DataFrame, status_ids) -> pd.DataFrame:
+    """Conteo de cambios de estado from -> to (filas: desde, columnas: hacia)."""
+    ids = np.asarray(sorted(status_ids), dtype=np.int64)
+    n = len(ids)
+    frm = history["from_status"].to_numpy()
+    to = history["to_status"].to_numpy()
+    mask = (frm != to) & np.isin(frm, ids) & np.isin(to, ids)
+    fi = np.searchsorted(ids, frm[mask])
+    ti = np.searchsorted(ids, to[mask])
+    counts = np.bincount(fi * n + ti, minlength=n * n).reshape(n, n)
+    return pd.DataFrame(counts, index=ids, columns=ids)
+
+
+def reassignment_counts(history: pd.DataFrame) -> pd.Series:
+    """Reasignaciones por ticket (filas del historial con from == to)."""
+    same = history[history["from_status"].to_numpy() == history["to_status"].to_numpy()]
+    return same.groupby("ticket_id").size()
+
+
+def analyst_throughput(history: pd.DataFrame, done_status_ids, *, weeks: int = 8,
+                       now: int) -> pd.DataFrame:
+    """
+    Cambios a un estado de `done_status_ids` por actor y semana, para las
+    últimas `weeks` semanas. Filas: actor_id, columnas: inicio de semana (epoch).
+    """
+    since = now - weeks * WEEK_SECONDS
+    frm = history["from_status"].to_numpy()
+    to = history["to_status"].to_numpy()
+    ts = history["ts"].to_numpy()
+    mask = (frm != to) & np.isin(to, list(done_status_ids)) & (ts >= since)
+    week = since + ((ts[mask] - since) // WEEK_SECONDS) * WEEK_SECONDS
+    df = pd.DataFrame({"actor_id": history["actor_id"].to_numpy()[mask], "week": week})
+    table = df.groupby(["actor_id", "week"]).size().unstack(fill_value=0)
+    all_weeks = since + np.arange(weeks, dtype=np.int64) * WEEK_SECONDS
+    return table.reindex(columns=all_weeks, fill_value=0)
@@ -0,0 +1,180 @@
+import json
+import atexit
+import logging
+import threading
+from datetime import datetime
+
+from sqlalchemy import text
+from sqlalchemy.exc import InterfaceError, OperationalError
+
+from src.infrastructure.metrics import AUDIT_DROPPED
+from src.infrastructure.persistence.database import db
+
+log = logging.getLogger(__name__)
+# Eventos que no se pudieron guardar (fila inválida o cola llena), en JSON
+dead_letter = logging.getLogger("incidex.audit.dead_letter")
+
+FLUSH_INTERVAL = 2.0   # segundos
+MAX_BATCH = 500        # eventos por INSERT multi-fila
+MAX_RETRIES = 3        # fallos seguidos antes de probar el lote fila por fila
+MAX_PENDING = 50_000   # tope de la cola en memoria
+
+INSERT_SQL = text("""
+    INSERT INTO audit_events
+        (ts, source, actor_id, actor_name, entity, entity_id, action, payload)
+    VALUES
+        (:ts, :source, :actor_id, :actor_name, :entity, :entity_id, :action, :payload)
+""")
+
+
+def compact_json(payload: dict | None) -> str | None:
+    if not payload:
+        return None
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class AuditWriter:
+    """
+    Escritor por lotes de audit_events.
+
+    record() solo encola (se llama después del commit de la operación
+    auditada); un hilo vacía la cola cada FLUSH_INTERVAL segundos o al
+    llegar a MAX_BATCH eventos, con un único INSERT y un commit. Si la
+    escritura falla, el lote vuelve a la cola para el siguiente intento;
+    tras MAX_RETRIES fallos seguidos se escribe fila por fila y las que
+    fallan por sí mismas (restricción, codificación...) van al log
+    incidex.audit.dead_letter en vez de trabar a las siguientes. Si el
+    error es de conexión (BD caída) se siguen reintentando, pero la cola no
+    pasa de MAX_PENDING: los más viejos se descartan y se cuentan en
+    incidex_audit_dropped_total.
+
+    La cola vive en memoria: al salir normalmente se vacía con atexit
+    (AUDIT_FLUSH_AT_EXIT, que los tests apagan), pero si el proceso muere
+    (kill -9, OOM, corte) se pierden los eventos aún no escritos, hasta
+    FLUSH_INTERVAL segundos de auditoría.
+    """
+
+    def __init__(self, flush_interval: float = FLUSH_INTERVAL, max_batch: int = MAX_BATCH):
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.app = None
+        self._pending: list[dict] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._at_exit = False
+        self._failures = 0
+        self.max_pending = MAX_PENDING
+
+    def init_app(self, app):
+        app.config.setdefault("AUDIT_FLUSH_AT_EXIT", True)
+        self.app = app
+        app.extensions["audit"] = self
+        # Una sola vez por escritor, aunque se llame con varias apps
+        if app.config["AUDIT_FLUSH_AT_EXIT"] and not self._at_exit:
+            atexit.register(self.flush)
+            self._at_exit = True
+
+    def record(self, *, entity: str, entity_id: int | None, action: str,
+               actor_id: int | None = None, actor_name: str | None = None,
+               payload: dict | None = None, source: str = "web"):
+        row = {
+            "ts": datetime.now(),
+            "source": source,
+            "actor_id": int(actor_id) if actor_id else None,
+            "actor_name": actor_name,
+            "entity": entity,
+            "entity_id": int(entity_id) if entity_id is not None else None,
+            "action": action,
+            "payload": compact_json(payload),
+        }
+        with self._lock:
+            self._pending.append(row)
+            self._trim()
+            full = len(self._pending) >= self.max_batch
+        self._ensure_thread()
+        if full:
+            self._wake.set()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> int:
+        """Escribe lo pendiente; devuelve cuántos eventos se guardaron."""
+        if self.app is None:
+            return 0
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            with self.app.app_context():
+                try:
+                    self._insert(batch)
+                    self._failures = 0
+                    return len(batch)
+                except Exception as e:
+                    self._failures += 1
+                    log.warning("[Audit] No se pudo escribir el lote (%d eventos, intento %d): %s",
+                                len(batch), self._failures, e)
+                    if self._failures < MAX_RETRIES:
+                        self._requeue(batch)
+                        return 0
+                self._failures = 0
+                return self._insert_one_by_one(batch)
+
+    def _insert(self, rows: list[dict]):
+        try:
+            db.session.execute(INSERT_SQL, rows)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    def _insert_one_by_one(self, batch: list[dict]) -> int:
+        """Aísla las filas que fallan por sí mismas; con la BD caída devuelve el resto a la cola."""
+        written = 0
+        for i, row in enumerate(batch):
+            try:
+                self._insert([row])
+                written += 1
+            except (OperationalError, InterfaceError):
+                self._requeue(batch[i:])
+                break
+            except Exception as e:
+                AUDIT_DROPPED.inc(reason="dead_letter")
+                dead_letter.error(compact_json(row), extra={"error": str(e)})
+        return written
+
+    def _requeue(self, batch: list[dict]):
+        with self._lock:
+            self._pending[:0] = batch
+            self._trim()
+
+    def _trim(self):
+        """Con la cola sobre el tope descarta los más viejos (llamar con _lock tomado)."""
+        extra = len(self._pending) - self.max_pending
+        if extra > 0:
+            for row in self._pending[:extra]:
+                dead_letter.error(compact_json(row), extra={"error": "cola de auditoría llena"})
+            del self._pending[:extra]
+            AUDIT_DROPPED.inc(extra, reason="overflow")
+
+    def _ensure_thread(self):
+        if self.app is None or (self._thread is not None and self._thread.is_alive()):
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+
+audit_writer = AuditWriter()
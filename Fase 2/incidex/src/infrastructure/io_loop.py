@@ -0,0 +1,102 @@
+import atexit
+import asyncio
+import logging
+import threading
+import concurrent.futures
+
+log = logging.getLogger(__name__)
+
+DRAIN_SECONDS = 10.0   # espera máxima al salir del proceso por lo que quede en vuelo
+
+
+class IoLoop:
+    """
+    Un event loop de asyncio en un hilo propio, compartido por el proceso.
+
+    Las esperas de red (SMTP, Gemini) corren ahí como corrutinas, así que
+    cientos de envíos en vuelo ocupan un solo hilo en vez de uno por
+    request:
+
+        io_loop.submit(send_async(msg))          # sin esperar (correos)
+        io_loop.run(suggest_async(...), 20)      # esperando el resultado
+
+    Al salir del proceso se esperan hasta DRAIN_SECONDS las tareas
+    pendientes (p. ej. los correos de un `flask sla-sweep`).
+    """
+
+    def __init__(self, drain_seconds: float = DRAIN_SECONDS):
+        self.drain_seconds = drain_seconds
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._inflight: set[concurrent.futures.Future] = set()
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is not None and self._thread.is_alive():
+            return self._loop
+        with self._lock:
+            if self._loop is None or not self._thread.is_alive():
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+
+                def _run():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(started.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=_run, name="io-loop", daemon=True)
+                self._thread.start()
+                started.wait()
+                self._loop = loop
+                self._semaphores = {}
+        return self._loop
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        """Programa `coro` en el loop y devuelve un Future de concurrent.futures."""
+        future = asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+        with self._lock:
+            self._inflight.add(future)
+        future.add_done_callback(self._done)
+        return future
+
+    def run(self, coro, timeout: float | None = None):
+        """Corre `coro` en el loop y espera el resultado (TimeoutError si se pasa)."""
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def limit(self, name: str, size: int) -> asyncio.Semaphore:
+        """Semáforo del loop para acotar conexiones simultáneas a un servicio (llamar desde el loop)."""
+        sem = self._semaphores.get(name)
+        if sem is None:
+            sem = self._semaphores[name] = asyncio.Semaphore(max(1, int(size)))
+        return sem
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._inflight)
+
+    def _done(self, future):
+        with self._lock:
+            self._inflight.discard(future)
+        if not future.cancelled() and future.exception() is not None:
+            log.error("Tarea del io-loop terminó con error", exc_info=future.exception())
+
+    def drain(self, timeout: float | None = None) -> bool:
+        """Espera a que terminen las tareas en vuelo; True si no quedó ninguna."""
+        with self._lock:
+            pending = list(self._inflight)
+        if not pending:
+            return True
+        _, not_done = concurrent.futures.wait(pending, timeout=timeout)
+        if not_done:
+            log.warning("%s tareas del io-loop sin terminar al salir", len(not_done))
+        return not not_done
+
+
+io_loop = IoLoop()
+atexit.register(lambda: io_loop.drain(io_loop.drain_seconds))
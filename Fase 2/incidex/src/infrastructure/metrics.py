@@ -0,0 +1,243 @@
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+# Buckets en segundos (los mismos por defecto que usa Prometheus)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLOW_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _labels_text(names, values) -> str:
+    if not names:
+        return ""
+    parts = []
+    for n, v in zip(names, values):
+        v = str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{n}="{v}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _fmt(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if not float(v).is_integer() else str(int(v))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, doc: str, labels=()):
+        self.name = name
+        self.doc = doc
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(n, "")) for n in self.labels)
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, doc, labels=()):
+        super().__init__(name, doc, labels)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def collect(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [f"{self.name}{_labels_text(self.labels, k)} {_fmt(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """Valor leído al momento del scrape con `fn()` -> número o {labels_tuple: número}."""
+    kind = "gauge"
+
+    def __init__(self, name, doc, fn, labels=()):
+        super().__init__(name, doc, labels)
+        self.fn = fn
+
+    def collect(self) -> list[str]:
+        try:
+            val = self.fn()
+        except Exception:
+            return []
+        if val is None:
+            return []
+        items = sorted(val.items()) if isinstance(val, dict) else [((), val)]
+        return self.header() + [f"{self.name}{_labels_text(self.labels, k)} {_fmt(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, doc, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, doc, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple, list] = {}   # key -> [conteos por bucket..., +Inf, suma]
+
+    def observe(self, seconds: float, **labels):
+        key = self._key(labels)
+        i = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            s = self._series.get(key)
+            if s is None:
+                s = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            s[i] += 1
+            s[-1] += seconds
+
+    @contextmanager
+    def time(self, **labels):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, **labels)
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            s = self._series.get(self._key(labels))
+            return sum(s[:-1]) if s else 0
+
+    def collect(self) -> list[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        out = self.header()
+        for key, s in items:
+            acc = 0
+            for le, n in zip(self.buckets + (float("inf"),), s[:-1]):
+                acc += n
+                out.append(f"{self.name}_bucket{_labels_text(self.labels + ('le',), key + (_fmt(le),))} {acc}")
+            out.append(f"{self.name}_sum{_labels_text(self.labels, key)} {_fmt(s[-1])}")
+            out.append(f"{self.name}_count{_labels_text(self.labels, key)} {acc}")
+        return out
+
+
+class Registry:
+    """
+    Métricas del proceso en formato de texto de Prometheus (0.0.4).
+    Con varios workers cada uno expone las suyas; Prometheus las separa por
+    instancia y se agregan con sum()/histogram_quantile().
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, doc, labels=()) -> Counter:
+        return self._register(Counter(name, doc, labels))
+
+    def histogram(self, name, doc, labels=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, doc, labels, buckets))
+
+    def gauge(self, name, doc, fn, labels=()) -> Gauge:
+        with self._lock:
+            # Los gauges se re-registran en cada create_app (apuntan a la app nueva)
+            self._metrics[name] = Gauge(name, doc, fn, labels)
+            return self._metrics[name]
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for m in metrics:
+            lines.extend(m.collect())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+HTTP_LATENCY = registry.histogram(
+    "incidex_http_request_duration_seconds", "Duración de requests por endpoint",
+    labels=("endpoint", "method"),
+)
+HTTP_REQUESTS = registry.counter(
+    "incidex_http_requests_total", "Requests por endpoint y código de estado",
+    labels=("endpoint", "method", "status"),
+)
+DB_POOL_WAIT = registry.histogram(
+    "incidex_db_pool_wait_seconds", "Espera para obtener una conexión del pool",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+DB_POOL_TIMEOUTS = registry.counter(
+    "incidex_db_pool_timeouts_total", "Checkouts que agotaron pool_timeout",
+)
+DB_READS = registry.counter(
+    "incidex_db_routed_reads_total", "Lecturas enrutadas por destino (replica | primary)",
+    labels=("target",),
+)
+DB_REPLICA_FAILOVERS = registry.counter(
+    "incidex_db_replica_failovers_total", "Lecturas que fallaron en la réplica y se repitieron en el primario",
+)
+SMTP_LATENCY = registry.histogram(
+    "incidex_smtp_send_duration_seconds", "Envío de correo por SMTP",
+    labels=("kind",), buckets=SLOW_BUCKETS,
+)
+SMTP_FAILURES = registry.counter(
+    "incidex_smtp_failures_total", "Correos que no se pudieron enviar",
+    labels=("kind",),
+)
+GEMINI_LATENCY = registry.histogram(
+    "incidex_gemini_request_duration_seconds", "Llamadas a Gemini",
+    buckets=SLOW_BUCKETS,
+)
+GEMINI_REQUESTS = registry.counter(
+    "incidex_gemini_requests_total", "Llamadas a Gemini por resultado (ok | error)",
+    labels=("outcome",),
+)
+RATE_LIMITED = registry.counter(
+    "incidex_rate_limited_total", "Requests rechazados por límite de uso (scope: user | ip)",
+    labels=("endpoint", "scope"),
+)
+
+AUDIT_DROPPED = registry.counter(
+    "incidex_audit_dropped_total",
+    "Eventos de auditoría no escritos (reason: overflow | dead_letter)",
+    labels=("reason",),
+)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool que mide cuánto espera cada checkout (incidex_db_pool_wait_seconds)."""
+
+    def _do_get(self):
+        t0 = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            DB_POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - t0)
+
+
+def pool_status(pool) -> dict | None:
+    """checked-out / overflow / tamaño del pool (solo QueuePool y derivados)."""
+    if not isinstance(pool, QueuePool):
+        return None
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    }
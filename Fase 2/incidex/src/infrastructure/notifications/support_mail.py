@@ -1,9 +1,78 @@
-import smtplib
+import logging
+from dataclasses import dataclass
 from email.message import EmailMessage
-from flask import current_app
 
+import aiosmtplib
+from flask import current_app
 
-def send_support_email(nombre: str, correo: str, asunto: str, mensaje: str) -> None:
+from src.infrastructure.io_loop import io_loop
+from src.infrastructure.metrics import SMTP_FAILURES, SMTP_LATENCY
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SmtpSettings:
+    host: str
+    port: int
+    username: str | None
+    password: str | None
+    use_tls: bool         # STARTTLS
+    use_ssl: bool         # TLS implícito (465)
+    timeout: float
+    max_connections: int  # envíos simultáneos por proceso
+
+    @classmethod
+    def from_config(cls, config) -> "SmtpSettings":
+        return cls(
+            host=config.get("MAIL_SERVER", "localhost"),
+            port=int(config.get("MAIL_PORT", 25)),
+            username=config.get("MAIL_USERNAME"),
+            password=config.get("MAIL_PASSWORD"),
+            use_tls=bool(config.get("MAIL_USE_TLS", False)),
+            use_ssl=bool(config.get("MAIL_USE_SSL", False)),
+            timeout=float(config.get("MAIL_TIMEOUT", 30)),
+            max_connections=int(config.get("MAIL_MAX_CONNECTIONS", 5)),
+        )
+
+
+async def send_message_async(msg: EmailMessage, settings: SmtpSettings, kind: str) -> bool:
+    """
+    Envía `msg` con aiosmtplib dentro del io-loop. Nunca lanza: si el SMTP
+    o el correo fallan se cuenta en incidex_smtp_failures_total y se loguea.
+    """
+    async with io_loop.limit("smtp", settings.max_connections):
+        try:
+            with SMTP_LATENCY.time(kind=kind):
+                await aiosmtplib.send(
+                    msg,
+                    hostname=settings.host,
+                    port=settings.port,
+                    username=settings.username if settings.password else None,
+                    password=settings.password if settings.username else None,
+                    use_tls=settings.use_ssl,
+                    start_tls=settings.use_tls and not settings.use_ssl,
+                    timeout=settings.timeout,
+                )
+            return True
+        except Exception as e:
+            SMTP_FAILURES.inc(kind=kind)
+            log.warning("No se pudo enviar el correo (%s) a %s: %s", kind, msg["To"], e)
+            return False
+
+
+def _dispatch(msg: EmailMessage, kind: str):
+    """Encola el envío en el io-loop; el request no espera al servidor SMTP."""
+    settings = SmtpSettings.from_config(current_app.config)
+    log.info("Encolando correo via SMTP", extra={
+        "kind": kind, "host": settings.host, "port": settings.port,
+        "tls": settings.use_tls, "ssl": settings.use_ssl,
+    })
+    return io_loop.submit(send_message_async(msg, settings, kind))
+
+
+def send_support_email(nombre: str, correo: str, asunto: str, mensaje: str):
+    """Arma el correo de soporte y lo deja enviándose en el io-loop (devuelve el Future)."""
     to_addr = current_app.config.get("SUPPORT_EMAIL_TO", "soporte@incidex.cl")
     from_addr = current_app.config.get("SUPPORT_EMAIL_FROM", to_addr)
 
@@ -60,42 +129,16 @@ Mensaje:
     msg.set_content(text_body)
     msg.add_alternative(html_body, subtype="html")
 
-    host = current_app.config.get("MAIL_SERVER", "localhost")
-    port = int(current_app.config.get("MAIL_PORT", 25))
-    username = current_app.config.get("MAIL_USERNAME")
-    password = current_app.config.get("MAIL_PASSWORD")
-    use_tls = bool(current_app.config.get("MAIL_USE_TLS", False))
-    use_ssl = bool(current_app.config.get("MAIL_USE_SSL", False))
-
-    # DEBUG: log visible
-    current_app.logger.info(
-        f"Enviando soporte via SMTP host={host} port={port} tls={use_tls} ssl={use_ssl} user={username}"
-    )
-
-    # ── Bloque protegido: si algo falla, se registra pero NO rompe la app ──
-    try:
-        if use_ssl:
-            with smtplib.SMTP_SSL(host, port) as smtp:
-                if username and password:
-                    smtp.login(username, password)
-                smtp.send_message(msg)
-        else:
-            with smtplib.SMTP(host, port) as smtp:
-                if use_tls:
-                    smtp.starttls()
-                if username and password:
-                    smtp.login(username, password)
-                smtp.send_message(msg)
-    except Exception as e:
-        current_app.logger.warning(f"[Support Email Error] {e}")
-
-
-def send_notification_email(to_email: str, title: str, message: str) -> None:
+    return _dispatch(msg, "support")
+
+
+def send_notification_email(to_email: str, title: str, message: str):
     """
     Envía un correo de notificación a un usuario (cuando se crea una
     notificación en la campanita).
     NO toca la lógica de soporte, reutiliza la misma config SMTP.
-    Si falla, NO rompe el flujo (solo loguea el error).
+    El envío corre en el io-loop: varias notificaciones de un mismo cambio
+    salen en paralelo y el request no las espera. Si falla, solo se loguea.
     """
     if not to_email:
         return
@@ -148,30 +191,5 @@ Por favor ingresa a la plataforma para revisar los detalles del ticket.
     msg.set_content(text_body)
     msg.add_alternative(html_body, subtype="html")
 
-    host = current_app.config.get("MAIL_SERVER", "localhost")
-    port = int(current_app.config.get("MAIL_PORT", 25))
-    username = current_app.config.get("MAIL_USERNAME")
-    password = current_app.config.get("MAIL_PASSWORD")
-    use_tls = bool(current_app.config.get("MAIL_USE_TLS", False))
-    use_ssl = bool(current_app.config.get("MAIL_USE_SSL", False))
-
-    current_app.logger.info(
-        f"Enviando notificación via SMTP host={host} port={port} tls={use_tls} ssl={use_ssl} user={username}"
-    )
-
-    # ── Bloque protegido: si el SMTP o el correo fallan, solo se loguea ──
-    try:
-        if use_ssl:
-            with smtplib.SMTP_SSL(host, port) as smtp:
-                if username and password:
-                    smtp.login(username, password)
-                smtp.send_message(msg)
-        else:
-            with smtplib.SMTP(host, port) as smtp:
-                if use_tls:
-                    smtp.starttls()
-                if username and password:
-                    smtp.login(username, password)
-                smtp.send_message(msg)
-    except Exception as e:
-        current_app.logger.warning(f"[Notification Email Error] {e}")
+    return _dispatch(msg, "notification")
+
@@ -0,0 +1,57 @@
+import time
+import threading
+from dataclasses import dataclass, field
+
+# Otros workers (o la app de escritorio) también insertan notificaciones y
+# no pueden invalidar esta caché; el TTL acota cuánto puede quedar desfasada.
+DEFAULT_TTL_SECONDS = 30
+MAX_USERS = 5000
+
+
+@dataclass
+class NotificationSummary:
+    unread: int
+    recent: list = field(default_factory=list)
+
+
+class UnreadNotificationCache:
+    """
+    Caché en memoria por usuario: contador de no leídas + últimas
+    notificaciones para el header. Se invalida explícitamente desde
+    insert_notification y mark_all_notifications_read_for_user.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL_SECONDS, max_users: int = MAX_USERS):
+        self.ttl = ttl
+        self.max_users = max_users
+        self._data: dict[int, tuple[float, NotificationSummary]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> NotificationSummary | None:
+        with self._lock:
+            entry = self._data.get(int(user_id))
+            if entry is None:
+                return None
+            expires, summary = entry
+            if expires < time.monotonic():
+                del self._data[int(user_id)]
+                return None
+            return summary
+
+    def set(self, user_id: int, summary: NotificationSummary):
+        with self._lock:
+            if len(self._data) >= self.max_users:
+                # Sin LRU: basta con no crecer sin límite
+                self._data.clear()
+            self._data[int(user_id)] = (time.monotonic() + self.ttl, summary)
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._data.pop(int(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+unread_cache = UnreadNotificationCache()
@@ -0,0 +1,97 @@
+import os
+from dataclasses import dataclass, replace
+
+
+@dataclass(frozen=True)
+class EngineProfile:
+    """
+    Opciones del engine/pool para un tipo de despliegue.
+
+    pool_size + max_overflow es el máximo de conexiones por proceso. Con
+    gunicorn: procesos × (pool_size + max_overflow) tiene que quedar bajo
+    max_connections de MySQL (contando la réplica aparte). Con workers
+    gthread, pool_size ≈ threads por proceso: más no ayuda (los hilos no
+    piden más conexiones) y menos hace esperar en el checkout
+    (incidex_db_pool_wait_seconds en /metrics). Ver tests/perf/test_pool_sizing_perf.py.
+    """
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0        # segundos esperando una conexión libre
+    pool_recycle: int = 280           # bajo wait_timeout del servidor
+    pool_pre_ping: bool = True        # un ping por checkout
+    pool_use_lifo: bool = False       # reusar la última devuelta (deja envejecer las sobrantes)
+    statement_timeout_ms: int = 0     # max_execution_time de MySQL (solo SELECT); 0 = sin límite
+    query_cache_size: int = 500       # SQL compilado que SQLAlchemy guarda por engine
+
+
+PROFILES = {
+    # Igual que antes de existir los perfiles
+    "dev": EngineProfile(),
+    # Pool chico y esperas cortas: un bloqueo en los tests falla rápido
+    "test": EngineProfile(pool_size=2, max_overflow=3, pool_timeout=5.0, statement_timeout_ms=10_000),
+    # 2-4 procesos × 4 hilos. Sin pre-ping: LIFO mantiene pocas conexiones
+    # en uso y pool_recycle descarta las viejas antes de que MySQL las corte
+    "prod-small": EngineProfile(pool_size=4, max_overflow=4, pool_timeout=10.0,
+                                pool_pre_ping=False, pool_use_lifo=True,
+                                statement_timeout_ms=15_000),
+    # 8+ procesos × 8 hilos detrás de un balanceador
+    "prod-large": EngineProfile(pool_size=8, max_overflow=4, pool_timeout=5.0,
+                                pool_pre_ping=False, pool_use_lifo=True,
+                                statement_timeout_ms=10_000, query_cache_size=1500),
+}
+
+# Variable de entorno -> campo que sobreescribe
+ENV_OVERRIDES = {
+    "DB_POOL_SIZE": "pool_size",
+    "DB_MAX_OVERFLOW": "max_overflow",
+    "DB_POOL_TIMEOUT": "pool_timeout",
+    "DB_POOL_RECYCLE": "pool_recycle",
+    "DB_POOL_PRE_PING": "pool_pre_ping",
+    "DB_POOL_LIFO": "pool_use_lifo",
+    "DB_STATEMENT_TIMEOUT_MS": "statement_timeout_ms",
+}
+
+
+def resolve_profile(name: str | None, env=None) -> EngineProfile:
+    """Perfil `name` (dev por defecto) con los DB_* del entorno aplicados encima."""
+    env = os.environ if env is None else env
+    name = (name or "dev").strip().lower()
+    if name not in PROFILES:
+        raise ValueError(f"DB_PROFILE desconocido: {name} (válidos: {', '.join(PROFILES)})")
+    profile = PROFILES[name]
+    changes = {}
+    for var, attr in ENV_OVERRIDES.items():
+        raw = (env.get(var) or "").strip()
+        if not raw:
+            continue
+        kind = type(getattr(profile, attr))
+        changes[attr] = raw.lower() in ("1", "true", "yes", "on") if kind is bool else kind(raw)
+    return replace(profile, **changes)
+
+
+def engine_options(profile: EngineProfile, url: str | None) -> dict:
+    """SQLALCHEMY_ENGINE_OPTIONS para `url` (el dimensionado del pool solo aplica a MySQL)."""
+    options = {
+        "pool_pre_ping": profile.pool_pre_ping,
+        "pool_recycle": profile.pool_recycle,
+        "query_cache_size": profile.query_cache_size,
+    }
+    if not (url or "").startswith("mysql"):
+        # SQLite en memoria usa StaticPool, que no acepta pool_size & cía.
+        return options
+
+    # Mismo QueuePool, midiendo la espera de cada checkout para /metrics
+    from src.infrastructure.metrics import TimedQueuePool
+    options.update(
+        poolclass=TimedQueuePool,
+        pool_size=profile.pool_size,
+        max_overflow=profile.max_overflow,
+        pool_timeout=profile.pool_timeout,
+        pool_use_lifo=profile.pool_use_lifo,
+    )
+    if profile.statement_timeout_ms:
+        # Al abrir cada conexión; corta los SELECT que se pasen (ER 3024)
+        options["connect_args"] = {
+            "init_command": f"SET SESSION max_execution_time = {int(profile.statement_timeout_ms)}",
+        }
+    return options
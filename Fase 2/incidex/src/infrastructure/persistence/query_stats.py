@@ -0,0 +1,196 @@
+import re
+import time
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+log = logging.getLogger("incidex.sql")
+
+SLOW_QUERY_MS = 200.0   # umbral del log de consultas lentas
+TOP_N = 3               # consultas más lentas que se guardan por request
+MAX_STATEMENT = 500     # caracteres del SQL que se registran
+
+_WS = re.compile(r"\s+")
+_current: ContextVar["QueryStats | None"] = ContextVar("incidex_sql_stats", default=None)
+
+
+def compact_sql(statement: str) -> str:
+    """SQL en una línea y recortado (para logs y cabeceras)."""
+    s = _WS.sub(" ", statement or "").strip()
+    return s if len(s) <= MAX_STATEMENT else s[:MAX_STATEMENT] + "…"
+
+
+@dataclass
+class QueryStats:
+    """Consultas ejecutadas dentro de un request (o de un bloque capture_queries)."""
+    count: int = 0
+    total_ms: float = 0.0
+    slowest: list = field(default_factory=list)     # [(ms, sql)] de mayor a menor
+    statements: list | None = None                  # todas, solo si se pidió
+    slow_ms: float | None = None                    # umbral del log (None = no registrar)
+
+    def add(self, statement: str, ms: float):
+        self.count += 1
+        self.total_ms += ms
+        if self.statements is not None:
+            self.statements.append(compact_sql(statement))
+        if len(self.slowest) < TOP_N or ms > self.slowest[-1][0]:
+            self.slowest.append((ms, statement))
+            self.slowest.sort(key=lambda x: x[0], reverse=True)
+            del self.slowest[TOP_N:]
+
+    def merge(self, other: "QueryStats"):
+        self.count += other.count
+        self.total_ms += other.total_ms
+        if self.statements is not None and other.statements is not None:
+            self.statements.extend(other.statements)
+        self.slowest = sorted(self.slowest + other.slowest, key=lambda x: x[0], reverse=True)[:TOP_N]
+
+
+def current_stats() -> "QueryStats | None":
+    return _current.get()
+
+
+@contextmanager
+def capture_queries(*, keep_statements: bool = True):
+    """
+    Cuenta las consultas hechas dentro del bloque (cualquier engine de
+    SQLAlchemy, en este hilo). Se usa en tests y comandos:
+
+        with capture_queries() as stats:
+            client.get("/app/mine")
+        assert stats.count <= 8
+    """
+    stats = QueryStats(statements=[] if keep_statements else None)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+# ==== Eventos de SQLAlchemy (una vez por proceso, para todo Engine) ====
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("incidex_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    starts = conn.info.get("incidex_query_start")
+    if not starts:
+        return
+    ms = (time.perf_counter() - starts.pop()) * 1000
+    stats.add(statement, ms)
+    if stats.slow_ms is not None and ms >= stats.slow_ms:
+        _log_slow(statement, ms, executemany)
+
+
+def _with_request(entry: dict) -> dict:
+    try:
+        entry.update(method=request.method, path=request.path, endpoint=request.endpoint)
+    except RuntimeError:
+        pass  # fuera de un request (CLI, hilos)
+    return entry
+
+
+def _log_slow(statement: str, ms: float, executemany: bool):
+    # Un registro por consulta lenta; sin parámetros (pueden traer datos personales)
+    sql = compact_sql(statement)
+    log.warning("Consulta lenta (%.1f ms): %s", ms, sql, extra=_with_request({
+        "event": "slow_query",
+        "ms": round(ms, 1),
+        "executemany": bool(executemany),
+        "sql": sql,
+    }))
+
+
+_listening = False
+
+
+def _listen_engines():
+    global _listening
+    if not _listening:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _listening = True
+
+
+# ==== Integración con Flask ====
+
+def server_timing(stats: QueryStats, app_ms: float) -> str:
+    return (f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries", '
+            f'app;dur={app_ms:.1f}')
+
+
+def init_query_stats(app):
+    """
+    Registra el conteo de consultas por request:
+      - cabecera Server-Timing (db = tiempo en BD y cantidad, app = total),
+      - log 'incidex.sql' de cada consulta sobre SQL_SLOW_MS (campos en `extra=`),
+      - g.sql_stats disponible para la vista (p. ej. para mostrarlo en debug).
+    """
+    app.config.setdefault("SQL_INSTRUMENTATION", True)
+    app.config.setdefault("SQL_SLOW_MS", SLOW_QUERY_MS)
+    app.config.setdefault("SQL_SERVER_TIMING", True)
+    if not app.config["SQL_INSTRUMENTATION"]:
+        return
+    _listen_engines()
+
+    @app.before_request
+    def _sql_stats_start():
+        # Dentro de capture_queries (tests) también se guardan las sentencias
+        outer = _current.get()
+        stats = QueryStats(
+            statements=[] if outer is not None and outer.statements is not None else None,
+            slow_ms=float(app.config["SQL_SLOW_MS"]),
+        )
+        g.sql_stats = stats
+        g.sql_stats_token = _current.set(stats)
+        g.sql_stats_t0 = time.perf_counter()
+
+    @app.after_request
+    def _sql_stats_header(response):
+        stats = g.get("sql_stats")
+        if stats is None:
+            return response
+        app_ms = (time.perf_counter() - g.sql_stats_t0) * 1000
+        if app.config["SQL_SERVER_TIMING"]:
+            response.headers["Server-Timing"] = server_timing(stats, app_ms)
+        # Request que en total pasó el umbral en BD: resumen con sus peores consultas
+        if stats.total_ms >= stats.slow_ms:
+            log.info("Request lento en BD: %d consultas, %.1f ms", stats.count, stats.total_ms,
+                     extra=_with_request({
+                         "event": "slow_request_db",
+                         "queries": stats.count,
+                         "db_ms": round(stats.total_ms, 1),
+                         "app_ms": round(app_ms, 1),
+                         "status": response.status_code,
+                         "slowest": [{"ms": round(ms, 1), "sql": compact_sql(sql)} for ms, sql in stats.slowest],
+                     }))
+        return response
+
+    @app.teardown_request
+    def _sql_stats_end(exc=None):
+        token = g.pop("sql_stats_token", None)
+        if token is None:
+            return
+        try:
+            _current.reset(token)
+        except ValueError:
+            # Respuesta en streaming cerrada desde otro contexto
+            _current.set(None)
+            return
+        # Si había un capture_queries abierto (cliente de pruebas en el mismo
+        # hilo), el request suma a ese conteo
+        outer = _current.get()
+        if outer is not None:
+            outer.merge(g.sql_stats)
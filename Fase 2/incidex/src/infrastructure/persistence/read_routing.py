@@ -0,0 +1,111 @@
+import time
+import logging
+import threading
+
+from flask import current_app, g, has_app_context, has_request_context, session
+from sqlalchemy import event
+from sqlalchemy.exc import InterfaceError, OperationalError
+
+from src.infrastructure.metrics import DB_READS, DB_REPLICA_FAILOVERS
+from src.infrastructure.persistence.database import db
+
+log = logging.getLogger(__name__)
+
+REPLICA_BIND = "replica"      # clave en SQLALCHEMY_BINDS
+STICKY_KEY = "_db_primary_until"
+
+# Sentencias que no escriben: todo lo demás fija el resto del request al primario
+_READ_PREFIXES = ("SELECT", "WITH", "SHOW", "EXPLAIN", "DESCRIBE", "SET")
+
+
+class _State:
+    def __init__(self):
+        self.down_until = 0.0
+        self.lock = threading.Lock()
+
+
+class ReadRouter:
+    """
+    Envía a la réplica (SQLALCHEMY_BINDS["replica"]) las lecturas pesadas
+    que los repositorios marcan con execute_read():
+
+        rows = read_router.execute_read(text("SELECT ..."), params).mappings().all()
+
+    Se usa el primario cuando:
+      - no hay réplica configurada,
+      - este request ya escribió en el primario (la lectura tiene que ver
+        su propia escritura, aunque todavía no esté confirmada),
+      - la sesión del usuario escribió hace menos de REPLICA_STICKY_SECONDS
+        (cubre el atraso de la replicación entre un POST y el redirect),
+      - la réplica falló hace menos de REPLICA_RETRY_SECONDS.
+
+    En la réplica la consulta corre en una conexión propia, fuera de la
+    transacción de db.session, y se lee entera antes de devolverla: si la
+    réplica se cae (al conectar o a mitad de la lectura) no queda nada roto
+    en la sesión del request y la misma lectura se repite en el primario.
+    """
+
+    def init_app(self, app):
+        app.config.setdefault("REPLICA_STICKY_SECONDS", 5.0)
+        app.config.setdefault("REPLICA_RETRY_SECONDS", 30.0)
+        app.extensions["read_router"] = _State()
+        if not self.enabled(app):
+            return
+
+        with app.app_context():
+            primary = db.engines[None]
+        event.listen(primary, "before_cursor_execute", _track_write)
+
+        @app.after_request
+        def _remember_write(response):
+            if g.get("db_wrote_primary"):
+                session[STICKY_KEY] = time.time() + float(app.config["REPLICA_STICKY_SECONDS"])
+            return response
+
+    @staticmethod
+    def enabled(app=None) -> bool:
+        app = app or current_app
+        return bool((app.config.get("SQLALCHEMY_BINDS") or {}).get(REPLICA_BIND))
+
+    def _state(self) -> _State:
+        return current_app.extensions["read_router"]
+
+    def use_replica(self) -> bool:
+        if not self.enabled():
+            return False
+        if time.monotonic() < self._state().down_until:
+            return False
+        if g.get("db_wrote_primary"):
+            return False
+        if has_request_context() and session.get(STICKY_KEY, 0) > time.time():
+            return False
+        return True
+
+    def mark_down(self, exc: Exception):
+        state = self._state()
+        retry = float(current_app.config["REPLICA_RETRY_SECONDS"])
+        with state.lock:
+            state.down_until = time.monotonic() + retry
+        DB_REPLICA_FAILOVERS.inc()
+        log.warning("Réplica no disponible, lecturas al primario por %.0fs: %s", retry, exc)
+
+    def execute_read(self, statement, params=None):
+        """Lectura en la réplica si corresponde (ya leída, en memoria); si falla, db.session.execute()."""
+        if self.use_replica():
+            try:
+                with db.engines[REPLICA_BIND].connect() as conn:
+                    rows = conn.execute(statement, params or {}).freeze()
+                DB_READS.inc(target="replica")
+                return rows()
+            except (OperationalError, InterfaceError) as e:
+                self.mark_down(e)
+        DB_READS.inc(target="primary")
+        return db.session.execute(statement, params)
+
+
+def _track_write(conn, cursor, statement, parameters, context, executemany):
+    if has_app_context() and not statement.lstrip()[:8].upper().startswith(_READ_PREFIXES):
+        g.db_wrote_primary = True
+
+
+read_router = ReadRouter()
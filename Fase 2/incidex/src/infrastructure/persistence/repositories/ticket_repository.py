@@ -1,10 +1,18 @@
-import os, hashlib
+import uuid
+from datetime import datetime
+from contextlib import contextmanager
 from dataclasses import dataclass
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 from src.infrastructure.persistence.database import db
+from src.infrastructure.persistence.read_routing import read_router
 from src.domain.entities.ticket import Ticket, Status, TicketHistory
 from src.domain.entities.ticket_extras import TicketAttachment, TicketComment
 from src.infrastructure.notifications.support_mail import send_notification_email
+from src.infrastructure.notifications.unread_cache import unread_cache, NotificationSummary
+from src.infrastructure.realtime.bus import RealtimeEvent, publish_event, user_topic, ticket_topic
+from src.infrastructure.audit.writer import audit_writer
+from src.infrastructure.storage.attachment_store import AttachmentStore
+from src.infrastructure.storage.previews import schedule_preview
 from werkzeug.utils import secure_filename
 from flask import current_app
 
@@ -50,8 +58,99 @@ def _coalesce_int(v, default=None):
     except Exception:
         return default
 
+class UnitOfWork:
+    """
+    Agrupa varias escrituras del repositorio en una sola transacción.
+    Los efectos externos (correos, archivos) se registran con after_commit()
+    y solo se ejecutan si el commit fue exitoso; on_rollback() limpia lo
+    que haya quedado a medias si la transacción se revierte.
+    """
+
+    def __init__(self):
+        self._after_commit = []
+        self._on_rollback = []
+
+    def after_commit(self, fn):
+        self._after_commit.append(fn)
+
+    def on_rollback(self, fn):
+        self._on_rollback.append(fn)
+
+    def _run(self, hooks):
+        for fn in hooks:
+            try:
+                fn()
+            except Exception:
+                current_app.logger.warning("Error en efecto diferido de la transacción", exc_info=True)
+
+    def committed(self):
+        self._run(self._after_commit)
+
+    def rolled_back(self):
+        self._run(self._on_rollback)
+
+
 class TicketRepository:
 
+    def __init__(self):
+        self._uow: UnitOfWork | None = None
+
+    # ==== TRANSACCIONES ====
+    @contextmanager
+    def unit_of_work(self):
+        """
+        with repo.unit_of_work():
+            repo.insert_ticket(...)
+            repo.insert_notification(...)
+            repo.save_attachment(...)
+
+        Todas las escrituras dentro del bloque comparten un único commit.
+        Si ya hay una unidad de trabajo abierta, se reutiliza.
+        """
+        if self._uow is not None:
+            yield self._uow
+            return
+
+        uow = UnitOfWork()
+        self._uow = uow
+        try:
+            yield uow
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            self._uow = None
+            uow.rolled_back()
+            raise
+        self._uow = None
+        uow.committed()
+
+    def _commit(self):
+        if self._uow is None:
+            db.session.commit()
+
+    def _rollback(self):
+        # Dentro de una unidad de trabajo el rollback lo hace unit_of_work()
+        if self._uow is None:
+            db.session.rollback()
+
+    def _after_commit(self, fn):
+        if self._uow is None:
+            fn()
+        else:
+            self._uow.after_commit(fn)
+
+    def _on_rollback(self, fn):
+        if self._uow is not None:
+            self._uow.on_rollback(fn)
+
+    def _audit(self, *, entity: str, entity_id: int | None, action: str,
+               actor_id: int | None, payload: dict | None = None):
+        # Se encola recién con el commit: un rollback no deja eventos huérfanos
+        self._after_commit(lambda: audit_writer.record(
+            entity=entity, entity_id=entity_id, action=action,
+            actor_id=actor_id, payload=payload,
+        ))
+
     # ==== CATÁLOGOS BÁSICOS ====
     def get_categories(self):
         return db.session.execute(text("SELECT id, name FROM categories ORDER BY name")).mappings().all()
@@ -118,36 +217,179 @@ class TicketRepository:
 
 
     # ==== CREACIÓN DE TICKET ====
-    def next_ticket_code(self) -> str:
-        last = db.session.execute(text("SELECT MAX(id) AS mid FROM tickets")).scalar() or 0
-        return f"INC-{(last + 1):05d}"
+    @staticmethod
+    def ticket_code_for(ticket_id: int) -> str:
+        return f"INC-{int(ticket_id):05d}"
 
     def default_status_id(self) -> int:
         return db.session.execute(text("SELECT id FROM statuses WHERE name='NUEVO'")).scalar()
 
-    def insert_ticket(self, *, code, title, description, requester_id,
-                      department_id, category_id, priority_id, assignee_id=None) -> CreatedTicket:
+    def insert_ticket(self, *, title, description, requester_id,
+                      department_id, category_id, priority_id, assignee_id=None,
+                      code: str | None = None) -> CreatedTicket:
+        """
+        Inserta el ticket y, si no se entrega `code`, lo deriva del id
+        autoincremental dentro de la misma transacción (INC-00042).
+        El id lo asigna InnoDB, así que dos creaciones concurrentes nunca
+        obtienen el mismo código (antes se calculaba MAX(id)+1 por separado).
+        """
         status_id = self.default_status_id()
-        res = db.session.execute(text("""
-            INSERT INTO tickets
-              (code, title, description, requester_id, assignee_id,
-               department_id, category_id, priority_id, status_id)
-            VALUES
-              (:code, :title, :description, :requester_id, :assignee_id,
-               :department_id, :category_id, :priority_id, :status_id)
-        """), {
-            "code": code,
-            "title": title,
-            "description": description,
-            "requester_id": requester_id,
-            "assignee_id": assignee_id if assignee_id and assignee_id > 0 else None,
-            "department_id": department_id,
-            "category_id": category_id,
-            "priority_id": priority_id,
-            "status_id": status_id
-        })
-        db.session.commit()
-        return CreatedTicket(id=res.lastrowid, code=code)
+        try:
+            res = db.session.execute(text("""
+                INSERT INTO tickets
+                  (code, title, description, requester_id, assignee_id,
+                   department_id, category_id, priority_id, status_id)
+                VALUES
+                  (:code, :title, :description, :requester_id, :assignee_id,
+                   :department_id, :category_id, :priority_id, :status_id)
+            """), {
+                # código provisorio único (<= 20 chars) hasta conocer el id
+                "code": code or f"TMP-{uuid.uuid4().hex[:16]}",
+                "title": title,
+                "description": description,
+                "requester_id": requester_id,
+                "assignee_id": assignee_id if assignee_id and assignee_id > 0 else None,
+                "department_id": department_id,
+                "category_id": category_id,
+                "priority_id": priority_id,
+                "status_id": status_id
+            })
+            ticket_id = res.lastrowid
+
+            if not code:
+                code = self.ticket_code_for(ticket_id)
+                db.session.execute(
+                    text("UPDATE tickets SET code = :code WHERE id = :tid"),
+                    {"code": code, "tid": ticket_id}
+                )
+
+            self._sla_start(ticket_id)
+            self._commit()
+        except Exception:
+            self._rollback()
+            raise
+
+        self._audit(entity="ticket", entity_id=ticket_id, action="create", actor_id=requester_id,
+                    payload={"code": code, "priority_id": priority_id,
+                             "department_id": department_id, "assignee_id": assignee_id or None})
+        return CreatedTicket(id=ticket_id, code=code)
+
+    # ==== SLA ====
+    def _sla_start(self, ticket_id: int):
+        """
+        Crea el temporizador del ticket según el objetivo de su prioridad.
+        Una prioridad sin sla_hours (NULL) no tiene plazo: no hay temporizador.
+        """
+        db.session.execute(text("""
+            INSERT INTO ticket_sla
+                (ticket_id, priority_id, started_at, warn_at, due_at,
+                 status_id, status_since, next_deadline)
+            SELECT t.id, t.priority_id, t.created_at,
+                   t.created_at + INTERVAL (p.sla_hours * p.sla_warn_pct * 36) SECOND,
+                   t.created_at + INTERVAL p.sla_hours HOUR,
+                   t.status_id, t.created_at,
+                   t.created_at + INTERVAL (p.sla_hours * p.sla_warn_pct * 36) SECOND
+            FROM tickets t
+            JOIN priorities p ON p.id = t.priority_id
+            WHERE t.id = :tid
+              AND p.sla_hours IS NOT NULL
+        """), {"tid": ticket_id})
+
+    def _sla_on_status_change(self, ticket_id: int, to_status_id: int):
+        """
+        Acumula el tiempo del estado que termina y mueve el temporizador.
+        RESUELTO y los estados terminales lo detienen; reabrir lo reanuda
+        corriendo warn_at/due_at por el tiempo que estuvo detenido (la pausa
+        no cuenta contra el SLA). Va en la misma transacción que el UPDATE
+        de tickets.
+        """
+        db.session.execute(text("""
+            INSERT INTO ticket_status_time (ticket_id, status_id, seconds)
+            SELECT ticket_id, status_id, GREATEST(TIMESTAMPDIFF(SECOND, status_since, NOW()), 0)
+            FROM ticket_sla
+            WHERE ticket_id = :tid
+            ON DUPLICATE KEY UPDATE seconds = seconds + VALUES(seconds)
+        """), {"tid": ticket_id})
+
+        # Reanudación: se corren los plazos antes del UPDATE principal, que
+        # así calcula next_deadline con los valores ya corridos
+        db.session.execute(text("""
+            UPDATE ticket_sla
+            SET warn_at = warn_at + INTERVAL TIMESTAMPDIFF(SECOND, stopped_at, NOW()) SECOND,
+                due_at  = due_at  + INTERVAL TIMESTAMPDIFF(SECOND, stopped_at, NOW()) SECOND
+            WHERE ticket_id = :tid
+              AND stopped_at IS NOT NULL
+              AND EXISTS (SELECT 1 FROM statuses s
+                          WHERE s.id = :to_status_id AND s.is_terminal = 0 AND s.name <> 'RESUELTO')
+        """), {"tid": ticket_id, "to_status_id": to_status_id})
+
+        # next_deadline no lee stopped_at: en un UPDATE multi-tabla MySQL
+        # no garantiza el orden de las asignaciones
+        db.session.execute(text("""
+            UPDATE ticket_sla sla
+            JOIN statuses s ON s.id = :to_status_id
+            SET sla.stopped_at = CASE
+                    WHEN s.is_terminal = 1 OR s.name = 'RESUELTO' THEN COALESCE(sla.stopped_at, NOW())
+                    ELSE NULL
+                END,
+                sla.status_id    = :to_status_id,
+                sla.status_since = NOW(),
+                sla.next_deadline = CASE
+                    WHEN s.is_terminal = 1 OR s.name = 'RESUELTO' THEN NULL
+                    WHEN sla.warned_at   IS NULL THEN sla.warn_at
+                    WHEN sla.breached_at IS NULL THEN sla.due_at
+                    ELSE NULL
+                END
+            WHERE sla.ticket_id = :tid
+        """), {"tid": ticket_id, "to_status_id": to_status_id})
+
+    def due_sla_timers(self, limit: int = 200):
+        """
+        Temporizadores con next_deadline vencido, en orden. Lee por rango
+        sobre idx_sla_next_deadline y bloquea las filas (SKIP LOCKED: dos
+        barridos simultáneos no toman el mismo ticket).
+        """
+        return db.session.execute(text("""
+            SELECT sla.ticket_id, sla.due_at, sla.next_deadline,
+                   sla.due_at <= NOW() AS breached,
+                   t.code, t.assignee_id, p.name AS priority_name
+            FROM ticket_sla sla
+            JOIN tickets t    ON t.id = sla.ticket_id
+            JOIN priorities p ON p.id = sla.priority_id
+            WHERE sla.next_deadline <= NOW()
+            ORDER BY sla.next_deadline
+            LIMIT :lim
+            FOR UPDATE OF sla SKIP LOCKED
+        """), {"lim": int(limit)}).mappings().all()
+
+    def advance_sla_timer(self, ticket_id: int, *, breached: bool):
+        """Marca el aviso o el vencimiento y deja next_deadline en el siguiente hito."""
+        if breached:
+            db.session.execute(text("""
+                UPDATE ticket_sla
+                SET warned_at     = COALESCE(warned_at, NOW()),
+                    breached_at   = COALESCE(breached_at, NOW()),
+                    next_deadline = NULL
+                WHERE ticket_id = :tid
+            """), {"tid": ticket_id})
+        else:
+            db.session.execute(text("""
+                UPDATE ticket_sla
+                SET warned_at     = COALESCE(warned_at, NOW()),
+                    next_deadline = due_at
+                WHERE ticket_id = :tid
+            """), {"tid": ticket_id})
+        self._commit()
+
+    def list_admin_ids(self) -> list[int]:
+        rows = db.session.execute(text("""
+            SELECT u.id
+            FROM users u
+            JOIN user_roles ur ON ur.user_id = u.id
+            JOIN roles r       ON r.id = ur.role_id
+            WHERE UPPER(r.name) = 'ADMIN' AND u.is_active = 1
+        """)).all()
+        return [int(r[0]) for r in rows]
 
     # ==== DASHBOARD ====
     def kpis_for_user(self, user_id: int) -> dict:
@@ -259,47 +501,77 @@ class TicketRepository:
         """), {"tid": ticket_id}).mappings().all()
 
     def add_comment(self, ticket_id: int, author_user_id: int, body: str):
-        db.session.execute(
+        res = db.session.execute(
             text("INSERT INTO ticket_comments (ticket_id, author_user_id, body) VALUES (:t,:u,:b)"),
             {"t": ticket_id, "u": author_user_id, "b": body.strip()}
         )
-        db.session.commit()
+        self._commit()
+
+        comment_id = res.lastrowid
+        self._audit(entity="ticket", entity_id=ticket_id, action="comment",
+                    actor_id=author_user_id, payload={"comment_id": comment_id})
+
+        author_name = self.get_user_fullname(author_user_id)
+        self._after_commit(lambda: publish_event(RealtimeEvent(
+            kind="comment",
+            topics=(ticket_topic(ticket_id),),
+            data={
+                "id": comment_id,
+                "ticket_id": ticket_id,
+                "author_name": author_name,
+                "body": body.strip(),
+                "created_at": datetime.now().strftime("%Y-%m-%d %H:%M"),
+            },
+            source_id=f"ticket_comments:{comment_id}",
+        )))
 
     def save_attachment(self, *, ticket_id: int, uploader_id: int, file_storage, upload_dir: str) -> int:
-        os.makedirs(upload_dir, exist_ok=True)
+        """
+        Guarda el adjunto en el almacén direccionado por contenido
+        (sha256 calculado mientras se copia el upload, sin segunda lectura)
+        y registra su metadata. El blob se publica recién después del
+        commit (y ahí se encola su vista previa); si la transacción se
+        revierte, el temporal se elimina.
+        """
         safe_name = secure_filename(file_storage.filename or "")
         if not safe_name:
             raise ValueError("Archivo inválido")
+        mime_type = file_storage.mimetype or "application/octet-stream"
 
-        disk_path = os.path.join(upload_dir, safe_name)
-        file_storage.save(disk_path)
-
-        size = os.path.getsize(disk_path)
-        sha = hashlib.sha256()
-        with open(disk_path, "rb") as fh:
-            for chunk in iter(lambda: fh.read(8192), b""):
-                sha.update(chunk)
-
-        res = db.session.execute(text("""
-            INSERT INTO ticket_attachments
-              (ticket_id, uploader_user_id, file_name, mime_type, file_path, file_size, checksum_sha256)
-            VALUES
-              (:t,:u,:n,:m,:p,:s,:h)
-        """), {
-            "t": ticket_id,
-            "u": uploader_id,
-            "n": safe_name,
-            "m": file_storage.mimetype or "application/octet-stream",
-            "p": disk_path,
-            "s": size,
-            "h": sha.hexdigest()
-        })
-        db.session.commit()
+        store = AttachmentStore(upload_dir, current_app.config.get("MAX_ATTACHMENT_BYTES"))
+        staged = store.stage(file_storage)
+
+        try:
+            res = db.session.execute(text("""
+                INSERT INTO ticket_attachments
+                  (ticket_id, uploader_user_id, file_name, mime_type, file_path, file_size, checksum_sha256)
+                VALUES
+                  (:t,:u,:n,:m,:p,:s,:h)
+            """), {
+                "t": ticket_id,
+                "u": uploader_id,
+                "n": safe_name,
+                "m": mime_type,
+                "p": staged.blob_path,
+                "s": staged.size,
+                "h": staged.sha256
+            })
+            self._commit()
+        except Exception:
+            self._rollback()
+            store.discard(staged)
+            raise
+
+        self._on_rollback(lambda: store.discard(staged))
+        self._audit(entity="ticket", entity_id=ticket_id, action="attachment", actor_id=uploader_id,
+                    payload={"attachment_id": res.lastrowid, "file_name": safe_name,
+                             "size": staged.size, "sha256": staged.sha256})
+        self._after_commit(lambda: schedule_preview(store.publish(staged), mime_type))
         return res.lastrowid
 
     def get_attachment_path(self, att_id: int, ticket_id: int):
         return db.session.execute(text("""
-            SELECT file_path, file_name, mime_type
+            SELECT file_path, file_name, mime_type, file_size, checksum_sha256
             FROM ticket_attachments
             WHERE id = :id AND ticket_id = :tid
         """), {"id": att_id, "tid": ticket_id}).mappings().first()
@@ -329,6 +601,15 @@ class TicketRepository:
         """), {"uid": user_id}).first()
         return row[0] if row else None
 
+    def user_names(self, user_ids: list[int]) -> dict[int, str]:
+        if not user_ids:
+            return {}
+        rows = db.session.execute(text("""
+            SELECT id, CONCAT(names_worker, ' ', last_name) AS full_name
+            FROM users WHERE id IN :ids
+        """).bindparams(bindparam("ids", expanding=True)), {"ids": list(user_ids)}).all()
+        return {int(r[0]): r[1] for r in rows}
+
     def get_user_department_id(self, user_id: int) -> int | None:
         row = db.session.execute(text("""
             SELECT department_id FROM users WHERE id = :uid
@@ -348,7 +629,7 @@ class TicketRepository:
             try:
                 # Bloqueamos el ticket actual y leemos el estado actual
                 cur = db.session.execute(text("""
-                    SELECT status_id
+                    SELECT status_id, requester_id, assignee_id
                     FROM tickets
                     WHERE id = :tid
                     FOR UPDATE
@@ -386,8 +667,10 @@ class TicketRepository:
                     "set_closed": set_closed,
                 })
 
+                self._sla_on_status_change(ticket_id, int(to_status_id))
+
                 # Registramos en historial
-                db.session.execute(text("""
+                hist = db.session.execute(text("""
                     INSERT INTO ticket_history
                         (ticket_id, actor_user_id, from_status_id, to_status_id, note, created_at)
                     VALUES
@@ -400,11 +683,31 @@ class TicketRepository:
                     "note": (note or "").strip() or None
                 })
 
-                db.session.commit()
+                self._commit()
             except Exception:
-                db.session.rollback()
+                self._rollback()
                 raise
 
+            history_id = hist.lastrowid
+            self._audit(entity="ticket", entity_id=ticket_id, action="status_change",
+                        actor_id=actor_user_id,
+                        payload={"from_status_id": from_status_id, "to_status_id": int(to_status_id),
+                                 "to_status": status_name, "note": (note or "").strip() or None})
+
+            # Delta para el detalle del ticket y los dashboards involucrados
+            topics = (ticket_topic(ticket_id),) + tuple(user_topic(u) for u in (cur[1], cur[2]) if u)
+            self._after_commit(lambda: publish_event(RealtimeEvent(
+                kind="status",
+                topics=topics,
+                data={
+                    "ticket_id": ticket_id,
+                    "to_status": status_name,
+                    "note": (note or "").strip() or None,
+                    "created_at": datetime.now().strftime("%Y-%m-%d %H:%M"),
+                },
+                source_id=f"ticket_history:{history_id}",
+            )))
+
 
     def update_assignee_with_history(self, *, ticket_id: int, new_assignee_id: int | None, actor_user_id: int, note: str | None = None):
         try:
@@ -448,11 +751,15 @@ class TicketRepository:
                 "note": final_note
             })
 
-            db.session.commit()
+            self._commit()
         except Exception:
-            db.session.rollback()
+            self._rollback()
             raise
 
+        self._audit(entity="ticket", entity_id=ticket_id, action="assign", actor_id=actor_user_id,
+                    payload={"from_assignee_id": old_assignee_id, "to_assignee_id": new_assignee_id,
+                             "note": (note or "").strip() or None})
+
     # ====== LISTAS / ASIGNABLES ======
     def list_assignable_requesters_same_dept(self, actor_user_id: int):
         dept = self.get_user_department_id(actor_user_id)
@@ -527,7 +834,8 @@ class TicketRepository:
         offset = max(int(page or 1), 1)
         offset = (offset - 1) * limit
 
-        total = db.session.execute(text(f"""
+        # Listados y exportación: solo lectura, van a la réplica si hay una
+        total = read_router.execute_read(text(f"""
             SELECT COUNT(*)
             FROM tickets t
             WHERE {where_sql}
@@ -544,7 +852,7 @@ class TicketRepository:
                   END AS role_for_user
             """
 
-        items = db.session.execute(text(f"""
+        items = read_router.execute_read(text(f"""
             SELECT
               t.id,
               t.code,
@@ -607,28 +915,22 @@ class TicketRepository:
         """
         Retorna analistas por departamento junto con su carga actual
         (cantidad de tickets abiertos asignados).
-        Carga = tickets en estados NUEVO, ASIGNADO, EN_PROGRESO.
+        Carga = tickets en estados NUEVO, ASIGNADO, EN_PROGRESO, leída desde
+        analyst_workload (mantenida por triggers sobre tickets), sin recorrer tickets.
         """
         sql = """
         SELECT
             u.id,
             u.department_id,
             CONCAT(u.names_worker, ' ', u.last_name) AS full_name,
-            COALESCE(SUM(
-                CASE
-                    WHEN s.name IN ('NUEVO','ASIGNADO','EN_PROGRESO') THEN 1
-                    ELSE 0
-                END
-            ), 0) AS open_count
+            COALESCE(w.open_count, 0) AS open_count
         FROM users u
         JOIN user_roles ur ON ur.user_id = u.id
         JOIN roles r       ON r.id = ur.role_id
-        LEFT JOIN tickets t   ON t.assignee_id = u.id
-        LEFT JOIN statuses s  ON s.id = t.status_id
+        LEFT JOIN analyst_workload w ON w.user_id = u.id
         WHERE u.is_active = 1
           AND u.department_id IS NOT NULL
           AND UPPER(r.name) = 'ANALYST'
-        GROUP BY u.id, u.department_id, full_name
         ORDER BY u.department_id, open_count ASC, full_name ASC
         """
         return db.session.execute(text(sql)).mappings().all()
@@ -639,21 +941,18 @@ class TicketRepository:
         Si hay empate, retorna el primero alfabéticamente.
         """
         sql = """
-        SELECT 
+        SELECT
             u.id,
             CONCAT(u.names_worker, ' ', u.last_name) AS full_name,
-            COUNT(t.id) AS open_count
+            COALESCE(w.open_count, 0) AS open_count
         FROM users u
         JOIN user_roles ur ON ur.user_id = u.id
         JOIN roles r ON r.id = ur.role_id
-        LEFT JOIN tickets t ON t.assignee_id = u.id AND t.status_id IN (
-            SELECT id FROM statuses WHERE name IN ('NUEVO','ASIGNADO','EN_PROGRESO')
-        )
-        WHERE 
+        LEFT JOIN analyst_workload w ON w.user_id = u.id
+        WHERE
             u.is_active = 1
             AND u.department_id = :dept
             AND UPPER(r.name) = 'ANALYST'
-        GROUP BY u.id, full_name
         ORDER BY open_count ASC, full_name ASC
         LIMIT 1
         """
@@ -665,10 +964,11 @@ class TicketRepository:
         """
         Inserta una notificación en la tabla ticket_notifications
         y, si es posible, envía un correo al usuario.
-        Si el envío de correo falla, NO rompe la app.
+        El correo se envía después del commit (al cerrar la unidad de
+        trabajo si hay una abierta). Si el envío falla, NO rompe la app.
         """
         # 1) Insertar en la BD (igual que antes)
-        db.session.execute(
+        res = db.session.execute(
             text("""
                 INSERT INTO ticket_notifications (user_id, ticket_id, kind, message)
                 VALUES (:u, :t, :k, :m)
@@ -680,9 +980,27 @@ class TicketRepository:
                 "m": message[:255],
             },
         )
-        db.session.commit()
+        self._commit()
+        self._after_commit(lambda: unread_cache.invalidate(user_id))
+
+        notif_id = res.lastrowid
+        self._after_commit(lambda: publish_event(RealtimeEvent(
+            kind="notification",
+            topics=(user_topic(user_id),),
+            data={
+                "id": notif_id,
+                "ticket_id": int(ticket_id),
+                "kind": kind,
+                "message": message[:255],
+                "created_at": datetime.now().strftime("%Y-%m-%d %H:%M"),
+            },
+            source_id=f"ticket_notifications:{notif_id}",
+        )))
 
         # 2) Intentar enviar correo (best-effort, no crítico)
+        self._after_commit(lambda: self._send_notification_email(user_id, kind, message))
+
+    def _send_notification_email(self, user_id: int, kind: str, message: str):
         try:
             # Traemos el correo del usuario desde la tabla users
             result = db.session.execute(
@@ -700,6 +1018,8 @@ class TicketRepository:
                 "ASSIGNED": "Nuevo ticket asignado",
                 "RESOLVED": "Tu ticket ha sido resuelto",
                 "CLOSED":   "Tu ticket ha sido cerrado",
+                "SLA_WARNING": "Ticket próximo a vencer",
+                "SLA_BREACH":  "Ticket con SLA vencido",
             }
             title = subject_map.get(kind, "Notificación de Incidex")
 
@@ -733,5 +1053,69 @@ class TicketRepository:
             SET is_read = 1
             WHERE user_id = :u AND is_read = 0
         """), {"u": int(user_id)})
-        db.session.commit()
+        self._commit()
+        self._after_commit(lambda: unread_cache.invalidate(user_id))
+
+    def archive_read_notifications_batch(self, *, older_than_days: int, batch_size: int = 5000) -> int:
+        """
+        Mueve a ticket_notifications_archive un lote de notificaciones leídas
+        con más de `older_than_days` días. Cada lote es una transacción corta
+        (INSERT + DELETE por id) para no bloquear la tabla viva.
+        Devuelve cuántas filas se archivaron (0 = no queda nada).
+        """
+        ids = db.session.execute(text("""
+            SELECT id
+            FROM ticket_notifications
+            WHERE is_read = 1
+              AND created_at < NOW() - INTERVAL :days DAY
+            ORDER BY id
+            LIMIT :lim
+        """), {"days": int(older_than_days), "lim": int(batch_size)}).scalars().all()
+        if not ids:
+            return 0
+
+        try:
+            db.session.execute(text("""
+                INSERT IGNORE INTO ticket_notifications_archive
+                    (id, user_id, ticket_id, kind, message, is_read, created_at)
+                SELECT id, user_id, ticket_id, kind, message, is_read, created_at
+                FROM ticket_notifications
+                WHERE id IN :ids
+            """).bindparams(bindparam("ids", expanding=True)), {"ids": ids})
+
+            db.session.execute(text("""
+                DELETE FROM ticket_notifications WHERE id IN :ids
+            """).bindparams(bindparam("ids", expanding=True)), {"ids": ids})
+
+            self._commit()
+        except Exception:
+            self._rollback()
+            raise
+        return len(ids)
+
+    def count_unread_notifications(self, user_id: int) -> int:
+        return db.session.execute(text("""
+            SELECT COUNT(*)
+            FROM ticket_notifications
+            WHERE user_id = :u AND is_read = 0
+        """), {"u": int(user_id)}).scalar() or 0
+
+    def unread_notifications_summary(self, user_id: int, limit: int = 10) -> NotificationSummary:
+        """
+        Contador real de no leídas + últimas `limit` para el header,
+        servido desde caché mientras no se invalide ni expire.
+        """
+        cached = unread_cache.get(user_id)
+        if cached is not None:
+            return cached
+
+        recent = [dict(r) for r in self.list_unread_notifications(user_id, limit=limit)]
+        if len(recent) < limit:
+            unread = len(recent)  # ya están todas, no hace falta el COUNT
+        else:
+            unread = self.count_unread_notifications(user_id)
+
+        summary = NotificationSummary(unread=unread, recent=recent)
+        unread_cache.set(user_id, summary)
+        return summary
 
@@ -0,0 +1,295 @@
+import os
+import re
+import sys
+import json
+import time
+import random
+import logging
+import cProfile
+import threading
+from collections import Counter
+from datetime import datetime
+
+from flask import g, request
+
+log = logging.getLogger(__name__)
+
+MODES = ("sample", "cprofile")
+CONTROL_FILE = "control.json"   # estado compartido por todos los workers
+CONTROL_TTL = 2.0               # segundos entre lecturas del archivo de control
+SAMPLE_INTERVAL_MS = 5.0
+
+# Nunca se perfilan (los consulta el monitoreo o no pasan por la app)
+SKIP_ENDPOINTS = {"static", "ops.metrics", "ops.health", "ops.live"}
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def endpoint_dir(endpoint: str | None) -> str:
+    return _UNSAFE.sub("_", endpoint or "unmatched")
+
+
+def frame_label(code) -> str:
+    """`función (ruta/relativa.py:línea)` sin ';' (separador del formato folded)."""
+    path = code.co_filename
+    try:
+        rel = os.path.relpath(path)
+        if not rel.startswith(".."):
+            path = rel
+        else:
+            path = os.path.join(*path.replace("\\", "/").split("/")[-2:])
+    except ValueError:
+        pass  # otra unidad en Windows
+    return f"{code.co_name} ({path}:{code.co_firstlineno})".replace(";", ":")
+
+
+def collapse(frame) -> str:
+    """Pila de `frame` en formato folded (raíz primero, separada por ';')."""
+    stack = []
+    while frame is not None:
+        stack.append(frame_label(frame.f_code))
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+class StackSampler:
+    """
+    Perfilador por muestreo: un hilo toma cada `interval_ms` la pila de los
+    hilos registrados (sys._current_frames) y cuenta las pilas colapsadas.
+    No instrumenta cada llamada como cProfile, así que el costo es casi
+    nulo y los tiempos no se distorsionan.
+    """
+
+    def __init__(self, interval_ms: float = SAMPLE_INTERVAL_MS):
+        self.interval = interval_ms / 1000
+        self._targets: dict[int, Counter] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self, ident: int):
+        with self._lock:
+            self._targets[ident] = Counter()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="incidex-profiler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def stop(self, ident: int) -> Counter:
+        with self._lock:
+            return self._targets.pop(ident, None) or Counter()
+
+    def sample_once(self):
+        frames = sys._current_frames()
+        with self._lock:
+            for ident, stacks in self._targets.items():
+                frame = frames.get(ident)
+                if frame is not None:
+                    stacks[collapse(frame)] += 1
+
+    def _run(self):
+        while True:
+            self._wake.clear()
+            with self._lock:
+                idle = not self._targets
+            if idle:
+                self._wake.wait()
+                continue
+            self.sample_once()
+            time.sleep(self.interval)
+
+
+class RequestProfiler:
+    """
+    Perfilado opcional de una fracción de los requests.
+
+    El estado (activo, fracción, endpoints) vive en PROFILE_DIR/control.json
+    para que el toggle de un admin llegue a todos los workers sin reiniciar;
+    sin ese archivo se usan PROFILE_ENABLED / PROFILE_SAMPLE_RATE.
+
+    Cada request perfilado deja un archivo en PROFILE_DIR/<endpoint>/:
+      - modo sample:   <ts>-<ms>ms-<pid>-<hilo>.folded (pilas colapsadas, para
+                       flamegraph.pl / speedscope)
+      - modo cprofile: <ts>-<ms>ms-<pid>-<hilo>.prof (pstats)
+    `flask profile-report` los junta por endpoint.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.sampler = None
+        self._control = (float("-inf"), None, None)   # (leído_en, mtime, datos)
+        self._control_lock = threading.Lock()
+
+    def init_app(self, app):
+        app.config.setdefault("PROFILE_ENABLED", False)
+        app.config.setdefault("PROFILE_SAMPLE_RATE", 0.01)
+        app.config.setdefault("PROFILE_MODE", "sample")
+        app.config.setdefault("PROFILE_INTERVAL_MS", SAMPLE_INTERVAL_MS)
+        app.config.setdefault("PROFILE_MIN_MS", 0.0)
+        app.config.setdefault("PROFILE_DIR", os.path.join(os.getcwd(), "var", "profiles"))
+        if app.config["PROFILE_MODE"] not in MODES:
+            raise ValueError(f"PROFILE_MODE debe ser uno de {MODES}")
+
+        self.app = app
+        self.sampler = StackSampler(float(app.config["PROFILE_INTERVAL_MS"]))
+        app.extensions["profiler"] = self
+        app.before_request(self._start)
+        app.teardown_request(self._stop)
+
+    # ---- Estado (archivo de control) ----
+
+    def _control_path(self) -> str:
+        return os.path.join(self.app.config["PROFILE_DIR"], CONTROL_FILE)
+
+    def settings(self) -> dict:
+        cfg = self.app.config
+        current = {
+            "enabled": bool(cfg["PROFILE_ENABLED"]),
+            "rate": float(cfg["PROFILE_SAMPLE_RATE"]),
+            "endpoints": [],
+            "mode": cfg["PROFILE_MODE"],
+        }
+        now = time.monotonic()
+        with self._control_lock:
+            read_at, mtime, data = self._control
+            if now - read_at >= CONTROL_TTL:
+                path = self._control_path()
+                try:
+                    new_mtime = os.stat(path).st_mtime
+                except OSError:
+                    new_mtime, data = None, None
+                if new_mtime is not None and new_mtime != mtime:
+                    try:
+                        with open(path, encoding="utf-8") as fh:
+                            data = json.load(fh)
+                    except (OSError, ValueError) as e:
+                        log.warning("No se pudo leer %s: %s", path, e)
+                        data = None
+                self._control = (now, new_mtime, data)
+        if data:
+            current.update({k: data[k] for k in ("enabled", "rate", "endpoints") if k in data})
+            current.update({k: data[k] for k in ("updated_by", "updated_at") if k in data})
+        return current
+
+    def update(self, *, enabled: bool, rate: float | None = None,
+               endpoints: list[str] | None = None, updated_by: str | None = None) -> dict:
+        """Guarda el estado para todos los workers (escritura atómica)."""
+        current = self.settings()
+        data = {
+            "enabled": bool(enabled),
+            "rate": min(max(float(current["rate"] if rate is None else rate), 0.0), 1.0),
+            "endpoints": sorted(set(current["endpoints"] if endpoints is None else endpoints)),
+            "updated_by": updated_by,
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        path = self._control_path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(data, fh)
+        os.replace(tmp, path)
+        with self._control_lock:
+            self._control = (float("-inf"), None, None)   # este worker lo ve de inmediato
+        return self.settings()
+
+    # ---- Hooks de request ----
+
+    def _wanted(self, endpoint: str | None) -> bool:
+        if endpoint in SKIP_ENDPOINTS:
+            return False
+        s = self.settings()
+        if not s["enabled"] or (s["endpoints"] and endpoint not in s["endpoints"]):
+            return False
+        return random.random() < s["rate"]
+
+    def _start(self):
+        if not self._wanted(request.endpoint):
+            return
+        mode = self.app.config["PROFILE_MODE"]
+        ident = threading.get_ident()
+        if mode == "cprofile":
+            prof = cProfile.Profile()
+            try:
+                prof.enable()
+            except ValueError:
+                return  # otro perfilador activo en este hilo (p. ej. un debugger)
+            g.profile = ("cprofile", prof, ident, time.perf_counter())
+        else:
+            self.sampler.start(ident)
+            g.profile = ("sample", None, ident, time.perf_counter())
+
+    def _stop(self, exc=None):
+        state = g.pop("profile", None)
+        if state is None:
+            return
+        mode, prof, ident, t0 = state
+        if mode == "cprofile":
+            prof.disable()
+        else:
+            stacks = self.sampler.stop(ident)
+        ms = (time.perf_counter() - t0) * 1000
+        if ms < float(self.app.config["PROFILE_MIN_MS"]):
+            return
+        try:
+            folder = os.path.join(self.app.config["PROFILE_DIR"], endpoint_dir(request.endpoint))
+            os.makedirs(folder, exist_ok=True)
+            base = os.path.join(
+                folder, f"{datetime.now():%Y%m%dT%H%M%S}-{int(ms)}ms-{os.getpid()}-{ident}",
+            )
+            if mode == "cprofile":
+                prof.dump_stats(base + ".prof")
+            elif stacks:
+                write_folded(base + ".folded", stacks)
+        except OSError as e:
+            log.warning("No se pudo guardar el perfil de %s: %s", request.endpoint, e)
+
+
+# ==== Lectura y agregación (comando profile-report) ====
+
+def write_folded(path: str, stacks: dict):
+    with open(path, "w", encoding="utf-8") as fh:
+        for stack, n in sorted(stacks.items(), key=lambda x: -x[1]):
+            fh.write(f"{stack} {n}\n")
+
+
+def read_folded(path: str) -> Counter:
+    stacks = Counter()
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            stack, _, n = line.rstrip("\n").rpartition(" ")
+            if stack and n.isdigit():
+                stacks[stack] += int(n)
+    return stacks
+
+
+def find_profiles(root: str, *, endpoint: str | None = None, since: float | None = None) -> dict:
+    """{endpoint: {"folded": [rutas], "prof": [rutas]}} de todos los workers."""
+    found = {}
+    if not os.path.isdir(root):
+        return found
+    for name in sorted(os.listdir(root)):
+        folder = os.path.join(root, name)
+        if not os.path.isdir(folder) or name == "aggregate":
+            continue
+        if endpoint and name != endpoint_dir(endpoint):
+            continue
+        files = {"folded": [], "prof": []}
+        for fname in sorted(os.listdir(folder)):
+            path = os.path.join(folder, fname)
+            ext = fname.rsplit(".", 1)[-1]
+            if ext in files and (since is None or os.path.getmtime(path) >= since):
+                files[ext].append(path)
+        if files["folded"] or files["prof"]:
+            found[name] = files
+    return found
+
+
+def self_samples(stacks: Counter) -> Counter:
+    """Muestras por función hoja (dónde se estaba realmente al muestrear)."""
+    leaves = Counter()
+    for stack, n in stacks.items():
+        leaves[stack.rsplit(";", 1)[-1]] += n
+    return leaves
+
+
+profiler = RequestProfiler()
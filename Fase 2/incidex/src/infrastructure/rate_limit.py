@@ -0,0 +1,244 @@
+import math
+import re
+import time
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache, wraps
+
+from flask import current_app, jsonify, request
+from flask_login import current_user
+from sqlalchemy import text
+
+from src.infrastructure.metrics import RATE_LIMITED
+from src.infrastructure.persistence.database import db
+
+log = logging.getLogger(__name__)
+
+_PERIODS = {
+    "s": 1, "sec": 1, "second": 1,
+    "m": 60, "min": 60, "minute": 60,
+    "h": 3600, "hour": 3600,
+    "d": 86400, "day": 86400,
+}
+_SPEC = re.compile(r"(\d+(?:\.\d+)?)\s*/\s*(\d*)\s*([a-z]+?)s?\s*(?:;\s*burst\s*=\s*(\d+(?:\.\d+)?))?")
+
+
+@dataclass(frozen=True)
+class Rate:
+    capacity: float     # ráfaga máxima (balde lleno)
+    per_second: float   # tokens que se recuperan por segundo
+
+
+@lru_cache(maxsize=64)
+def parse_rate(spec: str | None) -> Rate | None:
+    """
+    "10/minute" -> 10 seguidas y luego una cada 6 s
+    "5/hour;burst=2" -> 2 seguidas y luego 5 por hora
+    "30/5min", "1/s"; vacío, "0" u "off" = sin límite.
+    """
+    spec = (spec or "").strip().lower()
+    if spec in ("", "0", "off", "none"):
+        return None
+    m = _SPEC.fullmatch(spec)
+    if not m or m.group(3) not in _PERIODS:
+        raise ValueError(f"Límite inválido: {spec!r} (ej: 10/minute, 5/hour;burst=2)")
+    count = float(m.group(1))
+    seconds = int(m.group(2) or 1) * _PERIODS[m.group(3)]
+    capacity = float(m.group(4)) if m.group(4) else count
+    return Rate(capacity=max(capacity, 1.0), per_second=count / seconds)
+
+
+def _refill(tokens: float, updated: float, now: float, rate: Rate, cost: float) -> tuple[float, float]:
+    """(tokens recargados, segundos de espera para poder cobrar `cost`)."""
+    tokens = min(rate.capacity, tokens + max(0.0, now - updated) * rate.per_second)
+    if tokens >= cost:
+        return tokens, 0.0
+    return tokens, (cost - tokens) / rate.per_second
+
+
+def _charge(refilled: list[tuple[float, float]], cost: float) -> tuple[list[float], list[float]]:
+    """(tokens a guardar, esperas): se cobra en todos los baldes o en ninguno."""
+    waits = [wait for _, wait in refilled]
+    ok = not any(waits)
+    return [tokens - cost if ok else tokens for tokens, _ in refilled], waits
+
+
+class MemoryStore:
+    """
+    Baldes en memoria del proceso: cada worker lleva su propia cuenta (con N
+    workers el límite efectivo es hasta N veces el configurado). Se guardan
+    a lo sumo `max_keys`; al pasarse se descarta el usado hace más tiempo.
+    """
+
+    def __init__(self, max_keys: int = 10_000, clock=time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: Rate, cost: float = 1.0) -> float:
+        return self.take_all([(key, rate)], cost)[0]
+
+    def take_all(self, buckets: list[tuple[str, Rate]], cost: float = 1.0) -> list[float]:
+        """Espera de cada balde; si alguna es > 0 no se cobra en ninguno."""
+        now = self.clock()
+        with self._lock:
+            refilled = [_refill(*self._buckets.get(key, (rate.capacity, now)), now, rate, cost)
+                        for key, rate in buckets]
+            tokens, waits = _charge(refilled, cost)
+            for (key, _), left in zip(buckets, tokens):
+                self._buckets[key] = (left, now)
+                self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return waits
+
+
+class DbStore:
+    """
+    Baldes en la tabla rate_limit_buckets (migración 010), compartidos por
+    todos los workers y hosts. Cada cobro es una transacción corta en su
+    propia conexión (no toca la sesión del request) que bloquea la fila del
+    balde. Si la BD falla se deja pasar: el límite no debe tumbar la ruta.
+    """
+
+    PURGE_EVERY = 600.0      # cada cuánto borra un proceso los baldes viejos
+    IDLE_SECONDS = 86400.0   # un balde sin uso por un día ya está lleno
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self._next_purge = 0.0
+
+    def take(self, key: str, rate: Rate, cost: float = 1.0) -> float:
+        return self.take_all([(key, rate)], cost)[0]
+
+    def take_all(self, buckets: list[tuple[str, Rate]], cost: float = 1.0) -> list[float]:
+        """Espera de cada balde; si alguna es > 0 no se cobra en ninguno."""
+        now = self.clock()
+        try:
+            with db.engine.begin() as conn:
+                sqlite = conn.dialect.name == "sqlite"
+                refilled = {}
+                # Filas bloqueadas siempre en el mismo orden (sin deadlocks entre requests)
+                for key, rate in sorted(buckets, key=lambda b: b[0]):
+                    conn.execute(
+                        text(f"""
+                            INSERT {'OR IGNORE' if sqlite else 'IGNORE'} INTO rate_limit_buckets
+                                (bucket_key, tokens, updated_at)
+                            VALUES (:k, :cap, :now)
+                        """),
+                        {"k": key, "cap": rate.capacity, "now": now},
+                    )
+                    row = conn.execute(
+                        text(f"""
+                            SELECT tokens, updated_at FROM rate_limit_buckets
+                            WHERE bucket_key = :k {'' if sqlite else 'FOR UPDATE'}
+                        """),
+                        {"k": key},
+                    ).one()
+                    refilled[key] = _refill(float(row[0]), float(row[1]), now, rate, cost)
+                tokens, waits = _charge([refilled[key] for key, _ in buckets], cost)
+                conn.execute(
+                    text("UPDATE rate_limit_buckets SET tokens = :t, updated_at = :now WHERE bucket_key = :k"),
+                    [{"t": left, "now": now, "k": key} for (key, _), left in zip(buckets, tokens)],
+                )
+                if now >= self._next_purge:
+                    self._next_purge = now + self.PURGE_EVERY
+                    conn.execute(
+                        text("DELETE FROM rate_limit_buckets WHERE updated_at < :cutoff"),
+                        {"cutoff": now - self.IDLE_SECONDS},
+                    )
+            return waits
+        except Exception:
+            log.warning("No se pudo consultar el límite %s; se deja pasar",
+                        ", ".join(key for key, _ in buckets), exc_info=True)
+            return [0.0] * len(buckets)
+
+
+def limited_response(retry_after: float) -> tuple[dict, dict]:
+    """Cuerpo JSON y headers de un 429 (lo usan la vista Flask y la ruta ASGI)."""
+    seconds = max(1, math.ceil(retry_after))
+    return {"error": "rate_limited", "retry_after": seconds}, {"Retry-After": str(seconds)}
+
+
+def _json_429(retry_after: float):
+    payload, headers = limited_response(retry_after)
+    return jsonify(payload), 429, headers
+
+
+class RateLimiter:
+    """
+    Límite por token bucket para rutas caras o que disparan efectos
+    externos (Gemini, correo). Cada regla es una clave de config con un
+    límite en texto (ver parse_rate) y se aplica a dos baldes:
+
+        user  por usuario autenticado (no aplica a anónimos)
+        ip    por request.remote_addr (detrás de un proxy, ProxyFix con PROXY_FIX_X_FOR)
+
+        @rate_limiter.limit("tickets.ai_suggest",
+                            user="RATELIMIT_AI_SUGGEST_USER", ip="RATELIMIT_AI_SUGGEST_IP")
+
+    RATELIMIT_STORAGE elige dónde viven los baldes: memory (por proceso)
+    o db (tabla compartida). Sin init_app o con RATELIMIT_ENABLED=False
+    no se limita nada.
+    """
+
+    def init_app(self, app):
+        app.config.setdefault("RATELIMIT_ENABLED", True)
+        app.config.setdefault("RATELIMIT_STORAGE", "memory")   # memory | db
+        app.config.setdefault("RATELIMIT_MAX_KEYS", 10_000)
+        storage = app.config["RATELIMIT_STORAGE"]
+        if storage == "db":
+            store = DbStore()
+        elif storage == "memory":
+            store = MemoryStore(max_keys=int(app.config["RATELIMIT_MAX_KEYS"]))
+        else:
+            raise ValueError(f"RATELIMIT_STORAGE desconocido: {storage!r} (memory | db)")
+        app.extensions["rate_limiter"] = store
+
+    def check(self, name: str, user: str | None = None, ip: str | None = None, cost: float = 1.0) -> float:
+        """
+        Cobra en los baldes de `name`; 0 si pasa o los segundos que hay que
+        esperar. Se cobra en todos o en ninguno: un request rechazado por IP
+        no gasta el balde del usuario (ni al revés).
+        """
+        store = current_app.extensions.get("rate_limiter")
+        if store is None or not current_app.config.get("RATELIMIT_ENABLED", True):
+            return 0.0
+
+        buckets = []
+        if user and hasattr(current_app, "login_manager") and current_user.is_authenticated:
+            buckets.append(("user", current_user.get_id(), user))
+        if ip:
+            buckets.append(("ip", request.remote_addr or "-", ip))
+
+        rules = [(scope, who, parse_rate(current_app.config.get(config_key)))
+                 for scope, who, config_key in buckets]
+        rules = [(scope, who, rate) for scope, who, rate in rules if rate is not None]
+        if not rules:
+            return 0.0
+        waits = store.take_all([(f"{name}:{scope}:{who}", rate) for scope, who, rate in rules], cost)
+        wait, scope, who = max((w, scope, who) for w, (scope, who, _) in zip(waits, rules))
+        if wait > 0:
+            RATE_LIMITED.inc(endpoint=name, scope=scope)
+            log.info("Límite alcanzado en %s (%s %s), reintentar en %.1fs", name, scope, who, wait)
+        return wait
+
+    def limit(self, name: str, user: str | None = None, ip: str | None = None,
+              methods: tuple[str, ...] | None = None, on_limit=None):
+        """Decorador de vista; sobre el límite responde on_limit(retry_after) o un 429 JSON."""
+        def decorator(view):
+            @wraps(view)
+            def wrapped(*args, **kwargs):
+                if methods is None or request.method in methods:
+                    wait = self.check(name, user=user, ip=ip)
+                    if wait > 0:
+                        return (on_limit or _json_429)(wait)
+                return view(*args, **kwargs)
+            return wrapped
+        return decorator
+
+
+rate_limiter = RateLimiter()
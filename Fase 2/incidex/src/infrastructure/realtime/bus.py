@@ -0,0 +1,137 @@
+import json
+import queue
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+
+from flask import current_app, has_app_context
+
+log = logging.getLogger(__name__)
+
+SUBSCRIBER_QUEUE_SIZE = 100
+DEDUP_WINDOW = 5000
+
+
+def user_topic(user_id: int) -> str:
+    return f"user:{int(user_id)}"
+
+
+def ticket_topic(ticket_id: int) -> str:
+    return f"ticket:{int(ticket_id)}"
+
+
+@dataclass
+class RealtimeEvent:
+    kind: str                   # notification | status | comment
+    topics: tuple
+    data: dict = field(default_factory=dict)
+    source_id: str | None = None  # "<tabla>:<id>", para no repetir el mismo cambio
+
+    def to_sse(self) -> str:
+        lines = []
+        if self.source_id:
+            lines.append(f"id: {self.source_id}")
+        lines.append(f"event: {self.kind}")
+        lines.append(f"data: {json.dumps(self.data, default=str)}")
+        return "\n".join(lines) + "\n\n"
+
+
+class Subscription:
+    def __init__(self, topics):
+        self.topics = frozenset(topics)
+        self.overflowed = False
+        self._queue = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def put(self, event: RealtimeEvent):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            # Cliente lento: se le pide recargar en vez de crecer sin límite
+            self.overflowed = True
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def get(self, timeout: float) -> RealtimeEvent | None:
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class EventBus:
+    """
+    Pub/sub en proceso. Los repositorios publican después del commit y
+    cada conexión SSE se suscribe a sus tópicos (user:<id>, ticket:<id>).
+    Un mismo cambio puede llegar dos veces (publicación local + backend
+    entre workers); se descarta por source_id.
+    """
+
+    def __init__(self):
+        self._subs: set[Subscription] = set()
+        self._seen: set[str] = set()
+        self._seen_order: deque = deque()
+        self._lock = threading.Lock()
+
+    def subscribe(self, topics) -> Subscription:
+        sub = Subscription(topics)
+        with self._lock:
+            self._subs.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            self._subs.discard(sub)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subs)
+
+    def queued_events(self) -> int:
+        """Eventos encolados sin entregar, sumando todas las conexiones SSE."""
+        with self._lock:
+            subs = list(self._subs)
+        return sum(s.pending() for s in subs)
+
+    def publish(self, event: RealtimeEvent) -> bool:
+        with self._lock:
+            if event.source_id:
+                if event.source_id in self._seen:
+                    return False
+                self._seen.add(event.source_id)
+                self._seen_order.append(event.source_id)
+                if len(self._seen_order) > DEDUP_WINDOW:
+                    self._seen.discard(self._seen_order.popleft())
+            targets = [s for s in self._subs if s.topics.intersection(event.topics)]
+        for sub in targets:
+            sub.put(event)
+        return True
+
+
+bus = EventBus()
+
+
+class LocalBackend:
+    """Solo este proceso: sirve con un único worker (o en desarrollo)."""
+
+    def __init__(self, event_bus: EventBus = bus):
+        self.bus = event_bus
+
+    def publish(self, event: RealtimeEvent):
+        self.bus.publish(event)
+
+    def ensure_running(self):
+        pass
+
+
+def publish_event(event: RealtimeEvent):
+    """
+    Publica a través del backend configurado en la app (init_realtime).
+    Nunca rompe la operación que lo llama.
+    """
+    try:
+        backend = current_app.extensions.get("realtime") if has_app_context() else None
+        (backend or LocalBackend()).publish(event)
+    except Exception as e:
+        log.warning(f"[Realtime] No se pudo publicar {event.kind}: {e}")
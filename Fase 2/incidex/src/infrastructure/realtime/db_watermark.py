@@ -0,0 +1,232 @@
+import time
+import threading
+from collections import OrderedDict
+
+from sqlalchemy import bindparam, text
+
+from src.infrastructure.persistence.database import db
+from src.infrastructure.notifications.unread_cache import unread_cache
+from src.infrastructure.realtime.bus import (
+    EventBus, LocalBackend, RealtimeEvent, bus, user_topic, ticket_topic,
+)
+
+POLL_BATCH = 500
+GAP_SECONDS = 600.0   # cuánto se sigue buscando un id salteado (commit tardío)
+MAX_GAPS = 2000       # ids salteados recordados por tabla
+
+# Cada fuente: tabla con id autoincremental + SELECT de filas; {cond} es
+# "> :wm" (filas nuevas) o "IN :ids" (ids salteados que se vuelven a buscar)
+SOURCES = {
+    "ticket_notifications": """
+        SELECT n.id, n.user_id, n.ticket_id, n.kind, n.message,
+               DATE_FORMAT(n.created_at, '%Y-%m-%d %H:%i') AS created_at
+        FROM ticket_notifications n
+        WHERE n.id {cond}
+        ORDER BY n.id
+        LIMIT :lim
+    """,
+    "ticket_history": """
+        SELECT th.id, th.ticket_id, st.name AS to_status, th.note,
+               t.requester_id, t.assignee_id,
+               DATE_FORMAT(th.created_at, '%Y-%m-%d %H:%i') AS created_at
+        FROM ticket_history th
+        JOIN tickets t   ON t.id = th.ticket_id
+        JOIN statuses st ON st.id = th.to_status_id
+        WHERE th.id {cond}
+        ORDER BY th.id
+        LIMIT :lim
+    """,
+    "ticket_comments": """
+        SELECT c.id, c.ticket_id, c.body,
+               CONCAT(u.names_worker, ' ', u.last_name) AS author_name,
+               DATE_FORMAT(c.created_at, '%Y-%m-%d %H:%i') AS created_at
+        FROM ticket_comments c
+        JOIN users u ON u.id = c.author_user_id
+        WHERE c.id {cond}
+        ORDER BY c.id
+        LIMIT :lim
+    """,
+}
+
+
+def notification_event(row) -> RealtimeEvent:
+    return RealtimeEvent(
+        kind="notification",
+        topics=(user_topic(row["user_id"]),),
+        data={k: row[k] for k in ("id", "ticket_id", "kind", "message", "created_at")},
+        source_id=f"ticket_notifications:{row['id']}",
+    )
+
+
+def status_event(row) -> RealtimeEvent:
+    topics = [ticket_topic(row["ticket_id"])]
+    topics += [user_topic(u) for u in (row["requester_id"], row["assignee_id"]) if u]
+    return RealtimeEvent(
+        kind="status",
+        topics=tuple(topics),
+        data={k: row[k] for k in ("ticket_id", "to_status", "note", "created_at")},
+        source_id=f"ticket_history:{row['id']}",
+    )
+
+
+def comment_event(row) -> RealtimeEvent:
+    return RealtimeEvent(
+        kind="comment",
+        topics=(ticket_topic(row["ticket_id"]),),
+        data={k: row[k] for k in ("id", "ticket_id", "author_name", "body", "created_at")},
+        source_id=f"ticket_comments:{row['id']}",
+    )
+
+
+BUILDERS = {
+    "ticket_notifications": notification_event,
+    "ticket_history": status_event,
+    "ticket_comments": comment_event,
+}
+
+
+class IdGaps:
+    """
+    Ids por debajo del watermark que todavía no se vieron. El id se asigna
+    en el INSERT pero la fila aparece recién con el COMMIT: una transacción
+    larga (crear un ticket mientras se copian los adjuntos) confirma el id
+    41 cuando el poller ya leyó el 42 y movió el watermark. Cada hueco se
+    vuelve a consultar durante `ttl` segundos; después se da por perdido
+    (rollback o salto del autoincremento). El bus descarta repetidos por
+    source_id.
+    """
+
+    def __init__(self, ttl: float = GAP_SECONDS, max_ids: int = MAX_GAPS, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_ids = max_ids
+        self.clock = clock
+        self._ids: OrderedDict[int, float] = OrderedDict()
+
+    def advance(self, previous: int, ids: list[int]):
+        """Registra los huecos entre el watermark anterior y los ids recién leídos."""
+        now = self.clock()
+        for current in ids:
+            for missing in range(max(previous + 1, current - self.max_ids), current):
+                self._ids[missing] = now
+            previous = max(previous, current)
+        while len(self._ids) > self.max_ids:
+            self._ids.popitem(last=False)
+
+    def pending(self) -> list[int]:
+        cutoff = self.clock() - self.ttl
+        while self._ids and next(iter(self._ids.values())) < cutoff:
+            self._ids.popitem(last=False)
+        return list(self._ids)
+
+    def found(self, ids):
+        for i in ids:
+            self._ids.pop(i, None)
+
+
+class DBWatermarkBackend:
+    """
+    Backend entre workers sin infraestructura extra: un hilo por proceso
+    consulta las filas con id mayor a la última vista (watermark) en
+    notificaciones, historial y comentarios, y las publica en el bus local.
+    Los ids salteados que se confirman tarde se recuperan con IdGaps.
+
+    Solo consulta mientras haya conexiones SSE abiertas en este proceso;
+    sin ninguna olvida el watermark, así al volver a consultar arranca de
+    nuevo desde MAX(id) y no reenvía como nuevo lo ocurrido mientras tanto.
+    Lo publicado localmente se entrega al instante; el poller trae lo que
+    escribieron otros workers (o la app de escritorio).
+    """
+
+    def __init__(self, app, event_bus: EventBus = bus, interval: float = 2.0):
+        self.app = app
+        self.bus = event_bus
+        self.interval = interval
+        self._watermarks: dict[str, int] | None = None
+        self._gaps = {table: IdGaps() for table in SOURCES}
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def publish(self, event: RealtimeEvent):
+        # La fila ya está en la BD: los demás workers la verán al consultar
+        self.bus.publish(event)
+
+    def ensure_running(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="realtime-db-poller", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._tick()
+            time.sleep(self.interval)
+
+    def _tick(self):
+        if not self.bus.subscriber_count():
+            self.reset()
+            return
+        try:
+            with self.app.app_context():
+                self.poll_once()
+        except Exception as e:
+            self.app.logger.warning(f"[Realtime] Error consultando cambios: {e}")
+
+    def reset(self):
+        """El próximo poll vuelve a tomar el watermark desde MAX(id)."""
+        if self._watermarks is not None:
+            self._watermarks = None
+            self._gaps = {table: IdGaps() for table in SOURCES}
+
+    def poll_once(self) -> int:
+        """Publica las filas nuevas desde el último watermark. Devuelve cuántas."""
+        try:
+            if self._watermarks is None:
+                # Arrancamos desde "ahora": no se reenvía el histórico
+                self._watermarks = {
+                    table: db.session.execute(
+                        text(f"SELECT COALESCE(MAX(id), 0) FROM {table}")
+                    ).scalar() or 0
+                    for table in SOURCES
+                }
+                return 0
+
+            published = 0
+            for table, sql in SOURCES.items():
+                gaps = self._gaps[table]
+                late = []
+                pending = gaps.pending()
+                if pending:
+                    late = db.session.execute(
+                        text(sql.format(cond="IN :ids")).bindparams(bindparam("ids", expanding=True)),
+                        {"ids": pending, "lim": POLL_BATCH},
+                    ).mappings().all()
+                    gaps.found(row["id"] for row in late)
+                rows = db.session.execute(
+                    text(sql.format(cond="> :wm")), {"wm": self._watermarks[table], "lim": POLL_BATCH}
+                ).mappings().all()
+                for row in [*late, *rows]:
+                    if table == "ticket_notifications":
+                        # Escrita por otro worker: la caché local quedó vieja
+                        unread_cache.invalidate(row["user_id"])
+                    self.bus.publish(BUILDERS[table](row))
+                    published += 1
+                if rows:
+                    gaps.advance(self._watermarks[table], [row["id"] for row in rows])
+                    self._watermarks[table] = rows[-1]["id"]
+            return published
+        finally:
+            db.session.remove()
+
+
+def init_realtime(app):
+    """Registra el backend según REALTIME_BACKEND (db | local)."""
+    kind = (app.config.get("REALTIME_BACKEND") or "db").lower()
+    if kind == "local":
+        backend = LocalBackend()
+    else:
+        backend = DBWatermarkBackend(app, interval=app.config.get("REALTIME_POLL_SECONDS", 2.0))
+    app.extensions["realtime"] = backend
+    return backend
+
@@ -0,0 +1,219 @@
+import random
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+
+# Marcas para reconocer (y borrar) lo sembrado sin tocar datos reales
+SEED_EMAIL_DOMAIN = "seed.incidex.local"
+SEED_CODE_PREFIX = "SEED-"
+SEED_DEPT_PREFIX = "Sintético "
+SEED_BITACORA_SUFFIX = " [seed]"
+
+NOMBRES = ["Ana", "Bruno", "Camila", "Diego", "Elena", "Felipe", "Gabriela", "Hugo",
+           "Isabel", "Javier", "Karina", "Luis", "María", "Nicolás", "Olga", "Pablo",
+           "Rosa", "Sergio", "Tamara", "Víctor"]
+APELLIDOS = ["González", "Muñoz", "Rojas", "Díaz", "Pérez", "Soto", "Contreras", "Silva",
+             "Martínez", "Sepúlveda", "Morales", "Rodríguez", "López", "Fuentes", "Torres"]
+
+ASUNTOS = ["No enciende el equipo", "Sin acceso a la VPN", "Error al iniciar sesión",
+           "Impresora no responde", "Solicitud de licencia", "Correo no sincroniza",
+           "Lentitud en la aplicación", "Cambio de contraseña", "Pantalla azul",
+           "No carga el sistema interno", "Permisos de carpeta compartida"]
+DETALLES = ["Desde esta mañana el problema se repite cada vez que lo intento.",
+            "Ya reinicié el equipo y sigue igual, adjunto el mensaje de error.",
+            "Afecta a todo el equipo del área, necesitamos una solución pronto.",
+            "Ocurre de forma intermitente, sobre todo en la tarde."]
+COMENTARIOS = ["¿Puedes confirmar si sigue ocurriendo?", "Ya revisé, sigue igual.",
+               "Quedó funcionando, gracias.", "Escalo con el proveedor.",
+               "Necesito acceso remoto para revisar.", "Adjunto captura del error."]
+ACCIONES_BITACORA = [("Inicio de sesión", "Éxito"), ("Generación de reporte", "Éxito"),
+                     ("Consulta de bitácora", "Éxito"), ("Modificación de usuario", "Éxito"),
+                     ("Inicio de sesión", "Credenciales inválidas")]
+
+# Escalera normal de un ticket; el tiempo medio de cada paso es una
+# fracción del SLA de su prioridad (así ALTA avanza más rápido que BAJA).
+ESCALERA = ["ASIGNADO", "EN_PROGRESO", "RESUELTO", "CERRADO"]
+FRACCION_SLA = {"ASIGNADO": 0.05, "EN_PROGRESO": 0.15, "RESUELTO": 0.5, "CERRADO": 1.0}
+PROB_RECHAZO = 0.03
+PROB_REASIGNACION = 0.1
+# Parte de los tickets queda detenida en alguna etapa (backlog abierto),
+# si no casi todo lo antiguo terminaría CERRADO.
+PROB_ESTANCADO = 0.08
+
+# Orden de columnas de cada tabla (el mismo que usan los INSERT de seed-data)
+USER_COLUMNS = ["id", "names_worker", "last_name", "birthdate", "email", "gender",
+                "password_hash", "department_id", "is_active", "created_at", "updated_at"]
+TICKET_COLUMNS = ["id", "code", "title", "description", "requester_id", "assignee_id",
+                  "department_id", "category_id", "priority_id", "status_id",
+                  "created_at", "updated_at", "resolved_at", "closed_at"]
+HISTORY_COLUMNS = ["ticket_id", "actor_user_id", "from_status_id", "to_status_id", "note", "created_at"]
+COMMENT_COLUMNS = ["ticket_id", "author_user_id", "body", "created_at"]
+NOTIFICATION_COLUMNS = ["user_id", "ticket_id", "kind", "message", "is_read", "created_at"]
+BITACORA_COLUMNS = ["fecha", "usuario", "rol", "accion", "resultado"]
+
+
+@dataclass
+class Catalogs:
+    """Ids de catálogos existentes en la BD (statuses por nombre)."""
+    statuses: dict
+    priorities: list          # [(id, sla_hours)]
+    category_ids: list
+    department_ids: list
+    roles: dict               # nombre -> id
+
+
+@dataclass
+class Population:
+    """Usuarios sembrados agrupados por rol, para repartir tickets."""
+    requester_ids: list = field(default_factory=list)
+    admin_ids: list = field(default_factory=list)
+    analysts_by_dept: dict = field(default_factory=dict)
+    names: dict = field(default_factory=dict)      # id -> (nombre completo, rol)
+
+
+@dataclass
+class TicketBatch:
+    tickets: list = field(default_factory=list)
+    history: list = field(default_factory=list)
+    comments: list = field(default_factory=list)
+    notifications: list = field(default_factory=list)
+
+
+def _instante(rng: random.Random, now: datetime, days: int) -> datetime:
+    """Instante en los últimos `days` días, cargado a días hábiles y horario de oficina."""
+    d = now - timedelta(days=rng.randrange(days))
+    if d.weekday() >= 5 and rng.random() < 0.8:
+        d -= timedelta(days=d.weekday() - 4)
+    ts = d.replace(hour=rng.randint(8, 18), minute=rng.randrange(60), second=rng.randrange(60), microsecond=0)
+    return min(ts, now)
+
+
+def user_rows(rng: random.Random, first_id: int, count: int, catalogs: Catalogs,
+              password_hash: str, *, now: datetime):
+    """
+    Filas de users y user_roles para `count` usuarios con ids consecutivos
+    desde `first_id`. ~2% ADMIN (al menos 1), ~15% ANALYST (al menos uno
+    por departamento si alcanza) y el resto REQUESTER.
+    Devuelve (users, user_roles, Population).
+    """
+    users, roles = [], []
+    pop = Population()
+    n_admin = max(1, count // 50)
+    n_analyst = max(len(catalogs.department_ids), count * 15 // 100)
+    for i in range(count):
+        uid = first_id + i
+        nombre, apellido = rng.choice(NOMBRES), rng.choice(APELLIDOS)
+        dept = catalogs.department_ids[i % len(catalogs.department_ids)]
+        if i < n_admin:
+            rol = "ADMIN"
+            pop.admin_ids.append(uid)
+        elif i < n_admin + n_analyst:
+            rol = "ANALYST"
+            pop.analysts_by_dept.setdefault(dept, []).append(uid)
+        else:
+            rol = "REQUESTER"
+            pop.requester_ids.append(uid)
+        pop.names[uid] = (f"{nombre} {apellido}", rol)
+        creado = now - timedelta(days=rng.randrange(3 * 365))
+        users.append((
+            uid, nombre, apellido,
+            date(rng.randint(1960, 2003), rng.randint(1, 12), rng.randint(1, 28)),
+            f"{nombre.lower()}.{apellido.lower()}.{uid}@{SEED_EMAIL_DOMAIN}",
+            rng.choice(["M", "F", "X", "N/A"]),
+            password_hash, dept, 1, creado, creado,
+        ))
+        roles.append((uid, catalogs.roles[rol]))
+    if not pop.requester_ids:
+        pop.requester_ids = list(pop.names)
+    return users, roles, pop
+
+
+def ticket_batch(rng: random.Random, first_id: int, count: int, pop: Population,
+                 catalogs: Catalogs, *, now: datetime, days: int,
+                 comments_per_ticket: float = 2.0) -> TicketBatch:
+    """
+    Genera `count` tickets (ids consecutivos desde `first_id`) con un ciclo
+    de vida coherente: el historial sigue NUEVO -> ASIGNADO -> EN_PROGRESO
+    -> RESUELTO -> CERRADO (o NUEVO -> RECHAZADO) hasta donde alcance el
+    tiempo transcurrido, el estado del ticket es el último del historial y
+    resolved_at/closed_at calzan con esas filas. Igual que en la app, la
+    creación no escribe historial; las reasignaciones son filas con
+    from == to.
+    """
+    st = catalogs.statuses
+    out = TicketBatch()
+    depts = [d for d in catalogs.department_ids if pop.analysts_by_dept.get(d)] or catalogs.department_ids
+    # ALTA / MEDIA / BAJA en proporción 2:5:3 cuando están las tres de 001_init
+    pesos = [2, 5, 3] if len(catalogs.priorities) == 3 else None
+    for i in range(count):
+        tid = first_id + i
+        requester = rng.choice(pop.requester_ids)
+        dept = rng.choice(depts)
+        analysts = pop.analysts_by_dept.get(dept) or pop.admin_ids
+        pr_id, sla = rng.choices(catalogs.priorities, weights=pesos)[0]
+        sla = sla or 72
+        created = _instante(rng, now, days)
+
+        status, ts, assignee = "NUEVO", created, None
+        resolved_at = closed_at = None
+        hist = []
+        if rng.random() < PROB_RECHAZO:
+            t = ts + timedelta(hours=rng.expovariate(1 / (0.1 * sla)))
+            if t <= now:
+                hist.append((rng.choice(pop.admin_ids or analysts), "NUEVO", "RECHAZADO", "Fuera de alcance", t))
+                status, ts, closed_at = "RECHAZADO", t, t
+        else:
+            tope = rng.randrange(len(ESCALERA)) if rng.random() < PROB_ESTANCADO else len(ESCALERA)
+            for paso in ESCALERA[:tope]:
+                t = ts + timedelta(hours=rng.expovariate(1 / (FRACCION_SLA[paso] * sla)))
+                if t > now:
+                    break
+                if paso == "ASIGNADO":
+                    assignee = rng.choice(analysts)
+                    actor = rng.choice(pop.admin_ids or analysts)
+                elif paso == "CERRADO":
+                    actor = requester if rng.random() < 0.5 else rng.choice(pop.admin_ids or analysts)
+                else:
+                    actor = assignee
+                hist.append((actor, status, paso, None, t))
+                status, ts = paso, t
+                if paso == "RESUELTO":
+                    resolved_at = t
+                elif paso == "CERRADO":
+                    closed_at = t
+                if status in ("ASIGNADO", "EN_PROGRESO") and len(analysts) > 1 and rng.random() < PROB_REASIGNACION:
+                    t = ts + timedelta(minutes=rng.randint(5, 240))
+                    if t <= now:
+                        assignee = rng.choice([a for a in analysts if a != assignee])
+                        hist.append((rng.choice(pop.admin_ids or analysts), status, status, "Reasignado", t))
+                        ts = t
+
+        out.tickets.append((
+            tid, f"{SEED_CODE_PREFIX}{tid}", rng.choice(ASUNTOS), rng.choice(DETALLES),
+            requester, assignee, dept, rng.choice(catalogs.category_ids), pr_id, st[status],
+            created, ts, resolved_at, closed_at,
+        ))
+        for actor, desde, hacia, nota, t in hist:
+            out.history.append((tid, actor, st[desde], st[hacia], nota, t))
+            leido = int((now - t).days > 7 or rng.random() < 0.3)
+            if hacia == "ASIGNADO" and desde != hacia:
+                out.notifications.append((assignee, tid, "ASSIGNED", f"Se te asignó el ticket {SEED_CODE_PREFIX}{tid}", leido, t))
+            out.notifications.append((requester, tid, "status", f"Tu ticket {SEED_CODE_PREFIX}{tid} pasó a {hacia}", leido, t))
+
+        if comments_per_ticket > 0:
+            span = max((ts - created).total_seconds(), 60)
+            for _ in range(int(rng.expovariate(1 / comments_per_ticket))):
+                autor = requester if assignee is None or rng.random() < 0.5 else assignee
+                t = created + timedelta(seconds=rng.uniform(0, span))
+                out.comments.append((tid, autor, rng.choice(COMENTARIOS), t))
+    return out
+
+
+def bitacora_rows(rng: random.Random, count: int, pop: Population, *, now: datetime, days: int):
+    """Filas de bitácora de escritorio repartidas en el rango (usuario con SEED_BITACORA_SUFFIX)."""
+    actores = pop.admin_ids + [a for lst in pop.analysts_by_dept.values() for a in lst] or list(pop.names)
+    rows = []
+    for _ in range(count):
+        nombre, rol = pop.names[rng.choice(actores)]
+        accion, resultado = rng.choice(ACCIONES_BITACORA)
+        rows.append((_instante(rng, now, days), nombre + SEED_BITACORA_SUFFIX, rol, accion, resultado))
+    return rows
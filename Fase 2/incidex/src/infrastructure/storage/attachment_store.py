@@ -0,0 +1,89 @@
+import os
+import uuid
+import hashlib
+from dataclasses import dataclass
+
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class StagedBlob:
+    tmp_path: str
+    sha256: str
+    size: int
+    blob_path: str
+
+
+class AttachmentTooLarge(ValueError):
+    pass
+
+
+class AttachmentStore:
+    """
+    Almacén de adjuntos direccionado por contenido.
+
+    Cada archivo se guarda una sola vez en  <base>/ab/cd/abcd...  (sha256),
+    así dos tickets que suben el mismo archivo comparten el blob y dos
+    archivos distintos llamados igual ya no se pisan.
+
+    El flujo es en dos pasos para poder atarlo a una transacción:
+      stage()   -> copia el upload a un temporal calculando sha256 y tamaño
+                   en la misma pasada (sin volver a leer el archivo).
+      publish() -> mueve el temporal a su ruta final (o lo descarta si el
+                   blob ya existía).
+      discard() -> elimina el temporal (rollback).
+    """
+
+    def __init__(self, base_dir: str, max_bytes: int | None = None):
+        self.base_dir = base_dir
+        self.max_bytes = max_bytes
+
+    def blob_path(self, sha256: str) -> str:
+        return os.path.join(self.base_dir, sha256[:2], sha256[2:4], sha256)
+
+    def stage(self, file_storage) -> StagedBlob:
+        declared = getattr(file_storage, "content_length", None) or 0
+        if self.max_bytes and declared > self.max_bytes:
+            raise AttachmentTooLarge("El archivo supera el tamaño máximo permitido")
+
+        tmp_dir = os.path.join(self.base_dir, "tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        tmp_path = os.path.join(tmp_dir, f"{uuid.uuid4().hex}.part")
+
+        sha = hashlib.sha256()
+        size = 0
+        stream = file_storage.stream
+        try:
+            with open(tmp_path, "wb") as out:
+                for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+                    size += len(chunk)
+                    if self.max_bytes and size > self.max_bytes:
+                        raise AttachmentTooLarge("El archivo supera el tamaño máximo permitido")
+                    sha.update(chunk)
+                    out.write(chunk)
+        except Exception:
+            self.discard_path(tmp_path)
+            raise
+
+        digest = sha.hexdigest()
+        return StagedBlob(tmp_path=tmp_path, sha256=digest, size=size,
+                          blob_path=self.blob_path(digest))
+
+    def publish(self, staged: StagedBlob) -> str:
+        if os.path.exists(staged.blob_path):
+            # Mismo contenido ya almacenado: deduplicamos
+            self.discard_path(staged.tmp_path)
+        else:
+            os.makedirs(os.path.dirname(staged.blob_path), exist_ok=True)
+            os.replace(staged.tmp_path, staged.blob_path)
+        return staged.blob_path
+
+    def discard(self, staged: StagedBlob):
+        self.discard_path(staged.tmp_path)
+
+    @staticmethod
+    def discard_path(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,121 @@
+import os
+import uuid
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from PIL import Image, UnidentifiedImageError
+except ImportError:  # Pillow es opcional: sin él solo hay vistas previas de texto
+    Image = None
+    UNDECODABLE = ()
+else:
+    # El contenido no se puede decodificar: reintentar daría el mismo error.
+    # Los demás (E/S, permisos, disco lleno) pueden ser pasajeros.
+    UNDECODABLE = (UnidentifiedImageError, Image.DecompressionBombError, SyntaxError)
+
+log = logging.getLogger(__name__)
+
+THUMB_SIZE = (320, 320)
+THUMB_SUFFIX = ".thumb.jpg"
+TEXT_HEAD_BYTES = 4 * 1024
+TEXT_SUFFIX = ".head.txt"
+FAILED_SUFFIX = ".preview.failed"
+
+TEXT_MIME_TYPES = {"application/json", "application/xml", "application/x-yaml"}
+# Formatos raster que Pillow abre sin plugins extra (no SVG, HEIC, etc.)
+IMAGE_MIME_TYPES = {
+    "image/jpeg", "image/png", "image/gif", "image/webp", "image/bmp", "image/tiff",
+}
+
+# Un solo hilo: las miniaturas no deben competir con los requests por CPU
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="previews")
+
+
+def is_image(mime_type: str | None) -> bool:
+    return mime_type in IMAGE_MIME_TYPES
+
+
+def is_text(mime_type: str | None) -> bool:
+    return bool(mime_type) and (mime_type.startswith("text/") or mime_type in TEXT_MIME_TYPES)
+
+
+def preview_failed(blob_path: str) -> bool:
+    """True si ya se intentó generar la vista previa de este blob y falló."""
+    return os.path.exists(blob_path + FAILED_SUFFIX)
+
+
+def preview_path(blob_path: str, mime_type: str | None) -> str | None:
+    """
+    Ruta de la vista previa de un blob (junto al blob, mismo sha256),
+    o None si el tipo no admite vista previa.
+    """
+    if is_image(mime_type) and Image is not None:
+        return blob_path + THUMB_SUFFIX
+    if is_text(mime_type):
+        return blob_path + TEXT_SUFFIX
+    return None
+
+
+def preview_mimetype(path: str) -> str:
+    return "image/jpeg" if path.endswith(THUMB_SUFFIX) else "text/plain; charset=utf-8"
+
+
+def generate_preview(blob_path: str, mime_type: str | None) -> str | None:
+    """
+    Genera la vista previa si no existe todavía:
+      - imágenes -> miniatura JPEG de como máximo THUMB_SIZE
+      - texto    -> primeros TEXT_HEAD_BYTES del archivo
+    Se escribe a un temporal y se renombra, así nunca se sirve a medias.
+    Si el contenido no se puede decodificar (formato no reconocido, bomba
+    de descompresión) deja una marca FAILED_SUFFIX junto al blob: el blob va
+    por hash y no cambia, así que no se vuelve a intentar. Un error de E/S
+    no deja marca y se reintenta en el próximo pedido.
+    """
+    target = preview_path(blob_path, mime_type)
+    if target is None or os.path.exists(target):
+        return target
+    if preview_failed(blob_path):
+        return None
+
+    tmp = f"{target}.{uuid.uuid4().hex}.part"
+    try:
+        if target.endswith(THUMB_SUFFIX):
+            with Image.open(blob_path) as im:
+                im.draft("RGB", THUMB_SIZE)  # JPEG: decodifica ya reducido
+                im.thumbnail(THUMB_SIZE)
+                im.convert("RGB").save(tmp, "JPEG", quality=80, optimize=True)
+        else:
+            with open(blob_path, "rb") as fh:
+                head = fh.read(TEXT_HEAD_BYTES)
+            with open(tmp, "w", encoding="utf-8") as out:
+                out.write(head.decode("utf-8", errors="replace"))
+        os.replace(tmp, target)
+    except Exception as e:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        if isinstance(e, UNDECODABLE):
+            try:
+                open(blob_path + FAILED_SUFFIX, "w").close()
+            except OSError:
+                pass
+        raise
+    return target
+
+
+def _generate_safe(blob_path: str, mime_type: str | None):
+    try:
+        generate_preview(blob_path, mime_type)
+    except Exception:
+        log.exception("No se pudo generar la vista previa de %s", blob_path)
+
+
+def schedule_preview(blob_path: str, mime_type: str | None):
+    """
+    Encola la generación en segundo plano. Devuelve el Future
+    (o None si el tipo no tiene vista previa o ya falló antes).
+    """
+    if preview_path(blob_path, mime_type) is None or preview_failed(blob_path):
+        return None
+    return _executor.submit(_generate_safe, blob_path, mime_type)
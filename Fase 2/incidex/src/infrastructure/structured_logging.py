@@ -0,0 +1,166 @@
+import sys
+import json
+import queue
+import atexit
+import logging
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from flask import g, has_request_context, request
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Atributos propios de LogRecord: lo demás que llegue por `extra=` se emite
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Una línea JSON por registro: ts, level, logger, msg, correlación del
+    request (request_id, user_id, method, path), campos de `extra=` y la
+    traza si hubo excepción.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        msg = record.getMessage()
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": msg,
+        }
+        for key in ("request_id", "user_id", "method", "path"):
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and key not in entry and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class RequestContextFilter(logging.Filter):
+    """
+    Agrega request_id / user_id / method / path al registro. Corre en el
+    hilo que loguea (antes de encolar), donde todavía existe el request.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if has_request_context():
+            record.request_id = g.get("request_id")
+            record.method = request.method
+            record.path = request.path
+            # Solo si flask-login ya cargó al usuario (no dispara una consulta)
+            user = g.get("_login_user")
+            if user is not None and getattr(user, "is_authenticated", False):
+                record.user_id = user.get_id()
+        return True
+
+
+class _RecordQueueHandler(QueueHandler):
+    """
+    QueueHandler que deja el mensaje resuelto y la traza como texto, pero
+    sin formatear el registro completo (eso lo hace el formateador del
+    listener, en su hilo).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def parse_levels(spec: str | None) -> dict[str, str]:
+    """'incidex.sql=WARNING, werkzeug=ERROR' -> {'incidex.sql': 'WARNING', 'werkzeug': 'ERROR'}."""
+    levels = {}
+    for part in (spec or "").split(","):
+        name, sep, level = part.partition("=")
+        if sep and name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+_listener: QueueListener | None = None
+_queue_handler: QueueHandler | None = None
+
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()   # vacía la cola antes de salir
+        _listener = None
+
+
+def configure_logging(*, level: str = "INFO", levels: dict | None = None,
+                      fmt: str = "json", stream=None) -> QueueListener:
+    """
+    Configura el logger raíz: los registros se encolan en el hilo que
+    loguea y un QueueListener hace la escritura (stdout) en su propio hilo.
+    Se puede llamar de nuevo (cada create_app); reemplaza la configuración.
+    """
+    global _listener, _queue_handler
+    _stop_listener()
+    root = logging.getLogger()
+    if _queue_handler is not None:
+        root.removeHandler(_queue_handler)
+
+    out = logging.StreamHandler(stream or sys.stdout)
+    out.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(
+        "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s", defaults={"request_id": "-"},
+    ))
+
+    q: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler = _RecordQueueHandler(q)
+    _queue_handler.addFilter(RequestContextFilter())
+    root.addHandler(_queue_handler)
+    root.setLevel(level.upper())
+    for name, lvl in (levels or {}).items():
+        logging.getLogger(name).setLevel(lvl)
+
+    _listener = QueueListener(q, out, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+atexit.register(_stop_listener)
+
+
+def init_logging(app):
+    """
+    Logging estructurado para la app web:
+      - LOG_LEVEL (raíz), LOG_LEVELS ('modulo=NIVEL,...'), LOG_FORMAT (json | text),
+      - request_id por request (cabecera X-Request-ID entrante o uno nuevo),
+        devuelto en la respuesta para correlacionar con el proxy.
+    """
+    from flask.logging import default_handler
+
+    app.config.setdefault("LOG_LEVEL", "INFO")
+    app.config.setdefault("LOG_LEVELS", "")
+    app.config.setdefault("LOG_FORMAT", "json")
+    configure_logging(
+        level=app.config["LOG_LEVEL"],
+        levels=parse_levels(app.config["LOG_LEVELS"]),
+        fmt=app.config["LOG_FORMAT"],
+    )
+    # app.logger propaga al raíz; sin esto Flask escribe además por stderr
+    app.logger.removeHandler(default_handler)
+
+    @app.before_request
+    def _assign_request_id():
+        incoming = (request.headers.get(REQUEST_ID_HEADER) or "").strip()
+        g.request_id = incoming[:64] if incoming else uuid.uuid4().hex[:16]
+
+    @app.after_request
+    def _echo_request_id(response):
+        rid = g.get("request_id")
+        if rid:
+            response.headers[REQUEST_ID_HEADER] = rid
+        return response
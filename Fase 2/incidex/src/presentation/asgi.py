@@ -0,0 +1,308 @@
+"""
+Entrada ASGI de la app web:
+
+    uvicorn src.presentation.asgi:create_asgi_app --factory --workers 2
+
+Las rutas que casi solo esperan a un servicio externo se atienden como
+corrutinas en el event loop del worker, así un proceso tiene muchas en
+vuelo sin ocupar un hilo por cada una. El resto sigue siendo la app Flask
+(WSGI), que corre en un pool de hilos propio (WSGI_THREADS, 32 por
+defecto, ver PooledWsgi): el WsgiToAsgi de asgiref, sin un
+ThreadSensitiveContext por request, pondría todos los requests de Flask
+del worker en un único hilo.
+El canal SSE (/app/events/stream) tiene su propio pool, dimensionado por
+SSE_MAX_STREAMS, para que los streams abiertos no dejen sin hilos al resto.
+
+    POST /app/ai/suggest   Gemini con el cliente asíncrono
+
+La parte con BD (sesión, catálogos) corre en un hilo y se libera antes de
+esperar al modelo. Si la ruta asíncrona no puede atender el request (sin
+sesión, CSRF inválido, sin título ni descripción...) lo pasa tal cual a
+Flask, que responde como siempre (redirect al login, 400, skipped...).
+El límite de uso (rate_limit.py) se cobra en los mismos baldes que la
+vista Flask y, si se pasa, responde el mismo 429.
+"""
+import io
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import g, request
+from flask_login import current_user
+from werkzeug.middleware.proxy_fix import ProxyFix
+from werkzeug.test import EnvironBuilder
+
+from src.infrastructure import metrics
+from src.infrastructure.structured_logging import REQUEST_ID_HEADER
+
+log = logging.getLogger(__name__)
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+def _replay(body: bytes):
+    """`receive` que entrega de nuevo el cuerpo ya leído (para pasarle el request a Flask)."""
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return {"type": "http.disconnect"}
+    return receive
+
+
+def wsgi_environ(scope, body: bytes) -> dict:
+    """Environ WSGI equivalente al scope ASGI (para abrir un request context de Flask)."""
+    headers = [(k.decode("latin1"), v.decode("latin1")) for k, v in scope.get("headers", [])]
+    host = next((v for k, v in headers if k.lower() == "host"), "localhost")
+    client = scope.get("client") or ("127.0.0.1", 0)
+    return EnvironBuilder(
+        path=scope["path"],
+        base_url=f"{scope.get('scheme', 'http')}://{host}{scope.get('root_path', '')}",
+        query_string=scope.get("query_string", b"").decode("latin1"),
+        method=scope["method"],
+        headers=headers,
+        data=body,
+        environ_overrides={"REMOTE_ADDR": client[0]},
+    ).get_environ()
+
+
+def behind_proxy(app, environ: dict) -> dict:
+    """Aplica al environ el ProxyFix de create_app (el que ve Flask en el resto de las rutas)."""
+    fix = app.wsgi_app
+    if isinstance(fix, ProxyFix):
+        ProxyFix(lambda env, start: None, x_for=fix.x_for, x_proto=fix.x_proto,
+                 x_host=fix.x_host, x_port=fix.x_port, x_prefix=fix.x_prefix)(environ, None)
+    return environ
+
+
+# Rutas de Flask que retienen su hilo por minutos (van a un pool aparte)
+STREAM_PATHS = frozenset({"/app/events/stream"})
+STREAM_HEADROOM = 4   # hilos extra para responder "ocupado" con el cupo lleno
+
+def _wsgi_environ(scope, body: bytes) -> dict:
+    """Environ WSGI (PEP 3333) del scope ASGI, tal cual llegó de uvicorn."""
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin1"),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    server = scope.get("server") or ("localhost", 80)
+    environ["SERVER_NAME"], environ["SERVER_PORT"] = server[0], str(server[1] or 0)
+    if scope.get("client"):
+        environ["REMOTE_ADDR"], environ["REMOTE_PORT"] = scope["client"][0], str(scope["client"][1])
+    for name, value in scope.get("headers", []):
+        name = name.decode("latin1")
+        key = {"content-length": "CONTENT_LENGTH", "content-type": "CONTENT_TYPE"}.get(
+            name, "HTTP_" + name.upper().replace("-", "_"))
+        value = value.decode("latin1")
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def _run_wsgi(wsgi_application, environ: dict, send) -> None:
+    """
+    En un hilo del pool: llama a la app WSGI y manda la respuesta con
+    `send(mensaje)`, que bloquea hasta que el event loop la entrega. Cada
+    pedazo del iterable sale apenas se genera (los streams SSE no se juntan).
+    """
+    started = []
+
+    def start_response(status, headers, exc_info=None):
+        if exc_info and started:
+            raise exc_info[1].with_traceback(exc_info[2])
+        started[:] = [{
+            "type": "http.response.start",
+            "status": int(status.split(" ", 1)[0]),
+            "headers": [(k.lower().encode("latin1"), v.encode("latin1")) for k, v in headers],
+        }]
+
+    def body_start():
+        if started and started[0] is not None:
+            send(started[0])
+            started[0] = None
+
+    result = wsgi_application(environ, start_response)
+    try:
+        for chunk in result:
+            if chunk:
+                body_start()
+                send({"type": "http.response.body", "body": chunk, "more_body": True})
+        body_start()
+        send({"type": "http.response.body", "body": b"", "more_body": False})
+    finally:
+        if hasattr(result, "close"):
+            result.close()
+
+
+class PooledWsgi:
+    """Adaptador WSGI -> ASGI: cada request de `wsgi_application` corre en un hilo de `executor`."""
+
+    def __init__(self, wsgi_application, executor: ThreadPoolExecutor):
+        self.wsgi_application = wsgi_application
+        self.executor = executor
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            raise ValueError(f"PooledWsgi solo atiende requests http, no {scope['type']!r}")
+        environ = _wsgi_environ(scope, await _read_body(receive))
+        loop = asyncio.get_running_loop()
+
+        def send_from_thread(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        await loop.run_in_executor(self.executor, _run_wsgi, self.wsgi_application, environ, send_from_thread)
+
+
+class AsyncRoutes:
+    """
+    App ASGI: las rutas de `routes` ({(método, path): handler}) se atienden
+    con `await handler(flask_app, scope, body)`, que devuelve
+    (status, dict, headers) o None para delegar en Flask.
+
+    Flask corre en un pool de `threads` hilos; las rutas de STREAM_PATHS en
+    otro de SSE_MAX_STREAMS + STREAM_HEADROOM.
+    """
+
+    def __init__(self, flask_app, routes: dict, threads: int = 32):
+        self.flask_app = flask_app
+        self.routes = routes
+        self.wsgi = PooledWsgi(flask_app, ThreadPoolExecutor(max(1, threads), thread_name_prefix="wsgi"))
+        streams = int(flask_app.config.get("SSE_MAX_STREAMS", 16)) + STREAM_HEADROOM
+        self.streams = PooledWsgi(flask_app, ThreadPoolExecutor(streams, thread_name_prefix="sse"))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            handler = self.routes.get((scope["method"], scope["path"]))
+            if handler is not None:
+                body = await _read_body(receive)
+                response = await handler(self.flask_app, scope, body)
+                if response is not None:
+                    await self._send_json(send, *response)
+                    return
+                receive = _replay(body)
+            if scope["path"] in STREAM_PATHS:
+                await self.streams(scope, receive, send)
+                return
+        elif scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        await self.wsgi(scope, receive, send)
+
+    @staticmethod
+    async def _lifespan(receive, send):
+        # Sin nada que arrancar: solo confirmar a uvicorn el inicio y el cierre
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    @staticmethod
+    async def _send_json(send, status: int, payload: dict, headers: dict):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        raw = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        raw += [(k.lower().encode("latin1"), str(v).encode("latin1")) for k, v in headers.items()]
+        await send({"type": "http.response.start", "status": status, "headers": raw})
+        await send({"type": "http.response.body", "body": body})
+
+
+# ==== POST /app/ai/suggest ====
+
+def _prepare_suggest(app, environ) -> tuple | None:
+    """
+    En un hilo: sesión, CSRF, límite de uso y catálogos. Devuelve
+    (kwargs, headers) para llamar al modelo, (429, payload, headers) si se
+    pasó del límite, o None para que lo atienda Flask.
+    """
+    from src.infrastructure.persistence.repositories.ticket_repository import TicketRepository
+    from src.infrastructure.rate_limit import limited_response, rate_limiter
+    from src.presentation.web.blueprints.tickets.routes import AI_SUGGEST_LIMITS
+
+    with app.request_context(environ):
+        incoming = (request.headers.get(REQUEST_ID_HEADER) or "").strip()
+        g.request_id = incoming[:64] if incoming else uuid.uuid4().hex[:16]
+
+        csrf = app.extensions.get("csrf")
+        if csrf is not None and app.config.get("WTF_CSRF_ENABLED", True):
+            try:
+                csrf.protect()
+            except Exception:
+                return None
+        if not current_user.is_authenticated:
+            return None
+        wait = rate_limiter.check("tickets.ai_suggest", **AI_SUGGEST_LIMITS)
+        if wait > 0:
+            payload, headers = limited_response(wait)
+            return 429, payload, {REQUEST_ID_HEADER: g.request_id, **headers}
+
+        data = request.get_json(silent=True) or {}
+        title = (data.get("title") or "").strip()
+        description = (data.get("description") or "").strip()
+        if not title and not description:
+            return None
+
+        repo = TicketRepository()
+        kwargs = {
+            "title": title,
+            "description": description,
+            "categories": [dict(r) for r in repo.get_categories()],
+            "priorities": [dict(r) for r in repo.get_priorities()],
+            "departments": [dict(r) for r in repo.get_departments()],
+        }
+        return kwargs, {REQUEST_ID_HEADER: g.request_id}
+
+
+async def ai_suggest(app, scope, body):
+    from src.infrastructure.ai.gemini_client import suggest_ticket_metadata_async
+
+    t0 = time.perf_counter()
+    prepared = await asyncio.to_thread(_prepare_suggest, app, behind_proxy(app, wsgi_environ(scope, body)))
+    if prepared is None:
+        return None
+    if len(prepared) == 3:
+        metrics.HTTP_REQUESTS.inc(endpoint="tickets.ai_suggest", method="POST", status=429)
+        return prepared
+    kwargs, headers = prepared
+    # Igual que la vista Flask: nunca 4xx/5xx, el front ignora lo que no sirva
+    suggestion = await suggest_ticket_metadata_async(**kwargs) or {}
+
+    metrics.HTTP_LATENCY.observe(time.perf_counter() - t0, endpoint="tickets.ai_suggest", method="POST")
+    metrics.HTTP_REQUESTS.inc(endpoint="tickets.ai_suggest", method="POST", status=200)
+    return 200, suggestion, headers
+
+
+ASYNC_ROUTES = {
+    ("POST", "/app/ai/suggest"): ai_suggest,
+}
+
+
+def create_asgi_app():
+    from src.presentation.web import create_app
+
+    return AsyncRoutes(create_app(), ASYNC_ROUTES, threads=int(os.getenv("WSGI_THREADS", "32")))
@@ -1,4 +1,14 @@
 import sys
+
+# Primero: fija T0 para el reporte de tiempos de arranque
+from core.arranque import tiempos
+from core.registro import configurar_registro
+
+# Antes de importar las vistas: así el listener se detiene (atexit) después
+# del vaciado final de la bitácora y sus registros no se pierden
+configurar_registro()
+
+from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import QApplication
 from views.login_dialog import LoginDialog
 
@@ -16,6 +26,8 @@ def main():
     # Cargar la ventana de login
     window = LoginDialog()
     window.show()
+    # Se ejecuta en la primera vuelta del event loop, con la ventana ya pintada
+    QTimer.singleShot(0, lambda: tiempos.hito("ventana_login"))
 
     sys.exit(app.exec())
 
@@ -0,0 +1,102 @@
+# core/analitica.py
+# -*- coding: utf-8 -*-
+"""
+Indicadores sobre ticket_history calculados en bloque con NumPy.
+
+DBManager.cargar_historial_columnar() entrega dos arreglos int64:
+  historial: [id, ticket_id, actor_id, desde_estado, hacia_estado, ts]
+  tickets:   [ticket_id, estado_id, creado_ts]
+y estas funciones trabajan sobre columnas completas (ordenar, comparar
+vecinos, bincount), sin recorrer fila por fila.
+"""
+import numpy as np
+
+H_ID, H_TICKET, H_ACTOR, H_DESDE, H_HACIA, H_TS = range(6)
+T_ID, T_ESTADO, T_CREADO = range(3)
+
+
+def tiempo_en_estado(historial, tickets, ahora: int, estados_fin=()):
+    """
+    Segundos por (ticket, estado). Devuelve (ticket_ids, estado_ids, segundos).
+    El primer tramo va de la creación del ticket al primer cambio; el último
+    llega hasta `ahora`, salvo que el ticket esté en un estado de `estados_fin`.
+    Las filas desde == hacia son reasignaciones y no cambian el estado.
+    """
+    cambios = historial[historial[:, H_DESDE] != historial[:, H_HACIA]]
+    cambios = cambios[np.isin(cambios[:, H_TICKET], tickets[:, T_ID])]
+    cambios = cambios[np.lexsort((cambios[:, H_ID], cambios[:, H_TS], cambios[:, H_TICKET]))]
+
+    # Estado inicial = desde_estado del primer cambio de cada ticket
+    inicial = tickets[:, T_ESTADO].copy()
+    primeros = np.ones(len(cambios), dtype=bool)
+    primeros[1:] = cambios[1:, H_TICKET] != cambios[:-1, H_TICKET]
+    primeros &= cambios[:, H_DESDE] > 0
+    orden_t = np.argsort(tickets[:, T_ID])
+    pos = np.searchsorted(tickets[:, T_ID], cambios[primeros, H_TICKET], sorter=orden_t)
+    inicial[orden_t[pos]] = cambios[primeros, H_DESDE]
+
+    ticket = np.concatenate([tickets[:, T_ID], cambios[:, H_TICKET]])
+    ts = np.concatenate([tickets[:, T_CREADO], cambios[:, H_TS]])
+    estado = np.concatenate([inicial, cambios[:, H_HACIA]])
+    sec = np.concatenate([np.full(len(tickets), -1, dtype=np.int64), cambios[:, H_ID]])
+
+    orden = np.lexsort((sec, ts, ticket))
+    ticket, ts, estado = ticket[orden], ts[orden], estado[orden]
+
+    mismo = ticket[1:] == ticket[:-1]
+    fin = np.full(len(ts), ahora, dtype=np.int64)
+    fin[:-1] = np.where(mismo, ts[1:], ahora)
+    ultimo = np.ones(len(ts), dtype=bool)
+    ultimo[:-1] = ~mismo
+    fin = np.where(ultimo & np.isin(estado, list(estados_fin)), ts, fin)
+    return ticket, estado, np.clip(fin - ts, 0, None)
+
+
+def resumen_por_estado(ticket, estado, segundos):
+    """
+    Por estado: tickets que pasaron por él, promedio, p50 y p90 en horas.
+    Devuelve lista de dicts ordenada por estado_id.
+    """
+    if len(ticket) == 0:
+        return []
+    # Sumar tramos repetidos del mismo (ticket, estado) antes de resumir
+    claves, inverso = np.unique(np.stack([ticket, estado], axis=1), axis=0, return_inverse=True)
+    total = np.bincount(inverso.ravel(), weights=segundos)
+    estados_clave = claves[:, 1]
+    horas = total / 3600.0
+
+    resumen = []
+    for est in np.unique(estados_clave):   # un paso por estado (pocos), no por fila
+        h = horas[estados_clave == est]
+        resumen.append({
+            "estado_id": int(est),
+            "tickets": int(len(h)),
+            "promedio_horas": round(float(h.mean()), 1),
+            "p50_horas": round(float(np.percentile(h, 50)), 1),
+            "p90_horas": round(float(np.percentile(h, 90)), 1),
+        })
+    return resumen
+
+
+def matriz_transiciones(historial, estado_ids):
+    """Matriz [desde, hacia] de cambios de estado, en el orden de `estado_ids` ordenados."""
+    ids = np.asarray(sorted(estado_ids), dtype=np.int64)
+    n = len(ids)
+    desde, hacia = historial[:, H_DESDE], historial[:, H_HACIA]
+    m = (desde != hacia) & np.isin(desde, ids) & np.isin(hacia, ids)
+    idx = np.searchsorted(ids, desde[m]) * n + np.searchsorted(ids, hacia[m])
+    return ids, np.bincount(idx, minlength=n * n).reshape(n, n)
+
+
+def productividad(historial, estados_cierre):
+    """Cambios a un estado de cierre por actor. Devuelve (actor_ids, cantidades)."""
+    m = (historial[:, H_DESDE] != historial[:, H_HACIA]) & np.isin(historial[:, H_HACIA], list(estados_cierre))
+    actores, cantidades = np.unique(historial[m, H_ACTOR], return_counts=True)
+    orden = np.argsort(-cantidades, kind="stable")
+    return actores[orden], cantidades[orden]
+
+
+def reasignaciones(historial):
+    """Reasignaciones por ticket (desde == hacia). Devuelve (ticket_ids, cantidades)."""
+    m = historial[:, H_DESDE] == historial[:, H_HACIA]
+    return np.unique(historial[m, H_TICKET], return_counts=True)
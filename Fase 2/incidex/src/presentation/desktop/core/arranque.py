@@ -0,0 +1,54 @@
+# core/arranque.py
+# -*- coding: utf-8 -*-
+"""
+Tiempos de arranque de la app de escritorio.
+
+T0 se toma al importar este módulo (app.py lo importa primero). Se
+registran hitos (login visible, ventana principal visible) y el tiempo
+de construcción de cada página; el resumen sale por el logger
+`incidex.desktop.arranque` (hitos_ms y paginas_ms como campos del registro).
+"""
+
+import time
+import logging
+
+log = logging.getLogger("incidex.desktop.arranque")
+
+T0 = time.perf_counter()
+
+
+class TiemposArranque:
+    def __init__(self, t0: float = T0):
+        self.t0 = t0
+        self.hitos: dict[str, float] = {}
+        self.paginas: dict[str, float] = {}
+        self._inicios: dict[str, float] = {}
+
+    def desde_inicio_ms(self) -> float:
+        return round((time.perf_counter() - self.t0) * 1000, 1)
+
+    def iniciar(self, nombre: str):
+        """Marca el comienzo de un tramo (p. ej. login aceptado -> ventana principal)."""
+        self._inicios[nombre] = time.perf_counter()
+
+    def hito(self, nombre: str, *, desde: str | None = None) -> float:
+        """Registra `nombre` en ms desde T0 (y la duración del tramo `desde`, si se inició)."""
+        self.hitos[nombre] = self.desde_inicio_ms()
+        if desde and desde in self._inicios:
+            self.hitos[f"{desde}->{nombre}"] = round(
+                (time.perf_counter() - self._inicios.pop(desde)) * 1000, 1
+            )
+        return self.hitos[nombre]
+
+    def pagina(self, nombre: str, ms: float):
+        self.paginas[nombre] = round(ms, 1)
+        log.info("Página %s construida en %.1f ms", nombre, ms)
+
+    def reporte(self) -> dict:
+        return {"hitos_ms": dict(self.hitos), "paginas_ms": dict(self.paginas)}
+
+    def registrar(self):
+        log.info("arranque_escritorio", extra=self.reporte())
+
+
+tiempos = TiemposArranque()
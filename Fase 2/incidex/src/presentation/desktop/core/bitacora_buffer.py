@@ -0,0 +1,171 @@
+# core/bitacora_buffer.py
+# -*- coding: utf-8 -*-
+"""
+Escritura diferida de la bitácora.
+
+Antes cada acción abría una conexión y hacía su propio commit. Ahora
+insertar_bitacora solo encola y un hilo en segundo plano vacía la cola
+en lotes (un executemany + un commit) cada FLUSH_INTERVAL segundos o al
+llegar a MAX_BATCH registros. Cada acción se escribe también como evento
+tipado en audit_events (el mismo flujo de auditoría que usa la web).
+La ventana principal fuerza el vaciado en closeEvent y, por si acaso,
+también se vacía al salir del proceso.
+
+Si un lote falla vuelve a la cola; tras MAX_REINTENTOS fallos seguidos se
+escribe registro por registro y el que falla por sí mismo se descarta (se
+loguea entero), como antes del buffer, en vez de trabar a los siguientes.
+Sin conexión se conserva todo, pero la cola no pasa de MAX_PENDIENTES.
+"""
+import json
+import atexit
+import logging
+import threading
+from datetime import datetime
+
+from pymysql.err import InterfaceError, OperationalError
+
+from core.database import get_connection
+
+log = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 5.0     # segundos
+MAX_BATCH = 200          # registros por lote antes de vaciar sin esperar
+MAX_REINTENTOS = 3       # fallos seguidos antes de escribir uno por uno
+MAX_PENDIENTES = 20_000  # tope de la cola; se descartan los más viejos
+
+SQL_BITACORA = """
+    INSERT INTO bitacora (fecha, usuario, rol, accion, resultado)
+    VALUES (%s, %s, %s, %s, %s);
+"""
+SQL_AUDIT = """
+    INSERT INTO audit_events
+        (ts, source, actor_id, actor_name, entity, entity_id, action, payload)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s);
+"""
+
+
+class BitacoraBuffer:
+    def __init__(self, flush_interval: float = FLUSH_INTERVAL, max_batch: int = MAX_BATCH):
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._pendientes = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._despertar = threading.Event()
+        self._hilo = None
+        self._fallos = 0
+        self.max_pendientes = MAX_PENDIENTES
+        self.descartados = 0
+
+    def agregar(self, usuario, rol, accion, resultado, *, actor_id=None,
+                entidad="bitacora", entidad_id=None, evento="legacy", datos=None):
+        # La fecha se toma al encolar, no al escribir el lote
+        ahora = datetime.now()
+        payload = {"rol": rol, "accion": accion, "resultado": resultado}
+        payload.update(datos or {})
+        registro = (
+            (ahora, usuario, rol, accion, resultado),
+            (ahora, "desktop", actor_id, usuario, entidad, entidad_id, evento,
+             json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=str)),
+        )
+        with self._lock:
+            self._pendientes.append(registro)
+            self._recortar()
+            lleno = len(self._pendientes) >= self.max_batch
+        self._asegurar_hilo()
+        if lleno:
+            self._despertar.set()
+
+    def pendientes(self) -> int:
+        with self._lock:
+            return len(self._pendientes)
+
+    def flush(self) -> bool:
+        """Escribe todo lo pendiente en una sola transacción."""
+        with self._flush_lock:
+            with self._lock:
+                lote, self._pendientes = self._pendientes, []
+            if not lote:
+                return True
+
+            conn = get_connection()
+            if not conn:
+                self._devolver(lote)
+                log.error("No se pudo conectar a la base de datos (bitácora).")
+                return False
+            try:
+                try:
+                    self._insertar(conn, lote)
+                    self._fallos = 0
+                    log.info("%s acciones registradas en bitácora.", len(lote))
+                    return True
+                except Exception as e:
+                    self._fallos += 1
+                    log.error("Error al insertar en bitácora (intento %s): %s", self._fallos, e)
+                    if self._fallos < MAX_REINTENTOS:
+                        self._devolver(lote)
+                        return False
+                self._fallos = 0
+                return self._insertar_uno_por_uno(conn, lote)
+            finally:
+                conn.close()
+
+    @staticmethod
+    def _insertar(conn, lote):
+        try:
+            with conn.cursor() as cursor:
+                cursor.executemany(SQL_BITACORA, [b for b, _ in lote])
+                # placeholders puros: PyMySQL lo envía como un solo INSERT multi-fila
+                cursor.executemany(SQL_AUDIT, [a for _, a in lote])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    def _insertar_uno_por_uno(self, conn, lote) -> bool:
+        """Aísla el registro que falla; si se cae la conexión, el resto vuelve a la cola."""
+        for i, registro in enumerate(lote):
+            try:
+                self._insertar(conn, [registro])
+            except (OperationalError, InterfaceError) as e:
+                self._devolver(lote[i:])
+                log.error("Error al insertar en bitácora: %s", e)
+                return False
+            except Exception as e:
+                self.descartados += 1
+                log.error("Registro de bitácora descartado (%s): %r", e, registro[0])
+        return True
+
+    def _devolver(self, lote):
+        # Si falla la escritura, el lote vuelve al frente para el próximo intento
+        with self._lock:
+            self._pendientes[:0] = lote
+            self._recortar()
+
+    def _recortar(self):
+        # Con _lock tomado: si la cola pasa del tope se pierden los más viejos
+        sobra = len(self._pendientes) - self.max_pendientes
+        if sobra > 0:
+            del self._pendientes[:sobra]
+            self.descartados += sobra
+            log.error("Cola de bitácora llena: %s registros descartados", sobra)
+
+    def _asegurar_hilo(self):
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+        with self._lock:
+            if self._hilo is None or not self._hilo.is_alive():
+                self._hilo = threading.Thread(
+                    target=self._loop, name="bitacora-flush", daemon=True
+                )
+                self._hilo.start()
+
+    def _loop(self):
+        while True:
+            self._despertar.wait(self.flush_interval)
+            self._despertar.clear()
+            self.flush()
+
+
+bitacora_buffer = BitacoraBuffer()
+atexit.register(bitacora_buffer.flush)
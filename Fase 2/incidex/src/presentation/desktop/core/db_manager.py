@@ -1,14 +1,23 @@
 # core/db_manager.py
 # -*- coding: utf-8 -*-
+import logging
 import pymysql
 import bcrypt
-from core.database import get_connection
+from core.database import get_connection, get_read_connection
+from core.bitacora_buffer import bitacora_buffer
+from core import analitica
+import numpy as np
 from datetime import datetime
 import bcrypt
 import imaplib
 import email
 from email.header import decode_header
 from werkzeug.security import generate_password_hash, check_password_hash
+from core.registro import asignar_sesion
+
+log = logging.getLogger(__name__)
+
+
 class DBManager:
     # -----------------------------------------------------------
     # ROLES
@@ -24,7 +33,7 @@ class DBManager:
                 cursor.execute("SELECT id, name FROM roles ORDER BY id ASC;")
                 return cursor.fetchall()
         except Exception as e:
-            print("❌ Error al obtener roles:", e)
+            log.error("Error al obtener roles: %s", e)
             return []
         finally:
             conn.close()
@@ -43,7 +52,7 @@ class DBManager:
                 cursor.execute("SELECT id, name FROM departments ORDER BY id ASC;")
                 return cursor.fetchall()
         except Exception as e:
-            print("❌ Error al obtener departamentos:", e)
+            log.error("Error al obtener departamentos: %s", e)
             return []
         finally:
             conn.close()
@@ -57,11 +66,11 @@ class DBManager:
             with conn.cursor() as cursor:
                 cursor.execute("INSERT INTO departments (name) VALUES (%s);", (nombre,))
             conn.commit()
-            print(f"🟢 Departamento '{nombre}' creado correctamente.")
+            log.info("Departamento '%s' creado correctamente.", nombre)
             return True
         except Exception as e:
             conn.rollback()
-            print("❌ Error al crear departamento:", e)
+            log.error("Error al crear departamento: %s", e)
             return False
         finally:
             conn.close()
@@ -78,7 +87,7 @@ class DBManager:
             return True
         except Exception as e:
             conn.rollback()
-            print("❌ Error al eliminar departamento:", e)
+            log.error("Error al eliminar departamento: %s", e)
             return False
         finally:
             conn.close()
@@ -97,7 +106,7 @@ class DBManager:
                 cursor.execute("SELECT id, name, description FROM categories ORDER BY id ASC;")
                 return cursor.fetchall()
         except Exception as e:
-            print("❌ Error al obtener categorías:", e)
+            log.error("Error al obtener categorías: %s", e)
             return []
         finally:
             conn.close()
@@ -114,11 +123,11 @@ class DBManager:
                     (nombre, descripcion),
                 )
             conn.commit()
-            print(f"🟢 Categoría '{nombre}' creada correctamente.")
+            log.info("Categoría '%s' creada correctamente.", nombre)
             return True
         except Exception as e:
             conn.rollback()
-            print("❌ Error al crear categoría:", e)
+            log.error("Error al crear categoría: %s", e)
             return False
         finally:
             conn.close()
@@ -132,11 +141,11 @@ class DBManager:
             with conn.cursor() as cursor:
                 cursor.execute("DELETE FROM categories WHERE id = %s;", (cat_id,))
             conn.commit()
-            print(f"🗑️ Categoría ID {cat_id} eliminada correctamente.")
+            log.info("Categoría ID %s eliminada correctamente.", cat_id)
             return True
         except Exception as e:
             conn.rollback()
-            print("❌ Error al eliminar categoría:", e)
+            log.error("Error al eliminar categoría: %s", e)
             return False
         finally:
             conn.close()
@@ -174,11 +183,11 @@ class DBManager:
                 )
 
             conn.commit()
-            print(f"✅ Usuario creado correctamente con ID: {user_id}")
+            log.info("Usuario creado correctamente con ID: %s", user_id)
             return True
         except Exception as e:
             conn.rollback()
-            print("❌ Error al crear usuario:", e)
+            log.error("Error al crear usuario: %s", e)
             return False
         finally:
             conn.close()
@@ -212,23 +221,23 @@ class DBManager:
                 )
                 user = cursor.fetchone()
                 if not user:
-                    print("⚠ Usuario no encontrado o inactivo.")
+                    log.warning("Usuario no encontrado o inactivo.")
                     return None
 
                 stored_hash = user.get("password_hash")
                 if not stored_hash:
-                    print("⚠ Usuario sin contraseña registrada.")
+                    log.warning("Usuario sin contraseña registrada.")
                     return None
 
                 # 🔒 Verificar hash seguro
                 if DBManager.check_password(password, stored_hash):
-                    print(f"✅ Inicio de sesión exitoso: {user['nombre']} ({user['rol']})")
+                    log.info("Inicio de sesión exitoso: %s (%s)", user['nombre'], user['rol'])
                     return user
                 else:
-                    print("❌ Contraseña incorrecta.")
+                    log.warning("Contraseña incorrecta.")
                     return None
         except Exception as e:
-            print("❌ Error al verificar usuario:", e)
+            log.error("Error al verificar usuario: %s", e)
             return None
         finally:
             conn.close()
@@ -257,7 +266,7 @@ class DBManager:
                 )
                 return cursor.fetchall()
         except Exception as e:
-            print("❌ Error al obtener usuarios:", e)
+            log.error("Error al obtener usuarios: %s", e)
             return []
         finally:
             conn.close()
@@ -293,7 +302,7 @@ class DBManager:
                 )
                 return cursor.fetchone()
         except Exception as e:
-            print("❌ Error al obtener usuario por ID:", e)
+            log.error("Error al obtener usuario por ID: %s", e)
             return None
         finally:
             conn.close()
@@ -311,11 +320,11 @@ class DBManager:
                     (user_id,),
                 )
             conn.commit()
-            print(f"🟡 Usuario ID {user_id} desactivado correctamente.")
+            log.info("Usuario ID %s desactivado correctamente.", user_id)
             return True
         except Exception as e:
             conn.rollback()
-            print("❌ Error al desactivar usuario:", e)
+            log.error("Error al desactivar usuario: %s", e)
             return False
         finally:
             conn.close()
@@ -328,7 +337,7 @@ class DBManager:
         """
         conn = get_connection()
         if not conn:
-            print("❌ No se pudo conectar a la base de datos.")
+            log.error("No se pudo conectar a la base de datos.")
             return False
         try:
             with conn.cursor() as cursor:
@@ -371,11 +380,11 @@ class DBManager:
                     )
 
             conn.commit()
-            print(f"🟢 Usuario ID {user_id} actualizado correctamente.")
+            log.info("Usuario ID %s actualizado correctamente.", user_id)
             return True
         except Exception as e:
             conn.rollback()
-            print("❌ Error al actualizar usuario:", e)
+            log.error("Error al actualizar usuario: %s", e)
             return False
         finally:
             conn.close()
@@ -395,7 +404,7 @@ class DBManager:
                 cursor.execute("SELECT id, name FROM priorities ORDER BY id ASC;")
                 return cursor.fetchall()
         except Exception as e:
-            print(f"Error al obtener prioridades: {e}")
+            log.error("Error al obtener prioridades: %s", e)
             return []
         finally:
             if conn:
@@ -410,7 +419,7 @@ class DBManager:
                 cursor.execute("SELECT id, name FROM statuses ORDER BY id ASC;")
                 return cursor.fetchall()
         except Exception as e:
-            print(f"Error al obtener estados: {e}")
+            log.error("Error al obtener estados: %s", e)
             return []
         finally:
             if conn:
@@ -425,9 +434,9 @@ class DBManager:
         Genera un reporte de tickets filtrado por prioridad, estado y rango de fechas.
         Devuelve lista de dicts con los campos más relevantes.
         """
-        conn = get_connection()
+        conn = get_read_connection()
         if not conn:
-            print("❌ No se pudo conectar a la base de datos.")
+            log.error("No se pudo conectar a la base de datos.")
             return []
 
         try:
@@ -436,7 +445,6 @@ class DBManager:
                     t.id,
                     t.code,
                     t.title,
-                    t.description,
                     p.name  AS prioridad,
                     s.name  AS estado,
                     d.name  AS departamento,
@@ -463,7 +471,8 @@ class DBManager:
                 params.append(filtros["estado_id"])
 
             if filtros.get("inicio") and filtros.get("fin"):
-                query += " AND DATE(t.created_at) BETWEEN %s AND %s"
+                # Rango semiabierto sobre la columna (usa idx_tickets_created_at)
+                query += " AND t.created_at >= %s AND t.created_at < %s + INTERVAL 1 DAY"
                 params.append(filtros["inicio"].toString("yyyy-MM-dd"))
                 params.append(filtros["fin"].toString("yyyy-MM-dd"))
 
@@ -476,11 +485,245 @@ class DBManager:
             return results
 
         except Exception as e:
-            print("❌ Error al generar reporte:", e)
+            log.error("Error al generar reporte: %s", e)
+            return []
+        finally:
+            conn.close()
+
+    # -----------------------------------------------------------
+    # INDICADORES (tablas de resumen report_*_daily)
+    # -----------------------------------------------------------
+    # dimensión -> (columna en las tablas de resumen, catálogo, texto si es 0/NULL)
+    _DIMENSIONES_REPORTE = {
+        "estado":       ("status_id",     "statuses",    "(sin estado)"),
+        "prioridad":    ("priority_id",   "priorities",  "(sin prioridad)"),
+        "departamento": ("department_id", "departments", "(sin departamento)"),
+        "categoria":    ("category_id",   "categories",  "(sin categoría)"),
+    }
+
+    @staticmethod
+    def refrescar_reportes() -> bool:
+        """
+        Recalcula los días pendientes de las tablas de resumen (solo los
+        tocados desde la última marca de agua). El evento ev_report_refresh
+        lo hace cada 5 minutos; aquí se llama antes de leer para no mostrar
+        datos atrasados.
+        """
+        conn = get_connection()
+        if not conn:
+            log.error("No se pudo conectar a la base de datos.")
+            return False
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("CALL sp_report_refresh();")
+            conn.commit()
+            return True
+        except Exception as e:
+            conn.rollback()
+            log.error("Error al refrescar tablas de resumen: %s", e)
+            return False
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _rango_reporte(filtros: dict):
+        inicio = filtros.get("inicio")
+        fin = filtros.get("fin")
+        return (
+            inicio.toString("yyyy-MM-dd") if inicio else "1970-01-01",
+            fin.toString("yyyy-MM-dd") if fin else "9999-12-31",
+        )
+
+    @staticmethod
+    def reporte_volumen(filtros: dict):
+        """
+        Tickets creados en el rango, agrupados por filtros["dimension"]
+        (estado | prioridad | departamento | categoria).
+        Devuelve lista de dicts {nombre, tickets}.
+        """
+        columna, catalogo, vacio = DBManager._DIMENSIONES_REPORTE[filtros["dimension"]]
+        DBManager.refrescar_reportes()
+
+        conn = get_connection()
+        if not conn:
+            log.error("No se pudo conectar a la base de datos.")
+            return []
+        try:
+            with conn.cursor(pymysql.cursors.DictCursor) as cursor:
+                cursor.execute(f"""
+                    SELECT COALESCE(c.name, %s) AS nombre, SUM(r.tickets) AS tickets
+                    FROM report_ticket_daily r
+                    LEFT JOIN {catalogo} c ON c.id = r.{columna}
+                    WHERE r.dia BETWEEN %s AND %s
+                    GROUP BY r.{columna}, c.name
+                    ORDER BY tickets DESC;
+                """, (vacio, *DBManager._rango_reporte(filtros)))
+                return [
+                    {"nombre": r["nombre"], "tickets": int(r["tickets"])}
+                    for r in cursor.fetchall()
+                ]
+        except Exception as e:
+            log.error("Error al generar reporte de volumen: %s", e)
+            return []
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _percentil_tramos(tramos, total, q):
+        """Límite superior (horas) del tramo donde la frecuencia acumulada alcanza q."""
+        objetivo = q * total
+        acumulado = 0
+        for bucket_horas, n in tramos:
+            acumulado += n
+            if acumulado >= objetivo:
+                return bucket_horas
+        return tramos[-1][0] if tramos else None
+
+    @staticmethod
+    def reporte_resolucion(filtros: dict):
+        """
+        Tiempo de resolución de los tickets resueltos en el rango, agrupado
+        por filtros["dimension"] (prioridad | departamento | categoria).
+        Devuelve lista de dicts {nombre, resueltos, promedio_horas,
+        p50_horas, p90_horas}; los percentiles son el límite del tramo
+        (9999 = más de 720 h).
+        """
+        columna, catalogo, vacio = DBManager._DIMENSIONES_REPORTE[filtros["dimension"]]
+        DBManager.refrescar_reportes()
+
+        conn = get_connection()
+        if not conn:
+            log.error("No se pudo conectar a la base de datos.")
+            return []
+        try:
+            with conn.cursor(pymysql.cursors.DictCursor) as cursor:
+                cursor.execute(f"""
+                    SELECT COALESCE(c.name, %s) AS nombre,
+                           r.bucket_horas,
+                           SUM(r.resueltos)     AS resueltos,
+                           SUM(r.minutos_total) AS minutos
+                    FROM report_resolution_daily r
+                    LEFT JOIN {catalogo} c ON c.id = r.{columna}
+                    WHERE r.dia BETWEEN %s AND %s
+                    GROUP BY r.{columna}, c.name, r.bucket_horas
+                    ORDER BY nombre, r.bucket_horas;
+                """, (vacio, *DBManager._rango_reporte(filtros)))
+                filas = cursor.fetchall()
+        except Exception as e:
+            log.error("Error al generar reporte de resolución: %s", e)
             return []
         finally:
             conn.close()
 
+        grupos = {}
+        for f in filas:
+            g = grupos.setdefault(f["nombre"], {"tramos": [], "resueltos": 0, "minutos": 0})
+            g["tramos"].append((int(f["bucket_horas"]), int(f["resueltos"])))
+            g["resueltos"] += int(f["resueltos"])
+            g["minutos"] += int(f["minutos"])
+
+        resultado = []
+        for nombre, g in grupos.items():
+            total = g["resueltos"]
+            resultado.append({
+                "nombre": nombre,
+                "resueltos": total,
+                "promedio_horas": round(g["minutos"] / total / 60, 1) if total else 0,
+                "p50_horas": DBManager._percentil_tramos(g["tramos"], total, 0.5),
+                "p90_horas": DBManager._percentil_tramos(g["tramos"], total, 0.9),
+            })
+        resultado.sort(key=lambda r: r["resueltos"], reverse=True)
+        return resultado
+
+    # -----------------------------------------------------------
+    # ANALÍTICA DEL HISTORIAL (core/analitica.py)
+    # -----------------------------------------------------------
+    @staticmethod
+    def cargar_historial_columnar(filtros: dict, tam_lote: int = 5_000):
+        """
+        Tickets creados en el rango y su historial como arreglos int64
+        (columnas en core/analitica.py). El historial se lee solo para esos
+        tickets, de a `tam_lote` ids por consulta (índice idx_th_ticket), con
+        cursor de tuplas, sin armar dicts por fila.
+        """
+        vacio = (np.empty((0, 6), dtype=np.int64), np.empty((0, 3), dtype=np.int64))
+        conn = get_read_connection()
+        if not conn:
+            log.error("No se pudo conectar a la base de datos.")
+            return vacio
+        try:
+            inicio, fin = DBManager._rango_reporte(filtros)
+            with conn.cursor(pymysql.cursors.Cursor) as cursor:
+                cursor.execute("""
+                    SELECT id, status_id, CAST(UNIX_TIMESTAMP(created_at) AS SIGNED)
+                    FROM tickets
+                    WHERE created_at >= %s AND created_at < %s + INTERVAL 1 DAY
+                """, (inicio, fin))
+                filas = cursor.fetchall()
+                if not filas:
+                    return vacio
+                tickets = np.array(filas, dtype=np.int64)
+
+                ids = np.sort(tickets[:, 0]).tolist()
+                partes = []
+                for i in range(0, len(ids), tam_lote):
+                    lote_ids = ids[i:i + tam_lote]
+                    cursor.execute(f"""
+                        SELECT id, ticket_id, actor_user_id, COALESCE(from_status_id, 0),
+                               to_status_id, CAST(UNIX_TIMESTAMP(created_at) AS SIGNED)
+                        FROM ticket_history
+                        WHERE ticket_id IN ({", ".join(["%s"] * len(lote_ids))})
+                    """, lote_ids)
+                    lote = cursor.fetchall()
+                    if lote:
+                        partes.append(np.array(lote, dtype=np.int64))
+            historial = np.concatenate(partes) if partes else vacio[0]
+            return historial, tickets
+        except Exception as e:
+            log.error("Error al cargar historial: %s", e)
+            return vacio
+        finally:
+            conn.close()
+
+    @staticmethod
+    def reporte_historial(filtros: dict):
+        """
+        Indicadores del historial para tickets creados en el rango.
+        filtros["dimension"]: tiempo_estado | transiciones | productividad.
+        Devuelve (encabezados, filas) listos para la previsualización.
+        """
+        historial, tickets = DBManager.cargar_historial_columnar(filtros)
+        estados = {e["id"]: e["name"] for e in DBManager.get_statuses()}
+        if len(tickets) == 0:
+            return [], []
+
+        dimension = filtros["dimension"]
+        if dimension == "tiempo_estado":
+            fin = [i for i, n in estados.items() if n.upper() in ("RESUELTO", "CERRADO", "RECHAZADO")]
+            resumen = analitica.resumen_por_estado(
+                *analitica.tiempo_en_estado(historial, tickets, int(datetime.now().timestamp()), fin)
+            )
+            encabezados = ["Estado", "Tickets", "Promedio (h)", "P50 (h)", "P90 (h)"]
+            filas = [
+                [estados.get(r["estado_id"], r["estado_id"]), r["tickets"],
+                 r["promedio_horas"], r["p50_horas"], r["p90_horas"]]
+                for r in resumen
+            ]
+            return encabezados, filas
+
+        if dimension == "transiciones":
+            ids, matriz = analitica.matriz_transiciones(historial, estados.keys())
+            nombres = [estados[int(i)] for i in ids]
+            filas = [[nombres[k], *map(int, fila)] for k, fila in enumerate(matriz)]
+            return ["Desde / Hacia", *nombres], filas
+
+        # productividad
+        cierre = [i for i, n in estados.items() if n.upper() in ("RESUELTO", "CERRADO")]
+        actores, cantidades = analitica.productividad(historial, cierre)
+        nombres = {u["id"]: f"{u['nombre']} {u['apellido']}".strip() for u in DBManager.obtener_usuarios()}
+        filas = [[nombres.get(int(a), f"#{a}"), int(c)] for a, c in zip(actores, cantidades)]
+        return ["Usuario", "Resueltos / cerrados"], filas
+
     _current_user = None
 
     @classmethod
@@ -491,6 +734,7 @@ class DBManager:
         {'id': int, 'nombre': str, 'rol': str, 'email': str}
         """
         cls._current_user = user_data
+        asignar_sesion(user_data)
 
     @classmethod
     def get_user(cls):
@@ -501,61 +745,62 @@ class DBManager:
     def clear_user(cls):
         """Limpia la sesión (por ejemplo, al cerrar sesión)."""
         cls._current_user = None
+        asignar_sesion(None)
 
 
         # -----------------------------------------------------------
     # BITÁCORA DE ACCIONES
     # -----------------------------------------------------------
     @staticmethod
-    def insertar_bitacora(usuario, rol, accion, resultado):
+    def insertar_bitacora(usuario, rol, accion, resultado, *,
+                          entidad="bitacora", entidad_id=None, evento="legacy", datos=None):
         """
-        Inserta una nueva acción en la tabla bitacora.
+        Registra una acción en la bitácora y como evento tipado en
+        audit_events (entidad / entidad_id / evento + datos en JSON).
+        Se encola y se escribe en lote (ver core/bitacora_buffer.py);
+        usar flush_bitacora() para forzarlo.
         """
-        conn = get_connection()
-        if not conn:
-            print("❌ No se pudo conectar a la base de datos (bitácora).")
-            return False
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    INSERT INTO bitacora (usuario, rol, accion, resultado)
-                    VALUES (%s, %s, %s, %s);
-                """, (usuario, rol, accion, resultado))
-            conn.commit()
-            print(f"📝 Acción registrada en bitácora: {accion}")
-            return True
-        except Exception as e:
-            conn.rollback()
-            print("❌ Error al insertar en bitácora:", e)
-            return False
-        finally:
-            conn.close()
+        actual = DBManager.get_user() or {}
+        bitacora_buffer.agregar(
+            usuario, rol, accion, resultado,
+            actor_id=actual.get("id"),
+            entidad=entidad, entidad_id=entidad_id, evento=evento, datos=datos,
+        )
+        return True
+
+    @staticmethod
+    def flush_bitacora():
+        """Escribe de inmediato las acciones pendientes de la bitácora."""
+        return bitacora_buffer.flush()
     
 
     @staticmethod
-    def obtener_bitacora():
+    def obtener_bitacora(limite: int = 5000):
         """
-        Devuelve todos los registros de la tabla bitacora, ordenados por fecha descendente.
+        Devuelve los últimos `limite` registros de la bitácora, ordenados por
+        fecha descendente (para el histórico completo: generar_reporte_bitacora).
         """
+        bitacora_buffer.flush()
         conn = get_connection()
         if not conn:
-            print("❌ No se pudo conectar a la base de datos (bitácora).")
+            log.error("No se pudo conectar a la base de datos (bitácora).")
             return []
         try:
             with conn.cursor(pymysql.cursors.DictCursor) as cursor:
                 cursor.execute("""
                     SELECT id,
-                           DATE_FORMAT(fecha, '%d/%m/%Y %H:%i:%s') AS fecha,
+                           DATE_FORMAT(fecha, '%%d/%%m/%%Y %%H:%%i:%%s') AS fecha,
                            usuario,
                            rol,
                            accion,
                            resultado
                     FROM bitacora
-                    ORDER BY fecha DESC;
-                """)
+                    ORDER BY bitacora.fecha DESC
+                    LIMIT %s;
+                """, (int(limite),))
                 return cursor.fetchall()
         except Exception as e:
-            print("❌ Error al obtener bitácora:", e)
+            log.error("Error al obtener bitácora: %s", e)
             return []
         finally:
             conn.close()
@@ -571,9 +816,10 @@ class DBManager:
         usuario y rango de fechas (DATETIME).
         """
         from datetime import datetime, time
-        conn = get_connection()
+        bitacora_buffer.flush()
+        conn = get_read_connection()
         if not conn:
-            print("❌ No se pudo conectar a la base de datos.")
+            log.error("No se pudo conectar a la base de datos.")
             return []
 
         try:
@@ -596,26 +842,25 @@ class DBManager:
                 query += " AND usuario LIKE %s"
                 params.append(f"%{filtros['usuario']}%")
 
-            # Filtro por fechas (opcional) — columnas DATETIME
-            if filtros.get("inicio") and filtros.get("fin"):
-                query += " AND fecha BETWEEN %s AND %s"
-
-                ini_q = filtros["inicio"]
-                fin_q = filtros["fin"]
-
-                # QDate → datetime
-                if hasattr(ini_q, "toPython"):
-                    ini_dt = datetime.combine(ini_q.toPython(), time.min)   # 00:00:00
-                    fin_dt = datetime.combine(fin_q.toPython(), time.max)   # 23:59:59.999999
-                else:
-                    # fallback si viniera como 'YYYY-MM-DD'
-                    ini_dt = datetime.strptime(str(ini_q), "%Y-%m-%d")
-                    fin_dt = datetime.strptime(str(fin_q), "%Y-%m-%d")
-                    fin_dt = datetime.combine(fin_dt.date(), time.max)
-
-                params.extend([ini_dt, fin_dt])
-
-            query += " ORDER BY fecha DESC;"
+            # Filtro por fechas (opcional) — columnas DATETIME.
+            # Se compara `fecha` directamente contra constantes (sin funciones
+            # sobre la columna) para que MySQL solo lea las particiones
+            # mensuales del rango.
+            def _a_datetime(valor, hora):
+                # QDate → datetime; fallback si viniera como 'YYYY-MM-DD'
+                if hasattr(valor, "toPython"):
+                    return datetime.combine(valor.toPython(), hora)
+                return datetime.combine(datetime.strptime(str(valor), "%Y-%m-%d").date(), hora)
+
+            if filtros.get("inicio"):
+                query += " AND fecha >= %s"
+                params.append(_a_datetime(filtros["inicio"], time.min))   # 00:00:00
+            if filtros.get("fin"):
+                query += " AND fecha <= %s"
+                params.append(_a_datetime(filtros["fin"], time.max))      # 23:59:59.999999
+
+            # bitacora.fecha (la columna), no el alias formateado como texto
+            query += " ORDER BY bitacora.fecha DESC;"
 
             with conn.cursor(pymysql.cursors.DictCursor) as cursor:
                 # Debug útil para ver la query final con parámetros:
@@ -626,7 +871,7 @@ class DBManager:
             return rows
 
         except Exception as e:
-            print(f"❌ Error al generar reporte de bitácora: {e}")
+            log.error("Error al generar reporte de bitácora: %s", e)
             return []
         finally:
             conn.close()
@@ -710,6 +955,6 @@ class DBManager:
 
             mail.logout()
         except Exception as e:
-            print("❌ Error al obtener correos:", e)
+            log.error("Error al obtener correos: %s", e)
 
         return correos   
\ No newline at end of file
@@ -0,0 +1,115 @@
+# core/registro.py
+# -*- coding: utf-8 -*-
+"""
+Registro (logging) de la app de escritorio.
+
+Los módulos usan `logging.getLogger(__name__)`; configurar_registro()
+deja en el logger raíz un QueueHandler, así quien loguea (la UI o un
+hilo del pool) solo encola y un QueueListener escribe en su propio hilo.
+Cada línea es un JSON con el usuario y la sesión activos.
+
+Variables de entorno:
+    INCIDEX_LOG_LEVEL   nivel general (INFO)
+    INCIDEX_LOG_LEVELS  por módulo, ej: "core.database=DEBUG,core.db_manager=WARNING"
+    INCIDEX_LOG_FORMAT  json | texto
+"""
+
+import os
+import sys
+import json
+import uuid
+import queue
+import atexit
+import logging
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+_ATRIBUTOS_BASE = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+# Sesión activa (la app de escritorio tiene un solo usuario a la vez)
+_sesion = {"sesion_id": None, "usuario_id": None}
+
+
+def asignar_sesion(usuario: dict | None):
+    """Lo llama DBManager.set_user / clear_user."""
+    if usuario:
+        _sesion.update(sesion_id=uuid.uuid4().hex[:12], usuario_id=usuario.get("id"))
+    else:
+        _sesion.update(sesion_id=None, usuario_id=None)
+
+
+class FormatoJson(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entrada = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "nivel": record.levelname,
+            "modulo": record.name,
+            "hilo": record.threadName,
+            "msg": record.getMessage(),
+        }
+        for clave, valor in vars(record).items():
+            if clave not in _ATRIBUTOS_BASE and not clave.startswith("_") and valor is not None:
+                entrada.setdefault(clave, valor)
+        if record.exc_info:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entrada["exc"] = record.exc_text
+        return json.dumps(entrada, ensure_ascii=False, default=str)
+
+
+class _FiltroSesion(logging.Filter):
+    def filter(self, record):
+        record.sesion_id = _sesion["sesion_id"]
+        record.usuario_id = _sesion["usuario_id"]
+        return True
+
+
+class _ColaRegistros(QueueHandler):
+    """Resuelve mensaje y traza antes de encolar; el formato lo pone el listener."""
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def niveles_por_modulo(texto: str | None) -> dict:
+    niveles = {}
+    for parte in (texto or "").split(","):
+        nombre, sep, nivel = parte.partition("=")
+        if sep and nombre.strip() and nivel.strip():
+            niveles[nombre.strip()] = nivel.strip().upper()
+    return niveles
+
+
+_listener = None
+
+
+def configurar_registro(nivel: str | None = None, niveles: dict | None = None,
+                        formato: str | None = None, salida=None):
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    formato = formato or os.getenv("INCIDEX_LOG_FORMAT", "json")
+    destino = logging.StreamHandler(salida or sys.stdout)
+    destino.setFormatter(FormatoJson() if formato == "json" else logging.Formatter(
+        "%(asctime)s %(levelname)s %(name)s: %(message)s"
+    ))
+
+    cola = queue.SimpleQueue()
+    manejador = _ColaRegistros(cola)
+    manejador.addFilter(_FiltroSesion())
+    raiz = logging.getLogger()
+    raiz.addHandler(manejador)
+    raiz.setLevel((nivel or os.getenv("INCIDEX_LOG_LEVEL", "INFO")).upper())
+    for nombre, nv in (niveles if niveles is not None else niveles_por_modulo(os.getenv("INCIDEX_LOG_LEVELS"))).items():
+        logging.getLogger(nombre).setLevel(nv)
+
+    _listener = QueueListener(cola, destino, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)   # escribe lo pendiente al cerrar
+    return _listener
@@ -1 +1,48 @@
+# core/router.py
+# -*- coding: utf-8 -*-
+"""
+Router — construcción diferida de las páginas del QStackedWidget.
 
+Cada página se registra con una fábrica y se construye la primera vez
+que se navega a ella (o que alguien pide la instancia), no al abrir la
+ventana principal. El tiempo de construcción queda en el reporte de
+arranque (core/arranque.py).
+"""
+
+import time
+
+from core.arranque import tiempos
+
+
+class Router:
+    def __init__(self, stack):
+        self.stack = stack
+        self._fabricas = {}
+        self._paginas = {}
+
+    def registrar(self, nombre: str, fabrica):
+        """`fabrica()` -> QWidget; no se llama hasta la primera navegación."""
+        self._fabricas[nombre] = fabrica
+
+    def construida(self, nombre: str) -> bool:
+        return nombre in self._paginas
+
+    def pagina(self, nombre: str):
+        """Instancia de la página (la construye y la agrega al stack si hace falta)."""
+        pagina = self._paginas.get(nombre)
+        if pagina is None:
+            t0 = time.perf_counter()
+            pagina = self._fabricas[nombre]()
+            self.stack.addWidget(pagina)
+            self._paginas[nombre] = pagina
+            tiempos.pagina(nombre, (time.perf_counter() - t0) * 1000)
+        return pagina
+
+    def ir(self, nombre: str):
+        pagina = self.pagina(nombre)
+        self.stack.setCurrentWidget(pagina)
+        return pagina
+
+    def actual(self) -> str | None:
+        widget = self.stack.currentWidget()
+        return next((n for n, p in self._paginas.items() if p is widget), None)
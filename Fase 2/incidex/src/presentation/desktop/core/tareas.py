@@ -0,0 +1,68 @@
+# core/tareas.py
+# -*- coding: utf-8 -*-
+"""
+Consultas a la base fuera del hilo de la interfaz.
+
+    en_segundo_plano(DBManager.obtener_roles, al_terminar=self._aplicar_roles)
+
+La función corre en el QThreadPool global (cada llamada del DBManager abre
+su propia conexión, así que no se comparten conexiones entre hilos) y el
+resultado vuelve al hilo de la UI por señal; ahí se tocan los widgets.
+"""
+
+import logging
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+log = logging.getLogger(__name__)
+
+# Tareas en vuelo: sin esta referencia Python puede liberar las señales
+# antes de que Qt entregue el resultado
+_activas = set()
+
+
+class _Senales(QObject):
+    terminado = Signal(object)
+    fallido = Signal(str)
+
+
+class _Tarea(QRunnable):
+    def __init__(self, fn, args, kwargs):
+        super().__init__()
+        self.fn, self.args, self.kwargs = fn, args, kwargs
+        self.senales = _Senales()   # creado en el hilo de la UI: entrega ahí
+
+    def run(self):
+        try:
+            resultado = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.senales.fallido.emit(str(e))
+        else:
+            self.senales.terminado.emit(resultado)
+
+
+def en_segundo_plano(fn, *args, al_terminar=None, al_fallar=None, **kwargs):
+    """
+    Ejecuta `fn(*args, **kwargs)` en otro hilo y llama a `al_terminar(resultado)`
+    en la UI. Si falla, el error se loguea y luego se llama a `al_fallar(mensaje)`
+    (para dejar la vista en un estado vacío; no hace falta volver a loguear).
+    """
+    tarea = _Tarea(fn, args, kwargs)
+    _activas.add(tarea)
+
+    def _fin(resultado):
+        _activas.discard(tarea)
+        if al_terminar:
+            al_terminar(resultado)
+
+    def _error(mensaje):
+        _activas.discard(tarea)
+        log.error("Error en consulta en segundo plano (%s): %s", getattr(fn, "__name__", fn), mensaje)
+        if al_fallar:
+            al_fallar(mensaje)
+
+    tarea.senales.terminado.connect(_fin)
+    tarea.senales.fallido.connect(_error)
+    tarea.setAutoDelete(False)
+    QThreadPool.globalInstance().start(tarea)
+    return tarea
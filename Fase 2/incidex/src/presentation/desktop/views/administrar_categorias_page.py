@@ -12,6 +12,7 @@ from PySide6.QtCore import Qt
 from PySide6.QtGui import QPixmap
 from core.resources import asset_path
 from core.db_manager import DBManager
+from core.tareas import en_segundo_plano
 import math
 
 
@@ -159,7 +160,8 @@ class AdministrarCategoriasPage(QWidget):
         self.pagination_row.addLayout(self.pagination_layout)
         frame_layout.addLayout(self.pagination_row)
 
-        # === Cargar datos ===
+        # === Cargar datos (tabla vacía hasta que llega la consulta) ===
+        self._aplicar_categorias([])
         self.refrescar_datos()
 
         # === Añadir al layout principal ===
@@ -257,18 +259,23 @@ class AdministrarCategoriasPage(QWidget):
                         usuario=usuario_log["nombre"],
                         rol=usuario_log["rol"],
                         accion="Eliminación de categoría",
-                        resultado=f"Categoría '{cat['name']}' (ID {cat['id']}) eliminada correctamente."
+                        resultado=f"Categoría '{cat['name']}' (ID {cat['id']}) eliminada correctamente.",
+                        entidad="category", entidad_id=cat["id"], evento="delete",
+                        datos={"name": cat["name"]}
                     )
 
             else:
                 QMessageBox.critical(self, "Error", "No se pudo eliminar la categoría.")
                 
     def refrescar_datos(self):
-        try:
-            self.categorias = DBManager.obtener_categorias() or []
-        except Exception as e:
-            print("❌ Error al obtener categorías:", e)
-            self.categorias = []
+        """Pide los categorías en otro hilo; la tabla se arma al llegar."""
+        en_segundo_plano(
+            DBManager.obtener_categorias,
+            al_terminar=self._aplicar_categorias,
+        )
+
+    def _aplicar_categorias(self, categorias):
+        self.categorias = categorias or []
 
         self.filtered_data = self.categorias.copy()
         self.current_page = 1
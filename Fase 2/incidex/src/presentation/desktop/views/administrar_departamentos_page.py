@@ -12,6 +12,7 @@ from PySide6.QtCore import Qt
 from PySide6.QtGui import QPixmap
 from core.resources import asset_path
 from core.db_manager import DBManager
+from core.tareas import en_segundo_plano
 import math
 
 
@@ -150,7 +151,8 @@ class AdministrarDepartamentosPage(QWidget):
         self.pagination_row.addLayout(self.pagination_layout)
         frame_layout.addLayout(self.pagination_row)
 
-        # === Cargar datos ===
+        # === Cargar datos (tabla vacía hasta que llega la consulta) ===
+        self._aplicar_departamentos([])
         self.refrescar_datos()
 
         # === Agregar contenedor al layout principal ===
@@ -244,18 +246,23 @@ class AdministrarDepartamentosPage(QWidget):
                         usuario=usuario_log["nombre"],
                         rol=usuario_log["rol"],
                         accion="Eliminación de departamento",
-                        resultado=f"Departamento '{dep['name']}' (ID {dep['id']}) eliminado correctamente."
+                        resultado=f"Departamento '{dep['name']}' (ID {dep['id']}) eliminado correctamente.",
+                        entidad="department", entidad_id=dep["id"], evento="delete",
+                        datos={"name": dep["name"]}
                     )
 
             else:
                 QMessageBox.critical(self, "Error", "No se pudo eliminar el departamento.")
         # -----------------------------------------------------
     def refrescar_datos(self):
-        try:
-            self.departamentos = DBManager.obtener_departamentos() or []
-        except Exception as e:
-            print("❌ Error al obtener departamentos:", e)
-            self.departamentos = []
+        """Pide los departamentos en otro hilo; la tabla se arma al llegar."""
+        en_segundo_plano(
+            DBManager.obtener_departamentos,
+            al_terminar=self._aplicar_departamentos,
+        )
+
+    def _aplicar_departamentos(self, departamentos):
+        self.departamentos = departamentos or []
 
         self.filtered_data = self.departamentos.copy()
         self.current_page = 1
@@ -13,7 +13,8 @@ from PySide6.QtCore import Qt
 from PySide6.QtGui import QPixmap
 from PySide6.QtWidgets import QApplication, QMessageBox
 from core.resources import asset_path
-from core.db_manager import DBManager  # conexión real a la DB
+from core.db_manager import DBManager
+from core.tareas import en_segundo_plano  # conexión real a la DB
 import math
 
 
@@ -154,11 +155,8 @@ class AdministrarUsuariosPage(QWidget):
         self.table.setColumnWidth(4, 90)
         self.table.setColumnWidth(5, 150)
 
-        # === Obtener datos desde la base de datos ===
-        self.usuarios = [
-            (str(u["id"]), u["nombre"], u["apellido"], u["correo"], u["rol"])
-            for u in DBManager.obtener_usuarios()
-        ]
+        # === Datos: se piden en segundo plano (ver refrescar_datos) ===
+        self.usuarios = []
 
         self.filtered_data = self.usuarios.copy()
         self.current_page = 1
@@ -191,6 +189,8 @@ class AdministrarUsuariosPage(QWidget):
         logo_label.setAlignment(Qt.AlignRight | Qt.AlignBottom)
         main_layout.addWidget(logo_label, alignment=Qt.AlignRight | Qt.AlignBottom)
 
+        self.refrescar_datos()
+
     # ---------------------------------------------------------
     #   Cargar datos
     # ---------------------------------------------------------
@@ -342,7 +342,8 @@ class AdministrarUsuariosPage(QWidget):
                         usuario=usuario_log["nombre"],
                         rol=usuario_log["rol"],
                         accion="Desactivación de usuario",
-                        resultado=f"Usuario '{nombre}' (ID {user_id}) desactivado correctamente."
+                        resultado=f"Usuario '{nombre}' (ID {user_id}) desactivado correctamente.",
+                        entidad="user", entidad_id=user_id, evento="deactivate"
                     )
 
             else:
@@ -351,10 +352,13 @@ class AdministrarUsuariosPage(QWidget):
     #   Refrescar tabla
     # ---------------------------------------------------------
     def refrescar_datos(self):
-        """Recarga todos los usuarios activos desde la base y reconstruye la tabla."""
+        """Recarga los usuarios activos en otro hilo; la tabla se arma al llegar."""
+        en_segundo_plano(DBManager.obtener_usuarios, al_terminar=self._aplicar_usuarios)
+
+    def _aplicar_usuarios(self, usuarios):
         self.usuarios = [
             (str(u["id"]), u["nombre"], u["apellido"], u["correo"], u["rol"])
-            for u in DBManager.obtener_usuarios()
+            for u in usuarios or []
         ]
         self.filtered_data = self.usuarios.copy()
         self.cargar_tabla()
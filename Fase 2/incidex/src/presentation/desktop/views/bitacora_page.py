@@ -12,6 +12,7 @@ from PySide6.QtCore import Qt
 from PySide6.QtGui import QPixmap
 from core.resources import asset_path
 from core.db_manager import DBManager
+from core.tareas import en_segundo_plano
 import math
 
 
@@ -144,19 +145,8 @@ class BitacoraPage(QWidget):
         for i, w in enumerate(widths):
             self.table.setColumnWidth(i, w)
 
-        # === Cargar datos iniciales ===
-        registros = DBManager.obtener_bitacora()
-        self.bitacora = [
-            (
-                str(r["id"]),
-                r["fecha"],
-                r["usuario"],
-                r["rol"] if r["rol"] else "-",
-                r["accion"],
-                r["resultado"] if r["resultado"] else "-"
-            )
-            for r in registros
-        ]
+        # === Datos: se piden en segundo plano (ver refrescar_datos) ===
+        self.bitacora = []
 
         self.filtered_data = self.bitacora.copy()
         self.current_page = 1
@@ -186,6 +176,8 @@ class BitacoraPage(QWidget):
         logo_label.setAlignment(Qt.AlignRight | Qt.AlignBottom)
         main_layout.addWidget(logo_label, alignment=Qt.AlignRight | Qt.AlignBottom)
 
+        self.refrescar_datos()
+
     # ---------------------------------------------------------
     #   Cargar datos
     # ---------------------------------------------------------
@@ -271,7 +263,11 @@ class BitacoraPage(QWidget):
     #   Refrescar datos
     # ---------------------------------------------------------
     def refrescar_datos(self):
-        registros = DBManager.obtener_bitacora()
+        """Pide la bitácora en otro hilo; la tabla se arma al llegar."""
+        en_segundo_plano(DBManager.obtener_bitacora, al_terminar=self._aplicar_bitacora)
+
+    def _aplicar_bitacora(self, registros):
+        registros = registros or []
         self.bitacora = [
             (
                 str(r["id"]),
@@ -285,6 +281,7 @@ class BitacoraPage(QWidget):
         ]
         self.filtered_data = self.bitacora.copy()
         self.current_page = 1
+        self.total_pages = math.ceil(len(self.filtered_data) / self.rows_per_page)
         self.cargar_tabla()
         self.actualizar_paginacion()
         print("🔄 Bitácora actualizada.")
@@ -139,7 +139,8 @@ class CreateCategoriaPage(QWidget):
                     usuario=usuario_log["nombre"],
                     rol=usuario_log["rol"],
                     accion="Creación de categoría",
-                    resultado=f"Categoría '{nombre}' creada correctamente."
+                    resultado=f"Categoría '{nombre}' creada correctamente.",
+                    entidad="category", evento="create", datos={"name": nombre}
                 )
 
             # Limpiar campos
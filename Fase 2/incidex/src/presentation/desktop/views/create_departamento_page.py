@@ -128,7 +128,8 @@ class CreateDepartamentoPage(QWidget):
                     usuario=usuario_log["nombre"],
                     rol=usuario_log["rol"],
                     accion="Creación de departamento",
-                    resultado=f"Departamento '{nombre}' creado correctamente."
+                    resultado=f"Departamento '{nombre}' creado correctamente.",
+                    entidad="department", evento="create", datos={"name": nombre}
                 )
 
             # Limpiar campo
@@ -11,6 +11,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QDate
 from PySide6.QtGui import QPixmap
 from core.resources import asset_path
+from core.tareas import en_segundo_plano
 
 import re
 from datetime import date, datetime
@@ -215,11 +216,15 @@ class CreateUserPage(QWidget):
             self.role.clear()
             self.role.addItem("No hay conexión a DB")
             return
-        try:
-            roles = DBManager.obtener_roles() or []
-        except Exception as e:
-            print("❌ Error al obtener roles:", e)
-            roles = []
+        # La consulta corre en otro hilo; el combo muestra "Cargando..." mientras
+        en_segundo_plano(
+            DBManager.obtener_roles,
+            al_terminar=self._aplicar_roles,
+            al_fallar=lambda e: self._aplicar_roles([]),
+        )
+
+    def _aplicar_roles(self, roles):
+        roles = roles or []
         self.role.clear()
         if not roles:
             self.role.addItem("No hay roles disponibles")
@@ -233,11 +238,14 @@ class CreateUserPage(QWidget):
             self.department.clear()
             self.department.addItem("No hay conexión a DB")
             return
-        try:
-            deps = DBManager.obtener_departamentos() or []
-        except Exception as e:
-            print("❌ Error al obtener departamentos:", e)
-            deps = []
+        en_segundo_plano(
+            DBManager.obtener_departamentos,
+            al_terminar=self._aplicar_departamentos,
+            al_fallar=lambda e: self._aplicar_departamentos([]),
+        )
+
+    def _aplicar_departamentos(self, deps):
+        deps = deps or []
         self.department.clear()
         if not deps:
             self.department.addItem("No hay departamentos disponibles")
@@ -352,7 +360,8 @@ class CreateUserPage(QWidget):
                     usuario=usuario_log["nombre"],
                     rol=usuario_log["rol"],
                     accion=f"Creación de usuario",
-                    resultado=f"Usuario '{data['nombre']} {data['apellido']}' creado correctamente."
+                    resultado=f"Usuario '{data['nombre']} {data['apellido']}' creado correctamente.",
+                    entidad="user", evento="create", datos={"email": data["correo"]}
                 )
 
             # Limpiar campos
@@ -370,9 +379,8 @@ class CreateUserPage(QWidget):
             while parent_window and not hasattr(parent_window, "stack"):
                 parent_window = parent_window.parentWidget()
 
-            if parent_window and hasattr(parent_window, "admin_user_page"):
-                parent_window.admin_user_page.refrescar_datos()
-                parent_window.stack.setCurrentWidget(parent_window.admin_user_page)
+            if parent_window and hasattr(parent_window, "volver_a_administrar"):
+                parent_window.volver_a_administrar(refrescar=True)
 
     # ------------------------------------------------------------------
     def enviar_correo_credenciales(self, correo_destino, nombre, correo_usuario, contraseña):
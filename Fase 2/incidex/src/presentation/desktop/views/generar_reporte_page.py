@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 """
-GenerarReportePage — vista unificada con selector superior (Tickets / Bitácora).
+GenerarReportePage — vista unificada con selector superior (Tickets / Bitácora / Indicadores).
 Diseño visual mejorado: texto negro, acordeón limpio y campos bien definidos.
 """
 
+import logging
+
 from PySide6.QtWidgets import (
     QWidget, QLabel, QVBoxLayout, QHBoxLayout, QFrame,
     QComboBox, QDateEdit, QPushButton, QTableView, QLineEdit, QStackedWidget
@@ -12,8 +14,12 @@ from PySide6.QtCore import Signal, Qt, QDate
 from PySide6.QtGui import QPixmap, QStandardItemModel, QStandardItem
 from core.resources import asset_path
 from core.db_manager import DBManager
+from core.tareas import en_segundo_plano
 from PySide6.QtWidgets import QFileDialog
 
+log = logging.getLogger(__name__)
+
+
 class GenerarReportePage(QWidget):
     generarReporte = Signal(dict)
 
@@ -42,8 +48,9 @@ class GenerarReportePage(QWidget):
 
         self.btn_tickets = QPushButton("Reporte de Tickets")
         self.btn_bitacora = QPushButton("Reporte de Bitácora")
+        self.btn_indicadores = QPushButton("Indicadores")
 
-        for btn in (self.btn_tickets, self.btn_bitacora):
+        for btn in (self.btn_tickets, self.btn_bitacora, self.btn_indicadores):
             btn.setCheckable(True)
             btn.setFixedHeight(34)
             btn.setStyleSheet("""
@@ -68,6 +75,7 @@ class GenerarReportePage(QWidget):
         selector_layout.addStretch()
         selector_layout.addWidget(self.btn_tickets)
         selector_layout.addWidget(self.btn_bitacora)
+        selector_layout.addWidget(self.btn_indicadores)
         selector_layout.addStretch()
         main_layout.addWidget(selector_frame)
 
@@ -78,9 +86,11 @@ class GenerarReportePage(QWidget):
         # === SUBPÁGINAS ===
         self.stack.addWidget(self._build_ticket_report())
         self.stack.addWidget(self._build_bitacora_report())
+        self.stack.addWidget(self._build_indicadores_report())
 
         self.btn_tickets.clicked.connect(lambda: self._switch_page(0))
         self.btn_bitacora.clicked.connect(lambda: self._switch_page(1))
+        self.btn_indicadores.clicked.connect(lambda: self._switch_page(2))
 
         # === LOGO INFERIOR ===
         logo_label = QLabel()
@@ -308,16 +318,11 @@ class GenerarReportePage(QWidget):
         lbl_usuario = QLabel("Usuario:")
         self.input_usuario = QComboBox()
         self.input_usuario.addItem("(todos)", None)
-
-        try:
-            admins = self.db.obtener_usuarios() or []
-            for a in admins:
-                if str(a.get("rol", "")).lower() in ["administrador", "admin"]:
-                    nombre_completo = f"{a['nombre']} {a['apellido']}".strip()
-                    nombre_corto = a['nombre']
-                    self.input_usuario.addItem(nombre_completo, nombre_corto)
-        except Exception as e:
-            print("❌ Error al cargar administradores en bitácora:", e)
+        # Los administradores se agregan cuando llega la consulta (otro hilo)
+        en_segundo_plano(
+            self.db.obtener_usuarios,
+            al_terminar=self._aplicar_admins_bitacora,
+        )
 
         col1.addWidget(lbl_usuario)
         col1.addWidget(self.input_usuario)
@@ -382,19 +387,168 @@ class GenerarReportePage(QWidget):
         return frame
 
 
+    # ============================================================
+    #   SUBPÁGINA: INDICADORES (tablas de resumen)
+    # ============================================================
+    # (texto del combo, tipo de reporte, dimensión)
+    TIPOS_INDICADOR = [
+        ("Volumen por estado",                     "volumen",    "estado"),
+        ("Volumen por prioridad",                  "volumen",    "prioridad"),
+        ("Volumen por departamento",               "volumen",    "departamento"),
+        ("Volumen por categoría",                  "volumen",    "categoria"),
+        ("Tiempo de resolución por prioridad",     "resolucion", "prioridad"),
+        ("Tiempo de resolución por departamento",  "resolucion", "departamento"),
+        ("Tiempo de resolución por categoría",     "resolucion", "categoria"),
+        ("Tiempo en cada estado (historial)",      "historial",  "tiempo_estado"),
+        ("Transiciones entre estados (historial)", "historial",  "transiciones"),
+        ("Productividad por analista (historial)", "historial",  "productividad"),
+    ]
+
+    def _build_indicadores_report(self):
+        frame = QFrame()
+        frame.setMinimumSize(640, 560)
+        frame.setStyleSheet("""
+            QFrame {
+                background-color: white;
+                border-radius: 12px;
+                padding: 20px;
+            }
+            QLabel {
+                color: #000000;
+                font-weight: 600;
+                font-size: 12px;
+            }
+            QComboBox, QDateEdit {
+                border: 1px solid #999;
+                border-radius: 6px;
+                padding: 4px 8px;
+                font-size: 11px;
+                background-color: #ffffff;
+                color: #000000;
+                min-height: 26px;
+            }
+            QComboBox QAbstractItemView {
+                background-color: #ffffff;
+                color: #000000;
+                selection-background-color: #e0e0e0;
+            }
+            QCalendarWidget QWidget {
+                background-color: #ffffff;
+                color: #000000;
+            }
+            QCalendarWidget QAbstractItemView {
+                background-color: #ffffff;
+                color: #000000;
+                selection-background-color: #1E73FA;
+                selection-color: #ffffff;
+            }
+            QTableView {
+                background-color: #ffffff;
+                color: #000000;
+                gridline-color: #cccccc;
+                selection-background-color: #1E73FA;
+                selection-color: #ffffff;
+                border-radius: 8px;
+                border: 1px solid #ddd;
+            }
+            QHeaderView::section {
+                background-color: #f0f0f0;
+                color: #000000;
+                border: 1px solid #ccc;
+                font-weight: bold;
+                padding: 4px;
+            }
+            QPushButton#btn_generar_indicadores {
+                background-color: #ff9800;
+                color: white;
+                border-radius: 6px;
+                padding: 6px 14px;
+                font-weight: 600;
+            }
+            QPushButton#btn_generar_indicadores:hover {
+                background-color: #e68900;
+            }
+        """)
+
+        layout = QVBoxLayout(frame)
+        layout.setSpacing(15)
+        layout.setContentsMargins(25, 15, 25, 15)
+
+        title = QLabel("Indicadores de Tickets")
+        title.setStyleSheet("font-size: 15px; font-weight: 700; color: #000;")
+        layout.addWidget(title)
+
+        # === TIPO DE REPORTE ===
+        layout.addWidget(QLabel("Tipo de reporte:"))
+        self.combo_indicador = QComboBox()
+        for texto, tipo, dimension in self.TIPOS_INDICADOR:
+            self.combo_indicador.addItem(texto, (tipo, dimension))
+        layout.addWidget(self.combo_indicador)
+
+        # === FECHAS ===
+        row = QHBoxLayout()
+        row.setSpacing(20)
+        hoy = QDate.currentDate()
+
+        col1 = QVBoxLayout()
+        col1.addWidget(QLabel("Desde:"))
+        self.fecha_inicio_ind = QDateEdit()
+        self.fecha_inicio_ind.setDisplayFormat("dd/MM/yyyy")
+        self.fecha_inicio_ind.setCalendarPopup(True)
+        self.fecha_inicio_ind.setDate(hoy.addMonths(-1))
+        col1.addWidget(self.fecha_inicio_ind)
+
+        col2 = QVBoxLayout()
+        col2.addWidget(QLabel("Hasta:"))
+        self.fecha_fin_ind = QDateEdit()
+        self.fecha_fin_ind.setDisplayFormat("dd/MM/yyyy")
+        self.fecha_fin_ind.setCalendarPopup(True)
+        self.fecha_fin_ind.setDate(hoy)
+        col2.addWidget(self.fecha_fin_ind)
+
+        row.addLayout(col1)
+        row.addLayout(col2)
+        layout.addLayout(row)
+
+        # === PREVISUALIZACIÓN ===
+        layout.addWidget(QLabel("Previsualización:"))
+        self.ind_table = QTableView()
+        self.ind_model = QStandardItemModel(self.ind_table)
+        self.ind_table.setModel(self.ind_model)
+        layout.addWidget(self.ind_table)
+
+        # === BOTÓN GENERAR ===
+        self.btn_generar_indicadores = QPushButton("Generar Indicadores")
+        self.btn_generar_indicadores.setObjectName("btn_generar_indicadores")
+        layout.addWidget(self.btn_generar_indicadores, alignment=Qt.AlignCenter)
+
+        return frame
+
+
     # ============================================================
     #   AUXILIARES
     # ============================================================
     def _switch_page(self, index):
         self.btn_tickets.setChecked(index == 0)
         self.btn_bitacora.setChecked(index == 1)
+        self.btn_indicadores.setChecked(index == 2)
         self.stack.setCurrentIndex(index)
 
     def _load_filters(self):
+        """Pide prioridades y estados fuera del hilo de la UI."""
+        self.combo_prioridad.clear()
+        self.combo_estado.clear()
+        self.combo_prioridad.addItem("(todas)", None)
+        self.combo_estado.addItem("(todos)", None)
+        en_segundo_plano(
+            lambda: (self.db.get_priorities(), self.db.get_statuses()),
+            al_terminar=self._aplicar_filtros,
+        )
+
+    def _aplicar_filtros(self, resultado):
+        prioridades, estados = resultado
         self.combo_prioridad.clear()
         self.combo_estado.clear()
-        prioridades = self.db.get_priorities()
-        estados = self.db.get_statuses()
         self.combo_prioridad.addItem("(todas)", None)
         for p in prioridades:
             self.combo_prioridad.addItem(p["name"], p["id"])
@@ -402,6 +556,12 @@ class GenerarReportePage(QWidget):
         for e in estados:
             self.combo_estado.addItem(e["name"], e["id"])
 
+    def _aplicar_admins_bitacora(self, usuarios):
+        for a in usuarios or []:
+            if str(a.get("rol", "")).lower() in ["administrador", "admin"]:
+                nombre_completo = f"{a['nombre']} {a['apellido']}".strip()
+                self.input_usuario.addItem(nombre_completo, a['nombre'])
+
     def _load_admins(self):
         """Carga los usuarios con rol 'Administrador'."""
         self.combo_admin.clear()
@@ -456,19 +616,49 @@ class GenerarReportePage(QWidget):
         if callable(callback):
             callback(filtros)
 
+    def conectar_indicadores(self, indicadores_callback):
+        """Conecta el botón de indicadores con el callback principal."""
+        self.btn_generar_indicadores.clicked.connect(
+            lambda: self._emit_indicadores_filters(indicadores_callback)
+        )
+
+    def _emit_indicadores_filters(self, callback):
+        """Recolecta tipo de reporte y rango de fechas y llama al callback."""
+        tipo, dimension = self.combo_indicador.currentData()
+        filtros = {
+            "tipo": tipo,
+            "dimension": dimension,
+            "titulo": self.combo_indicador.currentText(),
+            "inicio": self.fecha_inicio_ind.date(),
+            "fin": self.fecha_fin_ind.date(),
+        }
+        if callable(callback):
+            callback(filtros)
+
+    def load_indicadores_rows(self, headers, rows):
+        """Carga el resultado de un indicador en su tabla de previsualización."""
+        self.ind_model.clear()
+        if not rows:
+            self.ind_model.setHorizontalHeaderLabels(["Sin resultados"])
+            return
+        self.ind_model.setHorizontalHeaderLabels(headers)
+        for row in rows:
+            self.ind_model.appendRow([QStandardItem(str(x)) for x in row])
+        self.ind_table.resizeColumnsToContents()
+
     def set_loading(self, is_loading: bool):
         """
         Muestra o oculta un estado de carga simple mientras se genera el reporte.
         """
         try:
             if is_loading:
-                print("⏳ Generando reporte, por favor espera...")
+                log.info("Generando reporte...")
                 self.setEnabled(False)
             else:
-                print("✅ Proceso de generación finalizado.")
+                log.info("Generación de reporte finalizada.")
                 self.setEnabled(True)
-        except Exception as e:
-            print("⚠ Error al cambiar estado de carga:", e)
+        except Exception:
+            log.exception("Error al cambiar el estado de carga")
 
     def load_preview_rows(self, headers, rows):
         """
@@ -511,10 +701,10 @@ class GenerarReportePage(QWidget):
             """)
             self.ticket_table.resizeColumnsToContents()
 
-            print(f"✅ Previsualización cargada con {len(rows)} registros.")
+            log.info("Previsualización cargada con %s registros.", len(rows))
 
-        except Exception as e:
-            print(f"❌ Error al cargar previsualización: {e}")
+        except Exception:
+            log.exception("Error al cargar la previsualización")
         
             
 
@@ -4,7 +4,7 @@ LoginDialog — validación real con MySQL (solo rol administrador)
 """
 
 import sys
-from PySide6.QtCore import Qt, QRect
+from PySide6.QtCore import Qt, QRect, QTimer
 from PySide6.QtGui import QIcon, QPixmap
 from PySide6.QtWidgets import (
     QApplication, QDialog, QFrame, QLabel, QLineEdit,
@@ -12,6 +12,7 @@ from PySide6.QtWidgets import (
 )
 from core.resources import asset_path
 from core.db_manager import DBManager  # ← import real
+from core.arranque import tiempos
 
 class Ui_Dialog(object):
     def setupUi(self, Dialog):
@@ -193,7 +194,8 @@ class LoginDialog(QDialog):
             usuario=user['nombre'],
             rol='ADMIN' if user['role_id'] == 1 else 'OTRO',
             accion='Inicio de sesión',
-            resultado='Éxito'
+            resultado='Éxito',
+            entidad='session', entidad_id=user['id'], evento='login'
         )
 
         # === Mensaje y paso a ventana principal ===
@@ -206,12 +208,18 @@ class LoginDialog(QDialog):
     def _open_main(self):
         try:
             from views.main_window import MainWindow
+            tiempos.iniciar("login_aceptado")
             self.main = MainWindow()
             self.main.show()
             self.close()
+            QTimer.singleShot(0, self._registrar_arranque)
         except Exception as e:
             self._msg("Error", f"No se pudo abrir la ventana principal:\n{e}", QMessageBox.Critical)
 
+    def _registrar_arranque(self):
+        tiempos.hito("ventana_principal", desde="login_aceptado")
+        tiempos.registrar()
+
     def _msg(self, title, text, icon):
         QMessageBox(icon, title, text, QMessageBox.Ok, self).exec()
 
@@ -5,14 +5,17 @@ barras superiores, navegación entre vistas y Bitácora de Acciones.
 Incluye: Usuarios, Categorías, Departamentos y Reportes.
 """
 
+import logging
+
 from PySide6.QtCore import Qt, QRect
 from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QFrame, QPushButton, QLabel, QVBoxLayout,
-    QHBoxLayout, QStackedWidget
+    QHBoxLayout, QStackedWidget, QMessageBox
 )
 from core.resources import asset_path
 from core.db_manager import DBManager
+from core.router import Router
 
 # === Imports de vistas ===
 from views.home_page import HomePage
@@ -29,12 +32,17 @@ from views.administrar_departamentos_page import AdministrarDepartamentosPage
 from views.generar_reporte_page import GenerarReportePage
 from views.modificar_categoria_page import ModificarCategoriaPage
 from views.modificar_departamento_page import ModificarDepartamentoPage
-from views.generar_reporte_page import GenerarReportePage
 from views.listar_correos_page import ListarCorreosPage
 
 
 from PySide6.QtGui import QStandardItem
 
+log = logging.getLogger(__name__)
+
+
+def _pagina(nombre):
+    return property(lambda self: self.router.pagina(nombre))
+
 
 class MainWindow(QMainWindow):
     def __init__(self, parent=None):
@@ -48,9 +56,9 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(central_widget)
         usuario = DBManager.get_user()
         if usuario:
-            print(f"Usuario logeado: {usuario['nombre']} ({usuario['rol']})")
+            log.info("Usuario logeado: %s (%s)", usuario["nombre"], usuario["rol"])
         else:
-            print("⚠ No hay usuario en sesión.")
+            log.warning("No hay usuario en sesión.")
 
         layout = QVBoxLayout(central_widget)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -74,53 +82,33 @@ class MainWindow(QMainWindow):
         self.stack.setStyleSheet("background-color: #1E73FA;")
         main_content.addWidget(self.stack, 4)
 
-        # === Páginas ===
-        self.home_page = HomePage()
-        self.create_user_page = CreateUserPage()
-        self.create_categoria_page = CreateCategoriaPage()
-        self.create_departamento_page = CreateDepartamentoPage()
-        self.admin_categoria_page = AdministrarCategoriasPage(
+        # === Páginas (se construyen al navegar por primera vez) ===
+        self.router = Router(self.stack)
+        self.router.registrar("inicio", HomePage)
+        self.router.registrar("crear_usuario", CreateUserPage)
+        self.router.registrar("crear_categoria", CreateCategoriaPage)
+        self.router.registrar("crear_departamento", CreateDepartamentoPage)
+        self.router.registrar("admin_usuarios", AdministrarUsuariosPage)
+        self.router.registrar("admin_categorias", lambda: AdministrarCategoriasPage(
             abrir_modificar_callback=lambda cat: self.abrir_modificar_categoria(cat)
-        )
-        self.admin_departamentos_page = AdministrarDepartamentosPage(
+        ))
+        self.router.registrar("admin_departamentos", lambda: AdministrarDepartamentosPage(
             abrir_modificar_callback=lambda dep: self.abrir_modificar_departamento(dep)
-        )
-        self.admin_user_page = AdministrarUsuariosPage()
-        self.modificar_usuario_page = ModificarUsuarioPage(
+        ))
+        self.router.registrar("modificar_usuario", lambda: ModificarUsuarioPage(
             volver_callback=lambda refrescar=False: self.volver_a_administrar(refrescar)
-        )
-
-        self.modificar_categoria_page = ModificarCategoriaPage(
+        ))
+        self.router.registrar("modificar_categoria", lambda: ModificarCategoriaPage(
             volver_callback=lambda refrescar=False: self.volver_a_admin_categorias(refrescar)
-        )
-
-        self.modificar_departamento_page = ModificarDepartamentoPage(
+        ))
+        self.router.registrar("modificar_departamento", lambda: ModificarDepartamentoPage(
             volver_callback=lambda refrescar=False: self.volver_a_admin_departamentos(refrescar)
-        )
-        # Crear la página
-        self.report_page = GenerarReportePage()
-        self.report_page.generarReporte.connect(self.on_generar_reporte)
-        self.report_page.conectar_tickets(self.on_generar_reporte)
-        self.report_page.conectar_acciones(self.on_generar_bitacora)
-        self.listar_correos_page = ListarCorreosPage()
-        self.bitacora_page = BitacoraPage()
-
-        # === Añadir páginas al stack ===
-        self.stack.addWidget(self.home_page)
-        self.stack.addWidget(self.create_user_page)
-        self.stack.addWidget(self.create_categoria_page)
-        self.stack.addWidget(self.create_departamento_page)
-        self.stack.addWidget(self.admin_user_page)
-        self.stack.addWidget(self.modificar_usuario_page)
-        self.stack.addWidget(self.admin_categoria_page)
-        self.stack.addWidget(self.admin_departamentos_page)
-        self.stack.addWidget(self.report_page)
-        self.stack.addWidget(self.bitacora_page)
-        self.stack.addWidget(self.modificar_categoria_page)
-        self.stack.addWidget(self.modificar_departamento_page)
-        self.stack.addWidget(self.listar_correos_page)
-
-        self.stack.setCurrentWidget(self.home_page)
+        ))
+        self.router.registrar("reportes", self._crear_report_page)
+        self.router.registrar("bitacora", BitacoraPage)
+        self.router.registrar("correos", ListarCorreosPage)
+
+        self.router.ir("inicio")
 
         # === Footer ===
         self.footer = QFrame()
@@ -128,8 +116,29 @@ class MainWindow(QMainWindow):
         self.footer.setStyleSheet("background-color: #B3B3B3; border: 0.5px solid #ffffff;")
         layout.addWidget(self.footer)
 
-        # === Conectar botones de administrar usuarios ===
-        self.conectar_botones_administrar()
+    # Accesos por nombre de atributo (las vistas buscan p. ej.
+    # window.modificar_usuario_page); construyen la página si hace falta
+    home_page = _pagina("inicio")
+    create_user_page = _pagina("crear_usuario")
+    create_categoria_page = _pagina("crear_categoria")
+    create_departamento_page = _pagina("crear_departamento")
+    admin_user_page = _pagina("admin_usuarios")
+    admin_categoria_page = _pagina("admin_categorias")
+    admin_departamentos_page = _pagina("admin_departamentos")
+    modificar_usuario_page = _pagina("modificar_usuario")
+    modificar_categoria_page = _pagina("modificar_categoria")
+    modificar_departamento_page = _pagina("modificar_departamento")
+    report_page = _pagina("reportes")
+    bitacora_page = _pagina("bitacora")
+    listar_correos_page = _pagina("correos")
+
+    def _crear_report_page(self):
+        page = GenerarReportePage()
+        page.generarReporte.connect(self.on_generar_reporte)
+        page.conectar_tickets(self.on_generar_reporte)
+        page.conectar_acciones(self.on_generar_bitacora)
+        page.conectar_indicadores(self.on_generar_indicadores)
+        return page
 
     # ---------------------------------------------------------
     #   Barras superiores
@@ -243,15 +252,15 @@ class MainWindow(QMainWindow):
             return btn
 
         # ---- Botones del menú ----
-        root.addWidget(make_menu_button("Inicio", "Home", lambda: self.stack.setCurrentWidget(self.home_page)))
-        root.addWidget(make_menu_button("Crear Usuario", "Create User", lambda: self.stack.setCurrentWidget(self.create_user_page)))
-        root.addWidget(make_menu_button("Crear Categoría", "Create Category", lambda: self.stack.setCurrentWidget(self.create_categoria_page)))
-        root.addWidget(make_menu_button("Crear Departamento", "Create Department", lambda: self.stack.setCurrentWidget(self.create_departamento_page)))
-        root.addWidget(make_menu_button("Administrar Usuarios", "Manage Users", lambda: self.stack.setCurrentWidget(self.admin_user_page)))
-        root.addWidget(make_menu_button("Administrar Categorías", "Manage Categories", lambda: self.stack.setCurrentWidget(self.admin_categoria_page)))
-        root.addWidget(make_menu_button("Administrar Departamentos", "Manage Departments", lambda: self.stack.setCurrentWidget(self.admin_departamentos_page)))
-        root.addWidget(make_menu_button("Generar Reporte", "Generate Report", lambda: self.stack.setCurrentWidget(self.report_page)))
-        root.addWidget(make_menu_button("Bitácora de Acciones", "Action Log", lambda: self.stack.setCurrentWidget(self.bitacora_page)))
+        root.addWidget(make_menu_button("Inicio", "Home", lambda: self.router.ir("inicio")))
+        root.addWidget(make_menu_button("Crear Usuario", "Create User", lambda: self.router.ir("crear_usuario")))
+        root.addWidget(make_menu_button("Crear Categoría", "Create Category", lambda: self.router.ir("crear_categoria")))
+        root.addWidget(make_menu_button("Crear Departamento", "Create Department", lambda: self.router.ir("crear_departamento")))
+        root.addWidget(make_menu_button("Administrar Usuarios", "Manage Users", lambda: self.router.ir("admin_usuarios")))
+        root.addWidget(make_menu_button("Administrar Categorías", "Manage Categories", lambda: self.router.ir("admin_categorias")))
+        root.addWidget(make_menu_button("Administrar Departamentos", "Manage Departments", lambda: self.router.ir("admin_departamentos")))
+        root.addWidget(make_menu_button("Generar Reporte", "Generate Report", lambda: self.router.ir("reportes")))
+        root.addWidget(make_menu_button("Bitácora de Acciones", "Action Log", lambda: self.router.ir("bitacora")))
         root.addWidget(make_menu_button("Correos", "Inbox", self._abrir_correos))
 
 
@@ -264,29 +273,6 @@ class MainWindow(QMainWindow):
 
         return sidebar
 
-    # ---------------------------------------------------------
-    #   Funciones para "Administrar Usuarios"
-    # ---------------------------------------------------------
-    def conectar_botones_administrar(self):
-        """Conecta los botones Modificar de la tabla con la vista de ModificarUsuario."""
-        table = self.admin_user_page.table
-        for row in range(table.rowCount()):
-            cell_widget = table.cellWidget(row, 5)
-            if cell_widget:
-                for btn in cell_widget.findChildren(QPushButton):
-                    if btn.text() == "Modificar":
-                        btn.clicked.connect(lambda _, r=row: self.ir_a_modificar_usuario(r))
-
-    def ir_a_modificar_usuario(self, row):
-        """Carga los datos del usuario seleccionado y abre la vista de modificación."""
-        datos = []
-        for col in range(5):  # ID, Nombre, Apellido, Correo, Rol
-            item = self.admin_user_page.table.item(row, col)
-            datos.append(item.text() if item else "")
-        data = DBManager.obtener_usuario_por_id(int(datos[0]))
-        self.modificar_usuario_page.cargar_datos_usuario(data)
-        self.stack.setCurrentWidget(self.modificar_usuario_page)
-
     # ---------------------------------------------------------
     #   Volver al login
     # ---------------------------------------------------------
@@ -301,12 +287,13 @@ class MainWindow(QMainWindow):
                 usuario=usuario['nombre'],
                 rol=usuario['rol'],
                 accion='Cierre de sesión',
-                resultado='Éxito'
+                resultado='Éxito',
+                entidad='session', entidad_id=usuario.get('id'), evento='logout'
             )
 
         # Limpiar usuario logeado
         DBManager.clear_user()
-        print("🔒 Sesión cerrada correctamente.")
+        log.info("Sesión cerrada correctamente.")
 
         # Cerrar ventana principal y volver al login
         self.hide()
@@ -316,31 +303,32 @@ class MainWindow(QMainWindow):
     # ---------------------------------------------------------
     #   Navegación entre vistas dinámicas
     # ---------------------------------------------------------
+    def _volver_a(self, nombre, refrescar):
+        # Si la página aún no existía, al construirse ya carga datos frescos
+        construida = self.router.construida(nombre)
+        pagina = self.router.ir(nombre)
+        if refrescar and construida:
+            pagina.refrescar_datos()
+
     def volver_a_administrar(self, refrescar=False):
         """Vuelve al listado de usuarios y refresca si se modificó algo."""
-        if refrescar and hasattr(self, "admin_user_page"):
-            self.admin_user_page.refrescar_datos()
-        self.stack.setCurrentWidget(self.admin_user_page)
+        self._volver_a("admin_usuarios", refrescar)
 
     def abrir_modificar_categoria(self, cat):
         self.modificar_categoria_page.cargar_datos_categoria(cat)
-        self.stack.setCurrentWidget(self.modificar_categoria_page)
+        self.router.ir("modificar_categoria")
 
     def abrir_modificar_departamento(self, dep):
         self.modificar_departamento_page.cargar_datos_departamento(dep)
-        self.stack.setCurrentWidget(self.modificar_departamento_page)
+        self.router.ir("modificar_departamento")
 
     def volver_a_admin_categorias(self, refrescar=False):
         """Vuelve al listado de categorías y refresca si se modificó algo."""
-        if refrescar and hasattr(self, "admin_categoria_page"):
-            self.admin_categoria_page.refrescar_datos()
-        self.stack.setCurrentWidget(self.admin_categoria_page)
+        self._volver_a("admin_categorias", refrescar)
 
     def volver_a_admin_departamentos(self, refrescar=False):
         """Vuelve al listado de departamentos y refresca si se modificó algo."""
-        if refrescar and hasattr(self, "admin_departamentos_page"):
-            self.admin_departamentos_page.refrescar_datos()
-        self.stack.setCurrentWidget(self.admin_departamentos_page)
+        self._volver_a("admin_departamentos", refrescar)
 
     def on_generar_reporte(self, filtros):
         """Callback que se ejecuta al presionar 'Generar Reporte'."""
@@ -352,7 +340,7 @@ class MainWindow(QMainWindow):
 
             if not resultados:
                 self.report_page.load_preview_rows([], [])
-                print("⚠ No se encontraron tickets con esos filtros.")
+                log.info("No se encontraron tickets con esos filtros.")
                 return
 
             headers = [
@@ -372,7 +360,7 @@ class MainWindow(QMainWindow):
 
             # Mostrar en previsualización
             self.report_page.load_preview_rows(headers, rows)
-            print(f"✅ {len(rows)} tickets cargados correctamente en el reporte.")
+            log.info("%s tickets cargados en el reporte.", len(rows))
 
             # === Exportar a CSV ===
             path = self.report_page.ask_save_csv()
@@ -383,15 +371,17 @@ class MainWindow(QMainWindow):
                         writer = csv.writer(f)
                         writer.writerow(headers)
                         writer.writerows(rows)
-                    print(f"✅ Reporte exportado correctamente a: {path}")
-                except Exception as e:
-                    print(f"❌ Error al exportar CSV: {e}")
+                    log.info("Reporte exportado a: %s", path)
+                except Exception:
+                    log.exception("Error al exportar CSV a %s", path)
+                    QMessageBox.critical(self, "Error", "No se pudo exportar el reporte a CSV.")
             else:
-                print("ℹ️ Exportación cancelada por el usuario.")
+                log.info("Exportación cancelada por el usuario.")
 
-        except Exception as e:
-            print("❌ Error al generar reporte:", e)
+        except Exception:
+            log.exception("Error al generar reporte de tickets")
             self.report_page.set_loading(False)
+            QMessageBox.critical(self, "Error", "No se pudo generar el reporte de tickets.")
 
 
     def closeEvent(self, event):
@@ -408,13 +398,17 @@ class MainWindow(QMainWindow):
                 usuario=usuario["nombre"],
                 rol=usuario["rol"],
                 accion="Cierre de sesión",
-                resultado="Aplicación cerrada"
+                resultado="Aplicación cerrada",
+                entidad="session", entidad_id=usuario.get("id"), evento="logout"
             )
-            print(f"🔒 Cierre de sesión registrado para {usuario['nombre']}.")
+            log.info("Cierre de sesión registrado para %s.", usuario["nombre"])
 
             # Limpiar sesión global
             DBManager.clear_user()
 
+        # Escribir lo que quede en el buffer de bitácora antes de salir
+        DBManager.flush_bitacora()
+
         # Aceptar el evento para que se cierre la app
         event.accept()
 
@@ -426,7 +420,7 @@ class MainWindow(QMainWindow):
 
             if not resultados:
                 self.report_page.bit_model.clear()
-                print("⚠ No se encontraron registros de bitácora con esos filtros.")
+                log.info("No se encontraron registros de bitácora con esos filtros.")
                 return
 
             headers = ["ID", "Fecha", "Usuario", "Rol", "Acción", "Resultado"]
@@ -441,7 +435,7 @@ class MainWindow(QMainWindow):
             for r in rows:
                 self.report_page.bit_model.appendRow([QStandardItem(str(x)) for x in r])
 
-            print(f"✅ {len(rows)} registros de bitácora cargados correctamente.")
+            log.info("%s registros de bitácora cargados.", len(rows))
 
             # === Exportar a CSV ===
             path = self.report_page.ask_save_csv()
@@ -451,16 +445,68 @@ class MainWindow(QMainWindow):
                     writer = csv.writer(f)
                     writer.writerow(headers)
                     writer.writerows(rows)
-                print(f"✅ Reporte de bitácora exportado a: {path}")
+                log.info("Reporte de bitácora exportado a: %s", path)
             else:
-                print("ℹ️ Exportación cancelada por el usuario.")
+                log.info("Exportación cancelada por el usuario.")
 
-        except Exception as e:
-            print("❌ Error al generar reporte de bitácora:", e)
+        except Exception:
+            log.exception("Error al generar reporte de bitácora")
+            QMessageBox.critical(self, "Error", "No se pudo generar o exportar el reporte de bitácora.")
   
 
+    def on_generar_indicadores(self, filtros):
+        """Genera un indicador desde las tablas de resumen, lo muestra y exporta el CSV."""
+        from core.db_manager import DBManager
+
+        def _horas(h):
+            return "> 720" if h == 9999 else f"≤ {h}"
+
+        try:
+            self.report_page.set_loading(True)
+            if filtros["tipo"] == "volumen":
+                resultados = DBManager.reporte_volumen(filtros)
+                headers = [filtros["dimension"].capitalize(), "Tickets"]
+                rows = [[r["nombre"], r["tickets"]] for r in resultados]
+            elif filtros["tipo"] == "historial":
+                headers, rows = DBManager.reporte_historial(filtros)
+            else:
+                resultados = DBManager.reporte_resolucion(filtros)
+                headers = [
+                    filtros["dimension"].capitalize(), "Resueltos",
+                    "Promedio (h)", "P50 (h)", "P90 (h)"
+                ]
+                rows = [
+                    [r["nombre"], r["resueltos"], r["promedio_horas"],
+                     _horas(r["p50_horas"]), _horas(r["p90_horas"])]
+                    for r in resultados
+                ]
+            self.report_page.set_loading(False)
+
+            self.report_page.load_indicadores_rows(headers, rows)
+            if not rows:
+                log.info("No hay datos para el indicador %s en el rango elegido.", filtros["titulo"])
+                return
+            log.info("%s: %s filas.", filtros["titulo"], len(rows))
+
+            # === Exportar a CSV ===
+            path = self.report_page.ask_save_csv("indicadores.csv")
+            if path:
+                import csv
+                with open(path, "w", newline="", encoding="utf-8") as f:
+                    writer = csv.writer(f)
+                    writer.writerow(headers)
+                    writer.writerows(rows)
+                log.info("Indicadores exportados a: %s", path)
+            else:
+                log.info("Exportación cancelada por el usuario.")
+
+        except Exception:
+            log.exception("Error al generar indicadores (%s)", filtros.get("titulo"))
+            self.report_page.set_loading(False)
+            QMessageBox.critical(self, "Error", "No se pudo generar o exportar el indicador.")
+
     def _abrir_correos(self):
         """Abre la vista de correos y carga los mensajes solo si aún no se cargaron."""
-        self.stack.setCurrentWidget(self.listar_correos_page)
-        if not self.listar_correos_page._correos_cargados:
-            self.listar_correos_page.cargar_correos()
+        page = self.router.ir("correos")
+        if not page._correos_cargados:
+            page.cargar_correos()
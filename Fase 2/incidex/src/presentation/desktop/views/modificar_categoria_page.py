@@ -181,7 +181,9 @@ class ModificarCategoriaPage(QWidget):
                     usuario=usuario_log["nombre"],
                     rol=usuario_log["rol"],
                     accion="Modificación de categoría",
-                    resultado=f"Categoría ID {self.categoria_id} ('{nombre}') modificada correctamente."
+                    resultado=f"Categoría ID {self.categoria_id} ('{nombre}') modificada correctamente.",
+                    entidad="category", entidad_id=self.categoria_id, evento="update",
+                    datos={"name": nombre}
                 )
 
             if callable(self.volver_callback):
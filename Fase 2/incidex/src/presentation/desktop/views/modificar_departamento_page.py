@@ -118,7 +118,9 @@ class ModificarDepartamentoPage(QWidget):
                     usuario=usuario_log["nombre"],
                     rol=usuario_log["rol"],
                     accion="Modificación de departamento",
-                    resultado=f"Departamento ID {self.departamento['id']} actualizado a '{nuevo_nombre}'."
+                    resultado=f"Departamento ID {self.departamento['id']} actualizado a '{nuevo_nombre}'.",
+                    entidad="department", entidad_id=self.departamento["id"], evento="update",
+                    datos={"name": nuevo_nombre}
                 )
 
             if callable(self.volver_callback):
@@ -8,6 +8,7 @@ from PySide6.QtCore import Qt, QDate
 from PySide6.QtGui import QPixmap
 from core.resources import asset_path
 from core.db_manager import DBManager
+from core.tareas import en_segundo_plano
 
 import re
 import smtplib
@@ -21,6 +22,8 @@ class ModificarUsuarioPage(QWidget):
         super().__init__(parent)
         self.volver_callback = volver_callback
         self.usuario_id = None
+        self._rol_pendiente = None
+        self._departamento_pendiente = None
 
         self.setStyleSheet("background-color: #1E73FA;")
 
@@ -214,28 +217,40 @@ class ModificarUsuarioPage(QWidget):
 
     # ------------------------------------------------------------------
     def cargar_roles(self):
-        try:
-            roles = DBManager.obtener_roles() or []
-        except:
-            roles = []
+        # En otro hilo; si el usuario se cargó antes, se selecciona al llegar
+        en_segundo_plano(DBManager.obtener_roles, al_terminar=self._aplicar_roles,
+                         al_fallar=lambda e: self._aplicar_roles([]))
+
+    def _aplicar_roles(self, roles):
+        roles = roles or []
         self.role.clear()
         if not roles:
             self.role.addItem("No hay roles disponibles")
             return
         for r in roles:
             self.role.addItem(r["name"], r["id"])
+        self._seleccionar(self.role, self._rol_pendiente)
 
     def cargar_departamentos(self):
-        try:
-            deps = DBManager.obtener_departamentos() or []
-        except:
-            deps = []
+        en_segundo_plano(DBManager.obtener_departamentos, al_terminar=self._aplicar_departamentos,
+                         al_fallar=lambda e: self._aplicar_departamentos([]))
+
+    def _aplicar_departamentos(self, deps):
+        deps = deps or []
         self.department.clear()
         if not deps:
             self.department.addItem("No hay departamentos disponibles")
             return
         for d in deps:
             self.department.addItem(d["name"], d["id"])
+        self._seleccionar(self.department, self._departamento_pendiente)
+
+    @staticmethod
+    def _seleccionar(combo, valor):
+        if valor is not None:
+            idx = combo.findData(valor)
+            if idx >= 0:
+                combo.setCurrentIndex(idx)
 
     # ------------------------------------------------------------------
     def cargar_datos_usuario(self, data):
@@ -282,10 +297,9 @@ class ModificarUsuarioPage(QWidget):
         if rol_id is None:
             rol_id = data.get("role_id")  # por si la columna viene sin alias
 
+        self._rol_pendiente = rol_id
         if rol_id is not None:
-            idx_rol = self.role.findData(rol_id)
-            if idx_rol >= 0:
-                self.role.setCurrentIndex(idx_rol)
+            self._seleccionar(self.role, rol_id)
         else:
             print("⚠ data sin 'rol_id' ni 'role_id':", data)
 
@@ -294,10 +308,9 @@ class ModificarUsuarioPage(QWidget):
         if dept_id is None:
             dept_id = data.get("department_id")
 
+        self._departamento_pendiente = dept_id
         if dept_id is not None:
-            idx_dep = self.department.findData(dept_id)
-            if idx_dep >= 0:
-                self.department.setCurrentIndex(idx_dep)
+            self._seleccionar(self.department, dept_id)
 
     # ------------------------------------------------------------------
     def modificar_usuario(self):
@@ -393,7 +406,8 @@ class ModificarUsuarioPage(QWidget):
                     usuario=usuario_log["nombre"],
                     rol=usuario_log["rol"],
                     accion="Modificación de usuario",
-                    resultado=f"Usuario {data['nombre']} modificado correctamente."
+                    resultado=f"Usuario {data['nombre']} modificado correctamente.",
+                    entidad="user", entidad_id=self.usuario_id, evento="update"
                 )
 
             # Volver
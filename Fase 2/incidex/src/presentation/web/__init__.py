@@ -1,5 +1,6 @@
 from flask import Flask
 from dotenv import load_dotenv
+from werkzeug.middleware.proxy_fix import ProxyFix
 import os
 from datetime import timedelta
 
@@ -18,15 +19,70 @@ def create_app():
 
     app.secret_key = os.getenv("FLASK_SECRET_KEY", "dev_secret")
 
+    # ==== Detrás de un proxy (nginx) ====
+    # Cantidad de proxies de confianza delante de la app; con > 0,
+    # request.remote_addr (y con él el límite por IP) sale de X-Forwarded-For.
+    # Por defecto 0: servida directo (flask run, uvicorn) cualquiera podría
+    # falsear su IP con ese header. Solo se activa detrás de un proxy real.
+    app.config["PROXY_FIX_X_FOR"] = int(os.getenv("PROXY_FIX_X_FOR", "0"))
+    app.config["PROXY_FIX_X_PROTO"] = int(os.getenv("PROXY_FIX_X_PROTO", "0"))
+    if app.config["PROXY_FIX_X_FOR"] or app.config["PROXY_FIX_X_PROTO"]:
+        app.wsgi_app = ProxyFix(
+            app.wsgi_app,
+            x_for=app.config["PROXY_FIX_X_FOR"],
+            x_proto=app.config["PROXY_FIX_X_PROTO"],
+        )
+
+    # ==== Logging estructurado (JSON, escritura en un hilo aparte) ====
+    app.config["LOG_LEVEL"] = os.getenv("LOG_LEVEL", "INFO")
+    app.config["LOG_LEVELS"] = os.getenv("LOG_LEVELS", "")      # ej: incidex.sql=WARNING,werkzeug=ERROR
+    app.config["LOG_FORMAT"] = os.getenv("LOG_FORMAT", "json")  # json | text
+    from src.infrastructure.structured_logging import init_logging
+    init_logging(app)
+
     # ==== Base de datos (MySQL) ====
     app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv("DATABASE_URL")
-    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
-        "pool_pre_ping": True,
-        "pool_recycle": 280,
-    }
+    # Pool por tipo de despliegue: dev | test | prod-small | prod-large
+    # (DB_POOL_SIZE, DB_STATEMENT_TIMEOUT_MS, etc. ajustan el elegido)
+    from src.infrastructure.persistence.engine_profiles import engine_options, resolve_profile
+    app.config["DB_PROFILE"] = os.getenv("DB_PROFILE", "dev")
+    db_profile = resolve_profile(app.config["DB_PROFILE"])
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(db_profile, app.config["SQLALCHEMY_DATABASE_URI"])
+    # Réplica de lectura opcional (listados y exportación; ver read_routing.py)
+    replica_url = os.getenv("DATABASE_REPLICA_URL")
+    if replica_url:
+        # Un bind en forma de dict no hereda SQLALCHEMY_ENGINE_OPTIONS
+        replica = {"url": replica_url, **engine_options(db_profile, replica_url)}
+        if replica_url.startswith("mysql"):
+            # Que una réplica caída falle rápido y se pase al primario
+            replica["connect_args"] = {
+                **replica.get("connect_args", {}),
+                "connect_timeout": int(os.getenv("REPLICA_CONNECT_TIMEOUT", "2")),
+            }
+        app.config["SQLALCHEMY_BINDS"] = {"replica": replica}
+    app.config["REPLICA_STICKY_SECONDS"] = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+    app.config["REPLICA_RETRY_SECONDS"] = float(os.getenv("REPLICA_RETRY_SECONDS", "30"))
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
     db.init_app(app)
 
+    from src.infrastructure.persistence.read_routing import read_router
+    read_router.init_app(app)
+
+    # Conteo y tiempo de consultas por request (Server-Timing + log de lentas)
+    app.config["SQL_SLOW_MS"] = float(os.getenv("SQL_SLOW_MS", "200"))
+    from src.infrastructure.persistence.query_stats import init_query_stats
+    init_query_stats(app)
+
+    # Perfilado opcional de una fracción de requests (se activa también
+    # en caliente desde Reportes; ver src/infrastructure/profiling.py)
+    app.config["PROFILE_ENABLED"] = os.getenv("PROFILE_ENABLED", "False").lower() == "true"
+    app.config["PROFILE_SAMPLE_RATE"] = float(os.getenv("PROFILE_SAMPLE_RATE", "0.01"))
+    app.config["PROFILE_MODE"] = os.getenv("PROFILE_MODE", "sample")   # sample | cprofile
+    app.config["PROFILE_MIN_MS"] = float(os.getenv("PROFILE_MIN_MS", "0"))
+    app.config["PROFILE_DIR"] = os.getenv("PROFILE_DIR", os.path.join(os.getcwd(), "var", "profiles"))
+    from src.infrastructure.profiling import profiler
+    profiler.init_app(app)
+
     # iniciar modelos
     import src.domain.entities 
 
@@ -41,6 +97,20 @@ def create_app():
 
     app.config["MAIL_USE_TLS"] = os.getenv("MAIL_USE_TLS", "True").lower() == "true"
     app.config["MAIL_USE_SSL"] = os.getenv("MAIL_USE_SSL", "False").lower() == "true"
+    # Los correos salen por aiosmtplib en el io-loop (src/infrastructure/io_loop.py)
+    app.config["MAIL_TIMEOUT"] = float(os.getenv("MAIL_TIMEOUT", "30"))
+    app.config["MAIL_MAX_CONNECTIONS"] = int(os.getenv("MAIL_MAX_CONNECTIONS", "5"))
+
+    # ==== Límites de uso (token bucket; ver src/infrastructure/rate_limit.py) ====
+    # memory: por proceso | db: tabla rate_limit_buckets compartida por los workers
+    app.config["RATELIMIT_ENABLED"] = os.getenv("RATELIMIT_ENABLED", "True").lower() == "true"
+    app.config["RATELIMIT_STORAGE"] = os.getenv("RATELIMIT_STORAGE", "memory")
+    app.config["RATELIMIT_AI_SUGGEST_USER"] = os.getenv("RATELIMIT_AI_SUGGEST_USER", "10/minute")
+    app.config["RATELIMIT_AI_SUGGEST_IP"] = os.getenv("RATELIMIT_AI_SUGGEST_IP", "30/minute")
+    app.config["RATELIMIT_SUPPORT_USER"] = os.getenv("RATELIMIT_SUPPORT_USER", "5/hour")
+    app.config["RATELIMIT_SUPPORT_IP"] = os.getenv("RATELIMIT_SUPPORT_IP", "5/hour")
+    from src.infrastructure.rate_limit import rate_limiter
+    rate_limiter.init_app(app)
 
     # ==== Migrate ====
     Migrate(app, db, compare_type=True)
@@ -54,6 +124,48 @@ def create_app():
     os.makedirs(upload_base, exist_ok=True)
     app.config["UPLOAD_FOLDER"] = upload_base
 
+    # Límites de adjuntos: por archivo (se corta mientras se copia) y por
+    # request completo (Werkzeug responde 413 antes de leer el cuerpo)
+    app.config["MAX_ATTACHMENT_BYTES"] = int(os.getenv("MAX_ATTACHMENT_MB", "20")) * 1024 * 1024
+    app.config["MAX_CONTENT_LENGTH"] = int(os.getenv("MAX_UPLOAD_MB", "60")) * 1024 * 1024
+
+    # Descarga de adjuntos delegada al proxy (opcional)
+    app.config["ATTACHMENT_ACCEL_REDIRECT"] = os.getenv("ATTACHMENT_ACCEL_REDIRECT")  # ej: /protected-uploads
+    app.config["USE_X_SENDFILE"] = os.getenv("USE_X_SENDFILE", "False").lower() == "true"
+
+    # ==== Tiempo real (SSE) ====
+    # db: cada worker consulta cambios por watermark | local: un solo proceso
+    app.config["REALTIME_BACKEND"] = os.getenv("REALTIME_BACKEND", "db")
+    app.config["REALTIME_POLL_SECONDS"] = float(os.getenv("REALTIME_POLL_SECONDS", "2"))
+    app.config["SSE_MAX_SECONDS"] = int(os.getenv("SSE_MAX_SECONDS", "300"))
+    app.config["SSE_HEARTBEAT_SECONDS"] = 15
+    # Presupuesto de hilos: con WSGI (dev server, gunicorn gthread) cada
+    # stream abierto retiene un hilo hasta SSE_MAX_SECONDS. SSE_MAX_STREAMS
+    # debe quedar bastante por debajo de los hilos del worker (p. ej.
+    # --threads 32 -> 16 streams y 16 hilos para el resto de las rutas);
+    # los que excedan reciben `retry:` y reconectan más tarde. Solo abren
+    # stream las páginas con realtime_enabled (panel y detalle).
+    app.config["SSE_MAX_STREAMS"] = int(os.getenv("SSE_MAX_STREAMS", "16"))
+    app.config["SSE_BUSY_RETRY_MS"] = int(os.getenv("SSE_BUSY_RETRY_MS", "30000"))
+
+    from src.infrastructure.realtime.db_watermark import init_realtime
+    init_realtime(app)
+
+    # ==== Analítica del historial (/app/reports) ====
+    # Copia en memoria de ticket_history por worker (~48 bytes por fila, ver
+    # analytics/ticket_history.py). True: se carga al arrancar en un hilo
+    # aparte en vez de en el primer request a Reportes.
+    app.config["ANALYTICS_WARM"] = os.getenv("ANALYTICS_WARM", "False").lower() == "true"
+    if app.config["ANALYTICS_WARM"]:
+        from src.infrastructure.analytics.ticket_history import history_store
+        history_store.warm(app)
+
+    # ==== Auditoría (audit_events, escritura por lotes) ====
+    # Al salir se escribe lo pendiente; si el proceso muere se pierde
+    app.config["AUDIT_FLUSH_AT_EXIT"] = os.getenv("AUDIT_FLUSH_AT_EXIT", "True").lower() == "true"
+    from src.infrastructure.audit.writer import audit_writer
+    audit_writer.init_app(app)
+
 
     @app.context_processor
     def inject_csrf_token():
@@ -87,12 +199,29 @@ def create_app():
     from src.presentation.web.blueprints.auth.routes import auth_bp
     app.register_blueprint(auth_bp)
 
+    # ==== Operación: /health (readiness), /health/live y /metrics ====
+    app.config["HEALTH_DB_TIMEOUT"] = float(os.getenv("HEALTH_DB_TIMEOUT", "2"))
+    app.config["METRICS_TOKEN"] = os.getenv("METRICS_TOKEN")  # opcional: Bearer para /metrics
+    from src.presentation.web.blueprints.ops.routes import ops_bp
+    app.register_blueprint(ops_bp)
+
     # ==== Comandos CLI personalizados ====
     from src.commands.seed_user import create_user_cmd
     app.cli.add_command(create_user_cmd)
 
-    @app.route("/health")
-    def health_check():
-        return {"status": "ok", "service": "Incidex Web"}
+    from src.commands.archive_notifications import archive_notifications_cmd
+    app.cli.add_command(archive_notifications_cmd)
+
+    from src.commands.sla_sweep import sla_sweep_cmd
+    app.cli.add_command(sla_sweep_cmd)
+
+    from src.commands.seed_data import seed_data_cmd
+    app.cli.add_command(seed_data_cmd)
+
+    from src.commands.load_test import load_test_cmd
+    app.cli.add_command(load_test_cmd)
+
+    from src.commands.profile_report import profile_report_cmd
+    app.cli.add_command(profile_report_cmd)
 
     return app
\ No newline at end of file
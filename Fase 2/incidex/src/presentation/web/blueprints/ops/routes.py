@@ -0,0 +1,130 @@
+import hmac
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from flask import Blueprint, Response, abort, current_app, g, jsonify, request
+from sqlalchemy import text
+
+from src.infrastructure import metrics
+from src.infrastructure.audit.writer import audit_writer
+from src.infrastructure.io_loop import io_loop
+from src.infrastructure.persistence.database import db
+from src.infrastructure.realtime.bus import bus
+
+ops_bp = Blueprint("ops", __name__)
+
+# Sin latencia propia: /metrics y /health se consultan cada pocos segundos
+_SKIP_ENDPOINTS = {"ops.metrics", "ops.health", "ops.live", "static"}
+
+_ping_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="health-db")
+_ping_lock = threading.Lock()
+_ping_future = None
+
+
+# ==== Latencia por endpoint (para toda la app) ====
+
+@ops_bp.before_app_request
+def _metrics_start():
+    g.metrics_t0 = time.perf_counter()
+
+
+@ops_bp.after_app_request
+def _metrics_observe(response):
+    t0 = g.get("metrics_t0")
+    endpoint = request.endpoint or "unmatched"
+    if t0 is not None and endpoint not in _SKIP_ENDPOINTS:
+        metrics.HTTP_LATENCY.observe(time.perf_counter() - t0, endpoint=endpoint, method=request.method)
+        metrics.HTTP_REQUESTS.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+    return response
+
+
+@ops_bp.record_once
+def _register_gauges(state):
+    app = state.app
+
+    def pool():
+        with app.app_context():
+            st = metrics.pool_status(db.engine.pool)
+        return {(k,): v for k, v in st.items()} if st else None
+
+    metrics.registry.gauge(
+        "incidex_db_pool_connections", "Conexiones del pool por estado (size, checked_out, checked_in, overflow)",
+        pool, labels=("state",),
+    )
+    metrics.registry.gauge(
+        "incidex_realtime_subscribers", "Conexiones SSE abiertas en este proceso", bus.subscriber_count,
+    )
+    metrics.registry.gauge(
+        "incidex_realtime_queued_events", "Eventos de notificación encolados sin entregar (todas las SSE)",
+        bus.queued_events,
+    )
+    metrics.registry.gauge(
+        "incidex_audit_pending_events", "Eventos de auditoría esperando el próximo lote", audit_writer.pending,
+    )
+    metrics.registry.gauge(
+        "incidex_io_tasks_inflight", "Tareas de red en el io-loop (correos, llamadas a Gemini)", io_loop.pending,
+    )
+
+
+# ==== Endpoints ====
+
+@ops_bp.get("/metrics", endpoint="metrics")
+def metrics_view():
+    token = current_app.config.get("METRICS_TOKEN")
+    if token:
+        given = (request.headers.get("Authorization") or "").removeprefix("Bearer ").strip()
+        if not hmac.compare_digest(given, token):
+            abort(401)
+    return Response(metrics.registry.render(), mimetype="text/plain; version=0.0.4; charset=utf-8")
+
+
+def _db_ping(app):
+    with app.app_context():
+        try:
+            db.session.execute(text("SELECT 1"))
+        finally:
+            db.session.remove()
+
+
+@ops_bp.get("/health", endpoint="health")
+def health():
+    """
+    Readiness: responde 200 solo si la BD contesta un SELECT 1 dentro de
+    HEALTH_DB_TIMEOUT segundos. El ping corre en un hilo aparte para que
+    una conexión colgada no bloquee el request; si el ping anterior sigue
+    pendiente no se lanza otro (se informa 503 de inmediato).
+    """
+    global _ping_future
+    timeout = float(current_app.config.get("HEALTH_DB_TIMEOUT", 2.0))
+    app = current_app._get_current_object()
+    t0 = time.perf_counter()
+
+    with _ping_lock:
+        if _ping_future is not None and not _ping_future.done():
+            fut, error = None, "ping anterior sin respuesta"
+        else:
+            fut = _ping_future = _ping_executor.submit(_db_ping, app)
+            error = None
+
+    if fut is not None:
+        try:
+            fut.result(timeout=timeout)
+        except FutureTimeout:
+            error = f"sin respuesta en {timeout:g}s"
+        except Exception as e:
+            error = type(e).__name__
+
+    db_ms = round((time.perf_counter() - t0) * 1000, 1)
+    body = {
+        "status": "ok" if error is None else "unavailable",
+        "service": "Incidex Web",
+        "db": {"ok": error is None, "ms": db_ms, **({"error": error} if error else {})},
+    }
+    return jsonify(body), (200 if error is None else 503)
+
+
+@ops_bp.get("/health/live", endpoint="live")
+def live():
+    """Liveness: el proceso atiende requests (no toca la BD)."""
+    return {"status": "ok", "service": "Incidex Web"}
@@ -1,5 +1,8 @@
+import math
+
 from flask import Blueprint, render_template, request, current_app
 from src.infrastructure.notifications.support_mail import send_support_email 
+from src.infrastructure.rate_limit import rate_limiter
 
 public_bp = Blueprint("public", __name__)
 
@@ -11,7 +14,21 @@ def index():
 def features():
     return render_template("public/features.html", title="Características")
 
+def _support_limited(retry_after: float):
+    """Sobre el límite no se envía el correo: se vuelve a mostrar el formulario con lo escrito."""
+    minutes = max(1, math.ceil(retry_after / 60))
+    form_data = {k: (request.form.get(k) or "").strip() for k in ("nombre", "correo", "asunto", "mensaje")}
+    return render_template(
+        "public/support.html",
+        title="Soporte",
+        sent_ok=False,
+        errors=[f"Enviaste demasiados mensajes seguidos. Inténtalo nuevamente en {minutes} min."],
+        form_data=form_data,
+    ), 429, {"Retry-After": str(math.ceil(retry_after))}
+
 @public_bp.route("/support", methods=["GET", "POST"])
+@rate_limiter.limit("public.support", user="RATELIMIT_SUPPORT_USER", ip="RATELIMIT_SUPPORT_IP",
+                    methods=("POST",), on_limit=_support_limited)
 def support():
     if request.method == "POST":
         nombre  = (request.form.get("nombre")  or "").strip()
@@ -1,14 +1,30 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app, send_file, abort, jsonify
+from flask import Blueprint, Response, render_template, request, redirect, url_for, flash, current_app, send_file, abort, jsonify
 from flask_login import login_required, current_user
 
 from src.presentation.web.blueprints.tickets.forms import TicketCreateForm
 from src.application.use_cases.ticket_service import TicketService
 from src.infrastructure.persistence.repositories.ticket_repository import TicketRepository
+from src.infrastructure.storage.attachment_store import AttachmentTooLarge
+from src.infrastructure.storage.previews import IMAGE_MIME_TYPES, preview_path, preview_mimetype, schedule_preview
+from src.infrastructure.notifications.unread_cache import unread_cache
+from src.infrastructure.realtime.bus import bus, user_topic, ticket_topic
+from src.infrastructure.rate_limit import rate_limiter
 
 import io
+import os
 import csv
+import time
+import logging
 
 tickets = Blueprint('tickets', __name__, url_prefix='/app')
+log = logging.getLogger(__name__)
+
+PREVIEW_MAX_AGE = 365 * 24 * 3600
+
+
+def _flash_too_large(filename: str):
+    max_mb = current_app.config.get("MAX_ATTACHMENT_BYTES", 0) // (1024 * 1024)
+    flash(f"«{filename}» supera el máximo de {max_mb} MB por archivo y no se adjuntó.", "error")
 
 
 @tickets.route('/dashboard', endpoint='dashboard')
@@ -71,9 +87,7 @@ def create_post():
     # archivos adjuntos del formulario (name="files")
     files = request.files.getlist("files")  # importante que el name del input sea "files"
 
-    # DEBUG duro para ver qué llega realmente
-    print("DEBUG FILES RAW:", request.files)
-    print("DEBUG getlist('files'):", [f.filename for f in files])
+    log.debug("Adjuntos recibidos al crear ticket", extra={"files": [f.filename for f in files]})
 
     # Fallback de autoasignación en backend
     if (not assignee_id) and department_id:
@@ -83,27 +97,32 @@ def create_post():
             assignee_id = int(lst[0]['id'])  # toma el primero
 
     try:
-        # 1) Crear el ticket
-        created = svc.create(
-            requester_id=current_user.id,
-            subject=subject,
-            details=details,
-            category_id=category_id,
-            department_id=department_id,
-            priority_id=priority_id,
-            assignee_id=assignee_id if assignee_id else None
-        )
-
-        # 2) Guardar adjuntos (si hay)
-        upload_dir = current_app.config.get("UPLOAD_FOLDER", "var/uploads")
-        for f in files:
-            if not f or not f.filename:
-                print("no hay archivos")
-                continue
-            try:
-                svc.add_attachment(created.id, current_user.id, f, upload_dir)
-            except ValueError:
-                current_app.logger.warning("Adjunto inválido al crear ticket", exc_info=True)
+        # Ticket + notificaciones + adjuntos en una sola transacción;
+        # correos y publicación de archivos ocurren después del commit.
+        with svc.unit_of_work():
+            # 1) Crear el ticket
+            created = svc.create(
+                requester_id=current_user.id,
+                subject=subject,
+                details=details,
+                category_id=category_id,
+                department_id=department_id,
+                priority_id=priority_id,
+                assignee_id=assignee_id if assignee_id else None
+            )
+
+            # 2) Guardar adjuntos (si hay)
+            upload_dir = current_app.config.get("UPLOAD_FOLDER", "var/uploads")
+            for f in files:
+                if not f or not f.filename:
+                    continue
+                try:
+                    svc.add_attachment(created.id, current_user.id, f, upload_dir)
+                except AttachmentTooLarge:
+                    # El ticket se crea igual; se avisa qué archivo quedó fuera
+                    _flash_too_large(f.filename)
+                except ValueError:
+                    current_app.logger.warning("Adjunto inválido al crear ticket", exc_info=True)
 
         # 3) Ir al detalle
         return redirect(url_for('tickets.detail', ticket_id=created.id))
@@ -154,6 +173,7 @@ def detail(ticket_id: int):
         is_analyst=is_analyst,
         is_request=is_request,
         is_assignee=is_assignee,
+        thumb_types=IMAGE_MIME_TYPES,
     )
 
 
@@ -173,7 +193,7 @@ def change_status(ticket_id: int):
     note = request.form.get("note", "")
 
     if not to_status_id:
-        print("Selecciona un estado válido.", "error")
+        log.info("Cambio de estado sin estado destino", extra={"ticket_id": ticket_id})
         return redirect(url_for('tickets.detail', ticket_id=ticket_id))
 
     try:
@@ -184,13 +204,11 @@ def change_status(ticket_id: int):
             to_status_id=to_status_id,
             note=note
         )
-        print("Estado actualizado y registrado en el historial.", "ok")
     except PermissionError as e:
-        print(str(e), "error")
+        log.warning("Cambio de estado denegado: %s", e, extra={"ticket_id": ticket_id})
         return abort(403)
-    except Exception as e:
-        print(str(e), "error")
-        print("No se pudo cambiar el estado.", "error")
+    except Exception:
+        log.exception("No se pudo cambiar el estado", extra={"ticket_id": ticket_id})
 
     return redirect(url_for('tickets.detail', ticket_id=ticket_id))
 
@@ -217,10 +235,10 @@ def assign(ticket_id: int):
             note=note
         )
     except PermissionError as e:
-        print(str(e), "error")
+        log.warning("Reasignación denegada: %s", e, extra={"ticket_id": ticket_id})
         return abort(403)
     except Exception:
-        print("No se pudo actualizar la asignación.", "error")
+        log.exception("No se pudo actualizar la asignación", extra={"ticket_id": ticket_id})
 
     return redirect(url_for('tickets.detail', ticket_id=ticket_id))
 
@@ -236,9 +254,8 @@ def add_comment(ticket_id):
 
     try:
         svc.add_comment(ticket_id, current_user.id, request.form.get("body", ""))
-        print("Comentario agregado.", "success")
     except ValueError as e:
-        print(str(e), "error")
+        log.info("Comentario rechazado: %s", e, extra={"ticket_id": ticket_id})
     return redirect(url_for('tickets.detail', ticket_id=ticket_id))
 
 # ===== ADJUNTAR ARCHIVO =====
@@ -254,21 +271,102 @@ def upload(ticket_id):
     file = request.files.get("file")
     try:
         att_id = svc.add_attachment(ticket_id, current_user.id, file, current_app.config.get("UPLOAD_FOLDER", "var/uploads"))
-        print("Archivo adjuntado.", "success")
+    except AttachmentTooLarge:
+        _flash_too_large(file.filename)
     except ValueError as e:
-        print(str(e), "error")
+        log.info("Adjunto rechazado: %s", e, extra={"ticket_id": ticket_id})
     return redirect(url_for('tickets.detail', ticket_id=ticket_id))
 
 # ===== DESCARGA SEGURA =====
-@tickets.get('/detail/<int:ticket_id>/file/<int:att_id>', endpoint='download')
-@login_required
-def download(ticket_id, att_id):
+def _send_attachment(meta):
+    """
+    Envía un adjunto con el sha256 como ETag fuerte (If-None-Match -> 304)
+    y soporte de Range. Si hay proxy delante, delega el envío de bytes:
+      - ATTACHMENT_ACCEL_REDIRECT: prefijo interno de nginx (X-Accel-Redirect)
+      - USE_X_SENDFILE: Apache / lighttpd (X-Sendfile, lo resuelve Flask)
+    """
+    etag = meta["checksum_sha256"] or True
+    accel_prefix = current_app.config.get("ATTACHMENT_ACCEL_REDIRECT")
+
+    if accel_prefix:
+        upload_root = current_app.config.get("UPLOAD_FOLDER", "var/uploads")
+        rel_path = os.path.relpath(meta["file_path"], upload_root).replace(os.sep, "/")
+        resp = current_app.response_class(mimetype=meta["mime_type"])
+        resp.headers["X-Accel-Redirect"] = f"{accel_prefix.rstrip('/')}/{rel_path}"
+        resp.headers.set("Content-Disposition", "attachment", filename=meta["file_name"])
+        if isinstance(etag, str):
+            resp.set_etag(etag)
+        resp = resp.make_conditional(request)
+    else:
+        resp = send_file(
+            meta["file_path"],
+            mimetype=meta["mime_type"],
+            as_attachment=True,
+            download_name=meta["file_name"],
+            conditional=True,
+            etag=etag,
+        )
+
+    # Contenido inmutable (direccionado por hash), pero solo para el usuario autenticado
+    resp.cache_control.private = True
+    return resp
+
+
+def _visible_attachment(ticket_id, att_id):
+    """Metadata del adjunto si el usuario puede ver el ticket; si no, aborta."""
     repo = TicketRepository()
+    svc = TicketService(repo)
+
+    tmin = repo.get_ticket_minimal(ticket_id)
+    if not tmin:
+        abort(404)
+
+    roles = [r.name for r in getattr(current_user, "roles", [])] if hasattr(current_user, "roles") else []
+    if not svc.can_view(tmin, current_user.id, roles):
+        abort(403)
+
     meta = repo.get_attachment_path(att_id, ticket_id)
     if not meta:
         abort(404)
-    # (opcional) validar que el usuario puede ver el ticket (requester o assignee)
-    return send_file(meta["file_path"], as_attachment=True, download_name=meta["file_name"])
+    return meta
+
+
+@tickets.get('/detail/<int:ticket_id>/file/<int:att_id>', endpoint='download')
+@login_required
+def download(ticket_id, att_id):
+    return _send_attachment(_visible_attachment(ticket_id, att_id))
+
+
+@tickets.get('/detail/<int:ticket_id>/file/<int:att_id>/preview', endpoint='preview')
+@login_required
+def preview(ticket_id, att_id):
+    """
+    Miniatura (imágenes) o primeras líneas (texto) del adjunto.
+    La vista previa cuelga del blob direccionado por hash, así que es
+    inmutable y se cachea en el navegador por un año.
+    """
+    meta = _visible_attachment(ticket_id, att_id)
+
+    path = preview_path(meta["file_path"], meta["mime_type"])
+    if path is None:
+        abort(404)
+    if not os.path.exists(path):
+        # Adjuntos previos al pipeline o generación aún en curso (si ya
+        # falló una vez, schedule_preview no la vuelve a encolar)
+        schedule_preview(meta["file_path"], meta["mime_type"])
+        abort(404)
+
+    resp = send_file(
+        path,
+        mimetype=preview_mimetype(path),
+        conditional=True,
+        etag=f"{meta['checksum_sha256']}-preview" if meta["checksum_sha256"] else True,
+        max_age=PREVIEW_MAX_AGE,
+    )
+    resp.cache_control.public = False
+    resp.cache_control.private = True
+    resp.cache_control.immutable = True
+    return resp
 
 
 # ===== Listar Tickets a tu dep =====
@@ -317,6 +415,54 @@ def mine():
     )
 
 
+# ===== Reportes (analítica del historial) =====
+@tickets.get('/reports', endpoint='reports')
+@login_required
+def reports():
+    roles = [r.name for r in getattr(current_user, "roles", [])] if hasattr(current_user, "roles") else []
+    if "ADMIN" not in {(r or "").upper() for r in roles}:
+        abort(403)
+
+    weeks = max(1, min(request.args.get("weeks", default=8, type=int), 26))
+    svc = TicketService(TicketRepository())
+    t0 = time.perf_counter()
+    report = svc.history_report(weeks=weeks)
+    profiler = current_app.extensions.get("profiler")
+    return render_template(
+        'tickets/reports.html',
+        title='Reportes',
+        report=report,
+        elapsed_ms=round((time.perf_counter() - t0) * 1000),
+        profiling=profiler.settings() if profiler else None,
+    )
+
+
+@tickets.post('/reports/profiling', endpoint='profiling_toggle')
+@login_required
+def profiling_toggle():
+    roles = [r.name for r in getattr(current_user, "roles", [])] if hasattr(current_user, "roles") else []
+    if "ADMIN" not in {(r or "").upper() for r in roles}:
+        abort(403)
+    profiler = current_app.extensions.get("profiler")
+    if profiler is None:
+        abort(404)
+
+    # Porcentaje en el formulario (0.1 - 100), fracción en el archivo de control
+    pct = request.form.get("rate_pct", type=float)
+    endpoints = [e.strip() for e in (request.form.get("endpoints") or "").split(",") if e.strip()]
+    s = profiler.update(
+        enabled=request.form.get("enabled") == "1",
+        rate=pct / 100 if pct is not None else None,
+        endpoints=endpoints,
+        updated_by=getattr(current_user, "email", None),
+    )
+    if s["enabled"]:
+        flash(f"Perfilado activo en el {s['rate']:.1%} de los requests.", "success")
+    else:
+        flash("Perfilado desactivado.", "info")
+    return redirect(url_for('tickets.reports'))
+
+
 # ===== DESCARGA REPORTES =====
 @tickets.get('/mine/export', endpoint='mine_export')
 @login_required
@@ -395,14 +541,22 @@ def mine_export():
 
 
 # ===== Sugerencias de la IA =====
+# Baldes por usuario y por IP (config en create_app); la ruta ASGI usa los mismos
+AI_SUGGEST_LIMITS = {"user": "RATELIMIT_AI_SUGGEST_USER", "ip": "RATELIMIT_AI_SUGGEST_IP"}
+
+
 @tickets.post("/ai/suggest", endpoint="ai_suggest")
 @login_required
+@rate_limiter.limit("tickets.ai_suggest", **AI_SUGGEST_LIMITS)
 def ai_suggest():
     """
     Endpoint AJAX que la UI usa para pedir sugerencias a la IA.
     Espera JSON: { "title": "...", "description": "..." }
     Devuelve JSON: { category_id, priority_id, department_id, reason? }
-    NUNCA devuelve 400/500 (así el front no se rompe).
+    NUNCA devuelve 400/500 (así el front no se rompe); sobre el límite de
+    uso responde 429 con Retry-After y el front deja de pedir hasta entonces.
+    Con la entrada ASGI (src/presentation/asgi.py) este POST lo atiende una
+    corrutina; esta vista queda para WSGI y para los casos que esa delega.
     """
     from src.infrastructure.ai.gemini_client import suggest_ticket_metadata
 
@@ -445,21 +599,101 @@ def ai_suggest():
 # ====== CONTEXTO GLOBAL (para header) ======
 @tickets.app_context_processor
 def inject_ticket_notifications():
+    """
+    No consulta la BD: si el resumen del usuario está en caché se pinta
+    en el servidor; si no, el header lo pide a /app/notifications/summary.
+    """
     if not current_user.is_authenticated:
         return {}
-    try:
-        repo = TicketRepository()
-        notifs = repo.list_unread_notifications(current_user.id, limit=10)
-        return {
-            "header_notifications": notifs,
-            "header_notifications_unread": len([n for n in notifs if not n["is_read"]]),
-        }
-    except Exception as e:
-        current_app.logger.warning(f"Error cargando notificaciones: {e}")
+    summary = unread_cache.get(current_user.id)
+    if summary is None:
         return {
+            "header_notifications_loaded": False,
             "header_notifications": [],
             "header_notifications_unread": 0,
         }
+    return {
+        "header_notifications_loaded": True,
+        "header_notifications": summary.recent,
+        "header_notifications_unread": summary.unread,
+    }
+
+
+@tickets.get("/notifications/summary", endpoint="notifications_summary")
+@login_required
+def notifications_summary():
+    """Contador + últimas notificaciones no leídas (carga diferida del header)."""
+    try:
+        summary = TicketRepository().unread_notifications_summary(current_user.id, limit=10)
+    except Exception as e:
+        current_app.logger.warning(f"Error cargando notificaciones: {e}")
+        return jsonify({"unread": 0, "items": []}), 503
+
+    items = [
+        {**n, "url": url_for('tickets.detail', ticket_id=n["ticket_id"])}
+        for n in summary.recent
+    ]
+    resp = jsonify({"unread": summary.unread, "items": items})
+    resp.cache_control.no_store = True
+    return resp
+
+@tickets.get("/events/stream", endpoint="events_stream")
+@login_required
+def events_stream():
+    """
+    Canal SSE: entrega deltas (notification / status / comment) del usuario
+    y, con ?ticket_id=, los del ticket abierto. La conexión se cierra sola
+    cada SSE_MAX_SECONDS para no retener un worker indefinidamente; el
+    EventSource del navegador reconecta.
+
+    Con WSGI cada conexión abierta ocupa un hilo del worker todo ese
+    tiempo. Por proceso se aceptan hasta SSE_MAX_STREAMS; pasado ese
+    número se responde un stream vacío con `retry:` largo (el navegador
+    reintenta más tarde) en vez de dejar sin hilos al resto de las rutas.
+    """
+    if bus.subscriber_count() >= current_app.config.get("SSE_MAX_STREAMS", 16):
+        busy = Response(f"retry: {int(current_app.config.get('SSE_BUSY_RETRY_MS', 30000))}\n\n",
+                        mimetype="text/event-stream")
+        busy.headers["Cache-Control"] = "no-cache"
+        return busy
+
+    topics = [user_topic(current_user.id)]
+
+    ticket_id = request.args.get("ticket_id", type=int)
+    if ticket_id:
+        repo = TicketRepository()
+        tmin = repo.get_ticket_minimal(ticket_id)
+        roles = [r.name for r in getattr(current_user, "roles", [])] if hasattr(current_user, "roles") else []
+        if not tmin or not TicketService(repo).can_view(tmin, current_user.id, roles):
+            abort(404)
+        topics.append(ticket_topic(ticket_id))
+
+    backend = current_app.extensions.get("realtime")
+    if backend is not None:
+        backend.ensure_running()
+
+    max_seconds = current_app.config.get("SSE_MAX_SECONDS", 300)
+    heartbeat = current_app.config.get("SSE_HEARTBEAT_SECONDS", 15)
+    sub = bus.subscribe(topics)
+
+    def stream():
+        deadline = time.monotonic() + max_seconds
+        try:
+            yield "retry: 3000\n\n"
+            while time.monotonic() < deadline:
+                if sub.overflowed:
+                    yield "event: resync\ndata: {}\n\n"
+                    return
+                event = sub.get(timeout=heartbeat)
+                yield event.to_sse() if event else ": ping\n\n"
+        finally:
+            bus.unsubscribe(sub)
+
+    resp = Response(stream(), mimetype="text/event-stream")
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.headers["X-Accel-Buffering"] = "no"  # nginx: no bufferizar el stream
+    return resp
+
 
 @tickets.post("/notifications/read-all", endpoint="notifications_read_all")
 @login_required
@@ -0,0 +1,44 @@
+// static/js/realtime.js
+// Canal SSE: recibe deltas del servidor y los re-emite como eventos DOM
+// (incidex:notification, incidex:status, incidex:comment) para que cada
+// página actualice solo lo que cambió, sin recargar.
+(function () {
+  const url = document.body.dataset.eventsUrl;
+  if (!url || !('EventSource' in window)) return;
+
+  const source = new EventSource(url);
+
+  const emit = (kind, data) => {
+    document.dispatchEvent(new CustomEvent(`incidex:${kind}`, { detail: data }));
+  };
+
+  ['notification', 'status', 'comment'].forEach((kind) => {
+    source.addEventListener(kind, (e) => {
+      try {
+        emit(kind, JSON.parse(e.data));
+      } catch (_) { /* evento mal formado: se ignora */ }
+    });
+  });
+
+  // El servidor perdió eventos para esta conexión: única salida segura
+  source.addEventListener('resync', () => {
+    source.close();
+    window.location.reload();
+  });
+
+  // Estado/fecha en cualquier tabla o ficha marcada con data-rt-*
+  document.addEventListener('incidex:status', (e) => {
+    const { ticket_id, to_status, created_at } = e.detail;
+    document.querySelectorAll(`[data-rt-status="${ticket_id}"]`).forEach((el) => {
+      el.textContent = to_status;
+      if (el.classList.contains('badge')) {
+        el.className = el.className.replace(/\bs-\S+/, `s-${String(to_status).toLowerCase()}`);
+      }
+    });
+    document.querySelectorAll(`[data-rt-updated="${ticket_id}"]`).forEach((el) => {
+      el.textContent = created_at;
+    });
+  });
+
+  window.addEventListener('beforeunload', () => source.close());
+})();
@@ -218,15 +218,26 @@
   // =============================
   // 5) IA: pedir sugerencias
   // =============================
-  function requestAISuggestion() {
-    const title = val('title');
-    const description = val('description');
+  // Se pide una sola vez, al pasar al paso 2 (cada pedido es una llamada a
+  // Gemini y cuenta para el límite de uso). Si el texto no cambió desde el
+  // último pedido se reutiliza esa respuesta (o el pedido en vuelo, si se
+  // hace doble clic); si ya se aplicó, no se vuelven a pisar los selects.
+  // Si el servidor responde 429 no se vuelve a pedir hasta Retry-After.
+  let aiInflight = null;        // { key, promise }
+  let aiResult = null;          // { key, data } última respuesta recibida
+  let aiAppliedKey = null;      // texto cuya sugerencia ya se aplicó a los selects
+  let aiBlockedUntil = 0;
+
+  function aiKey() {
+    return JSON.stringify([val('title'), val('description')]);
+  }
 
-    // Si no hay nada escrito aún, no pedimos nada
-    if (!title && !description) {
-      return Promise.resolve();
-    }
+  function fetchAISuggestion(key) {
+    if (aiInflight && aiInflight.key === key) return aiInflight.promise;
+    if (aiResult && aiResult.key === key) return Promise.resolve(aiResult.data);
+    if (Date.now() < aiBlockedUntil) return Promise.resolve(null);
 
+    const [title, description] = JSON.parse(key);
     const payload = { title, description };
 
     // CSRF de Flask-WTF (tomamos el mismo token del formulario)
@@ -236,14 +247,18 @@
       headers['X-CSRFToken'] = csrfInput.value;
     }
 
-    showAISpinner();
-
-    return fetch('/app/ai/suggest', {
+    const promise = fetch('/app/ai/suggest', {
       method: 'POST',
       headers,
       body: JSON.stringify(payload),
     })
       .then(async (r) => {
+        if (r.status === 429) {
+          const retry = parseInt(r.headers.get('Retry-After') || '60', 10);
+          aiBlockedUntil = Date.now() + retry * 1000;
+          console.info(`Sugerencias IA en pausa ${retry}s (límite de uso)`);
+          return null;
+        }
         if (!r.ok) {
           console.error('IA respondio HTTP no-OK:', r.status);
           try {
@@ -252,48 +267,78 @@
           } catch(e){}
           return null;
         }
-        return r.json();
+        const data = await r.json();
+        aiResult = { key, data };
+        return data;
       })
-      .then(data => {
-        if (!data || data.error) return;
+      .catch(err => {
+        console.error('Error pidiendo sugerencia IA:', err);
+        return null;
+      })
+      .finally(() => {
+        aiInflight = null;
+      });
 
-        // Setear selects con lo sugerido (el usuario los puede cambiar después)
-        if (data.category_id) {
-          const sel = document.getElementById('category');
-          if (sel) sel.value = String(data.category_id);
-        }
-        if (data.priority_id) {
-          const sel = document.getElementById('priority');
-          if (sel) sel.value = String(data.priority_id);
-        }
-        if (data.department_id) {
-          const sel = document.getElementById('area');
-          if (sel) {
-            sel.value = String(data.department_id);
-            // dispara change para auto-analista
-            sel.dispatchEvent(new Event('change'));
-          }
-        }
+    aiInflight = { key, promise };
+    return promise;
+  }
 
-        // Mensaje tipo “Sugerido por IA”
-        let hint = document.getElementById('aiHint');
-        if (!hint) {
-          hint = document.createElement('small');
-          hint.id = 'aiHint';
-          hint.className = 'muted';
-          const step2 = document.querySelector('.step[data-step="2"] .muted');
-          if (step2 && step2.parentNode) {
-            step2.parentNode.insertBefore(hint, step2.nextSibling);
-          }
-        }
-        hint.textContent = data.reason
-          ? `Sugerido por IA: ${data.reason}`
-          : 'Valores sugeridos automáticamente por IA (puedes cambiarlos).';
+  function applyAISuggestion(data) {
+    if (!data || data.error || data.skipped) return;
 
-        updateSummary();
-      })
-      .catch(err => {
-        console.error('Error pidiendo sugerencia IA:', err);
+    // Setear selects con lo sugerido (el usuario los puede cambiar después)
+    if (data.category_id) {
+      const sel = document.getElementById('category');
+      if (sel) sel.value = String(data.category_id);
+    }
+    if (data.priority_id) {
+      const sel = document.getElementById('priority');
+      if (sel) sel.value = String(data.priority_id);
+    }
+    if (data.department_id) {
+      const sel = document.getElementById('area');
+      if (sel) {
+        sel.value = String(data.department_id);
+        // dispara change para auto-analista
+        sel.dispatchEvent(new Event('change'));
+      }
+    }
+
+    // Mensaje tipo “Sugerido por IA”
+    let hint = document.getElementById('aiHint');
+    if (!hint) {
+      hint = document.createElement('small');
+      hint.id = 'aiHint';
+      hint.className = 'muted';
+      const step2 = document.querySelector('.step[data-step="2"] .muted');
+      if (step2 && step2.parentNode) {
+        step2.parentNode.insertBefore(hint, step2.nextSibling);
+      }
+    }
+    hint.textContent = data.reason
+      ? `Sugerido por IA: ${data.reason}`
+      : 'Valores sugeridos automáticamente por IA (puedes cambiarlos).';
+
+    updateSummary();
+  }
+
+  function requestAISuggestion() {
+    const key = aiKey();
+    const [title, description] = JSON.parse(key);
+
+    // Si no hay nada escrito aún, o ya se aplicó la sugerencia para este
+    // texto (volvió al paso 1 sin cambiarlo), no tocamos lo que eligió
+    if ((!title && !description) || aiAppliedKey === key) {
+      return Promise.resolve();
+    }
+
+    const ready = aiResult && aiResult.key === key;
+    if (!ready) showAISpinner();
+
+    return fetchAISuggestion(key)
+      .then(data => {
+        if (data && !data.error) aiAppliedKey = key;
+        applyAISuggestion(data);
       })
       .finally(() => {
         hideAISpinner();
@@ -91,6 +91,30 @@
     assignForm.onsubmit = ()=>{ this.setAttribute('data-prev', this.value); if (oldSubmit) oldSubmit(); };
   });
 
+  // ===== Comentarios en vivo (SSE, ver realtime.js) =====
+  const commentList = document.getElementById('commentList');
+  document.addEventListener('incidex:comment', (e) => {
+    if (!commentList) return;
+    const c = e.detail;
+    if (commentList.querySelector(`[data-comment-id="${c.id}"]`)) return;
+    commentList.querySelector('[data-empty]')?.remove();
+
+    const li = document.createElement('li');
+    li.dataset.commentId = c.id;
+    const head = document.createElement('div');
+    head.className = 'c-head';
+    const author = document.createElement('strong');
+    author.textContent = c.author_name || '';
+    const date = document.createElement('span');
+    date.className = 'muted';
+    date.textContent = c.created_at;
+    head.append(author, ' ', date);
+    const body = document.createElement('p');
+    body.textContent = c.body;
+    li.append(head, body);
+    commentList.appendChild(li);
+  });
+
   // ===== Custom file input (se mantiene) =====
   const fileInput = document.getElementById('fileInput');
   const list = document.getElementById('uploadFiles');
@@ -1,13 +1,17 @@
 # tests/conftest.py
 import os
 os.environ.setdefault("GEMINI_API_KEY", "dummy")
+# Cada test crea su app: sin flush de auditoría al terminar pytest
+os.environ.setdefault("AUDIT_FLUSH_AT_EXIT", "False")
 import pytest
 import datetime
 import uuid
+from contextlib import contextmanager
 
 from src.presentation.web import create_app
 from src.infrastructure.persistence.database import db
 from src.domain.entities.user import User
+from src.infrastructure.persistence.query_stats import capture_queries
 
 
 @pytest.fixture
@@ -89,3 +93,21 @@ def db_conn(app):
             conn.rollback()  # revertimos todo lo hecho en el test
         finally:
             conn.close()
+
+
+@pytest.fixture
+def assert_max_queries():
+    """
+    Falla si el bloque hace más de `limit` consultas (evita N+1):
+
+        with assert_max_queries(10):
+            auth_client.get("/app/mine")
+    """
+    @contextmanager
+    def _check(limit: int):
+        with capture_queries() as stats:
+            yield stats
+        assert stats.count <= limit, (
+            f"{stats.count} consultas (máximo {limit}):\n  " + "\n  ".join(stats.statements)
+        )
+    return _check
@@ -0,0 +1,102 @@
+# tests/integration/test_db_analyst_workload.py
+import uuid
+
+
+def _status_id(cur, name: str) -> int:
+    cur.execute("SELECT id FROM statuses WHERE name = %s", (name,))
+    row = cur.fetchone()
+    assert row is not None, f"No existe el estado {name}"
+    return row[0]
+
+
+def _open_count(cur, user_id: int) -> int:
+    cur.execute("SELECT open_count FROM analyst_workload WHERE user_id = %s", (user_id,))
+    row = cur.fetchone()
+    return row[0] if row else 0
+
+
+def _crear_ticket(cur, requester_id: int, assignee_id: int | None, status_id: int) -> int:
+    cur.execute("SELECT id FROM priorities LIMIT 1")
+    priority_id = cur.fetchone()[0]
+
+    cur.execute(
+        """
+        INSERT INTO tickets
+            (code, title, description, requester_id, assignee_id,
+             priority_id, status_id)
+        VALUES
+            (%s, %s, %s, %s, %s, %s, %s)
+        """,
+        (
+            f"WLD-{uuid.uuid4().hex[:8]}",
+            "Ticket carga analista",
+            "Ticket generado para probar analyst_workload",
+            int(requester_id),
+            assignee_id,
+            priority_id,
+            status_id,
+        )
+    )
+    return cur.lastrowid
+
+
+def test_workload_sube_al_crear_ticket_abierto(db_conn, test_user):
+    """
+    Al insertar un ticket abierto con asignado, el trigger incrementa
+    analyst_workload.open_count del asignado en la misma transacción.
+    """
+    with db_conn.cursor() as cur:
+        nuevo = _status_id(cur, "NUEVO")
+        antes = _open_count(cur, test_user)
+
+        _crear_ticket(cur, test_user, test_user, nuevo)
+
+        assert _open_count(cur, test_user) == antes + 1
+
+
+def test_workload_baja_al_cerrar_y_reasignar(db_conn, test_user):
+    """
+    Cerrar un ticket descuenta la carga; reasignar un ticket abierto
+    la mueve del asignado anterior al nuevo.
+    """
+    with db_conn.cursor() as cur:
+        nuevo = _status_id(cur, "NUEVO")
+        cerrado = _status_id(cur, "CERRADO")
+
+        cur.execute(
+            """
+            INSERT INTO users
+                (names_worker, last_name, birthdate, email, gender, password_hash, is_active)
+            VALUES
+                ('Carga', 'Analista', '1990-01-01', %s, 'X', 'hash_de_prueba', 1)
+            """,
+            (f"pytest_wl_{uuid.uuid4()}@example.com",)
+        )
+        otro_id = cur.lastrowid
+
+        base = _open_count(cur, test_user)
+        t1 = _crear_ticket(cur, test_user, test_user, nuevo)
+        t2 = _crear_ticket(cur, test_user, test_user, nuevo)
+        assert _open_count(cur, test_user) == base + 2
+
+        cur.execute("UPDATE tickets SET status_id = %s WHERE id = %s", (cerrado, t1))
+        assert _open_count(cur, test_user) == base + 1
+
+        cur.execute("UPDATE tickets SET assignee_id = %s WHERE id = %s", (otro_id, t2))
+        assert _open_count(cur, test_user) == base
+        assert _open_count(cur, otro_id) == 1
+
+
+def test_workload_ticket_sin_asignado_no_cuenta(db_conn, test_user):
+    """
+    Un ticket sin assignee no genera filas en analyst_workload.
+    """
+    with db_conn.cursor() as cur:
+        nuevo = _status_id(cur, "NUEVO")
+        cur.execute("SELECT COALESCE(SUM(open_count), 0) FROM analyst_workload")
+        antes = cur.fetchone()[0]
+
+        _crear_ticket(cur, test_user, None, nuevo)
+
+        cur.execute("SELECT COALESCE(SUM(open_count), 0) FROM analyst_workload")
+        assert cur.fetchone()[0] == antes
@@ -0,0 +1,49 @@
+# tests/integration/test_db_audit_events.py
+import pymysql
+import pytest
+
+
+def _insert_event(cur, entity_id: int) -> int:
+    cur.execute(
+        """
+        INSERT INTO audit_events (source, actor_id, entity, entity_id, action, payload)
+        VALUES ('web', NULL, 'ticket', %s, 'comment', '{"comment_id":1}')
+        """,
+        (entity_id,),
+    )
+    return cur.lastrowid
+
+
+def test_audit_events_es_solo_insercion(db_conn):
+    """
+    Los triggers de la migración 007 rechazan UPDATE y DELETE.
+    """
+    with db_conn.cursor() as cur:
+        event_id = _insert_event(cur, 999999)
+
+        with pytest.raises(pymysql.err.MySQLError):
+            cur.execute("UPDATE audit_events SET action = 'x' WHERE id = %s", (event_id,))
+        with pytest.raises(pymysql.err.MySQLError):
+            cur.execute("DELETE FROM audit_events WHERE id = %s", (event_id,))
+
+
+def test_historial_de_entidad_usa_indice(db_conn):
+    """
+    La consulta típica "todo lo que pasó con el ticket X" usa idx_audit_entity.
+    """
+    with db_conn.cursor() as cur:
+        _insert_event(cur, 424242)
+        cur.execute(
+            """
+            EXPLAIN
+            SELECT ts, action, payload
+            FROM audit_events
+            WHERE entity = 'ticket' AND entity_id = %s
+            ORDER BY ts DESC
+            """,
+            (424242,),
+        )
+        cols = [d[0] for d in cur.description]
+        plan = dict(zip(cols, cur.fetchone()))
+
+    assert plan["key"] == "idx_audit_entity"
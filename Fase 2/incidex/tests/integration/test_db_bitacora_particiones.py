@@ -0,0 +1,79 @@
+# tests/integration/test_db_bitacora_particiones.py
+import datetime
+
+
+def _particiones(cur):
+    cur.execute(
+        """
+        SELECT partition_name
+        FROM information_schema.partitions
+        WHERE table_schema = DATABASE()
+          AND table_name = 'bitacora'
+          AND partition_name IS NOT NULL
+        ORDER BY partition_ordinal_position
+        """
+    )
+    return [row[0] for row in cur.fetchall()]
+
+
+def test_bitacora_particionada_por_mes(db_conn):
+    """
+    La migración 006 deja una partición por mes hasta al menos el mes
+    actual y termina en pmax.
+    """
+    with db_conn.cursor() as cur:
+        nombres = _particiones(cur)
+
+    mes_actual = f"p{datetime.date.today():%Y%m}"
+    assert nombres[0] == "p_hist"
+    assert nombres[-1] == "pmax"
+    assert mes_actual in nombres
+
+
+def test_reporte_por_rango_lee_solo_sus_particiones(db_conn):
+    """
+    Un filtro por fecha como el de generar_reporte_bitacora debe podar
+    particiones: el plan solo menciona los meses del rango.
+    """
+    hoy = datetime.date.today()
+    inicio = datetime.datetime.combine(hoy.replace(day=1), datetime.time.min)
+    fin = datetime.datetime.combine(hoy, datetime.time.max)
+
+    with db_conn.cursor() as cur:
+        cur.execute(
+            """
+            EXPLAIN
+            SELECT id, fecha, usuario, rol, accion, resultado
+            FROM bitacora
+            WHERE fecha >= %s AND fecha <= %s
+            ORDER BY bitacora.fecha DESC
+            """,
+            (inicio, fin),
+        )
+        cols = [d[0] for d in cur.description]
+        plan = dict(zip(cols, cur.fetchone()))
+
+    assert plan["partitions"] == f"p{hoy:%Y%m}"
+
+
+def test_bitacora_insert_en_lote(db_conn):
+    """
+    El buffer de escritorio inserta en lote con executemany y fecha
+    explícita; las filas quedan en la partición de su mes.
+    """
+    ahora = datetime.datetime.now().replace(microsecond=0)
+    filas = [(ahora, "pytest_lote", "ADMIN", f"Acción {i}", "Éxito") for i in range(5)]
+
+    with db_conn.cursor() as cur:
+        cur.executemany(
+            """
+            INSERT INTO bitacora (fecha, usuario, rol, accion, resultado)
+            VALUES (%s, %s, %s, %s, %s)
+            """,
+            filas,
+        )
+        cur.execute(
+            f"SELECT COUNT(*) FROM bitacora PARTITION (p{ahora:%Y%m}) WHERE usuario = %s",
+            ("pytest_lote",),
+        )
+        assert cur.fetchone()[0] == 5
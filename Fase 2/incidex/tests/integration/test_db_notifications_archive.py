@@ -0,0 +1,82 @@
+# tests/integration/test_db_notifications_archive.py
+from sqlalchemy import text
+
+from src.infrastructure.persistence.database import db
+from src.infrastructure.persistence.repositories.ticket_repository import TicketRepository
+
+
+def test_indice_compuesto_de_no_leidas_existe(db_conn):
+    """
+    La migración 005 agrega (user_id, is_read, created_at) en ese orden.
+    """
+    with db_conn.cursor() as cur:
+        cur.execute(
+            "SHOW INDEX FROM ticket_notifications WHERE Key_name = 'idx_notif_user_read_created'"
+        )
+        cols = [row[4] for row in sorted(cur.fetchall(), key=lambda r: r[3])]
+
+    assert cols == ["user_id", "is_read", "created_at"]
+
+
+def test_listado_de_no_leidas_usa_indice_compuesto(db_conn, test_user):
+    """
+    El plan de list_unread_notifications debe usar el índice compuesto
+    y no necesitar filesort para ORDER BY created_at DESC.
+    """
+    with db_conn.cursor() as cur:
+        cur.execute(
+            """
+            EXPLAIN
+            SELECT id, ticket_id, kind, message, is_read, created_at
+            FROM ticket_notifications
+            WHERE user_id = %s AND is_read = 0
+            ORDER BY created_at DESC
+            LIMIT 10
+            """,
+            (int(test_user),),
+        )
+        cols = [d[0] for d in cur.description]
+        plan = dict(zip(cols, cur.fetchone()))
+
+    assert plan["possible_keys"] and "idx_notif_user_read_created" in plan["possible_keys"]
+    assert "filesort" not in (plan.get("Extra") or "").lower()
+
+
+def test_archivado_mueve_solo_leidas_antiguas(app, test_user):
+    """
+    Las leídas con más de N días pasan a la tabla de archivo; las no
+    leídas y las recientes se quedan.
+    """
+    with app.app_context():
+        ticket_id = db.session.execute(text("SELECT id FROM tickets LIMIT 1")).scalar()
+        assert ticket_id is not None, "No hay tickets para asociar notificaciones"
+
+        ids = {}
+        for key, is_read, age_days in (("vieja_leida", 1, 4000),
+                                        ("vieja_no_leida", 0, 4000),
+                                        ("reciente_leida", 1, 0)):
+            res = db.session.execute(text("""
+                INSERT INTO ticket_notifications (user_id, ticket_id, kind, message, is_read, created_at)
+                VALUES (:u, :t, 'TEST', 'archivo', :r, NOW() - INTERVAL :d DAY)
+            """), {"u": int(test_user), "t": ticket_id, "r": is_read, "d": age_days})
+            ids[key] = res.lastrowid
+        db.session.commit()
+
+        try:
+            repo = TicketRepository()
+            while repo.archive_read_notifications_batch(older_than_days=3650, batch_size=100):
+                pass
+
+            vivas = set(db.session.execute(text(
+                "SELECT id FROM ticket_notifications WHERE id IN (:a, :b, :c)"
+            ), {"a": ids["vieja_leida"], "b": ids["vieja_no_leida"], "c": ids["reciente_leida"]}).scalars())
+            archivada = db.session.execute(text(
+                "SELECT COUNT(*) FROM ticket_notifications_archive WHERE id = :i"
+            ), {"i": ids["vieja_leida"]}).scalar()
+
+            assert vivas == {ids["vieja_no_leida"], ids["reciente_leida"]}
+            assert archivada == 1
+        finally:
+            for table in ("ticket_notifications", "ticket_notifications_archive"):
+                db.session.execute(text(f"DELETE FROM {table} WHERE kind = 'TEST' AND message = 'archivo'"))
+            db.session.commit()
@@ -0,0 +1,143 @@
+# tests/integration/test_db_report_rollups.py
+import uuid
+
+
+def _status_id(cur, name: str) -> int:
+    cur.execute("SELECT id FROM statuses WHERE name = %s", (name,))
+    row = cur.fetchone()
+    assert row is not None, f"No existe el estado {name}"
+    return row[0]
+
+
+def _refrescar(cur):
+    cur.execute("CALL sp_report_refresh()")
+
+
+def _volumen_hoy(cur, status_id: int, priority_id: int) -> int:
+    cur.execute(
+        """
+        SELECT COALESCE(SUM(tickets), 0)
+        FROM report_ticket_daily
+        WHERE dia = CURDATE() AND status_id = %s AND priority_id = %s
+          AND department_id = 0 AND category_id = 0
+        """,
+        (status_id, priority_id),
+    )
+    return int(cur.fetchone()[0])
+
+
+def _resueltos_hoy(cur, priority_id: int) -> int:
+    cur.execute(
+        """
+        SELECT COALESCE(SUM(resueltos), 0)
+        FROM report_resolution_daily
+        WHERE dia = CURDATE() AND priority_id = %s
+          AND department_id = 0 AND category_id = 0
+        """,
+        (priority_id,),
+    )
+    return int(cur.fetchone()[0])
+
+
+def _crear_ticket(cur, requester_id: int, priority_id: int, status_id: int) -> int:
+    cur.execute(
+        """
+        INSERT INTO tickets
+            (code, title, description, requester_id, priority_id, status_id)
+        VALUES
+            (%s, 'Ticket resumen', 'Ticket para probar report_*_daily', %s, %s, %s)
+        """,
+        (f"RPT-{uuid.uuid4().hex[:8]}", int(requester_id), priority_id, status_id),
+    )
+    return cur.lastrowid
+
+
+def test_refresh_suma_ticket_nuevo_al_volumen_del_dia(db_conn, test_user):
+    """
+    Un ticket creado después de la última marca de agua aparece en
+    report_ticket_daily tras sp_report_refresh().
+    """
+    with db_conn.cursor() as cur:
+        nuevo = _status_id(cur, "NUEVO")
+        cur.execute("SELECT id FROM priorities LIMIT 1")
+        priority_id = cur.fetchone()[0]
+
+        _refrescar(cur)
+        antes = _volumen_hoy(cur, nuevo, priority_id)
+
+        _crear_ticket(cur, test_user, priority_id, nuevo)
+        _refrescar(cur)
+
+        assert _volumen_hoy(cur, nuevo, priority_id) == antes + 1
+
+
+def test_cambio_de_estado_mueve_volumen_y_registra_resolucion(db_conn, test_user):
+    """
+    Una fila nueva en ticket_history hace recalcular los días del ticket:
+    el volumen pasa de NUEVO a RESUELTO y el ticket entra en
+    report_resolution_daily.
+    """
+    with db_conn.cursor() as cur:
+        nuevo = _status_id(cur, "NUEVO")
+        resuelto = _status_id(cur, "RESUELTO")
+        cur.execute("SELECT id FROM priorities LIMIT 1")
+        priority_id = cur.fetchone()[0]
+
+        ticket_id = _crear_ticket(cur, test_user, priority_id, nuevo)
+        _refrescar(cur)
+        nuevos = _volumen_hoy(cur, nuevo, priority_id)
+        resueltos_vol = _volumen_hoy(cur, resuelto, priority_id)
+        resueltos = _resueltos_hoy(cur, priority_id)
+
+        cur.execute(
+            "UPDATE tickets SET status_id = %s, resolved_at = NOW() WHERE id = %s",
+            (resuelto, ticket_id),
+        )
+        cur.execute(
+            """
+            INSERT INTO ticket_history (ticket_id, actor_user_id, from_status_id, to_status_id, note)
+            VALUES (%s, %s, %s, %s, 'pytest resumen')
+            """,
+            (ticket_id, int(test_user), nuevo, resuelto),
+        )
+        _refrescar(cur)
+
+        assert _volumen_hoy(cur, nuevo, priority_id) == nuevos - 1
+        assert _volumen_hoy(cur, resuelto, priority_id) == resueltos_vol + 1
+        assert _resueltos_hoy(cur, priority_id) == resueltos + 1
+
+
+def test_watermarks_avanzan_hasta_el_maximo(db_conn):
+    """Después de refrescar, las marcas de agua quedan en el MAX(id) de cada tabla."""
+    with db_conn.cursor() as cur:
+        _refrescar(cur)
+        cur.execute("SELECT source, last_id FROM report_watermarks")
+        marcas = dict(cur.fetchall())
+        cur.execute("SELECT COALESCE(MAX(id), 0) FROM tickets")
+        max_ticket = cur.fetchone()[0]
+        cur.execute("SELECT COALESCE(MAX(id), 0) FROM ticket_history")
+        max_hist = cur.fetchone()[0]
+
+    assert marcas["tickets"] == max_ticket
+    assert marcas["ticket_history"] == max_hist
+
+
+def test_refresh_relee_tickets_confirmados_tras_la_marca(db_conn, test_user):
+    """
+    Un ticket con id menor a la marca (su transacción confirmó después de
+    que se resumiera un id mayor) entra igual en la siguiente pasada.
+    """
+    with db_conn.cursor() as cur:
+        nuevo = _status_id(cur, "NUEVO")
+        cur.execute("SELECT id FROM priorities LIMIT 1")
+        priority_id = cur.fetchone()[0]
+
+        _refrescar(cur)
+        antes = _volumen_hoy(cur, nuevo, priority_id)
+
+        ticket_id = _crear_ticket(cur, test_user, priority_id, nuevo)
+        # Commit tardío: la marca ya pasó este id sin haberlo visto
+        cur.execute("UPDATE report_watermarks SET last_id = %s WHERE source = 'tickets'", (ticket_id + 1,))
+        _refrescar(cur)
+
+        assert _volumen_hoy(cur, nuevo, priority_id) == antes + 1
@@ -0,0 +1,183 @@
+# tests/integration/test_db_ticket_sla.py
+from sqlalchemy import text
+
+from src.infrastructure.persistence.database import db
+from src.infrastructure.persistence.repositories.ticket_repository import TicketRepository
+
+
+def test_barrido_usa_indice_de_proximo_vencimiento(db_conn):
+    """
+    La consulta del barrido lee idx_sla_next_deadline por rango en vez
+    de recorrer los tickets abiertos.
+    """
+    with db_conn.cursor() as cur:
+        cur.execute(
+            """
+            EXPLAIN
+            SELECT ticket_id, due_at
+            FROM ticket_sla
+            WHERE next_deadline <= NOW()
+            ORDER BY next_deadline
+            LIMIT 200
+            """
+        )
+        cols = [d[0] for d in cur.description]
+        plan = dict(zip(cols, cur.fetchone()))
+
+    assert plan["key"] == "idx_sla_next_deadline"
+    assert plan["type"] == "range"
+    assert "filesort" not in (plan.get("Extra") or "").lower()
+
+
+def _sla(ticket_id):
+    return db.session.execute(text("""
+        SELECT status_id, stopped_at, warned_at, breached_at, warn_at, next_deadline
+        FROM ticket_sla WHERE ticket_id = :t
+    """), {"t": ticket_id}).mappings().first()
+
+
+def test_temporizador_se_mantiene_con_los_cambios_de_estado(app, test_user):
+    """
+    insert_ticket crea el temporizador; RESUELTO lo detiene y acumula el
+    tiempo del estado anterior; reabrir lo reanuda con el aviso pendiente.
+    """
+    with app.app_context():
+        repo = TicketRepository()
+        pri = db.session.execute(text("SELECT id FROM priorities LIMIT 1")).scalar()
+        created = repo.insert_ticket(
+            title="Ticket SLA", description="pytest sla", requester_id=int(test_user),
+            department_id=None, category_id=None, priority_id=pri,
+        )
+        try:
+            sla = _sla(created.id)
+            assert sla is not None
+            assert sla["next_deadline"] == sla["warn_at"]
+
+            nuevo = repo.default_status_id()
+            resuelto = repo.get_status_id_by_name("RESUELTO")
+            en_progreso = repo.get_status_id_by_name("EN_PROGRESO")
+
+            repo.update_status_with_history(ticket_id=created.id, to_status_id=resuelto,
+                                            actor_user_id=int(test_user))
+            sla = _sla(created.id)
+            assert sla["status_id"] == resuelto
+            assert sla["stopped_at"] is not None
+            assert sla["next_deadline"] is None
+
+            acumulado = db.session.execute(text("""
+                SELECT COUNT(*) FROM ticket_status_time WHERE ticket_id = :t AND status_id = :s
+            """), {"t": created.id, "s": nuevo}).scalar()
+            assert acumulado == 1
+
+            repo.update_status_with_history(ticket_id=created.id, to_status_id=en_progreso,
+                                            actor_user_id=int(test_user))
+            sla = _sla(created.id)
+            assert sla["stopped_at"] is None
+            assert sla["next_deadline"] == sla["warn_at"]
+        finally:
+            db.session.execute(text("DELETE FROM tickets WHERE id = :t"), {"t": created.id})
+            db.session.commit()
+
+
+def test_aviso_mueve_el_proximo_vencimiento_al_plazo(app, test_user):
+    """
+    advance_sla_timer(breached=False) marca el aviso y deja due_at como
+    siguiente hito; con breached=True ya no queda nada pendiente.
+    """
+    with app.app_context():
+        repo = TicketRepository()
+        pri = db.session.execute(text("SELECT id FROM priorities LIMIT 1")).scalar()
+        created = repo.insert_ticket(
+            title="Ticket SLA aviso", description="pytest sla", requester_id=int(test_user),
+            department_id=None, category_id=None, priority_id=pri,
+        )
+        try:
+            repo.advance_sla_timer(created.id, breached=False)
+            row = db.session.execute(text("""
+                SELECT warned_at, next_deadline, due_at FROM ticket_sla WHERE ticket_id = :t
+            """), {"t": created.id}).mappings().first()
+            assert row["warned_at"] is not None
+            assert row["next_deadline"] == row["due_at"]
+
+            repo.advance_sla_timer(created.id, breached=True)
+            row = _sla(created.id)
+            assert row["breached_at"] is not None
+            assert row["next_deadline"] is None
+        finally:
+            db.session.execute(text("DELETE FROM tickets WHERE id = :t"), {"t": created.id})
+            db.session.commit()
+
+
+def test_prioridad_sin_sla_no_crea_temporizador(app, test_user):
+    """
+    Con priorities.sla_hours NULL el ticket se crea igual, sin fila en
+    ticket_sla (warn_at/due_at serían NULL en columnas NOT NULL).
+    """
+    with app.app_context():
+        repo = TicketRepository()
+        db.session.execute(text("""
+            INSERT INTO priorities (name, sla_hours) VALUES ('PYTEST_SIN_SLA', NULL)
+        """))
+        pri = db.session.execute(text("SELECT id FROM priorities WHERE name = 'PYTEST_SIN_SLA'")).scalar()
+        db.session.commit()
+        created = None
+        try:
+            created = repo.insert_ticket(
+                title="Ticket sin SLA", description="pytest sla", requester_id=int(test_user),
+                department_id=None, category_id=None, priority_id=pri,
+            )
+            assert _sla(created.id) is None
+
+            resuelto = repo.get_status_id_by_name("RESUELTO")
+            repo.update_status_with_history(ticket_id=created.id, to_status_id=resuelto,
+                                            actor_user_id=int(test_user))
+            assert _sla(created.id) is None
+        finally:
+            if created is not None:
+                db.session.execute(text("DELETE FROM tickets WHERE id = :t"), {"t": created.id})
+            db.session.execute(text("DELETE FROM priorities WHERE id = :p"), {"p": pri})
+            db.session.commit()
+
+
+def test_reabrir_corre_los_plazos_por_el_tiempo_detenido(app, test_user):
+    """
+    Dos horas en RESUELTO no cuentan contra el SLA: al reabrir, warn_at y
+    due_at se corren esas dos horas y el próximo hito queda en el futuro.
+    """
+    with app.app_context():
+        repo = TicketRepository()
+        pri = db.session.execute(text(
+            "SELECT id FROM priorities WHERE sla_hours IS NOT NULL LIMIT 1"
+        )).scalar()
+        created = repo.insert_ticket(
+            title="Ticket SLA pausa", description="pytest sla", requester_id=int(test_user),
+            department_id=None, category_id=None, priority_id=pri,
+        )
+        try:
+            repo.update_status_with_history(ticket_id=created.id,
+                                            to_status_id=repo.get_status_id_by_name("RESUELTO"),
+                                            actor_user_id=int(test_user))
+            # Simula que quedó resuelto dos horas
+            db.session.execute(text("""
+                UPDATE ticket_sla SET stopped_at = NOW() - INTERVAL 2 HOUR WHERE ticket_id = :t
+            """), {"t": created.id})
+            db.session.commit()
+            antes = db.session.execute(text(
+                "SELECT warn_at, due_at FROM ticket_sla WHERE ticket_id = :t"
+            ), {"t": created.id}).mappings().first()
+
+            repo.update_status_with_history(ticket_id=created.id,
+                                            to_status_id=repo.get_status_id_by_name("EN_PROGRESO"),
+                                            actor_user_id=int(test_user))
+            despues = db.session.execute(text(
+                "SELECT warn_at, due_at, next_deadline, stopped_at FROM ticket_sla WHERE ticket_id = :t"
+            ), {"t": created.id}).mappings().first()
+
+            corrido = (despues["due_at"] - antes["due_at"]).total_seconds()
+            assert 7195 <= corrido <= 7260
+            assert (despues["warn_at"] - antes["warn_at"]).total_seconds() == corrido
+            assert despues["stopped_at"] is None
+            assert despues["next_deadline"] == despues["warn_at"]
+        finally:
+            db.session.execute(text("DELETE FROM tickets WHERE id = :t"), {"t": created.id})
+            db.session.commit()
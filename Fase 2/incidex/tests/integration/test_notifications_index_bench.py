@@ -0,0 +1,100 @@
+# tests/integration/test_notifications_index_bench.py
+"""
+Benchmark del índice (user_id, is_read, created_at) sobre una copia de
+ticket_notifications sembrada con muchas filas.
+
+Es lento (10M filas tardan minutos en sembrarse), así que solo corre si
+se pide explícitamente:
+
+    INCIDEX_BENCH_NOTIF_ROWS=10000000 pytest tests/integration/test_notifications_index_bench.py -s
+"""
+import os
+import time
+import statistics
+
+import pytest
+
+ROWS = int(os.getenv("INCIDEX_BENCH_NOTIF_ROWS", "0"))
+USERS = 5000
+SAMPLES = 50
+
+pytestmark = pytest.mark.skipif(ROWS <= 0, reason="Benchmark opt-in: definir INCIDEX_BENCH_NOTIF_ROWS")
+
+LIST_SQL = """
+    SELECT id, ticket_id, kind, message, is_read, created_at
+    FROM bench_ticket_notifications {hint}
+    WHERE user_id = %s AND is_read = 0
+    ORDER BY created_at DESC
+    LIMIT 10
+"""
+COUNT_SQL = """
+    SELECT COUNT(*)
+    FROM bench_ticket_notifications {hint}
+    WHERE user_id = %s AND is_read = 0
+"""
+
+
+def _seed(cur, rows: int):
+    cur.execute("DROP TABLE IF EXISTS bench_ticket_notifications")
+    cur.execute("CREATE TABLE bench_ticket_notifications LIKE ticket_notifications")
+    cur.execute(
+        """
+        INSERT INTO bench_ticket_notifications (user_id, ticket_id, kind, message, is_read, created_at)
+        VALUES (1, 1, 'BENCH', 'seed', 0, NOW())
+        """
+    )
+    total = 1
+    # Duplicamos hasta llegar a `rows`: ~24 INSERT ... SELECT para 10M
+    while total < rows:
+        cur.execute(
+            """
+            INSERT INTO bench_ticket_notifications (user_id, ticket_id, kind, message, is_read, created_at)
+            SELECT
+              1 + ((id + %s) * 7919) %% %s,
+              ticket_id,
+              kind,
+              message,
+              IF(((id + %s) %% 10) = 0, 0, 1),        -- ~10%% sin leer
+              NOW() - INTERVAL ((id + %s) %% 720) DAY
+            FROM bench_ticket_notifications
+            LIMIT %s
+            """,
+            (total, USERS, total, total, rows - total),
+        )
+        total += cur.rowcount
+
+
+def _timed(cur, sql: str, users) -> list[float]:
+    tiempos = []
+    for uid in users:
+        t0 = time.perf_counter()
+        cur.execute(sql, (uid,))
+        cur.fetchall()
+        tiempos.append(time.perf_counter() - t0)
+    return tiempos
+
+
+def test_bench_indice_compuesto_vs_indice_por_usuario(db_conn):
+    with db_conn.cursor() as cur:
+        t0 = time.perf_counter()
+        _seed(cur, ROWS)
+        db_conn.commit()
+        seed_s = time.perf_counter() - t0
+
+        try:
+            users = [1 + (i * 97) % USERS for i in range(SAMPLES)]
+            resultados = {}
+            for nombre, hint in (("idx_notif_user", "FORCE INDEX (idx_notif_user)"),
+                                 ("compuesto", "FORCE INDEX (idx_notif_user_read_created)")):
+                lista = _timed(cur, LIST_SQL.format(hint=hint), users)
+                conteo = _timed(cur, COUNT_SQL.format(hint=hint), users)
+                resultados[nombre] = (statistics.median(lista), statistics.median(conteo))
+
+            print(f"\nSiembra de {ROWS} filas: {seed_s:.1f}s")
+            for nombre, (lista, conteo) in resultados.items():
+                print(f"  {nombre:>15}: listado p50 {lista * 1000:.2f} ms · conteo p50 {conteo * 1000:.2f} ms")
+
+            assert resultados["compuesto"][0] <= resultados["idx_notif_user"][0]
+            assert resultados["compuesto"][1] <= resultados["idx_notif_user"][1]
+        finally:
+            cur.execute("DROP TABLE IF EXISTS bench_ticket_notifications")
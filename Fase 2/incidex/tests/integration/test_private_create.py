@@ -95,3 +95,43 @@ def test_create_post_happy_path(auth_client, monkeypatch):
 
     # Como tenemos analistas en el depto 2, debe autoasignar al 42
     assert called["assignee_id"] == 42
+
+
+def test_create_post_adjunto_muy_grande_avisa(auth_client, monkeypatch):
+    """
+    Si un adjunto supera MAX_ATTACHMENT_BYTES el ticket se crea igual,
+    pero el usuario ve un aviso con el nombre del archivo descartado.
+    """
+    import io
+    from src.infrastructure.storage.attachment_store import AttachmentTooLarge
+
+    def fake_add_attachment(self, ticket_id, user_id, file_storage, upload_dir):
+        raise AttachmentTooLarge("El archivo supera el tamaño máximo permitido")
+
+    monkeypatch.setattr(
+        "src.presentation.web.blueprints.tickets.routes.TicketService.create",
+        lambda self, **kw: SimpleNamespace(id=123, code="INC-00123"),
+    )
+    monkeypatch.setattr(
+        "src.presentation.web.blueprints.tickets.routes.TicketService.add_attachment",
+        fake_add_attachment,
+    )
+
+    form_data = {
+        "subject": "Error en login",
+        "details": "Adjunto el video.",
+        "category_id": "1",
+        "department_id": "2",
+        "priority_id": "3",
+        "assignee_id": "42",
+        "files": (io.BytesIO(b"x" * 10), "video.mp4"),
+    }
+    resp = auth_client.post("/app/create", data=form_data,
+                            content_type="multipart/form-data", follow_redirects=False)
+
+    assert resp.status_code == HTTPStatus.FOUND
+    assert "/app/detail/123" in resp.headers["Location"]
+    with auth_client.session_transaction() as sess:
+        flashes = sess.get("_flashes", [])
+    assert [cat for cat, _ in flashes] == ["error"]
+    assert "video.mp4" in flashes[0][1]
@@ -0,0 +1,63 @@
+# tests/integration/test_private_download.py
+import hashlib
+
+from src.presentation.web.blueprints.tickets.routes import _send_attachment
+
+
+def _meta(tmp_path, data: bytes):
+    path = tmp_path / "blob"
+    path.write_bytes(data)
+    return {
+        "file_path": str(path),
+        "file_name": "captura.png",
+        "mime_type": "image/png",
+        "file_size": len(data),
+        "checksum_sha256": hashlib.sha256(data).hexdigest(),
+    }
+
+
+def test_download_usa_sha256_como_etag(app, tmp_path):
+    meta = _meta(tmp_path, b"0123456789" * 10)
+
+    with app.test_request_context("/"):
+        resp = _send_attachment(meta)
+
+    assert resp.status_code == 200
+    assert resp.get_etag() == (meta["checksum_sha256"], False)
+    assert resp.cache_control.private
+    resp.close()
+
+
+def test_download_if_none_match_devuelve_304(app, tmp_path):
+    meta = _meta(tmp_path, b"0123456789" * 10)
+
+    with app.test_request_context("/", headers={"If-None-Match": f'"{meta["checksum_sha256"]}"'}):
+        resp = _send_attachment(meta)
+
+    assert resp.status_code == 304
+    resp.close()
+
+
+def test_download_range_devuelve_206(app, tmp_path):
+    meta = _meta(tmp_path, b"0123456789" * 10)
+
+    with app.test_request_context("/", headers={"Range": "bytes=10-19"}):
+        resp = _send_attachment(meta)
+        resp.direct_passthrough = False
+        body = resp.get_data()
+
+    assert resp.status_code == 206
+    assert body == b"0123456789"
+    resp.close()
+
+
+def test_download_x_accel_redirect(app, tmp_path):
+    meta = _meta(tmp_path, b"contenido")
+    app.config["UPLOAD_FOLDER"] = str(tmp_path)
+    app.config["ATTACHMENT_ACCEL_REDIRECT"] = "/protected-uploads/"
+
+    with app.test_request_context("/"):
+        resp = _send_attachment(meta)
+
+    assert resp.headers["X-Accel-Redirect"] == "/protected-uploads/blob"
+    assert resp.get_data() == b""
@@ -0,0 +1,26 @@
+# tests/integration/test_private_events_stream.py
+
+
+def test_solo_las_paginas_en_vivo_abren_el_stream(auth_client):
+    """
+    El canal SSE retiene un hilo del worker: el panel lo abre, el
+    formulario de creación no.
+    """
+    panel = auth_client.get("/app/dashboard").data.decode("utf-8")
+    assert "data-events-url=" in panel and "js/realtime.js" in panel
+
+    crear = auth_client.get("/app/tickets/create").data.decode("utf-8")
+    assert "data-events-url=" not in crear and "js/realtime.js" not in crear
+
+
+def test_sobre_el_cupo_de_streams_responde_retry_sin_retener_hilo(app, auth_client):
+    """
+    Con SSE_MAX_STREAMS alcanzado se responde al instante un stream con
+    `retry:` (el EventSource reconecta más tarde) en vez de quedar abierto.
+    """
+    app.config.update(SSE_MAX_STREAMS=0, SSE_BUSY_RETRY_MS=45000)
+    resp = auth_client.get("/app/events/stream")
+
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/event-stream"
+    assert resp.data == b"retry: 45000\n\n"
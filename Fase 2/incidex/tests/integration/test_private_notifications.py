@@ -0,0 +1,42 @@
+from src.infrastructure.notifications.unread_cache import NotificationSummary, unread_cache
+
+
+def test_render_de_pagina_no_consulta_notificaciones(auth_client, monkeypatch):
+    """
+    El header ya no carga notificaciones al renderizar: solo las pide
+    vía JSON (carga diferida).
+    """
+    def fail(*args, **kwargs):
+        raise AssertionError("la página no debe consultar notificaciones")
+
+    monkeypatch.setattr(
+        "src.presentation.web.blueprints.tickets.routes.TicketRepository.list_unread_notifications",
+        fail,
+    )
+    unread_cache.clear()
+
+    resp = auth_client.get("/app/dashboard")
+    assert resp.status_code == 200
+    assert 'data-loaded="0"' in resp.data.decode("utf-8")
+
+
+def test_summary_json(auth_client, monkeypatch):
+    def fake_summary(self, user_id, limit=10):
+        return NotificationSummary(
+            unread=12,
+            recent=[{"id": 1, "ticket_id": 5, "kind": "ASSIGNED",
+                     "message": "Nuevo ticket", "is_read": 0,
+                     "created_at": "2025-01-01 10:00"}],
+        )
+
+    monkeypatch.setattr(
+        "src.presentation.web.blueprints.tickets.routes.TicketRepository.unread_notifications_summary",
+        fake_summary,
+    )
+
+    resp = auth_client.get("/app/notifications/summary")
+    assert resp.status_code == 200
+
+    data = resp.get_json()
+    assert data["unread"] == 12
+    assert data["items"][0]["url"].endswith("/app/detail/5")
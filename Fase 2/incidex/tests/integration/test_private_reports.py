@@ -0,0 +1,60 @@
+from http import HTTPStatus
+import uuid
+
+from sqlalchemy import text
+
+from src.infrastructure.persistence.database import db
+from src.application.use_cases.ticket_service import TicketService, HistoryReportDTO
+
+
+def test_reports_requires_admin(auth_client):
+    """El usuario de prueba no tiene rol ADMIN: /app/reports responde 403."""
+    resp = auth_client.get("/app/reports")
+    assert resp.status_code == HTTPStatus.FORBIDDEN
+
+
+def test_reports_renders_for_admin(app, monkeypatch):
+    """Un ADMIN ve las tablas armadas por TicketService.history_report."""
+    with app.app_context():
+        res = db.session.execute(text("""
+            INSERT INTO users
+                (names_worker, last_name, birthdate, email, gender, password_hash, is_active)
+            VALUES ('Admin', 'Reportes', '1990-01-01', :e, 'X', 'hash_de_prueba', 1)
+        """), {"e": f"pytest_reports_{uuid.uuid4()}@example.com"})
+        admin_id = res.lastrowid
+        db.session.execute(text("""
+            INSERT INTO user_roles (user_id, role_id)
+            SELECT :u, id FROM roles WHERE name = 'ADMIN'
+        """), {"u": admin_id})
+        db.session.commit()
+
+    def fake_history_report(self, *, weeks=8, store=None):
+        return HistoryReportDTO(
+            history_rows=3, tickets=2,
+            states=[{"status": "NUEVO", "tickets": 2, "mean_hours": 1.5,
+                     "p50_hours": 1.5, "p90_hours": 1.9}],
+            transition_labels=["NUEVO", "CERRADO"],
+            transitions=[["NUEVO", 0, 2], ["CERRADO", 0, 0]],
+            week_labels=["01/01"],
+            throughput=[{"name": "Ana Analista", "weeks": [2], "total": 2}],
+            reassigned_tickets=1, reassignments_max=1, reassignments_mean=1.0,
+        )
+
+    monkeypatch.setattr(TicketService, "history_report", fake_history_report)
+
+    try:
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess["_user_id"] = str(admin_id)
+            sess["_fresh"] = True
+
+        resp = client.get("/app/reports")
+        assert resp.status_code == HTTPStatus.OK
+        html = resp.get_data(as_text=True)
+        assert "Transiciones entre estados" in html
+        assert "Ana Analista" in html
+    finally:
+        with app.app_context():
+            db.session.execute(text("DELETE FROM user_roles WHERE user_id = :u"), {"u": admin_id})
+            db.session.execute(text("DELETE FROM users WHERE id = :u"), {"u": admin_id})
+            db.session.commit()
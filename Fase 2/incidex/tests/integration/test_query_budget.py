@@ -0,0 +1,79 @@
+# tests/integration/test_query_budget.py
+"""
+Presupuesto de consultas por endpoint. Si una vista empieza a consultar
+por fila (N+1), el conteo crece con los datos y estos tests fallan
+mostrando las sentencias ejecutadas.
+"""
+import uuid
+
+from sqlalchemy import text
+
+from src.domain.entities.ticket import Ticket
+from src.infrastructure.persistence.database import db
+
+DASHBOARD_MAX = 10
+MINE_MAX = 14
+DETAIL_MAX = 20
+
+
+def _ticket(requester_id: int) -> int:
+    t = Ticket(
+        code=f"QB-{uuid.uuid4().hex[:8].upper()}",
+        title="Ticket presupuesto de consultas",
+        description="Ticket para contar consultas",
+        requester_id=requester_id,
+        department_id=1,
+        category_id=1,
+        priority_id=1,
+        status_id=1,
+    )
+    db.session.add(t)
+    db.session.commit()
+    return t.id
+
+
+def _comentar(ticket_id: int, author_id: int, n: int):
+    for i in range(n):
+        db.session.execute(
+            text("INSERT INTO ticket_comments (ticket_id, author_user_id, body) VALUES (:t, :u, :b)"),
+            {"t": ticket_id, "u": author_id, "b": f"comentario {i}"},
+        )
+    db.session.commit()
+
+
+def test_dashboard_dentro_del_presupuesto(auth_client, assert_max_queries):
+    with assert_max_queries(DASHBOARD_MAX):
+        assert auth_client.get("/app/dashboard").status_code == 200
+
+
+def test_mine_no_crece_con_los_tickets(app, auth_client, test_user, assert_max_queries):
+    with assert_max_queries(MINE_MAX) as antes:
+        assert auth_client.get("/app/mine").status_code == 200
+
+    with app.app_context():
+        for _ in range(5):
+            _ticket(test_user)
+
+    with assert_max_queries(MINE_MAX) as despues:
+        assert auth_client.get("/app/mine").status_code == 200
+    assert despues.count == antes.count
+
+
+def test_detail_no_crece_con_los_comentarios(app, auth_client, test_user, assert_max_queries):
+    with app.app_context():
+        ticket_id = _ticket(test_user)
+
+    with assert_max_queries(DETAIL_MAX) as antes:
+        assert auth_client.get(f"/app/detail/{ticket_id}").status_code == 200
+
+    with app.app_context():
+        _comentar(ticket_id, test_user, 10)
+
+    with assert_max_queries(DETAIL_MAX) as despues:
+        assert auth_client.get(f"/app/detail/{ticket_id}").status_code == 200
+    assert despues.count == antes.count
+
+
+def test_respuesta_trae_server_timing(auth_client):
+    r = auth_client.get("/app/dashboard")
+    assert "db;dur=" in r.headers.get("Server-Timing", "")
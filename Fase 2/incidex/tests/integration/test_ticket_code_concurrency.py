@@ -0,0 +1,63 @@
+# tests/integration/test_ticket_code_concurrency.py
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import bindparam, text
+
+from src.infrastructure.persistence.database import db
+from src.infrastructure.persistence.repositories.ticket_repository import TicketRepository
+
+WORKERS = 8
+CREATES_PER_WORKER = 10
+MAX_P95_SECONDS = 1.0
+
+
+def test_creaciones_paralelas_sin_colisiones_de_codigo(app, test_user):
+    """
+    Benchmark de concurrencia: varios hilos crean tickets a la vez.
+    Todos los códigos deben ser únicos (INC-<id>) y la latencia p95
+    de insert_ticket debe mantenerse acotada.
+    """
+
+    def crear(n: int):
+        resultados = []
+        with app.app_context():
+            repo = TicketRepository()
+            for i in range(CREATES_PER_WORKER):
+                t0 = time.perf_counter()
+                created = repo.insert_ticket(
+                    title=f"Concurrencia {n}-{i}",
+                    description="Ticket generado por el benchmark de concurrencia",
+                    requester_id=test_user,
+                    department_id=1,
+                    category_id=1,
+                    priority_id=1,
+                )
+                resultados.append((created, time.perf_counter() - t0))
+        return resultados
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        lotes = list(pool.map(crear, range(WORKERS)))
+
+    resultados = [r for lote in lotes for r in lote]
+    creados = [c for c, _ in resultados]
+    latencias = sorted(lat for _, lat in resultados)
+
+    try:
+        codes = [c.code for c in creados]
+        assert len(codes) == WORKERS * CREATES_PER_WORKER
+        assert len(set(codes)) == len(codes), "Se generaron códigos duplicados"
+        for c in creados:
+            assert c.code == TicketRepository.ticket_code_for(c.id)
+
+        p95 = latencias[int(len(latencias) * 0.95) - 1]
+        assert p95 < MAX_P95_SECONDS, f"p95 de creación demasiado alto: {p95:.3f}s"
+    finally:
+        with app.app_context():
+            db.session.execute(
+                text("DELETE FROM tickets WHERE id IN :ids").bindparams(
+                    bindparam("ids", expanding=True)
+                ),
+                {"ids": [c.id for c in creados]},
+            )
+            db.session.commit()
@@ -0,0 +1,161 @@
+# tests/perf/conftest.py
+"""
+Benchmarks (pytest-benchmark) de las rutas calientes de repositorio,
+servicio y reportes de escritorio contra MySQL con datos de `flask seed-data`.
+
+Son opt-in y necesitan la BD de infra/docker (DATABASE_URL a MySQL):
+
+    # 1) Guardar la línea base (queda en tests/perf/.benchmarks/<máquina>/)
+    INCIDEX_PERF=1 pytest tests/perf --benchmark-storage=tests/perf/.benchmarks --benchmark-autosave
+
+    # 2) Comparar contra la última línea base y fallar si la mediana empeora >20%
+    INCIDEX_PERF=1 pytest tests/perf --benchmark-storage=tests/perf/.benchmarks \
+        --benchmark-compare --benchmark-compare-fail=median:20%
+
+Si la BD tiene menos de INCIDEX_PERF_TICKETS tickets sembrados (por
+defecto 20000) se siembran con la semilla fija de seed-data, así todas las
+corridas miden el mismo conjunto de datos. El esquema usa SQL de MySQL
+(DATE_FORMAT, FULLTEXT, procedimientos), por lo que no corre sobre SQLite.
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+PERF_ENABLED = os.getenv("INCIDEX_PERF") == "1"
+PERF_TICKETS = int(os.getenv("INCIDEX_PERF_TICKETS", "20000"))
+DESKTOP_DIR = Path(__file__).resolve().parents[2] / "src" / "presentation" / "desktop"
+
+
+def _plugin_available() -> bool:
+    try:
+        import pytest_benchmark  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def pytest_collection_modifyitems(config, items):
+    if PERF_ENABLED and _plugin_available():
+        return
+    razon = ("definir INCIDEX_PERF=1 para correr los benchmarks" if not PERF_ENABLED
+             else "falta pytest-benchmark (pip install -r requirements.txt)")
+    skip = pytest.mark.skip(reason=razon)
+    perf_dir = Path(__file__).resolve().parent
+    for item in items:
+        if Path(str(item.fspath)).resolve().is_relative_to(perf_dir):
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def perf_app():
+    from src.presentation.web import create_app
+    from src.infrastructure.persistence.database import db
+
+    app = create_app()
+    app.config.update(
+        TESTING=True,
+        WTF_CSRF_ENABLED=False,
+        # Correo a un puerto cerrado: falla al instante y solo se loguea,
+        # así change_status mide la BD y no un servidor SMTP.
+        MAIL_SERVER="127.0.0.1",
+        MAIL_PORT=1,
+        MAIL_USE_TLS=False,
+        MAIL_USE_SSL=False,
+    )
+    with app.app_context():
+        if db.engine.dialect.name != "mysql":
+            pytest.skip("los benchmarks necesitan MySQL (DATABASE_URL)")
+    return app
+
+
+@pytest.fixture(scope="session")
+def perf_data(perf_app):
+    """
+    Ids fijos del conjunto sembrado: el solicitante y el analista con más
+    tickets, un admin y un ticket abierto para cambiar de estado.
+    """
+    from sqlalchemy import text
+    from src.commands.seed_data import seed_data_cmd
+    from src.infrastructure.persistence.database import db
+    from src.infrastructure.seeding.synthetic import SEED_CODE_PREFIX, SEED_EMAIL_DOMAIN
+
+    with perf_app.app_context():
+        sembrados = db.session.execute(
+            text("SELECT COUNT(*) FROM tickets WHERE code LIKE :p"), {"p": f"{SEED_CODE_PREFIX}%"}
+        ).scalar()
+        db.session.commit()
+        if sembrados < PERF_TICKETS:
+            res = perf_app.test_cli_runner().invoke(
+                seed_data_cmd, ["--tickets", str(PERF_TICKETS - sembrados), "--no-refresh-reports"]
+            )
+            assert res.exit_code == 0, res.output
+
+        dominio = {"d": f"%@{SEED_EMAIL_DOMAIN}"}
+
+        def por_rol(rol: str, col: str) -> int:
+            return db.session.execute(text(f"""
+                SELECT u.id
+                FROM users u
+                JOIN user_roles ur ON ur.user_id = u.id
+                JOIN roles r       ON r.id = ur.role_id AND r.name = :rol
+                LEFT JOIN tickets t ON t.{col} = u.id
+                WHERE u.email LIKE :d
+                GROUP BY u.id
+                ORDER BY COUNT(t.id) DESC, u.id
+                LIMIT 1
+            """), {**dominio, "rol": rol}).scalar()
+
+        requester = por_rol("REQUESTER", "requester_id")
+        analyst = por_rol("ANALYST", "assignee_id")
+        admin = por_rol("ADMIN", "requester_id")
+        ticket = db.session.execute(text("""
+            SELECT t.id
+            FROM tickets t
+            JOIN statuses s ON s.id = t.status_id
+            WHERE t.code LIKE :p AND s.name IN ('ASIGNADO', 'EN_PROGRESO')
+            ORDER BY t.id
+            LIMIT 1
+        """), {"p": f"{SEED_CODE_PREFIX}%"}).scalar()
+        statuses = dict(db.session.execute(text("SELECT name, id FROM statuses")).all())
+        db.session.commit()
+
+    return {
+        "requester_id": requester,
+        "analyst_id": analyst,
+        "admin_id": admin,
+        "ticket_id": ticket,
+        "statuses": statuses,
+    }
+
+
+@pytest.fixture
+def app_ctx(perf_app):
+    from src.infrastructure.persistence.database import db
+
+    with perf_app.app_context():
+        yield
+        db.session.rollback()
+
+
+@pytest.fixture
+def login_as(perf_app):
+    def _client(user_id: int):
+        client = perf_app.test_client()
+        with client.session_transaction() as sess:
+            sess["_user_id"] = str(user_id)
+            sess["_fresh"] = True
+        return client
+    return _client
+
+
+@pytest.fixture(scope="session")
+def desktop_db_manager():
+    """DBManager de escritorio (usa imports `core.*` y las variables MYSQL_*)."""
+    if not os.getenv("MYSQL_USER"):
+        pytest.skip("definir MYSQL_USER/MYSQL_PASSWORD/MYSQL_DATABASE para el DBManager de escritorio")
+    if str(DESKTOP_DIR) not in sys.path:
+        sys.path.insert(0, str(DESKTOP_DIR))
+    from core.db_manager import DBManager
+    return DBManager
@@ -0,0 +1,41 @@
+# tests/perf/test_desktop_reports_perf.py
+"""Reportes del DBManager de escritorio sobre el mismo conjunto sembrado."""
+from datetime import date, timedelta
+
+import pytest
+
+# perf_data asegura que el conjunto sembrado exista antes de medir
+pytestmark = pytest.mark.usefixtures("perf_data")
+
+HOY = date.today()
+HACE_90 = HOY - timedelta(days=90)
+
+
+@pytest.fixture(scope="module")
+def qdate():
+    # generar_reporte_tickets recibe QDate (los filtros vienen de la UI)
+    QtCore = pytest.importorskip("PySide6.QtCore")
+    return lambda d: QtCore.QDate(d.year, d.month, d.day)
+
+
+def test_generar_reporte_tickets_90_dias(benchmark, desktop_db_manager, qdate):
+    filtros = {"inicio": qdate(HACE_90), "fin": qdate(HOY)}
+    filas = benchmark.pedantic(desktop_db_manager.generar_reporte_tickets, args=(filtros,),
+                               rounds=5, iterations=1, warmup_rounds=1)
+    assert filas
+
+
+def test_generar_reporte_tickets_filtrado(benchmark, desktop_db_manager, qdate):
+    filtros = {"prioridad_id": 1, "estado_id": 3, "inicio": qdate(HACE_90), "fin": qdate(HOY)}
+    benchmark(desktop_db_manager.generar_reporte_tickets, filtros)
+
+
+def test_generar_reporte_bitacora_30_dias(benchmark, desktop_db_manager):
+    filtros = {"inicio": str(HOY - timedelta(days=30)), "fin": str(HOY)}
+    filas = benchmark.pedantic(desktop_db_manager.generar_reporte_bitacora, args=(filtros,),
+                               rounds=5, iterations=1, warmup_rounds=1)
+    assert filas
+
+
+def test_generar_reporte_bitacora_por_usuario(benchmark, desktop_db_manager):
+    benchmark(desktop_db_manager.generar_reporte_bitacora, {"usuario": "González"})
@@ -0,0 +1,116 @@
+# tests/perf/test_desktop_startup_perf.py
+"""
+Arranque de la app de escritorio sin pantalla (QT_QPA_PLATFORM=offscreen):
+login visible, ventana principal con páginas diferidas, construcción de
+cada página y navegación hasta que llegan los datos en segundo plano.
+"""
+import os
+
+import pytest
+
+pytestmark = pytest.mark.usefixtures("perf_data")
+
+PAGINAS = [
+    "crear_usuario", "admin_usuarios", "admin_categorias",
+    "admin_departamentos", "reportes", "bitacora",
+]
+
+
+@pytest.fixture(scope="module")
+def qapp(desktop_db_manager):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    yield app
+    _esperar_tareas(app)
+
+
+@pytest.fixture
+def sesion(desktop_db_manager, perf_data):
+    desktop_db_manager.set_user({"id": perf_data["admin_id"], "nombre": "perf", "rol": "ADMIN", "email": "perf@x"})
+    yield
+    desktop_db_manager.clear_user()
+
+
+def _esperar_tareas(app):
+    from PySide6.QtCore import QThreadPool
+    QThreadPool.globalInstance().waitForDone()
+    app.processEvents()
+
+
+def _ventana(app):
+    from views.main_window import MainWindow
+    win = MainWindow()
+    win.show()
+    app.processEvents()
+    return win
+
+
+def _cerrar(app, win):
+    _esperar_tareas(app)
+    win.hide()
+    win.deleteLater()
+    app.processEvents()
+
+
+def test_ventana_login(benchmark, qapp):
+    from views.login_dialog import LoginDialog
+
+    def abrir():
+        dlg = LoginDialog()
+        dlg.show()
+        qapp.processEvents()
+        return dlg
+
+    dlg = benchmark.pedantic(abrir, rounds=10, iterations=1, warmup_rounds=1)
+    dlg.deleteLater()
+
+
+def test_ventana_principal_solo_construye_inicio(benchmark, qapp, sesion):
+    win = benchmark.pedantic(lambda: _ventana(qapp), rounds=10, iterations=1, warmup_rounds=1)
+    assert [n for n in PAGINAS + ["inicio"] if win.router.construida(n)] == ["inicio"]
+    _cerrar(qapp, win)
+
+
+@pytest.mark.parametrize("nombre", PAGINAS)
+def test_construir_pagina(benchmark, qapp, sesion, nombre):
+    """Solo la construcción (hilo de la UI); la consulta queda en segundo plano."""
+    ventanas = []
+
+    def preparar():
+        ventanas.append(_ventana(qapp))
+        return (ventanas[-1],), {}
+
+    benchmark.pedantic(lambda win: win.router.pagina(nombre), setup=preparar, rounds=5, iterations=1)
+    for win in ventanas:
+        _cerrar(qapp, win)
+
+
+@pytest.mark.parametrize("nombre", ["admin_usuarios", "bitacora"])
+def test_navegar_hasta_tener_datos(benchmark, qapp, sesion, nombre):
+    """Construcción + consulta en el pool + tabla armada en la UI."""
+    ventanas = []
+
+    def preparar():
+        ventanas.append(_ventana(qapp))
+        return (ventanas[-1],), {}
+
+    def navegar(win):
+        win.router.ir(nombre)
+        _esperar_tareas(qapp)
+
+    benchmark.pedantic(navegar, setup=preparar, rounds=5, iterations=1)
+    assert ventanas[-1].router.pagina(nombre).table.rowCount() > 0
+    for win in ventanas:
+        _cerrar(qapp, win)
+
+
+def test_reporte_de_arranque(qapp, sesion):
+    from core.arranque import tiempos
+
+    win = _ventana(qapp)
+    win.router.ir("admin_usuarios")
+    reporte = tiempos.reporte()
+    assert "admin_usuarios" in reporte["paginas_ms"] and "inicio" in reporte["paginas_ms"]
+    tiempos.registrar()
+    _cerrar(qapp, win)
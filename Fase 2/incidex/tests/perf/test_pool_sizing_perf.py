@@ -0,0 +1,105 @@
+# tests/perf/test_pool_sizing_perf.py
+"""
+Throughput del listado /mine (COUNT + página) con N hilos concurrentes
+para cada perfil de pool (DB_PROFILE). Cada operación abre y cierra su
+app context, como un request: toma una conexión del pool y la devuelve.
+
+Sirve para dimensionar el pool según los hilos por proceso de gunicorn:
+con más hilos que pool_size + max_overflow sube la espera del checkout y
+aparecen timeouts; con muchos menos, el pool sobra. Los resultados quedan
+en extra_info (ops_por_s, timeouts, errores) del JSON de pytest-benchmark:
+
+    INCIDEX_PERF=1 pytest tests/perf/test_pool_sizing_perf.py --benchmark-columns=median,rounds \\
+        --benchmark-storage=tests/perf/.benchmarks --benchmark-autosave
+"""
+import os
+import threading
+import time
+
+import pytest
+
+from src.infrastructure.metrics import DB_POOL_TIMEOUTS
+
+pytestmark = pytest.mark.usefixtures("perf_data")
+
+PROFILES = ["dev", "prod-small", "prod-large"]
+WORKERS = [1, 4, 8, 16, 32]
+OPS_PER_WORKER = 25
+
+_apps = {}
+
+
+@pytest.fixture
+def profile_app(perf_app):
+    """Una app por perfil (create_app lee DB_PROFILE al crear el engine)."""
+    def _get(profile: str):
+        if profile not in _apps:
+            from src.presentation.web import create_app
+
+            previo = os.environ.get("DB_PROFILE")
+            os.environ["DB_PROFILE"] = profile
+            try:
+                app = create_app()
+            finally:
+                if previo is None:
+                    os.environ.pop("DB_PROFILE", None)
+                else:
+                    os.environ["DB_PROFILE"] = previo
+            app.config.update(TESTING=True)
+            _apps[profile] = app
+        return _apps[profile]
+    return _get
+
+
+def _carga(app, user_id: int, workers: int) -> dict:
+    from src.infrastructure.persistence.database import db
+    from src.infrastructure.persistence.repositories.ticket_repository import TicketRepository
+
+    errores = []
+    inicio = threading.Barrier(workers + 1)
+
+    def trabajar(i):
+        inicio.wait()
+        for n in range(OPS_PER_WORKER):
+            try:
+                with app.app_context():
+                    TicketRepository().list_mine(user_id, page=1 + (i + n) % 5, per_page=10)
+                    db.session.commit()
+            except Exception as e:   # p. ej. timeout del pool: se cuenta, no corta la corrida
+                errores.append(type(e).__name__)
+
+    hilos = [threading.Thread(target=trabajar, args=(i,), daemon=True) for i in range(workers)]
+    for h in hilos:
+        h.start()
+    timeouts0 = DB_POOL_TIMEOUTS.value()
+    t0 = time.perf_counter()
+    inicio.wait()
+    for h in hilos:
+        h.join()
+    elapsed = time.perf_counter() - t0
+    return {
+        "ops_por_s": round(workers * OPS_PER_WORKER / elapsed, 1),
+        "timeouts": int(DB_POOL_TIMEOUTS.value() - timeouts0),
+        "errores": len(errores),
+    }
+
+
+@pytest.mark.parametrize("workers", WORKERS)
+@pytest.mark.parametrize("profile", PROFILES)
+def test_throughput_por_hilos(benchmark, profile_app, perf_data, profile, workers):
+    app = profile_app(profile)
+    corridas = []
+    benchmark.pedantic(
+        lambda: corridas.append(_carga(app, perf_data["requester_id"], workers)),
+        rounds=3, iterations=1, warmup_rounds=1,
+    )
+    mejor = max(corridas, key=lambda c: c["ops_por_s"])
+    with app.app_context():
+        from src.infrastructure.persistence.database import db
+        pool = db.engine.pool
+        benchmark.extra_info.update(
+            profile=profile, workers=workers,
+            pool_size=pool.size(), max_overflow=pool._max_overflow,
+            **mejor,
+        )
+    assert sum(c["errores"] for c in corridas) == sum(c["timeouts"] for c in corridas), corridas
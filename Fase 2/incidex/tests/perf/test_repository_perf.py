@@ -0,0 +1,50 @@
+# tests/perf/test_repository_perf.py
+import pytest
+
+from src.infrastructure.persistence.repositories.ticket_repository import TicketRepository
+
+pytestmark = pytest.mark.usefixtures("app_ctx")
+
+
+@pytest.fixture
+def repo():
+    return TicketRepository()
+
+
+@pytest.mark.parametrize("page", [1, 50])
+def test_paged_items_mine(benchmark, repo, perf_data, page):
+    """_paged_items con el filtro de /mine (solicitante o asignado), primera y página 50."""
+    items, total = benchmark(repo.list_mine, perf_data["requester_id"], page=page, per_page=10)
+    assert total > 0
+
+
+@pytest.mark.parametrize("page", [1, 200])
+def test_paged_items_admin(benchmark, repo, page):
+    """_paged_items sin filtro de usuario (vista de admin): COUNT(*) + ORDER BY updated_at."""
+    items, total = benchmark(repo.list_all, page=page, per_page=10)
+    assert len(items) == 10
+
+
+def test_paged_items_busqueda(benchmark, repo):
+    """_paged_items con búsqueda de texto y rango de fechas."""
+    benchmark(repo.list_all, q="VPN", date_from="2000-01-01", date_to="2999-12-31", page=1, per_page=10)
+
+
+def test_kpis_for_user(benchmark, repo, perf_data):
+    kpis = benchmark(repo.kpis_for_user, perf_data["analyst_id"])
+    assert set(kpis) == {"open", "in_progress", "closed_week"}
+
+
+def test_recent_for_user(benchmark, repo, perf_data):
+    rows = benchmark(repo.recent_for_user, perf_data["requester_id"], limit=5)
+    assert len(rows) == 5
+
+
+def test_detail(benchmark, repo, perf_data):
+    t = benchmark(repo.detail, perf_data["ticket_id"])
+    assert t is not None
+
+
+def test_list_analysts_by_department_with_load(benchmark, repo):
+    rows = benchmark(repo.list_analysts_by_department_with_load)
+    assert rows
@@ -0,0 +1,51 @@
+# tests/perf/test_service_perf.py
+from itertools import cycle
+
+from src.application.use_cases.ticket_service import TicketService
+from src.infrastructure.persistence.repositories.ticket_repository import TicketRepository
+
+
+def test_change_status(benchmark, perf_app, perf_data):
+    """
+    change_status completo (historial, SLA, notificaciones, commit) como
+    admin, alternando el mismo ticket entre ASIGNADO y EN_PROGRESO.
+    """
+    st = perf_data["statuses"]
+    destinos = cycle([st["EN_PROGRESO"], st["ASIGNADO"]])
+
+    def cambiar():
+        with perf_app.app_context():
+            svc = TicketService(TicketRepository())
+            svc.change_status(
+                ticket_id=perf_data["ticket_id"],
+                actor_id=perf_data["admin_id"],
+                actor_roles=["ADMIN"],
+                to_status_id=next(destinos),
+                note="perf",
+            )
+
+    benchmark.pedantic(cambiar, rounds=30, iterations=1, warmup_rounds=2)
+
+
+def test_mine_export_requester(benchmark, login_as, perf_data):
+    """/app/mine/export de un solicitante: listado completo sin paginar + CSV."""
+    client = login_as(perf_data["requester_id"])
+
+    def exportar():
+        r = client.get("/app/mine/export")
+        assert r.status_code == 200
+        return r
+
+    benchmark(exportar)
+
+
+def test_mine_export_analyst(benchmark, login_as, perf_data):
+    """/app/mine/export de un analista: su departamento completo."""
+    client = login_as(perf_data["analyst_id"])
+
+    def exportar():
+        r = client.get("/app/mine/export")
+        assert r.status_code == 200
+        return r
+
+    benchmark.pedantic(exportar, rounds=5, iterations=1, warmup_rounds=1)
@@ -8,3 +8,12 @@ def fake_gemini_key():
     simplemente colocamos un valor dummy.
     """
     os.environ["GEMINI_API_KEY"] = "dummy"
+
+
+# La app de escritorio importa sus módulos como `core.*` (corre desde su carpeta)
+DESKTOP_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "src", "presentation", "desktop")
+
+
+@pytest.fixture
+def desktop_path(monkeypatch):
+    monkeypatch.syspath_prepend(os.path.abspath(DESKTOP_DIR))
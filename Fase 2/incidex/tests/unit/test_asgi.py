@@ -0,0 +1,202 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from flask import Flask, jsonify, request
+from flask_login import LoginManager, UserMixin
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+from src.infrastructure.ai import gemini_client
+from src.infrastructure.rate_limit import rate_limiter
+from src.infrastructure.persistence.repositories.ticket_repository import TicketRepository
+from src.presentation import asgi
+
+
+class _User(UserMixin):
+    id = 1
+
+
+@pytest.fixture
+def flask_app():
+    app = Flask(__name__)
+    app.secret_key = "test"
+    login = LoginManager(app)
+    login.user_loader(lambda uid: _User() if uid == "1" else None)
+
+    @app.post("/app/ai/suggest")
+    def suggest():
+        return jsonify({"via": "flask", "body": request.get_json(silent=True)})
+
+    return app
+
+
+def _call(app, path, payload, cookie=None, extra_headers=()):
+    body = json.dumps(payload).encode()
+    headers = [(b"host", b"test"), (b"content-type", b"application/json"),
+               (b"content-length", str(len(body)).encode())]
+    if cookie:
+        headers.append((b"cookie", cookie.encode()))
+    headers += [(k.lower().encode(), v.encode()) for k, v in extra_headers]
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+             "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+             "query_string": b"", "headers": headers, "client": ("127.0.0.1", 5000),
+             "server": ("test", 80)}
+    chunks = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return chunks.pop(0) if chunks else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    start = sent[0]
+    headers = {k.decode(): v.decode() for k, v in start["headers"]}
+    return start["status"], headers, json.loads(b"".join(m.get("body", b"") for m in sent[1:]))
+
+
+def _session_cookie(app):
+    value = app.session_interface.get_signing_serializer(app).dumps({"_user_id": "1", "_fresh": True})
+    return f"{app.config['SESSION_COOKIE_NAME']}={value}"
+
+
+@pytest.fixture
+def fake_backends(monkeypatch):
+    llamadas = []
+
+    async def fake_suggest(**kwargs):
+        llamadas.append(kwargs)
+        await asyncio.sleep(0)
+        return {"category_id": 2, "reason": "red"}
+
+    monkeypatch.setattr(gemini_client, "suggest_ticket_metadata_async", fake_suggest)
+    for name in ("get_categories", "get_priorities", "get_departments"):
+        monkeypatch.setattr(TicketRepository, name, lambda self: [{"id": 2, "name": "Redes"}])
+    return llamadas
+
+
+def test_suggest_lo_atiende_la_corrutina(flask_app, fake_backends):
+    app = asgi.AsyncRoutes(flask_app, asgi.ASYNC_ROUTES)
+    status, headers, data = _call(app, "/app/ai/suggest", {"title": "VPN caída"},
+                                  cookie=_session_cookie(flask_app))
+
+    assert status == 200 and data == {"category_id": 2, "reason": "red"}
+    assert headers["content-type"] == "application/json" and headers["x-request-id"]
+    assert fake_backends[0]["title"] == "VPN caída"
+    assert fake_backends[0]["categories"] == [{"id": 2, "name": "Redes"}]
+
+
+@pytest.mark.parametrize("payload,with_session", [({"title": "x"}, False), ({}, True)])
+def test_sin_sesion_o_sin_texto_lo_atiende_flask(flask_app, fake_backends, payload, with_session):
+    app = asgi.AsyncRoutes(flask_app, asgi.ASYNC_ROUTES)
+    status, _, data = _call(app, "/app/ai/suggest", payload,
+                            cookie=_session_cookie(flask_app) if with_session else None)
+
+    assert status == 200 and data == {"via": "flask", "body": payload}   # el cuerpo llega entero
+    assert fake_backends == []
+
+
+def test_sobre_el_limite_responde_429_sin_llamar_al_modelo(flask_app, fake_backends):
+    flask_app.config.update(RATELIMIT_AI_SUGGEST_USER="1/minute", RATELIMIT_AI_SUGGEST_IP="off")
+    rate_limiter.init_app(flask_app)
+    app = asgi.AsyncRoutes(flask_app, asgi.ASYNC_ROUTES)
+    cookie = _session_cookie(flask_app)
+
+    assert _call(app, "/app/ai/suggest", {"title": "VPN"}, cookie=cookie)[0] == 200
+    status, headers, data = _call(app, "/app/ai/suggest", {"title": "VPN"}, cookie=cookie)
+
+    assert status == 429 and data == {"error": "rate_limited", "retry_after": 60}
+    assert headers["retry-after"] == "60" and headers["x-request-id"]
+    assert len(fake_backends) == 1
+
+
+def test_limite_por_ip_usa_x_forwarded_for_como_flask(flask_app, fake_backends):
+    flask_app.config.update(RATELIMIT_AI_SUGGEST_USER="off", RATELIMIT_AI_SUGGEST_IP="1/minute")
+    flask_app.wsgi_app = ProxyFix(flask_app.wsgi_app, x_for=1)
+    rate_limiter.init_app(flask_app)
+    app = asgi.AsyncRoutes(flask_app, asgi.ASYNC_ROUTES)
+    cookie = _session_cookie(flask_app)
+
+    def post(ip):
+        return _call(app, "/app/ai/suggest", {"title": "VPN"}, cookie=cookie,
+                     extra_headers=[("X-Forwarded-For", ip)])[0]
+
+    assert [post("203.0.113.5"), post("203.0.113.5"), post("203.0.113.6")] == [200, 429, 200]
+
+
+def _get(app, path):
+    """GET por la app ASGI dentro del loop que ya corre (para lanzar varios a la vez)."""
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+             "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+             "query_string": b"", "headers": [(b"host", b"test")], "client": ("127.0.0.1", 5000),
+             "server": ("test", 80)}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    async def run():
+        await app(scope, receive, send)
+        return sent[0]["status"], b"".join(m.get("body", b"") for m in sent[1:]).decode()
+    return run()
+
+
+def test_requests_de_flask_lentos_corren_en_paralelo(flask_app):
+    hilos = set()
+
+    @flask_app.get("/lento")
+    def lento():
+        hilos.add(threading.get_ident())
+        time.sleep(0.5)
+        return "ok"
+
+    @flask_app.get("/app/events/stream")
+    def stream():
+        hilos.add(threading.current_thread().name)
+        return "stream"
+
+    app = asgi.AsyncRoutes(flask_app, asgi.ASYNC_ROUTES, threads=4)
+
+    async def juntos():
+        return await asyncio.gather(_get(app, "/lento"), _get(app, "/lento"), _get(app, "/app/events/stream"))
+
+    t0 = time.perf_counter()
+    resultados = asyncio.run(juntos())
+    assert time.perf_counter() - t0 < 0.9      # no 2 × 0.5 s en un solo hilo
+    assert resultados == [(200, "ok"), (200, "ok"), (200, "stream")]
+    assert len({h for h in hilos if isinstance(h, int)}) == 2
+    assert any(isinstance(h, str) and h.startswith("sse") for h in hilos)   # SSE en su propio pool
+
+
+def test_flask_recibe_el_request_y_la_respuesta_sale_por_pedazos(flask_app):
+    @flask_app.get("/eco")
+    def eco():
+        vistos = f"{request.path}?{request.query_string.decode()} {request.remote_addr}"
+
+        def pedazos():
+            yield vistos
+            yield "|fin"
+        return flask_app.response_class(pedazos(), mimetype="text/plain")
+
+    app = asgi.PooledWsgi(flask_app, asgi.ThreadPoolExecutor(1))
+    scope = {"type": "http", "http_version": "1.1", "method": "GET", "scheme": "http",
+             "path": "/eco", "root_path": "", "query_string": b"q=%C3%B1", "headers": [(b"host", b"test")],
+             "client": ("10.0.0.7", 5000), "server": ("test", 80)}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    assert sent[0]["status"] == 200
+    assert [m["body"] for m in sent[1:]] == [b"/eco?q=%C3%B1 10.0.0.7", b"|fin", b""]
+    assert [m["more_body"] for m in sent[1:]] == [True, True, False]
@@ -0,0 +1,87 @@
+import os
+
+import pytest
+
+from src.infrastructure.storage import previews
+
+
+def test_preview_de_texto_guarda_solo_la_cabecera(tmp_path):
+    blob = tmp_path / "abc123"
+    blob.write_bytes(b"linea de log\n" * 2000)
+
+    path = previews.generate_preview(str(blob), "text/plain")
+
+    assert path == str(blob) + previews.TEXT_SUFFIX
+    with open(path, "rb") as fh:
+        assert len(fh.read()) <= previews.TEXT_HEAD_BYTES
+
+
+def test_tipo_sin_preview_devuelve_none(tmp_path):
+    blob = tmp_path / "abc123"
+    blob.write_bytes(b"%PDF-1.7")
+
+    assert previews.generate_preview(str(blob), "application/pdf") is None
+    assert os.listdir(tmp_path) == ["abc123"]
+
+
+def test_miniatura_de_imagen_reducida(tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    blob = tmp_path / "abc123"
+    Image.new("RGB", (2000, 1000), "red").save(blob, "PNG")
+
+    previews.schedule_preview(str(blob), "image/png").result()
+    path = previews.preview_path(str(blob), "image/png")
+
+    with Image.open(path) as im:
+        assert im.format == "JPEG"
+        assert max(im.size) <= max(previews.THUMB_SIZE)
+
+
+def test_no_regenera_si_ya_existe(tmp_path):
+    blob = tmp_path / "abc123"
+    blob.write_bytes(b"contenido")
+    first = previews.generate_preview(str(blob), "text/plain")
+    mtime = os.path.getmtime(first)
+
+    assert previews.generate_preview(str(blob), "text/plain") == first
+    assert os.path.getmtime(first) == mtime
+
+
+def test_solo_imagenes_raster_tienen_miniatura(tmp_path):
+    pytest.importorskip("PIL.Image")
+    blob = str(tmp_path / "abc123")
+
+    assert previews.preview_path(blob, "image/png") == blob + previews.THUMB_SUFFIX
+    assert previews.preview_path(blob, "image/svg+xml") is None
+    assert previews.schedule_preview(blob, "image/heic") is None
+
+
+def test_imagen_corrupta_no_se_reintenta(tmp_path):
+    pytest.importorskip("PIL.Image")
+    blob = tmp_path / "abc123"
+    blob.write_bytes(b"no es un png")
+
+    previews.schedule_preview(str(blob), "image/png").result()   # el error solo se loguea
+
+    assert previews.preview_failed(str(blob))
+    assert not os.path.exists(previews.preview_path(str(blob), "image/png"))
+    assert previews.schedule_preview(str(blob), "image/png") is None
+    assert previews.generate_preview(str(blob), "image/png") is None
+
+
+def test_error_de_disco_no_deja_marca_y_se_reintenta(tmp_path, monkeypatch):
+    Image = pytest.importorskip("PIL.Image")
+    blob = tmp_path / "abc123"
+    Image.new("RGB", (50, 50), "blue").save(blob, "PNG")
+
+    def disco_lleno(*args, **kwargs):
+        raise OSError(28, "No space left on device")
+
+    with monkeypatch.context() as m:
+        m.setattr(previews.os, "replace", disco_lleno)
+        with pytest.raises(OSError):
+            previews.generate_preview(str(blob), "image/png")
+    assert not previews.preview_failed(str(blob))
+
+    path = previews.generate_preview(str(blob), "image/png")
+    assert path and os.path.exists(path)
@@ -0,0 +1,64 @@
+import hashlib
+import io
+import os
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from src.infrastructure.storage.attachment_store import AttachmentStore, AttachmentTooLarge
+
+
+def _upload(data: bytes, name="log.txt"):
+    return FileStorage(stream=io.BytesIO(data), filename=name, content_type="text/plain")
+
+
+def test_stage_calcula_hash_y_tamano_en_una_pasada(tmp_path):
+    store = AttachmentStore(str(tmp_path))
+    data = b"linea de log\n" * 1000
+
+    staged = store.stage(_upload(data))
+
+    assert staged.size == len(data)
+    assert staged.sha256 == hashlib.sha256(data).hexdigest()
+    assert staged.blob_path.endswith(
+        os.path.join(staged.sha256[:2], staged.sha256[2:4], staged.sha256)
+    )
+    assert os.path.exists(staged.tmp_path)
+    assert not os.path.exists(staged.blob_path)
+
+
+def test_publish_deduplica_contenido_identico(tmp_path):
+    store = AttachmentStore(str(tmp_path))
+
+    a = store.stage(_upload(b"mismo contenido", name="log.txt"))
+    b = store.stage(_upload(b"mismo contenido", name="otro.txt"))
+    store.publish(a)
+    store.publish(b)
+
+    assert a.blob_path == b.blob_path
+    assert os.path.exists(a.blob_path)
+    assert not os.path.exists(a.tmp_path)
+    assert not os.path.exists(b.tmp_path)
+
+
+def test_mismo_nombre_distinto_contenido_no_se_pisan(tmp_path):
+    store = AttachmentStore(str(tmp_path))
+
+    a = store.stage(_upload(b"ticket 1", name="log.txt"))
+    b = store.stage(_upload(b"ticket 2", name="log.txt"))
+    store.publish(a)
+    store.publish(b)
+
+    with open(a.blob_path, "rb") as fh:
+        assert fh.read() == b"ticket 1"
+    with open(b.blob_path, "rb") as fh:
+        assert fh.read() == b"ticket 2"
+
+
+def test_stage_corta_si_supera_el_maximo(tmp_path):
+    store = AttachmentStore(str(tmp_path), max_bytes=1024)
+
+    with pytest.raises(AttachmentTooLarge):
+        store.stage(_upload(b"x" * 4096))
+
+    assert os.listdir(os.path.join(str(tmp_path), "tmp")) == []
@@ -0,0 +1,156 @@
+import json
+
+import pytest
+from flask import Flask
+from sqlalchemy import text
+
+from src.infrastructure.audit import writer as writer_module
+from src.infrastructure.audit.writer import AuditWriter
+from src.infrastructure.metrics import AUDIT_DROPPED
+from src.infrastructure.persistence.database import db
+from src.infrastructure.persistence.repositories import ticket_repository
+from src.infrastructure.persistence.repositories.ticket_repository import TicketRepository
+
+
+@pytest.fixture
+def sqlite_app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    app.config["AUDIT_FLUSH_AT_EXIT"] = False
+    db.init_app(app)
+    with app.app_context():
+        db.session.execute(text("""
+            CREATE TABLE audit_events (
+              id INTEGER PRIMARY KEY AUTOINCREMENT,
+              ts DATETIME, source TEXT, actor_id INTEGER, actor_name TEXT,
+              entity TEXT, entity_id INTEGER, action TEXT, payload TEXT
+            )
+        """))
+        db.session.commit()
+    return app
+
+
+def test_flush_escribe_el_lote_en_un_paso(sqlite_app):
+    writer = AuditWriter(flush_interval=60)
+    writer.init_app(sqlite_app)
+
+    for i in range(3):
+        writer.record(entity="ticket", entity_id=10 + i, action="comment",
+                      actor_id=7, payload={"comment_id": i})
+    assert writer.pending() == 3
+
+    assert writer.flush() == 3
+    assert writer.pending() == 0
+
+    with sqlite_app.app_context():
+        rows = db.session.execute(text(
+            "SELECT entity_id, action, payload FROM audit_events ORDER BY id"
+        )).all()
+    assert [r[0] for r in rows] == [10, 11, 12]
+    assert rows[0][2] == '{"comment_id":0}'  # JSON compacto
+    assert json.loads(rows[2][2]) == {"comment_id": 2}
+
+
+def test_si_falla_la_escritura_el_lote_se_conserva(sqlite_app):
+    writer = AuditWriter(flush_interval=60)
+    writer.init_app(sqlite_app)
+    with sqlite_app.app_context():
+        db.session.execute(text("DROP TABLE audit_events"))
+        db.session.commit()
+
+    writer.record(entity="ticket", entity_id=1, action="create", actor_id=1)
+
+    assert writer.flush() == 0
+    assert writer.pending() == 1
+
+
+def test_fila_invalida_va_al_dead_letter_sin_trabar_las_demas(sqlite_app, caplog):
+    writer = AuditWriter(flush_interval=60)
+    writer.init_app(sqlite_app)
+    with sqlite_app.app_context():
+        db.session.execute(text("""
+            CREATE TRIGGER rechaza_malo BEFORE INSERT ON audit_events
+            WHEN NEW.action = 'malo' BEGIN SELECT RAISE(ABORT, 'fila inválida'); END
+        """))
+        db.session.commit()
+    antes = AUDIT_DROPPED.value(reason="dead_letter")
+
+    for action in ("create", "malo", "comment"):
+        writer.record(entity="ticket", entity_id=1, action=action, actor_id=1)
+    assert [writer.flush() for _ in range(writer_module.MAX_RETRIES)] == [0, 0, 2]
+
+    assert writer.pending() == 0
+    assert AUDIT_DROPPED.value(reason="dead_letter") == antes + 1
+    assert any('"malo"' in r.getMessage() for r in caplog.records if r.name == "incidex.audit.dead_letter")
+
+    writer.record(entity="ticket", entity_id=2, action="close", actor_id=1)
+    assert writer.flush() == 1                     # las siguientes ya no esperan
+    with sqlite_app.app_context():
+        acciones = db.session.execute(text("SELECT action FROM audit_events ORDER BY id")).scalars().all()
+    assert acciones == ["create", "comment", "close"]
+
+
+def test_con_la_bd_caida_no_descarta_pero_acota_la_cola(sqlite_app):
+    writer = AuditWriter(flush_interval=60)
+    writer.init_app(sqlite_app)
+    writer.max_pending = 3
+    with sqlite_app.app_context():
+        db.session.execute(text("DROP TABLE audit_events"))
+        db.session.commit()
+    antes = AUDIT_DROPPED.value(reason="overflow")
+
+    writer.record(entity="ticket", entity_id=1, action="create", actor_id=1)
+    for _ in range(writer_module.MAX_RETRIES + 1):
+        assert writer.flush() == 0
+    assert writer.pending() == 1                   # error de conexión/esquema: se conserva
+
+    for i in range(4):
+        writer.record(entity="ticket", entity_id=10 + i, action="comment", actor_id=1)
+    assert writer.pending() == 3
+    assert AUDIT_DROPPED.value(reason="overflow") == antes + 2
+
+
+def test_atexit_una_vez_por_escritor_y_opcional(sqlite_app, monkeypatch):
+    registrados = []
+    monkeypatch.setattr(writer_module.atexit, "register", registrados.append)
+
+    writer = AuditWriter()
+    writer.init_app(sqlite_app)           # AUDIT_FLUSH_AT_EXIT=False
+    assert registrados == []
+
+    for _ in range(3):                    # p. ej. una app por test
+        app = Flask(__name__)
+        writer.init_app(app)
+    assert registrados == [writer.flush]
+
+
+class FakeSession:
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class FakeDB:
+    def __init__(self):
+        self.session = FakeSession()
+
+
+def test_repo_audita_solo_despues_del_commit(monkeypatch):
+    monkeypatch.setattr(ticket_repository, "db", FakeDB())
+    recorded = []
+    monkeypatch.setattr(ticket_repository.audit_writer, "record",
+                        lambda **kw: recorded.append(kw))
+    repo = TicketRepository()
+
+    with pytest.raises(RuntimeError):
+        with repo.unit_of_work():
+            repo._audit(entity="ticket", entity_id=1, action="create", actor_id=1)
+            raise RuntimeError("rollback")
+    assert recorded == []
+
+    with repo.unit_of_work():
+        repo._audit(entity="ticket", entity_id=2, action="create", actor_id=1)
+        assert recorded == []
+    assert recorded[0]["entity_id"] == 2
@@ -0,0 +1,77 @@
+import pytest
+from pymysql.err import IntegrityError, OperationalError
+
+
+class FakeConn:
+    """Conexión PyMySQL falsa: la bitácora rechaza la acción "malo"."""
+
+    def __init__(self, guardadas, caida=False):
+        self.guardadas = guardadas
+        self.caida = caida
+        self._tx = []
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def executemany(self, sql, filas):
+        if self.caida:
+            raise OperationalError(2013, "Lost connection to MySQL server")
+        if "INSERT INTO bitacora" in sql and any(f[3] == "malo" for f in filas):
+            raise IntegrityError(1062, "fila inválida")
+        if "INSERT INTO bitacora" in sql:
+            self._tx += [f[3] for f in filas]
+
+    def commit(self):
+        self.guardadas += self._tx
+        self._tx = []
+
+    def rollback(self):
+        self._tx = []
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def buffer_mod(desktop_path):
+    from core import bitacora_buffer
+    return bitacora_buffer
+
+
+def test_registro_invalido_se_descarta_sin_trabar_los_demas(buffer_mod, monkeypatch):
+    guardadas = []
+    monkeypatch.setattr(buffer_mod, "get_connection", lambda: FakeConn(guardadas))
+    buf = buffer_mod.BitacoraBuffer(flush_interval=60)
+    monkeypatch.setattr(buf, "_asegurar_hilo", lambda: None)
+
+    for accion in ("login", "malo", "crear"):
+        buf.agregar("ana", "ADMIN", accion, "ok")
+    assert [buf.flush() for _ in range(buffer_mod.MAX_REINTENTOS)] == [False, False, True]
+
+    assert guardadas == ["login", "crear"]
+    assert buf.pendientes() == 0 and buf.descartados == 1
+
+    buf.agregar("ana", "ADMIN", "salir", "ok")
+    assert buf.flush() and guardadas[-1] == "salir"
+
+
+def test_sin_conexion_conserva_pero_acota_la_cola(buffer_mod, monkeypatch):
+    monkeypatch.setattr(buffer_mod, "get_connection", lambda: FakeConn([], caida=True))
+    buf = buffer_mod.BitacoraBuffer(flush_interval=60)
+    buf.max_pendientes = 3
+    monkeypatch.setattr(buf, "_asegurar_hilo", lambda: None)
+
+    buf.agregar("ana", "ADMIN", "login", "ok")
+    for _ in range(buffer_mod.MAX_REINTENTOS + 1):
+        assert buf.flush() is False
+    assert buf.pendientes() == 1 and buf.descartados == 0
+
+    for i in range(4):
+        buf.agregar("ana", "ADMIN", f"accion{i}", "ok")
+    assert buf.pendientes() == 3 and buf.descartados == 2
@@ -0,0 +1,46 @@
+import pytest
+from sqlalchemy import create_engine
+
+from src.infrastructure.metrics import TimedQueuePool
+from src.infrastructure.persistence.engine_profiles import PROFILES, engine_options, resolve_profile
+
+MYSQL_URL = "mysql+pymysql://u:p@127.0.0.1:1/incidex"
+
+
+def test_dev_conserva_la_configuracion_anterior():
+    opts = engine_options(resolve_profile(None, env={}), MYSQL_URL)
+    assert opts["pool_pre_ping"] is True and opts["pool_recycle"] == 280
+    assert opts["poolclass"] is TimedQueuePool
+    assert (opts["pool_size"], opts["max_overflow"], opts["pool_timeout"]) == (5, 10, 30.0)
+    assert "connect_args" not in opts
+
+
+def test_prod_usa_lifo_sin_pre_ping_y_timeout_de_sentencia():
+    opts = engine_options(resolve_profile("prod-large", env={}), MYSQL_URL)
+    assert opts["pool_use_lifo"] is True and opts["pool_pre_ping"] is False
+    assert opts["connect_args"]["init_command"] == "SET SESSION max_execution_time = 10000"
+
+
+def test_variables_de_entorno_sobreescriben_el_perfil():
+    profile = resolve_profile("PROD-SMALL", env={
+        "DB_POOL_SIZE": "12", "DB_POOL_TIMEOUT": "2.5", "DB_POOL_PRE_PING": "true",
+        "DB_POOL_LIFO": "0", "DB_STATEMENT_TIMEOUT_MS": "0", "DB_MAX_OVERFLOW": "",
+    })
+    assert profile.pool_size == 12 and profile.pool_timeout == 2.5
+    assert profile.pool_pre_ping is True and profile.pool_use_lifo is False
+    assert profile.max_overflow == PROFILES["prod-small"].max_overflow
+    assert "connect_args" not in engine_options(profile, MYSQL_URL)
+
+
+def test_perfil_desconocido():
+    with pytest.raises(ValueError):
+        resolve_profile("prod-xl", env={})
+
+
+@pytest.mark.parametrize("name", list(PROFILES))
+def test_opciones_validas_para_el_engine(name):
+    profile = resolve_profile(name, env={})
+    mysql = create_engine(MYSQL_URL, **engine_options(profile, MYSQL_URL))   # no conecta
+    assert mysql.pool.size() == profile.pool_size
+    # SQLite en memoria no recibe opciones de dimensionado (StaticPool)
+    create_engine("sqlite://", **engine_options(profile, "sqlite://"))
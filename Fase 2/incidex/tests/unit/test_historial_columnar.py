@@ -0,0 +1,81 @@
+import pytest
+
+# Estados: 1 Abierto, 2 En progreso, 3 Resuelto.
+TICKETS = [(10, 3, 1_000), (20, 3, 2_000)]
+# El ticket 15 queda entre 10 y 20 por id pero no está en el rango del reporte.
+HISTORIAL = [
+    (1, 10, 7, 0, 1, 1_000), (2, 10, 7, 1, 3, 1_500),
+    (3, 15, 8, 0, 1, 1_200), (4, 15, 8, 1, 2, 1_300), (5, 15, 8, 2, 3, 1_400),
+    (6, 20, 7, 0, 1, 2_000), (7, 20, 9, 1, 3, 2_600),
+]
+
+
+class FakeConn:
+    """Conexión PyMySQL falsa: resuelve el filtro `ticket_id IN (...)`."""
+
+    def __init__(self):
+        self.consultas = []
+        self._filas = []
+
+    def cursor(self, *_):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params):
+        self.consultas.append(list(params))
+        if "FROM tickets" in sql:
+            self._filas = list(TICKETS)
+        elif "ticket_id IN" in sql:
+            self._filas = [h for h in HISTORIAL if h[1] in params]
+        else:
+            raise AssertionError(f"consulta inesperada: {sql}")
+
+    def fetchall(self):
+        return self._filas
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def manager(desktop_path, monkeypatch):
+    from core import db_manager
+    conn = FakeConn()
+    monkeypatch.setattr(db_manager, "get_read_connection", lambda: conn)
+    monkeypatch.setattr(db_manager.DBManager, "get_statuses", staticmethod(lambda: [
+        {"id": 1, "name": "Abierto"}, {"id": 2, "name": "En progreso"}, {"id": 3, "name": "Resuelto"},
+    ]))
+    monkeypatch.setattr(db_manager.DBManager, "obtener_usuarios", staticmethod(lambda: [
+        {"id": 7, "nombre": "Ana", "apellido": ""},
+        {"id": 8, "nombre": "Beto", "apellido": ""},
+        {"id": 9, "nombre": "Caro", "apellido": ""},
+    ]))
+    return db_manager.DBManager, conn
+
+
+def test_historial_solo_de_los_tickets_del_rango(manager):
+    DBManager, conn = manager
+    historial, tickets = DBManager.cargar_historial_columnar({}, tam_lote=1)
+
+    assert sorted(tickets[:, 0].tolist()) == [10, 20]
+    assert sorted(set(historial[:, 1].tolist())) == [10, 20]
+    assert conn.consultas[1:] == [[10], [20]]
+
+
+def test_indicadores_ignoran_tickets_fuera_del_rango(manager):
+    DBManager, _ = manager
+    _, filas = DBManager.reporte_historial({"dimension": "transiciones"})
+    # Sin el ticket 15 nadie pasó por "En progreso".
+    assert filas == [
+        ["Abierto", 0, 0, 2],
+        ["En progreso", 0, 0, 0],
+        ["Resuelto", 0, 0, 0],
+    ]
+
+    _, filas = DBManager.reporte_historial({"dimension": "productividad"})
+    assert sorted(filas) == [["Ana", 1], ["Caro", 1]]
@@ -0,0 +1,151 @@
+import time
+
+import numpy as np
+import pandas as pd
+from flask import Flask
+from sqlalchemy import text
+
+from src.application.use_cases.ticket_service import TicketService
+from src.infrastructure.analytics import ticket_history as analytics
+from src.infrastructure.persistence.database import db
+
+H = 3600
+# estados: 1 NUEVO, 2 ASIGNADO, 3 EN_PROGRESO, 4 RESUELTO, 5 CERRADO
+
+
+def _history(rows):
+    return pd.DataFrame(np.array(rows, dtype=np.int64).reshape(-1, 6), columns=analytics.HISTORY_COLUMNS)
+
+
+def _tickets(rows):
+    return pd.DataFrame(np.array(rows, dtype=np.int64).reshape(-1, 3), columns=analytics.TICKET_COLUMNS)
+
+
+def _sample():
+    # ticket 10: NUEVO 2h -> EN_PROGRESO 3h -> RESUELTO (detiene)
+    # ticket 11: NUEVO 1h -> ASIGNADO, reasignado una vez, sigue abierto
+    # ticket 12: sin historial, NUEVO desde hace 4h
+    history = _history([
+        # id, ticket, actor, from, to, ts
+        [1, 10, 7, 1, 3, 2 * H],
+        [2, 11, 8, 1, 2, 1 * H],
+        [3, 10, 7, 3, 4, 5 * H],
+        [4, 11, 9, 2, 2, 2 * H],
+    ])
+    tickets = _tickets([
+        [10, 4, 0],
+        [11, 2, 0],
+        [12, 1, 6 * H],
+    ])
+    return history, tickets
+
+
+def test_time_in_state_por_tramos():
+    history, tickets = _sample()
+    tis = analytics.time_in_state(history, tickets, now=10 * H, stop_status_ids=[4, 5])
+    got = {(int(r.ticket_id), int(r.status_id)): int(r.seconds) for r in tis.itertuples()}
+
+    assert got == {
+        (10, 1): 2 * H,
+        (10, 3): 3 * H,
+        (10, 4): 0,          # estado de cierre: no acumula
+        (11, 1): 1 * H,
+        (11, 2): 9 * H,      # la reasignación no corta el tramo
+        (12, 1): 4 * H,
+    }
+
+
+def test_transition_matrix_ignora_reasignaciones():
+    history, _ = _sample()
+    m = analytics.transition_matrix(history, [1, 2, 3, 4, 5])
+
+    assert m.loc[1, 3] == 1
+    assert m.loc[1, 2] == 1
+    assert m.loc[3, 4] == 1
+    assert m.loc[2, 2] == 0
+    assert int(m.to_numpy().sum()) == 3
+
+
+def test_reasignaciones_y_productividad():
+    history, _ = _sample()
+    assert analytics.reassignment_counts(history).to_dict() == {11: 1}
+
+    thr = analytics.analyst_throughput(history, [4, 5], weeks=2, now=10 * H)
+    assert thr.loc[7].sum() == 1
+    assert list(thr.columns) == [10 * H - 2 * analytics.WEEK_SECONDS, 10 * H - analytics.WEEK_SECONDS]
+
+
+def test_history_report_arma_tablas_con_nombres():
+    history, tickets = _sample()
+
+    class FakeStore:
+        def frames(self):
+            return history, tickets
+
+    class FakeRepo:
+        def get_statuses(self):
+            return [{"id": 1, "name": "NUEVO"}, {"id": 2, "name": "ASIGNADO"},
+                    {"id": 3, "name": "EN_PROGRESO"}, {"id": 4, "name": "RESUELTO"},
+                    {"id": 5, "name": "CERRADO"}]
+
+        def user_names(self, ids):
+            return {7: "Ana Analista"}
+
+    report = TicketService(FakeRepo()).history_report(store=FakeStore())
+
+    assert report.history_rows == 4 and report.tickets == 3
+    assert report.transition_labels == ["NUEVO", "ASIGNADO", "EN_PROGRESO", "RESUELTO", "CERRADO"]
+    assert report.transitions[0] == ["NUEVO", 0, 1, 1, 0, 0]
+    assert {s["status"] for s in report.states} == {"NUEVO", "ASIGNADO", "EN_PROGRESO", "RESUELTO"}
+    assert report.reassigned_tickets == 1
+
+
+def test_store_recupera_commits_tardios_sin_bloquear(tmp_path, monkeypatch):
+    """
+    Una fila con id menor a la marca (confirmada tarde) entra en el
+    siguiente refresco, en orden de id; el refresco corre en otro hilo y
+    mientras tanto se sirve la copia anterior.
+    """
+    # Mismas columnas que en MySQL, con funciones de sqlite
+    monkeypatch.setattr(analytics, "HISTORY_RANGE_SQL", text("""
+        SELECT id, ticket_id, actor_user_id, COALESCE(from_status_id, 0), to_status_id, created_at
+        FROM ticket_history WHERE id > :lo AND id <= :hi ORDER BY id
+    """))
+    monkeypatch.setattr(analytics, "TICKETS_RANGE_SQL", text("""
+        SELECT id, status_id, created_at FROM tickets WHERE id > :lo AND id <= :hi ORDER BY id
+    """))
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'h.db'}"
+    db.init_app(app)
+
+    def historial(*ids):
+        for i in ids:
+            db.session.execute(text(
+                "INSERT INTO ticket_history VALUES (:i, 10, 7, 1, 2, :i)"
+            ), {"i": i})
+        db.session.commit()
+
+    with app.app_context():
+        db.session.execute(text("CREATE TABLE tickets (id INTEGER PRIMARY KEY, status_id INT, created_at INT)"))
+        db.session.execute(text(
+            "CREATE TABLE ticket_history (id INTEGER PRIMARY KEY, ticket_id INT, actor_user_id INT,"
+            " from_status_id INT, to_status_id INT, created_at INT)"
+        ))
+        db.session.execute(text("INSERT INTO tickets VALUES (10, 2, 0)"))
+        historial(1, 2, 4)              # el 3 todavía no confirmó
+
+        store = analytics.HistoryStore(refresh_seconds=0)
+        history, _ = store.frames()
+        assert history["id"].tolist() == [1, 2, 4]
+
+        historial(3, 5)
+        history, _ = store.frames()     # lanza el refresco y devuelve la copia anterior
+        assert history["id"].tolist() == [1, 2, 4]
+        for _ in range(100):
+            if not store._refreshing:
+                break
+            time.sleep(0.02)
+
+        store.refresh_seconds = 3600
+        history, _ = store.frames()
+        assert history["id"].tolist() == [1, 2, 3, 4, 5]
@@ -0,0 +1,102 @@
+"""
+Benchmark opcional de la analítica del historial sobre datos sintéticos.
+
+    INCIDEX_BENCH_HISTORY_ROWS=5000000 pytest tests/unit/test_history_analytics_bench.py -s
+
+Compara el cálculo en bloque (time_in_state + transiciones + productividad)
+con el equivalente fila por fila en Python sobre una muestra.
+"""
+import os
+import time
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.infrastructure.analytics import ticket_history as analytics
+
+ROWS = int(os.getenv("INCIDEX_BENCH_HISTORY_ROWS", "0"))
+SAMPLE_ROWS = 200_000
+
+pytestmark = pytest.mark.skipif(not ROWS, reason="definir INCIDEX_BENCH_HISTORY_ROWS para correr el benchmark")
+
+
+def synthetic_history(rows: int, *, changes_per_ticket: int = 5, seed: int = 42):
+    """Historial sintético: cada ticket recorre estados 1..6 con saltos de minutos a días."""
+    rng = np.random.default_rng(seed)
+    n_tickets = max(rows // changes_per_ticket, 1)
+    ticket = np.repeat(np.arange(1, n_tickets + 1, dtype=np.int64), changes_per_ticket)[:rows]
+    created = rng.integers(1_600_000_000, 1_700_000_000, n_tickets, dtype=np.int64)
+    step = rng.integers(60, 3 * 86400, rows, dtype=np.int64)
+    # ts creciente dentro de cada ticket
+    first = np.r_[True, ticket[1:] != ticket[:-1]]
+    group_start = np.maximum.accumulate(np.where(first, np.arange(rows), 0))
+    csum = np.cumsum(step)
+    ts = created[ticket - 1] + csum - csum[group_start] + step[group_start]
+    to_status = rng.integers(1, 7, rows, dtype=np.int64)
+    from_status = np.r_[0, to_status[:-1]]
+    from_status[first] = 1
+    tickets = pd.DataFrame({
+        "ticket_id": np.arange(1, n_tickets + 1, dtype=np.int64),
+        "status_id": to_status[np.r_[np.flatnonzero(first)[1:] - 1, rows - 1]],
+        "created_ts": created,
+    })
+    # Como en la tabla real: ids en orden de inserción, tickets intercalados
+    order = np.argsort(ts, kind="stable")
+    history = pd.DataFrame({
+        "id": np.arange(1, rows + 1, dtype=np.int64),
+        "ticket_id": ticket[order],
+        "actor_id": rng.integers(1, 200, rows, dtype=np.int64),
+        "from_status": from_status[order],
+        "to_status": to_status[order],
+        "ts": ts[order],
+    })
+    return history, tickets
+
+
+def _row_by_row(history: pd.DataFrame, tickets: pd.DataFrame, now: int, stop):
+    """Lo que habría que hacer sin columnas: recorrer cada fila."""
+    created = dict(zip(tickets.ticket_id, tickets.created_ts))
+    current = {}
+    seconds = defaultdict(int)
+    transitions = defaultdict(int)
+    done = defaultdict(int)
+    for _id, t, actor, frm, to, ts in history.itertuples(index=False):
+        if frm == to:
+            continue
+        status, since = current.get(t, (frm, created[t]))
+        seconds[(t, status)] += max(ts - since, 0)
+        current[t] = (to, ts)
+        transitions[(frm, to)] += 1
+        if to in stop:
+            done[actor] += 1
+    for t, (status, since) in current.items():
+        if status not in stop:
+            seconds[(t, status)] += max(now - since, 0)
+    return seconds, transitions, done
+
+
+def test_benchmark_vectorizado_vs_fila_por_fila():
+    history, tickets = synthetic_history(ROWS)
+    now = int(history.ts.max()) + 1
+    stop = [4, 5, 6]
+
+    t0 = time.perf_counter()
+    tis = analytics.time_in_state(history, tickets, now=now, stop_status_ids=stop)
+    analytics.state_duration_summary(tis)
+    analytics.transition_matrix(history, range(1, 7))
+    analytics.analyst_throughput(history, [4, 5], now=now)
+    analytics.reassignment_counts(history)
+    vectorized = time.perf_counter() - t0
+
+    n = min(ROWS, SAMPLE_ROWS)
+    sample = history.iloc[:n]
+    sample_tickets = tickets[tickets.ticket_id.isin(sample.ticket_id.unique())]
+    t0 = time.perf_counter()
+    _row_by_row(sample, sample_tickets, now, set(stop))
+    loop = (time.perf_counter() - t0) * (ROWS / n)
+
+    print(f"\n[bench] {ROWS:,} filas: vectorizado {vectorized:.2f}s | "
+          f"fila por fila (extrapolado de {n:,}) {loop:.2f}s | x{loop / vectorized:.1f}")
+    assert vectorized < loop
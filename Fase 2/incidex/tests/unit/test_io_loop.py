@@ -0,0 +1,100 @@
+import asyncio
+import concurrent.futures
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+from src.infrastructure.io_loop import IoLoop
+from src.infrastructure.metrics import SMTP_FAILURES
+from src.infrastructure.notifications import support_mail
+
+
+def test_muchas_esperas_en_un_solo_hilo():
+    loop = IoLoop()
+    hilos = set()
+
+    async def espera():
+        hilos.add(threading.get_ident())
+        await asyncio.sleep(0.2)
+        return 1
+
+    t0 = time.perf_counter()
+    futures = [loop.submit(espera()) for _ in range(50)]
+    assert sum(f.result(5) for f in futures) == 50
+    assert time.perf_counter() - t0 < 1.5   # en paralelo, no 50 × 0.2 s
+    assert len(hilos) == 1 and threading.get_ident() not in hilos
+    assert loop.pending() == 0
+
+
+def test_run_con_timeout_cancela():
+    loop = IoLoop()
+    with pytest.raises(concurrent.futures.TimeoutError):
+        loop.run(asyncio.sleep(5), timeout=0.05)
+    assert loop.run(asyncio.sleep(0, result="ok"), timeout=1) == "ok"
+
+
+def test_limit_acota_la_concurrencia():
+    loop = IoLoop()
+    activos = {"ahora": 0, "max": 0}
+
+    async def tarea():
+        async with loop.limit("smtp", 3):
+            activos["ahora"] += 1
+            activos["max"] = max(activos["max"], activos["ahora"])
+            await asyncio.sleep(0.02)
+            activos["ahora"] -= 1
+
+    for f in [loop.submit(tarea()) for _ in range(12)]:
+        f.result(5)
+    assert activos["max"] == 3
+
+
+def test_drain_espera_lo_pendiente():
+    loop = IoLoop()
+    hecho = []
+
+    async def tarea():
+        await asyncio.sleep(0.05)
+        hecho.append(1)
+
+    loop.submit(tarea())
+    assert loop.drain(2) and hecho == [1]
+
+
+@pytest.fixture
+def mail_app():
+    app = Flask(__name__)
+    app.config.update(MAIL_SERVER="smtp.test", MAIL_PORT=587, MAIL_USE_TLS=True,
+                      MAIL_USERNAME="u", MAIL_PASSWORD="p", SUPPORT_EMAIL_TO="soporte@test")
+    return app
+
+
+def test_correo_de_soporte_sale_por_el_io_loop(mail_app, monkeypatch):
+    enviados = []
+
+    async def fake_send(msg, **kwargs):
+        enviados.append((msg["To"], kwargs, threading.current_thread().name))
+
+    monkeypatch.setattr(support_mail.aiosmtplib, "send", fake_send)
+    with mail_app.app_context():
+        future = support_mail.send_support_email("Ana", "ana@test", "VPN", "No conecta")
+    assert future.result(2) is True
+
+    (to, kwargs, hilo), = enviados
+    assert to == "soporte@test" and hilo == "io-loop"
+    assert kwargs["start_tls"] is True and kwargs["use_tls"] is False
+    assert (kwargs["hostname"], kwargs["port"], kwargs["username"]) == ("smtp.test", 587, "u")
+
+
+def test_fallo_smtp_se_cuenta_y_no_lanza(mail_app, monkeypatch):
+    async def fake_send(msg, **kwargs):
+        raise OSError("conexión rechazada")
+
+    monkeypatch.setattr(support_mail.aiosmtplib, "send", fake_send)
+    antes = SMTP_FAILURES.value(kind="notification")
+    with mail_app.app_context():
+        future = support_mail.send_notification_email("a@test", "Título", "Mensaje")
+    assert future.result(2) is False
+    assert SMTP_FAILURES.value(kind="notification") == antes + 1
@@ -0,0 +1,125 @@
+import time
+
+import pytest
+from flask import Flask
+
+from src.infrastructure import metrics
+from src.infrastructure.metrics import Registry, pool_status
+from src.infrastructure.persistence.database import db
+from src.presentation.web.blueprints.ops import routes as ops_routes
+from src.presentation.web.blueprints.ops.routes import ops_bp
+
+
+@pytest.fixture
+def ops_app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    app.config["HEALTH_DB_TIMEOUT"] = 2.0
+    db.init_app(app)
+    app.register_blueprint(ops_bp)
+
+    @app.get("/ping")
+    def ping():
+        return "pong"
+
+    return app
+
+
+def test_histograma_acumula_por_bucket():
+    reg = Registry()
+    h = reg.histogram("x_seconds", "prueba", labels=("endpoint",), buckets=(0.1, 1.0))
+    h.observe(0.05, endpoint="a")
+    h.observe(0.5, endpoint="a")
+    h.observe(3.0, endpoint="a")
+
+    text = reg.render()
+    assert '# TYPE x_seconds histogram' in text
+    assert 'x_seconds_bucket{endpoint="a",le="0.1"} 1' in text
+    assert 'x_seconds_bucket{endpoint="a",le="1"} 2' in text
+    assert 'x_seconds_bucket{endpoint="a",le="+Inf"} 3' in text
+    assert 'x_seconds_count{endpoint="a"} 3' in text
+    assert h.count(endpoint="a") == 3
+
+
+def test_contador_y_gauge_con_etiquetas():
+    reg = Registry()
+    c = reg.counter("y_total", "prueba", labels=("kind",))
+    c.inc(kind='di"go')
+    c.inc(2, kind='di"go')
+    reg.gauge("z", "prueba", lambda: {("a",): 1, ("b",): 2}, labels=("state",))
+    reg.gauge("roto", "falla al leer", lambda: 1 / 0)
+
+    text = reg.render()
+    assert 'y_total{kind="di\\"go"} 3' in text
+    assert 'z{state="a"} 1' in text and 'z{state="b"} 2' in text
+    assert "roto" not in text
+
+
+def test_pool_status_solo_para_queuepool():
+    from sqlalchemy import create_engine
+    from sqlalchemy.pool import StaticPool
+
+    assert pool_status(create_engine("sqlite://", poolclass=StaticPool).pool) is None
+    engine = create_engine("sqlite://", poolclass=metrics.TimedQueuePool, pool_size=2)
+    antes = metrics.DB_POOL_WAIT.count()
+    with engine.connect():
+        assert pool_status(engine.pool)["checked_out"] == 1
+    assert metrics.DB_POOL_WAIT.count() == antes + 1
+
+
+def test_metrics_expone_latencia_por_endpoint(ops_app):
+    client = ops_app.test_client()
+    client.get("/ping")
+    client.get("/no-existe")
+
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.mimetype == "text/plain"
+    body = r.get_data(as_text=True)
+    assert 'incidex_http_request_duration_seconds_count{endpoint="ping",method="GET"}' in body
+    assert 'incidex_http_requests_total{endpoint="unmatched",method="GET",status="404"}' in body
+    assert 'endpoint="ops.metrics"' not in body
+    assert "incidex_realtime_queued_events" in body
+    assert "incidex_audit_pending_events" in body
+
+
+def test_metrics_con_token(ops_app):
+    ops_app.config["METRICS_TOKEN"] = "secreto"
+    client = ops_app.test_client()
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer secreto"}).status_code == 200
+
+
+def test_health_ok_con_bd(ops_app):
+    r = ops_app.test_client().get("/health")
+    assert r.status_code == 200
+    assert r.json["status"] == "ok" and r.json["db"]["ok"] is True
+
+
+def test_health_503_si_la_bd_falla(ops_app, monkeypatch):
+    def roto(app):
+        raise ConnectionError("sin BD")
+
+    monkeypatch.setattr(ops_routes, "_db_ping", roto)
+    r = ops_app.test_client().get("/health")
+    assert r.status_code == 503
+    assert r.json["db"] == {"ok": False, "ms": r.json["db"]["ms"], "error": "ConnectionError"}
+
+
+def test_health_no_espera_mas_que_el_timeout(ops_app, monkeypatch):
+    monkeypatch.setattr(ops_routes, "_db_ping", lambda app: time.sleep(0.5))
+    ops_app.config["HEALTH_DB_TIMEOUT"] = 0.05
+    client = ops_app.test_client()
+
+    t0 = time.perf_counter()
+    r = client.get("/health")
+    assert r.status_code == 503
+    assert time.perf_counter() - t0 < 0.4
+    # El ping colgado sigue en curso: no se apila otro
+    assert client.get("/health").json["db"]["error"] == "ping anterior sin respuesta"
+    time.sleep(0.5)
+
+
+def test_live_no_toca_la_bd(ops_app, monkeypatch):
+    monkeypatch.setattr(ops_routes, "_db_ping", lambda app: 1 / 0)
+    assert ops_app.test_client().get("/health/live").status_code == 200
@@ -0,0 +1,75 @@
+import pytest
+
+from src.infrastructure.notifications.unread_cache import unread_cache
+from src.infrastructure.persistence.repositories import ticket_repository
+from src.infrastructure.persistence.repositories.ticket_repository import TicketRepository
+
+
+class FakeResult:
+    lastrowid = 1
+
+
+class FakeSession:
+    def execute(self, *args, **kwargs):
+        return FakeResult()
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class FakeDB:
+    def __init__(self):
+        self.session = FakeSession()
+
+
+@pytest.fixture
+def repo(monkeypatch):
+    monkeypatch.setattr(ticket_repository, "db", FakeDB())
+    unread_cache.clear()
+    repo = TicketRepository()
+    repo.queries = 0
+
+    def fake_list(user_id, limit=10):
+        repo.queries += 1
+        return [{"id": i, "ticket_id": 1, "message": f"n{i}"} for i in range(3)]
+
+    monkeypatch.setattr(repo, "list_unread_notifications", fake_list)
+    monkeypatch.setattr(repo, "_send_notification_email", lambda *a: None)
+    yield repo
+    unread_cache.clear()
+
+
+def test_resumen_se_sirve_desde_cache(repo):
+    first = repo.unread_notifications_summary(7)
+    second = repo.unread_notifications_summary(7)
+
+    assert first.unread == 3
+    assert second is first
+    assert repo.queries == 1
+
+
+def test_insert_notification_invalida_cache(repo):
+    repo.unread_notifications_summary(7)
+    repo.insert_notification(user_id=7, ticket_id=1, kind="ASSIGNED", message="hola")
+    repo.unread_notifications_summary(7)
+
+    assert repo.queries == 2
+
+
+def test_marcar_leidas_invalida_cache(repo):
+    repo.unread_notifications_summary(7)
+    repo.mark_all_notifications_read_for_user(7)
+    repo.unread_notifications_summary(7)
+
+    assert repo.queries == 2
+
+
+def test_contador_usa_count_si_hay_mas_que_el_limite(repo, monkeypatch):
+    monkeypatch.setattr(repo, "count_unread_notifications", lambda user_id: 42)
+
+    summary = repo.unread_notifications_summary(7, limit=3)
+
+    assert summary.unread == 42
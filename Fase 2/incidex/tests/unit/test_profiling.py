@@ -0,0 +1,109 @@
+import os
+import time
+import threading
+
+import pytest
+from flask import Flask
+
+from src.commands.profile_report import profile_report_cmd
+from src.infrastructure.profiling import (
+    RequestProfiler, StackSampler, read_folded, self_samples, write_folded,
+)
+
+
+def _busy(ms: float):
+    fin = time.perf_counter() + ms / 1000
+    while time.perf_counter() < fin:
+        pass
+
+
+def _app(tmp_path, **config):
+    app = Flask(__name__)
+    app.config.update(PROFILE_DIR=str(tmp_path), PROFILE_INTERVAL_MS=1.0, **config)
+    profiler = RequestProfiler()
+    profiler.init_app(app)
+    app.cli.add_command(profile_report_cmd)
+
+    @app.get("/slow", endpoint="tickets.mine")
+    def slow():
+        _busy(40)
+        return "ok"
+
+    return app, profiler
+
+
+def test_sampler_toma_la_pila_del_hilo_registrado():
+    sampler = StackSampler(interval_ms=1.0)
+    sampler.start(threading.get_ident())
+    _busy(30)
+    stacks = sampler.stop(threading.get_ident())
+
+    assert sum(stacks.values()) > 0
+    assert any("_busy (" in stack.rsplit(";", 1)[-1] for stack in stacks)
+    assert sampler.stop(threading.get_ident()) == {}
+
+
+def test_folded_ida_y_vuelta(tmp_path):
+    path = tmp_path / "x.folded"
+    write_folded(str(path), {"a;b": 3, "a;c": 1})
+    stacks = read_folded(str(path))
+    assert stacks == {"a;b": 3, "a;c": 1}
+    assert self_samples(stacks) == {"b": 3, "c": 1}
+
+
+def test_desactivado_no_escribe(tmp_path):
+    app, _ = _app(tmp_path, PROFILE_ENABLED=False)
+    app.test_client().get("/slow")
+    assert not (tmp_path / "tickets.mine").exists()
+
+
+def test_request_muestreado_deja_pilas_por_endpoint(tmp_path):
+    app, _ = _app(tmp_path, PROFILE_ENABLED=True, PROFILE_SAMPLE_RATE=1.0)
+    app.test_client().get("/slow")
+
+    files = os.listdir(tmp_path / "tickets.mine")
+    assert len(files) == 1 and files[0].endswith(".folded")
+    stacks = read_folded(str(tmp_path / "tickets.mine" / files[0]))
+    assert any("slow (" in s for s in stacks)
+
+
+def test_modo_cprofile(tmp_path):
+    app, _ = _app(tmp_path, PROFILE_ENABLED=True, PROFILE_SAMPLE_RATE=1.0, PROFILE_MODE="cprofile")
+    app.test_client().get("/slow")
+    assert os.listdir(tmp_path / "tickets.mine")[0].endswith(".prof")
+
+
+def test_toggle_llega_a_los_demas_workers(tmp_path):
+    app_a, worker_a = _app(tmp_path)
+    app_b, worker_b = _app(tmp_path)
+    assert worker_b.settings()["enabled"] is False
+
+    worker_a.update(enabled=True, rate=0.25, endpoints=["tickets.mine"], updated_by="admin@x")
+    worker_b._control = (float("-inf"), None, None)   # vence el TTL de lectura
+
+    s = worker_b.settings()
+    assert (s["enabled"], s["rate"], s["endpoints"], s["updated_by"]) == (True, 0.25, ["tickets.mine"], "admin@x")
+    assert worker_b._wanted("tickets.detail") is False
+    assert worker_b._wanted("ops.metrics") is False
+
+
+def test_modo_invalido(tmp_path):
+    with pytest.raises(ValueError):
+        _app(tmp_path, PROFILE_MODE="otro")
+
+
+def test_profile_report_junta_los_workers(tmp_path):
+    folder = tmp_path / "tickets.mine"
+    folder.mkdir()
+    write_folded(str(folder / "1-10ms-100-1.folded"), {"app;mine;query": 4})
+    write_folded(str(folder / "2-12ms-200-1.folded"), {"app;mine;query": 2, "app;mine;render": 2})
+    app, _ = _app(tmp_path)
+
+    result = app.test_cli_runner().invoke(args=["profile-report", "--purge"])
+
+    assert result.exit_code == 0, result.output
+    assert "2 requests, 8 muestras" in result.output
+    assert "75.0%  query" in result.output
+    merged = read_folded(str(tmp_path / "aggregate" / "tickets.mine.folded"))
+    assert merged == {"app;mine;query": 6, "app;mine;render": 2}
+    assert os.listdir(folder) == []
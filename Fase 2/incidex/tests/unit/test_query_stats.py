@@ -0,0 +1,82 @@
+import logging
+
+import pytest
+from flask import Flask, g
+from sqlalchemy import text
+
+from src.infrastructure.persistence import query_stats
+from src.infrastructure.persistence.database import db
+from src.infrastructure.persistence.query_stats import capture_queries, init_query_stats
+
+
+@pytest.fixture
+def sqlite_app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    app.config["SQL_SLOW_MS"] = 10_000.0
+    db.init_app(app)
+    init_query_stats(app)
+
+    @app.get("/three")
+    def three():
+        for i in range(3):
+            db.session.execute(text("SELECT :i"), {"i": i})
+        return {"count": g.sql_stats.count}
+
+    return app
+
+
+def test_server_timing_lleva_conteo_y_tiempo(sqlite_app):
+    r = sqlite_app.test_client().get("/three")
+
+    assert r.json == {"count": 3}
+    header = r.headers["Server-Timing"]
+    assert header.startswith("db;dur=")
+    assert 'desc="3 queries"' in header
+    assert "app;dur=" in header
+
+
+def test_capture_queries_suma_los_requests_del_cliente(sqlite_app, assert_max_queries):
+    client = sqlite_app.test_client()
+    with capture_queries() as stats:
+        client.get("/three")
+        client.get("/three")
+
+    assert stats.count == 6
+    assert all(s == "SELECT ?" for s in stats.statements)
+
+    with assert_max_queries(3):
+        client.get("/three")
+
+
+def test_assert_max_queries_falla_y_muestra_las_sentencias(sqlite_app, assert_max_queries):
+    client = sqlite_app.test_client()
+    with pytest.raises(AssertionError, match="3 consultas"):
+        with assert_max_queries(2):
+            client.get("/three")
+
+
+def test_consulta_lenta_se_registra_con_sus_campos(sqlite_app, caplog):
+    sqlite_app.config["SQL_SLOW_MS"] = 0.0
+    with caplog.at_level(logging.INFO, logger="incidex.sql"):
+        sqlite_app.test_client().get("/three")
+
+    entries = [vars(r) for r in caplog.records if hasattr(r, "event")]
+    slow = [e for e in entries if e["event"] == "slow_query"]
+    assert len(slow) == 3
+    assert slow[0]["path"] == "/three" and slow[0]["sql"] == "SELECT ?"
+    summary = [e for e in entries if e["event"] == "slow_request_db"]
+    assert summary and summary[0]["queries"] == 3
+    assert len(summary[0]["slowest"]) == query_stats.TOP_N
+
+
+def test_sin_request_ni_captura_no_se_cuenta(sqlite_app):
+    with sqlite_app.app_context():
+        db.session.execute(text("SELECT 1"))
+    assert query_stats.current_stats() is None
+
+
+def test_compact_sql_una_linea_y_recortado():
+    assert query_stats.compact_sql("SELECT\n   a,\n b  FROM t") == "SELECT a, b FROM t"
+    largo = query_stats.compact_sql("SELECT " + "x, " * 500)
+    assert len(largo) == query_stats.MAX_STATEMENT + 1
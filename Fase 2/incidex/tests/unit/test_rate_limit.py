@@ -0,0 +1,191 @@
+import pytest
+from flask import Flask, jsonify
+from flask_login import LoginManager, UserMixin, login_user
+from sqlalchemy import text
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+from src.infrastructure.metrics import RATE_LIMITED
+from src.infrastructure.persistence.database import db
+from src.infrastructure.rate_limit import DbStore, MemoryStore, Rate, parse_rate, rate_limiter
+
+
+class _Reloj:
+    def __init__(self):
+        self.t = 1000.0
+
+    def __call__(self):
+        return self.t
+
+
+@pytest.mark.parametrize("spec,esperado", [
+    ("10/minute", Rate(10.0, 10 / 60)),
+    ("5/hour;burst=2", Rate(2.0, 5 / 3600)),
+    ("30/5min", Rate(30.0, 30 / 300)),
+    ("1/s", Rate(1.0, 1.0)),
+    ("2/days", Rate(2.0, 2 / 86400)),
+])
+def test_parse_rate(spec, esperado):
+    assert parse_rate(spec) == esperado
+
+
+def test_parse_rate_sin_limite_e_invalido():
+    assert parse_rate("") is None and parse_rate("off") is None and parse_rate(None) is None
+    with pytest.raises(ValueError):
+        parse_rate("diez por minuto")
+
+
+def test_balde_rafaga_y_recarga():
+    reloj = _Reloj()
+    store = MemoryStore(clock=reloj)
+    rate = parse_rate("6/minute;burst=3")   # 3 seguidas, luego una cada 10 s
+
+    assert [store.take("k", rate) for _ in range(3)] == [0, 0, 0]
+    assert store.take("k", rate) == pytest.approx(10.0)
+    reloj.t += 4
+    assert store.take("k", rate) == pytest.approx(6.0)   # el rechazo no cobra
+    reloj.t += 6
+    assert store.take("k", rate) == 0
+    reloj.t += 3600
+    assert [store.take("k", rate) for _ in range(4)][-1] > 0   # no acumula más que burst
+
+
+def test_take_all_cobra_en_todos_o_en_ninguno():
+    store = MemoryStore(clock=_Reloj())
+    holgado, justo = parse_rate("5/minute"), parse_rate("1/minute")
+
+    assert store.take_all([("a", holgado), ("b", justo)]) == [0, 0]
+    assert store.take_all([("a", holgado), ("b", justo)]) == [0, pytest.approx(60.0)]
+    # "a" no pagó el intento rechazado: le quedan 4 de 5
+    assert [store.take("a", holgado) for _ in range(5)] == [0, 0, 0, 0, pytest.approx(12.0)]
+
+
+def test_memory_store_acota_las_claves():
+    store = MemoryStore(max_keys=2, clock=_Reloj())
+    rate = parse_rate("1/hour")
+    for k in ("a", "b", "c"):
+        store.take(k, rate)
+    assert store.take("a", rate) == 0     # "a" se descartó: balde nuevo
+    assert store.take("c", rate) > 0
+
+
+class _User(UserMixin):
+    def __init__(self, uid):
+        self.id = uid
+
+
+def _app(**config):
+    app = Flask(__name__)
+    app.secret_key = "test"
+    app.config.update({"RATELIMIT_USER": "2/minute", "RATELIMIT_IP": "3/minute", **config})
+    login = LoginManager(app)
+    login.user_loader(lambda uid: _User(uid))
+    rate_limiter.init_app(app)
+
+    @app.post("/login/<uid>")
+    def do_login(uid):
+        login_user(_User(uid))
+        return "ok"
+
+    @app.route("/caro", methods=["GET", "POST"])
+    @rate_limiter.limit("caro", user="RATELIMIT_USER", ip="RATELIMIT_IP", methods=("POST",))
+    def caro():
+        return jsonify({"ok": True})
+
+    return app
+
+
+def _client(app, ip, uid=None):
+    client = app.test_client()
+    client.environ_base["REMOTE_ADDR"] = ip
+    if uid:
+        client.post(f"/login/{uid}")
+    return client
+
+
+def test_limite_por_usuario_responde_429_con_retry_after():
+    app = _app()
+    ana = _client(app, "10.0.0.1", uid="1")
+    antes = RATE_LIMITED.value(endpoint="caro", scope="user")
+
+    assert [ana.post("/caro").status_code for _ in range(2)] == [200, 200]
+    resp = ana.post("/caro")
+    assert resp.status_code == 429
+    assert resp.json == {"error": "rate_limited", "retry_after": 30}
+    assert resp.headers["Retry-After"] == "30"
+    assert RATE_LIMITED.value(endpoint="caro", scope="user") == antes + 1
+
+    assert ana.get("/caro").status_code == 200                          # solo POST
+    assert _client(app, "10.0.0.2", uid="2").post("/caro").status_code == 200   # otro usuario
+
+
+def test_limite_por_ip_aplica_a_anonimos_y_usuarios():
+    app = _app()
+    anonimo = _client(app, "10.0.0.9")
+    assert [anonimo.post("/caro").status_code for _ in range(4)] == [200, 200, 200, 429]
+
+    # Misma IP: el balde de IP ya está vacío aunque el usuario tenga tokens
+    assert _client(app, "10.0.0.9", uid="7").post("/caro").status_code == 429
+    assert _client(app, "10.0.0.8").post("/caro").status_code == 200
+    # ...y el rechazo no le gastó tokens al usuario: desde otra IP tiene los 2
+    otra_ip = _client(app, "10.0.0.10", uid="7")
+    assert [otra_ip.post("/caro").status_code for _ in range(3)] == [200, 200, 429]
+
+
+def test_detras_del_proxy_limita_por_x_forwarded_for():
+    app = _app()
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1)   # como create_app con PROXY_FIX_X_FOR=1
+
+    def post(forwarded):
+        # Todo llega desde nginx (127.0.0.1); la IP real viene en el header
+        return _client(app, "127.0.0.1").post("/caro", headers={"X-Forwarded-For": forwarded}).status_code
+
+    assert [post("203.0.113.5") for _ in range(4)] == [200, 200, 200, 429]
+    assert post("203.0.113.6") == 200
+    # Solo se confía en la entrada que agregó nginx, no en lo que mande el cliente
+    assert post("198.51.100.1, 203.0.113.5") == 429
+
+
+def test_sin_proxy_x_forwarded_for_no_cambia_la_ip():
+    app = _app()   # como create_app con PROXY_FIX_X_FOR=0 (por defecto)
+    client = _client(app, "10.0.0.20")
+
+    codigos = [client.post("/caro", headers={"X-Forwarded-For": f"203.0.113.{i}"}).status_code
+               for i in range(4)]
+    assert codigos == [200, 200, 200, 429]
+
+
+def test_desactivado_o_sin_regla_no_limita():
+    app = _app(RATELIMIT_ENABLED=False)
+    client = _client(app, "10.0.0.1")
+    assert all(client.post("/caro").status_code == 200 for _ in range(5))
+
+    app = _app(RATELIMIT_IP="off")
+    client = _client(app, "10.0.0.1")
+    assert all(client.post("/caro").status_code == 200 for _ in range(5))
+
+
+def test_db_store_comparte_el_balde(tmp_path):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'rl.db'}"
+    db.init_app(app)
+    reloj = _Reloj()
+    rate = parse_rate("2/minute")
+
+    with app.app_context():
+        db.session.execute(text(
+            "CREATE TABLE rate_limit_buckets (bucket_key TEXT PRIMARY KEY, tokens REAL, updated_at REAL)"
+        ))
+        db.session.commit()
+        uno, otro = DbStore(clock=reloj), DbStore(clock=reloj)   # p. ej. dos workers
+        assert uno.take("k", rate) == 0 and otro.take("k", rate) == 0
+        assert uno.take("k", rate) == pytest.approx(30.0)
+        reloj.t += 30
+        assert otro.take("k", rate) == 0
+
+        # Rechazado por "k" (vacío): tampoco se cobra en "k2"
+        assert uno.take_all([("k2", rate), ("k", rate)]) == [0, pytest.approx(30.0)]
+        assert [otro.take("k2", rate) for _ in range(3)] == [0, 0, pytest.approx(30.0)]
+
+        db.session.execute(text("DROP TABLE rate_limit_buckets"))
+        db.session.commit()
+        assert uno.take("k", rate) == 0    # si la BD falla se deja pasar
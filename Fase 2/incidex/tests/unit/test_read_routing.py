@@ -0,0 +1,126 @@
+import sqlite3
+
+import pytest
+from flask import Flask
+from sqlalchemy import event, text
+
+from src.infrastructure.persistence.database import db
+from src.infrastructure.persistence.read_routing import read_router
+
+
+def _sqlite_db(path, origin, rows=1):
+    con = sqlite3.connect(path)
+    con.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, origin TEXT)")
+    con.executemany("INSERT INTO items (origin) VALUES (?)", [(origin,)] * rows)
+    con.commit()
+    con.close()
+    return f"sqlite:///{path}"
+
+
+def _make_app(primary_url, replica_url=None, replica_fails_after=None):
+    """Réplica simulada: otra base sqlite con distinto contenido."""
+    app = Flask(__name__)
+    app.secret_key = "test"
+    app.config["SQLALCHEMY_DATABASE_URI"] = primary_url
+    if replica_url:
+        app.config["SQLALCHEMY_BINDS"] = {"replica": replica_url}
+    db.init_app(app)
+    read_router.init_app(app)
+
+    if replica_fails_after is not None:
+        # corte(): 1 en el primario; en la réplica falla tras N filas leídas
+        def _register(engine, fails_after):
+            vistas = []
+
+            def corte():
+                vistas.append(1)
+                if fails_after is not None and len(vistas) > fails_after:
+                    raise RuntimeError("conexión perdida")
+                return 1
+
+            @event.listens_for(engine, "connect")
+            def _connect(dbapi_con, _):
+                dbapi_con.create_function("corte", 0, corte)
+
+        with app.app_context():
+            _register(db.engines[None], None)
+            _register(db.engines["replica"], replica_fails_after)
+
+    @app.post("/read-then-write")
+    def read_then_write():
+        origins = read_router.execute_read(
+            text("SELECT origin FROM items WHERE corte() = 1 ORDER BY id")
+        ).scalars().all()
+        db.session.execute(text("INSERT INTO items (origin) VALUES ('nuevo')"))
+        db.session.commit()
+        return ",".join(origins)
+
+    @app.get("/origin")
+    def origin():
+        return read_router.execute_read(text("SELECT origin FROM items ORDER BY id LIMIT 1")).scalar()
+
+    @app.post("/write")
+    def write():
+        db.session.execute(text("INSERT INTO items (origin) VALUES ('nuevo')"))
+        db.session.commit()
+        return read_router.execute_read(text("SELECT origin FROM items ORDER BY id LIMIT 1")).scalar()
+
+    return app
+
+
+@pytest.fixture
+def urls(tmp_path):
+    return (_sqlite_db(tmp_path / "primary.db", "primary"),
+            _sqlite_db(tmp_path / "replica.db", "replica"))
+
+
+def test_sin_replica_todo_al_primario(urls):
+    app = _make_app(urls[0])
+    assert app.test_client().get("/origin").text == "primary"
+
+
+def test_lecturas_a_la_replica(urls):
+    app = _make_app(*urls)
+    assert app.test_client().get("/origin").text == "replica"
+
+
+def test_lee_sus_escrituras_en_el_request_y_la_sesion(urls):
+    app = _make_app(*urls)
+    client = app.test_client()
+
+    # El mismo request ya escribió: lee del primario
+    assert client.post("/write").text == "primary"
+    # El siguiente request de esa sesión sigue en el primario (ventana pegajosa)
+    assert client.get("/origin").text == "primary"
+    # Otra sesión no escribió: réplica
+    assert app.test_client().get("/origin").text == "replica"
+
+    app.config["REPLICA_STICKY_SECONDS"] = 0
+    client.post("/write")
+    assert client.get("/origin").text == "replica"
+
+
+def test_replica_caida_pasa_al_primario(urls, tmp_path):
+    app = _make_app(urls[0], f"sqlite:///{tmp_path / 'no-existe' / 'replica.db'}")
+    client = app.test_client()
+
+    assert client.get("/origin").text == "primary"
+    with app.app_context():
+        assert not read_router.use_replica()   # no se reintenta hasta REPLICA_RETRY_SECONDS
+        app.extensions["read_router"].down_until = 0
+        assert read_router.use_replica()
+
+
+def test_replica_que_falla_a_mitad_de_la_lectura(tmp_path):
+    primary = _sqlite_db(tmp_path / "primary.db", "primary")
+    replica = _sqlite_db(tmp_path / "replica.db", "replica", rows=3)
+    app = _make_app(primary, replica, replica_fails_after=1)
+    client = app.test_client()
+
+    # La réplica entrega una fila y se corta: se repite entera en el
+    # primario y el commit del mismo request no encuentra la sesión rota
+    resp = client.post("/read-then-write")
+    assert resp.status_code == 200 and resp.text == "primary"
+    with app.app_context():
+        assert db.session.execute(text("SELECT COUNT(*) FROM items")).scalar() == 2
+        assert not read_router.use_replica()
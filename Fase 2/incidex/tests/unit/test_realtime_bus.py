@@ -0,0 +1,101 @@
+import json
+
+from src.infrastructure.realtime.bus import (
+    EventBus, RealtimeEvent, SUBSCRIBER_QUEUE_SIZE, ticket_topic, user_topic,
+)
+
+
+def _event(kind="comment", topics=(ticket_topic(1),), source_id=None, **data):
+    return RealtimeEvent(kind=kind, topics=topics, data=data, source_id=source_id)
+
+
+def test_entrega_solo_a_suscriptores_del_topico():
+    bus = EventBus()
+    detalle = bus.subscribe([user_topic(7), ticket_topic(1)])
+    otro = bus.subscribe([user_topic(8)])
+
+    bus.publish(_event(body="hola"))
+
+    assert detalle.get(timeout=0.1).data == {"body": "hola"}
+    assert otro.get(timeout=0.01) is None
+
+
+def test_mismo_cambio_local_y_desde_bd_se_entrega_una_vez():
+    bus = EventBus()
+    sub = bus.subscribe([ticket_topic(1)])
+
+    assert bus.publish(_event(source_id="ticket_comments:10")) is True
+    assert bus.publish(_event(source_id="ticket_comments:10")) is False
+
+    assert sub.get(timeout=0.1) is not None
+    assert sub.get(timeout=0.01) is None
+
+
+def test_cliente_lento_queda_marcado_para_resync():
+    bus = EventBus()
+    sub = bus.subscribe([ticket_topic(1)])
+
+    for i in range(SUBSCRIBER_QUEUE_SIZE + 1):
+        bus.publish(_event(n=i))
+
+    assert sub.overflowed
+
+
+def test_unsubscribe_libera_la_conexion():
+    bus = EventBus()
+    sub = bus.subscribe([user_topic(1)])
+    bus.unsubscribe(sub)
+
+    assert bus.subscriber_count() == 0
+
+
+def test_formato_sse():
+    ev = _event(kind="status", source_id="ticket_history:5", to_status="CERRADO")
+    chunk = ev.to_sse()
+
+    assert chunk.endswith("\n\n")
+    lines = chunk.strip().split("\n")
+    assert lines[0] == "id: ticket_history:5"
+    assert lines[1] == "event: status"
+    assert json.loads(lines[2][len("data: "):]) == {"to_status": "CERRADO"}
+
+
+def test_ids_salteados_se_vuelven_a_buscar_hasta_que_expiran():
+    from src.infrastructure.realtime.db_watermark import IdGaps
+
+    reloj = {"t": 0.0}
+    gaps = IdGaps(ttl=60, max_ids=5, clock=lambda: reloj["t"])
+
+    gaps.advance(10, [11, 14, 15])     # 12 y 13 todavía sin confirmar
+    assert gaps.pending() == [12, 13]
+
+    gaps.found([12])                   # el commit tardío llegó en la siguiente consulta
+    assert gaps.pending() == [13]
+
+    reloj["t"] = 61                    # rollback: se da por perdido
+    assert gaps.pending() == []
+
+    gaps.advance(15, [1000])           # salto grande: solo los max_ids más cercanos
+    assert gaps.pending() == [995, 996, 997, 998, 999]
+
+
+def test_poller_sin_suscriptores_olvida_el_watermark():
+    from flask import Flask
+    from src.infrastructure.realtime.db_watermark import DBWatermarkBackend
+
+    bus = EventBus()
+    backend = DBWatermarkBackend(Flask(__name__), event_bus=bus)
+    polls = []
+    backend.poll_once = lambda: polls.append(dict(backend._watermarks or {}))
+    backend._watermarks = {"ticket_comments": 40}
+    backend._gaps["ticket_comments"].advance(40, [42])
+
+    sub = bus.subscribe([ticket_topic(1)])
+    backend._tick()
+    assert polls == [{"ticket_comments": 40}]
+
+    bus.unsubscribe(sub)
+    backend._tick()                    # inactivo: no consulta y descarta el estado
+    assert len(polls) == 1
+    assert backend._watermarks is None
+    assert backend._gaps["ticket_comments"].pending() == []
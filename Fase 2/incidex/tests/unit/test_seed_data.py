@@ -0,0 +1,109 @@
+import random
+from datetime import datetime
+
+import click
+import pytest
+
+from src.commands.load_test import parse_mix, percentile, summarize
+from src.infrastructure.seeding import synthetic as syn
+
+NOW = datetime(2025, 6, 30, 12, 0)
+STATUSES = {"NUEVO": 1, "ASIGNADO": 2, "EN_PROGRESO": 3, "RESUELTO": 4, "CERRADO": 5, "RECHAZADO": 6}
+
+
+def _catalogs():
+    return syn.Catalogs(
+        statuses=STATUSES,
+        priorities=[(1, 24), (2, 72), (3, 120)],
+        category_ids=[1, 2, 3],
+        department_ids=[1, 2, 3, 4],
+        roles={"ADMIN": 1, "ANALYST": 2, "REQUESTER": 3, "QA": 4},
+    )
+
+
+def _population(rng, count=200):
+    return syn.user_rows(rng, 1000, count, _catalogs(), "hash", now=NOW)
+
+
+def test_user_rows_reparte_roles_y_marca_el_dominio():
+    users, roles, pop = _population(random.Random(1))
+
+    assert [u[0] for u in users] == list(range(1000, 1200))
+    assert all(u[4].endswith("@" + syn.SEED_EMAIL_DOMAIN) for u in users)
+    assert len({u[4] for u in users}) == len(users)
+    assert len(roles) == len(users)
+    assert pop.admin_ids and pop.requester_ids
+    assert set(pop.analysts_by_dept) == {1, 2, 3, 4}
+
+
+def test_ticket_batch_estado_final_calza_con_el_historial():
+    rng = random.Random(7)
+    _, _, pop = _population(rng)
+    lote = syn.ticket_batch(rng, 500, 2000, pop, _catalogs(), now=NOW, days=90)
+
+    assert [t[0] for t in lote.tickets] == list(range(500, 2500))
+    hist = {}
+    for ticket_id, _actor, desde, hacia, _nota, ts in lote.history:
+        hist.setdefault(ticket_id, []).append((desde, hacia, ts))
+
+    for t in lote.tickets:
+        tid, status_id, created, resolved_at, closed_at = t[0], t[9], t[10], t[12], t[13]
+        filas = hist.get(tid, [])
+        if not filas:
+            assert status_id == STATUSES["NUEVO"]
+            continue
+        # Cadena continua en el tiempo y sin saltos de estado
+        assert filas[0][0] == STATUSES["NUEVO"]
+        assert all(a[1] == b[0] and a[2] <= b[2] for a, b in zip(filas, filas[1:]))
+        assert created <= filas[0][2] <= NOW
+        assert filas[-1][1] == status_id
+        if STATUSES["RESUELTO"] in {h for _, h, _ in filas}:
+            assert resolved_at is not None
+        if status_id in (STATUSES["CERRADO"], STATUSES["RECHAZADO"]):
+            assert closed_at is not None
+
+    # Con 90 días de ventana hay tickets en todas las etapas
+    assert {t[9] for t in lote.tickets} >= {STATUSES[s] for s in ("NUEVO", "RESUELTO", "CERRADO")}
+    # Cada cambio notifica al solicitante
+    assert len(lote.notifications) >= len(lote.history)
+
+
+def test_ticket_batch_es_determinista_con_la_misma_semilla():
+    def generar():
+        rng = random.Random(3)
+        _, _, pop = _population(rng, 60)
+        return syn.ticket_batch(rng, 1, 100, pop, _catalogs(), now=NOW, days=30).tickets
+
+    assert generar() == generar()
+
+
+def test_bitacora_rows_lleva_el_sufijo_de_purga():
+    rng = random.Random(2)
+    _, _, pop = _population(rng, 50)
+    rows = syn.bitacora_rows(rng, 30, pop, now=NOW, days=10)
+
+    assert len(rows) == 30
+    assert all(r[1].endswith(syn.SEED_BITACORA_SUFFIX) for r in rows)
+
+
+def test_percentile_rango_mas_cercano():
+    vals = sorted(float(i) for i in range(1, 101))
+
+    assert percentile(vals, 50) == 50.0
+    assert percentile(vals, 95) == 95.0
+    assert percentile(vals, 99) == 99.0
+    assert percentile([], 50) == 0.0
+
+
+def test_summarize_omite_flujos_sin_datos():
+    filas = summarize({"dashboard": [0.01, 0.02, 0.03]}, {"create": 2}, elapsed=1.0)
+
+    assert [f["flow"] for f in filas] == ["dashboard", "create"]
+    assert filas[0]["n"] == 3 and round(filas[0]["p50"]) == 20
+    assert filas[1]["errors"] == 2 and filas[1]["n"] == 0
+
+
+def test_parse_mix_rechaza_flujos_desconocidos():
+    assert parse_mix("dashboard=3, create=1") == {"dashboard": 3.0, "create": 1.0}
+    with pytest.raises(click.BadParameter):
+        parse_mix("login=1")
@@ -0,0 +1,71 @@
+from contextlib import contextmanager
+from datetime import datetime
+
+from src.application.use_cases.ticket_service import TicketService
+
+
+class FakeRepo:
+    def __init__(self, due):
+        self.due = due
+        self.advanced = []
+        self.notifications = []
+        self.transactions = 0
+
+    @contextmanager
+    def unit_of_work(self):
+        self.transactions += 1
+        yield
+
+    def due_sla_timers(self, limit):
+        return self.due[:limit]
+
+    def advance_sla_timer(self, ticket_id, *, breached):
+        self.advanced.append((ticket_id, breached))
+
+    def list_admin_ids(self):
+        return [1, 2]
+
+    def insert_notification(self, *, user_id, ticket_id, kind, message):
+        self.notifications.append((user_id, ticket_id, kind))
+
+
+def _timer(ticket_id, *, breached, assignee_id):
+    return {
+        "ticket_id": ticket_id,
+        "due_at": datetime(2025, 1, 1, 12, 0),
+        "breached": 1 if breached else 0,
+        "code": f"INC-{ticket_id:05d}",
+        "assignee_id": assignee_id,
+        "priority_name": "ALTA",
+    }
+
+
+def test_sweep_avisa_y_vence_en_una_transaccion():
+    repo = FakeRepo([
+        _timer(10, breached=False, assignee_id=7),
+        _timer(11, breached=True, assignee_id=7),
+    ])
+
+    res = TicketService(repo).sweep_sla(batch_size=50)
+
+    assert res == {"warned": 1, "breached": 1}
+    assert repo.transactions == 1
+    assert repo.advanced == [(10, False), (11, True)]
+    assert repo.notifications == [(7, 10, "SLA_WARNING"), (7, 11, "SLA_BREACH")]
+
+
+def test_sweep_sin_asignado_notifica_a_administradores():
+    repo = FakeRepo([_timer(12, breached=True, assignee_id=None)])
+
+    TicketService(repo).sweep_sla()
+
+    assert repo.notifications == [(1, 12, "SLA_BREACH"), (2, 12, "SLA_BREACH")]
+
+
+def test_sweep_respeta_tamano_de_lote():
+    repo = FakeRepo([_timer(i, breached=False, assignee_id=3) for i in range(1, 6)])
+
+    res = TicketService(repo).sweep_sla(batch_size=2)
+
+    assert res == {"warned": 2, "breached": 0}
+    assert [t for t, _ in repo.advanced] == [1, 2]
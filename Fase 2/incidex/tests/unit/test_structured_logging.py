@@ -0,0 +1,92 @@
+import io
+import json
+import logging
+
+import pytest
+from flask import Flask
+
+from src.infrastructure import structured_logging
+from src.infrastructure.structured_logging import JsonFormatter, configure_logging, init_logging, parse_levels
+
+
+@pytest.fixture
+def restore_root():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    structured_logging._stop_listener()
+    if structured_logging._queue_handler is not None:
+        root.removeHandler(structured_logging._queue_handler)
+        structured_logging._queue_handler = None
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def _lines(stream):
+    structured_logging._stop_listener()   # vacía la cola
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_parse_levels():
+    assert parse_levels("incidex.sql=warning, werkzeug=ERROR,,roto") == {
+        "incidex.sql": "WARNING", "werkzeug": "ERROR",
+    }
+    assert parse_levels(None) == {}
+
+
+def test_registro_json_con_extra_y_traza(restore_root):
+    out = io.StringIO()
+    configure_logging(level="INFO", levels={"t.ruido": "ERROR"}, stream=out)
+    log = logging.getLogger("t.mod")
+    log.info("ticket %s asignado", 5, extra={"ticket_id": 5})
+    logging.getLogger("t.ruido").warning("no debe salir")
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        log.exception("falló")
+
+    first, second = _lines(out)
+    assert first["msg"] == "ticket 5 asignado" and first["ticket_id"] == 5
+    assert first["level"] == "INFO" and first["logger"] == "t.mod"
+    assert "request_id" not in first
+    assert second["level"] == "ERROR" and "ZeroDivisionError" in second["exc"]
+
+
+def test_campos_de_extra_sin_pisar_los_propios():
+    record = logging.getLogger("incidex.sql").makeRecord(
+        "incidex.sql", logging.WARNING, "", 0, "Consulta lenta (%.1f ms)", (812.0,), None,
+        extra={"event": "slow_query", "ms": 812, "level": "x"},
+    )
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["msg"] == "Consulta lenta (812.0 ms)"
+    assert entry["event"] == "slow_query" and entry["ms"] == 812
+    assert entry["level"] == "WARNING"
+
+
+def test_mensaje_con_forma_de_json_queda_como_texto():
+    msg = json.dumps({"event": "otro", "ms": 1})
+    record = logging.LogRecord("t.mod", logging.INFO, "", 0, msg, (), None)
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["msg"] == msg and "event" not in entry
+
+
+def test_request_id_correlaciona_y_se_devuelve(restore_root):
+    app = Flask(__name__)
+    init_logging(app)
+    out = io.StringIO()
+    configure_logging(stream=out)
+
+    @app.get("/x")
+    def x():
+        logging.getLogger("t.req").info("dentro")
+        return "ok"
+
+    client = app.test_client()
+    resp = client.get("/x", headers={"X-Request-ID": "abc123"})
+    assert resp.headers["X-Request-ID"] == "abc123"
+    generated = client.get("/x").headers["X-Request-ID"]
+    assert len(generated) == 16
+
+    first, second = [e for e in _lines(out) if e["logger"] == "t.req"]
+    assert first["request_id"] == "abc123" and first["path"] == "/x" and first["method"] == "GET"
+    assert second["request_id"] == generated
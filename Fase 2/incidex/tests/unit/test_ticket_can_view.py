@@ -0,0 +1,34 @@
+from src.application.use_cases.ticket_service import TicketService
+
+
+class FakeRepo:
+    def __init__(self, departments):
+        self.departments = departments
+
+    def get_user_department_id(self, user_id):
+        return self.departments.get(user_id)
+
+
+TICKET = {"id": 1, "requester_id": 10, "assignee_id": 20, "department_id": 2}
+
+
+def test_can_view_admin_ve_todo():
+    svc = TicketService(FakeRepo({}))
+    assert svc.can_view(TICKET, viewer_id=99, viewer_roles=["ADMIN"]) is True
+
+
+def test_can_view_solicitante_y_asignado():
+    svc = TicketService(FakeRepo({}))
+    assert svc.can_view(TICKET, viewer_id=10, viewer_roles=["REQUESTER"]) is True
+    assert svc.can_view(TICKET, viewer_id=20, viewer_roles=["REQUESTER"]) is True
+
+
+def test_can_view_analista_solo_de_su_departamento():
+    svc = TicketService(FakeRepo({30: 2, 31: 3}))
+    assert svc.can_view(TICKET, viewer_id=30, viewer_roles=["ANALYST"]) is True
+    assert svc.can_view(TICKET, viewer_id=31, viewer_roles=["ANALYST"]) is False
+
+
+def test_can_view_requester_ajeno_no_ve():
+    svc = TicketService(FakeRepo({40: 2}))
+    assert svc.can_view(TICKET, viewer_id=40, viewer_roles=["REQUESTER"]) is False
@@ -0,0 +1,68 @@
+import pytest
+
+from src.infrastructure.persistence.repositories import ticket_repository
+from src.infrastructure.persistence.repositories.ticket_repository import TicketRepository
+
+
+class FakeSession:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class FakeDB:
+    def __init__(self):
+        self.session = FakeSession()
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    fake = FakeDB()
+    monkeypatch.setattr(ticket_repository, "db", fake)
+    return fake
+
+
+def test_unit_of_work_un_solo_commit_y_efectos_despues(fake_db):
+    repo = TicketRepository()
+    events = []
+
+    with repo.unit_of_work():
+        repo._commit()
+        repo._commit()
+        repo._after_commit(lambda: events.append(("email", fake_db.session.commits)))
+        assert events == []  # diferido hasta el commit
+
+    assert fake_db.session.commits == 1
+    assert events == [("email", 1)]
+
+
+def test_unit_of_work_rollback_ejecuta_limpieza(fake_db):
+    repo = TicketRepository()
+    events = []
+
+    with pytest.raises(RuntimeError):
+        with repo.unit_of_work():
+            repo._after_commit(lambda: events.append("email"))
+            repo._on_rollback(lambda: events.append("cleanup"))
+            raise RuntimeError("falla al guardar")
+
+    assert fake_db.session.commits == 0
+    assert fake_db.session.rollbacks == 1
+    assert events == ["cleanup"]
+
+
+def test_sin_unit_of_work_el_efecto_es_inmediato(fake_db):
+    repo = TicketRepository()
+    events = []
+
+    repo._commit()
+    repo._after_commit(lambda: events.append("email"))
+
+    assert fake_db.session.commits == 1
+    assert events == ["email"]